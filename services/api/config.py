@@ -55,11 +55,24 @@ class Settings(BaseSettings):
     # Generation
     generation_candidate_pool_size: int = 30
     generation_llm_timeout_s: float = 5.0
+    # Serve the deterministic ranking if the LLM misses this budget, then
+    # upgrade the itinerary in the background (false = wait for the LLM)
+    generation_speculative: bool = True
+    generation_speculative_budget_s: float = 1.5
 
     # Weather (OpenWeatherMap)
     # Free tier: 1,000 calls/day. Redis caching (1 hour per city) keeps usage well under budget.
     openweathermap_api_key: str = ""
     weather_api_timeout_s: float = 8.0
+    # Refresh active-trip cities before the hourly cache rollover. Off by
+    # default; max_cities caps calls per hourly cycle (20 x 25 cycles = 500/day).
+    weather_prefetch_enabled: bool = False
+    weather_prefetch_lead_s: float = 600.0
+    weather_prefetch_jitter_s: float = 480.0
+    weather_prefetch_max_cities: int = 20
+
+    # In-memory per-city ActivityNode index (micro-stops, entity resolution)
+    spatial_index_max_bytes: int = 256 * 1024 * 1024
 
     # GCS
     gcs_raw_bucket: str = Field(default="overplanned-raw")
@@ -15,18 +15,33 @@ Promotion gates (from design doc):
 
 Test data: Parquet file with (user_id, ground_truth_item_id, context_items).
 Model interface: model.predict(user_id, context_items) -> list[str] (ranked IDs).
+Models may also implement predict_batch(user_ids, context_items) ->
+list[list[str]]; otherwise predict() is awaited with bounded concurrency.
+
+Evaluation streams the memory-mapped Parquet file in record batches, and
+every batch is predicted by every model under evaluation (several candidates
+plus, optionally, the production model) -- one pass over the test set.
+Each query is reduced to the rank of its ground truth item (0 = miss);
+HR@5 / MRR / NDCG@10 are computed from the (models x queries) rank matrix.
+
+With a production model, the NDCG@10 gate is a paired bootstrap: the same
+resampled query sets score both models, and the candidate's CI lower bound
+must exceed production's upper bound. Without one, the candidate's point
+estimate is compared with production's last stored NDCG@10.
 
 Results are stored in the EvalRun table for tracking model progression.
 """
 
+import asyncio
 import logging
 import math
 import time
 import uuid
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any, Protocol
+from typing import Any, Iterator, Protocol, Sequence
 
+import numpy as np
 import pyarrow.parquet as pq
 
 logger = logging.getLogger(__name__)
@@ -35,6 +50,19 @@ logger = logging.getLogger(__name__)
 GATE_HR_AT_5 = 0.15
 GATE_MRR = 0.08
 
+# Queries read and predicted per step
+EVAL_BATCH_SIZE = 512
+# Concurrent predict() calls for models without predict_batch
+PREDICT_CONCURRENCY = 16
+
+# Bootstrap CI for NDCG@10
+BOOTSTRAP_RESAMPLES = 1000
+BOOTSTRAP_CONFIDENCE = 0.95
+# Resample index cells materialized at once (resamples x queries)
+_BOOTSTRAP_CHUNK_CELLS = 4_000_000
+
+_TEST_COLUMNS = ["user_id", "ground_truth_item_id", "context_items"]
+
 
 class EvalModel(Protocol):
     """Protocol for models that can be evaluated."""
@@ -46,6 +74,18 @@ class EvalModel(Protocol):
         ...
 
 
+class BatchEvalModel(EvalModel, Protocol):
+    """EvalModel that can rank many queries in one call."""
+
+    async def predict_batch(
+        self,
+        user_ids: list[str],
+        context_items: list[list[str]],
+    ) -> list[list[str]]:
+        """Return one ranked list of item IDs per query."""
+        ...
+
+
 @dataclass
 class EvalResult:
     """Result of an offline evaluation run."""
@@ -58,6 +98,7 @@ class EvalResult:
     duration_ms: int
     passed_gates: bool
     gate_details: dict = field(default_factory=dict)
+    ndcg_at_10_ci: tuple[float, float] | None = None
 
 
 _INSERT_RESULT_SQL = """
@@ -122,6 +163,22 @@ def _compute_ndcg_at_k(
     return dcg / idcg
 
 
+def _iter_test_batches(
+    test_data_path: str,
+    batch_size: int = EVAL_BATCH_SIZE,
+) -> Iterator[tuple[list[str], list[str], list[list[str]]]]:
+    """
+    Stream (user_ids, ground_truth_item_ids, context_items) from a
+    memory-mapped Parquet file, batch_size rows at a time.
+    """
+    parquet = pq.ParquetFile(test_data_path, memory_map=True)
+    for batch in parquet.iter_batches(batch_size=batch_size, columns=_TEST_COLUMNS):
+        user_ids = batch.column(0).to_pylist()
+        ground_truths = batch.column(1).to_pylist()
+        contexts = [c if isinstance(c, list) else [] for c in batch.column(2).to_pylist()]
+        yield user_ids, ground_truths, contexts
+
+
 def _load_test_data(test_data_path: str) -> list[dict]:
     """
     Load test data from a Parquet file.
@@ -129,18 +186,108 @@ def _load_test_data(test_data_path: str) -> list[dict]:
     Expected columns: user_id (str), ground_truth_item_id (str),
     context_items (list of str).
     """
-    table = pq.read_table(test_data_path)
     rows = []
-    for i in range(len(table)):
-        context_items_raw = table.column("context_items")[i].as_py()
-        rows.append({
-            "user_id": table.column("user_id")[i].as_py(),
-            "ground_truth_item_id": table.column("ground_truth_item_id")[i].as_py(),
-            "context_items": context_items_raw if isinstance(context_items_raw, list) else [],
-        })
+    for user_ids, ground_truths, contexts in _iter_test_batches(test_data_path):
+        rows.extend(
+            {"user_id": u, "ground_truth_item_id": g, "context_items": c}
+            for u, g, c in zip(user_ids, ground_truths, contexts)
+        )
     return rows
 
 
+def _ground_truth_ranks(rankings: Sequence[list[str]], ground_truths: Sequence[str]) -> np.ndarray:
+    """1-based rank of each query's ground truth item, 0 when absent."""
+    ranks = np.zeros(len(ground_truths), dtype=np.int32)
+    for i, (ranked, truth) in enumerate(zip(rankings, ground_truths)):
+        try:
+            ranks[i] = ranked.index(truth) + 1
+        except ValueError:
+            pass
+    return ranks
+
+
+def metrics_from_ranks(ranks: np.ndarray, k: int = 10) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Per-query HR@5, reciprocal rank and NDCG@k from a rank array of any
+    shape (0 = miss). Matches _compute_hr_at_k / _compute_reciprocal_rank /
+    _compute_ndcg_at_k element-wise.
+    """
+    ranks = np.asarray(ranks)
+    hit = ranks > 0
+    safe = np.where(hit, ranks, 1).astype(np.float64)
+    hr = (hit & (ranks <= 5)).astype(np.float64)
+    rr = np.where(hit, 1.0 / safe, 0.0)
+    ndcg = np.where(hit & (ranks <= k), 1.0 / np.log2(safe + 1.0), 0.0)
+    return hr, rr, ndcg
+
+
+def bootstrap_ci(
+    values: np.ndarray,
+    n_resamples: int = BOOTSTRAP_RESAMPLES,
+    confidence: float = BOOTSTRAP_CONFIDENCE,
+    seed: int | None = 0,
+) -> np.ndarray:
+    """
+    Percentile bootstrap CI of the mean for each row of ``values``
+    (models x queries). Rows share resample indices, so CIs are paired.
+
+    Returns an (models, 2) array of (low, high).
+    """
+    values = np.atleast_2d(np.asarray(values, dtype=np.float64))
+    n = values.shape[1]
+    if n == 0:
+        return np.zeros((values.shape[0], 2))
+
+    rng = np.random.default_rng(seed)
+    means = np.empty((values.shape[0], n_resamples))
+    chunk = max(1, _BOOTSTRAP_CHUNK_CELLS // n)
+    for start in range(0, n_resamples, chunk):
+        stop = min(start + chunk, n_resamples)
+        idx = rng.integers(0, n, size=(stop - start, n))
+        means[:, start:stop] = values[:, idx].mean(axis=2)
+
+    alpha = (1.0 - confidence) / 2.0
+    return np.quantile(means, [alpha, 1.0 - alpha], axis=1).T
+
+
+async def _predict_batch(
+    model: EvalModel,
+    user_ids: list[str],
+    contexts: list[list[str]],
+    semaphore: asyncio.Semaphore,
+) -> list[list[str]]:
+    """Rank a batch with predict_batch when available, else concurrent predict()."""
+    predict_batch = getattr(model, "predict_batch", None)
+    if predict_batch is not None:
+        try:
+            rankings = await predict_batch(user_ids, contexts)
+            if len(rankings) == len(user_ids):
+                return [list(r or []) for r in rankings]
+            logger.warning(
+                "predict_batch for model=%s returned %d rankings for %d queries; "
+                "falling back to predict()",
+                model.model_id, len(rankings), len(user_ids),
+            )
+        except Exception:
+            logger.exception(
+                "predict_batch failed for model=%s; falling back to predict()",
+                model.model_id,
+            )
+
+    async def _one(user_id: str, context_items: list[str]) -> list[str]:
+        async with semaphore:
+            try:
+                return list(await model.predict(user_id, context_items) or [])
+            except Exception:
+                logger.exception(
+                    "Model prediction failed for user=%s, treating as miss",
+                    user_id,
+                )
+                return []
+
+    return list(await asyncio.gather(*(_one(u, c) for u, c in zip(user_ids, contexts))))
+
+
 async def _get_production_ndcg(pool, model_id: str) -> float | None:
     """Fetch the most recent production model's NDCG@10 for gate comparison."""
     async with pool.acquire() as conn:
@@ -155,6 +302,8 @@ def _check_gates(
     mrr: float,
     ndcg_at_10: float,
     production_ndcg: float | None,
+    ndcg_ci: tuple[float, float] | None = None,
+    production_ci: tuple[float, float] | None = None,
 ) -> tuple[bool, dict]:
     """
     Check promotion gates. Returns (passed_all, gate_details).
@@ -162,12 +311,16 @@ def _check_gates(
     Gates:
     1. HR@5 >= 0.15
     2. MRR >= 0.08
-    3. NDCG@10 > production NDCG@10 (if production baseline exists)
+    3. NDCG@10 beats production (if a production baseline exists): with
+       both CIs, the candidate's lower bound must exceed production's upper
+       bound; otherwise the point estimate must exceed the baseline
     """
     gate_hr = hr_at_5 >= GATE_HR_AT_5
     gate_mrr = mrr >= GATE_MRR
 
-    if production_ndcg is not None:
+    if ndcg_ci is not None and production_ci is not None:
+        gate_ndcg = ndcg_ci[0] > production_ci[1]
+    elif production_ndcg is not None:
         gate_ndcg = ndcg_at_10 > production_ndcg
     else:
         # No production baseline: pass by default (first model)
@@ -182,6 +335,11 @@ def _check_gates(
             "passed": gate_ndcg,
         },
     }
+    if ndcg_ci is not None:
+        details["ndcg_at_10"]["ci"] = list(ndcg_ci)
+    if production_ci is not None:
+        details["ndcg_at_10"]["production_ci"] = list(production_ci)
+        details["ndcg_at_10"]["method"] = "bootstrap_ci_non_overlap"
 
     passed_all = gate_hr and gate_mrr and gate_ndcg
     return passed_all, details
@@ -212,6 +370,9 @@ async def run_offline_eval(
     model: EvalModel,
     test_data_path: str,
     k: int = 10,
+    *,
+    production_model: EvalModel | None = None,
+    **options: Any,
 ) -> EvalResult:
     """
     Evaluate an ML model against held-out test data.
@@ -221,92 +382,136 @@ async def run_offline_eval(
         model: model implementing EvalModel protocol (predict method).
         test_data_path: path to Parquet file with test queries.
         k: cutoff for NDCG (default 10).
+        production_model: evaluated in the same pass for the bootstrap
+            NDCG@10 gate (see run_offline_eval_many).
+        options: batch_size, concurrency, n_resamples, seed.
 
     Returns:
         EvalResult with all metrics, gate pass/fail, and details.
     """
-    start = time.monotonic()
+    results = await run_offline_eval_many(
+        pool, [model], test_data_path, k, production_model=production_model, **options
+    )
+    return results[0]
+
+
+async def run_offline_eval_many(
+    pool,
+    models: Sequence[EvalModel],
+    test_data_path: str,
+    k: int = 10,
+    *,
+    production_model: EvalModel | None = None,
+    batch_size: int = EVAL_BATCH_SIZE,
+    concurrency: int = PREDICT_CONCURRENCY,
+    n_resamples: int = BOOTSTRAP_RESAMPLES,
+    seed: int | None = 0,
+) -> list[EvalResult]:
+    """
+    Evaluate several candidate models in one pass over the test set.
+
+    Each batch of queries is ranked by every candidate (and production_model,
+    when given) concurrently. Results are stored per candidate; the
+    production model's metrics are only used for the NDCG@10 gate.
 
-    # Load test data
-    test_data = _load_test_data(test_data_path)
-    total_queries = len(test_data)
+    Returns:
+        One EvalResult per model, in order.
+    """
+    start = time.monotonic()
+    evaluated: list[EvalModel] = list(models)
+    if production_model is not None:
+        evaluated.append(production_model)
+
+    semaphore = asyncio.Semaphore(concurrency)
+    rank_batches: list[np.ndarray] = []
+    for user_ids, ground_truths, contexts in _iter_test_batches(test_data_path, batch_size):
+        rankings = await asyncio.gather(
+            *(_predict_batch(m, user_ids, contexts, semaphore) for m in evaluated)
+        )
+        rank_batches.append(np.stack([_ground_truth_ranks(r, ground_truths) for r in rankings]))
 
+    total_queries = sum(b.shape[1] for b in rank_batches)
     if total_queries == 0:
         duration_ms = int((time.monotonic() - start) * 1000)
+        results = []
+        for model in models:
+            result = EvalResult(
+                model_id=model.model_id,
+                model_version=model.model_version,
+                hr_at_5=0.0,
+                mrr=0.0,
+                ndcg_at_10=0.0,
+                total_queries=0,
+                duration_ms=duration_ms,
+                passed_gates=False,
+                gate_details={"error": "no test data"},
+            )
+            await _store_result(pool, result)
+            results.append(result)
+        return results
+
+    # (models x queries)
+    ranks = np.concatenate(rank_batches, axis=1)
+    hr, rr, ndcg = metrics_from_ranks(ranks, k=k)
+    hr_mean, mrr_mean, ndcg_mean = hr.mean(axis=1), rr.mean(axis=1), ndcg.mean(axis=1)
+
+    production_ci: tuple[float, float] | None = None
+    cis: list[tuple[float, float] | None] = [None] * len(models)
+    if production_model is not None:
+        bounds = bootstrap_ci(ndcg, n_resamples=n_resamples, seed=seed)
+        cis = [(float(lo), float(hi)) for lo, hi in bounds[: len(models)]]
+        production_ci = (float(bounds[-1, 0]), float(bounds[-1, 1]))
+
+    duration_ms = int((time.monotonic() - start) * 1000)
+
+    results = []
+    for i, model in enumerate(models):
+        if production_model is not None:
+            production_ndcg = float(ndcg_mean[-1])
+        else:
+            # Get production baseline for gate comparison
+            production_ndcg = await _get_production_ndcg(pool, model.model_id)
+
+        # Check promotion gates
+        passed_gates, gate_details = _check_gates(
+            float(hr_mean[i]),
+            float(mrr_mean[i]),
+            float(ndcg_mean[i]),
+            production_ndcg,
+            ndcg_ci=cis[i],
+            production_ci=production_ci,
+        )
+
         result = EvalResult(
             model_id=model.model_id,
             model_version=model.model_version,
-            hr_at_5=0.0,
-            mrr=0.0,
-            ndcg_at_10=0.0,
-            total_queries=0,
+            hr_at_5=float(hr_mean[i]),
+            mrr=float(mrr_mean[i]),
+            ndcg_at_10=float(ndcg_mean[i]),
+            total_queries=total_queries,
             duration_ms=duration_ms,
-            passed_gates=False,
-            gate_details={"error": "no test data"},
+            passed_gates=passed_gates,
+            gate_details=gate_details,
+            ndcg_at_10_ci=cis[i],
         )
-        await _store_result(pool, result)
-        return result
 
-    # Run predictions and compute per-query metrics
-    hr_scores = []
-    rr_scores = []
-    ndcg_scores = []
+        logger.info(
+            "Offline eval complete: model=%s HR@5=%.3f MRR=%.3f NDCG@10=%.3f gates=%s (%d queries, %dms)",
+            model.model_id,
+            result.hr_at_5,
+            result.mrr,
+            result.ndcg_at_10,
+            "PASS" if passed_gates else "FAIL",
+            total_queries,
+            duration_ms,
+        )
 
-    for query in test_data:
+        # Persist results
         try:
-            rankings = await model.predict(query["user_id"], query["context_items"])
+            await _store_result(pool, result)
         except Exception:
-            logger.exception(
-                "Model prediction failed for user=%s, treating as miss",
-                query["user_id"],
-            )
-            rankings = []
-
-        ground_truth = query["ground_truth_item_id"]
-        hr_scores.append(_compute_hr_at_k(rankings, ground_truth, k=5))
-        rr_scores.append(_compute_reciprocal_rank(rankings, ground_truth))
-        ndcg_scores.append(_compute_ndcg_at_k(rankings, ground_truth, k=k))
-
-    # Aggregate metrics
-    hr_at_5 = sum(hr_scores) / total_queries
-    mrr = sum(rr_scores) / total_queries
-    ndcg_at_10 = sum(ndcg_scores) / total_queries
+            logger.exception("Failed to store eval result for model=%s", model.model_id)
 
-    # Get production baseline for gate comparison
-    production_ndcg = await _get_production_ndcg(pool, model.model_id)
-
-    # Check promotion gates
-    passed_gates, gate_details = _check_gates(hr_at_5, mrr, ndcg_at_10, production_ndcg)
-
-    duration_ms = int((time.monotonic() - start) * 1000)
-
-    result = EvalResult(
-        model_id=model.model_id,
-        model_version=model.model_version,
-        hr_at_5=hr_at_5,
-        mrr=mrr,
-        ndcg_at_10=ndcg_at_10,
-        total_queries=total_queries,
-        duration_ms=duration_ms,
-        passed_gates=passed_gates,
-        gate_details=gate_details,
-    )
-
-    logger.info(
-        "Offline eval complete: model=%s HR@5=%.3f MRR=%.3f NDCG@10=%.3f gates=%s (%d queries, %dms)",
-        model.model_id,
-        hr_at_5,
-        mrr,
-        ndcg_at_10,
-        "PASS" if passed_gates else "FAIL",
-        total_queries,
-        duration_ms,
-    )
-
-    # Persist results
-    try:
-        await _store_result(pool, result)
-    except Exception:
-        logger.exception("Failed to store eval result for model=%s", model.model_id)
+        results.append(result)
 
-    return result
+    return results
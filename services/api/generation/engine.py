@@ -5,6 +5,7 @@ Flow:
   1. Build persona-weighted query string from personaSeed
   2. Search Qdrant via ActivitySearchService (persona-weighted vector)
   3. Run fallback cascade: LLM ranking -> deterministic -> PG -> template
+     (speculative mode: deterministic first, LLM upgrade in the background)
   4. Assign time slots: anchors first, meals at windows, flex fills gaps
   5. Write ItinerarySlot rows linked to ActivityNodes
   6. Log full candidate set to RawEvent
@@ -12,10 +13,17 @@ Flow:
   8. Return generation summary
 
 Every LLM call logs: model version, prompt version, latency, estimated cost.
+
+Speculative mode (speculative_budget_s set): when the LLM misses the budget
+the deterministic itinerary is persisted and returned, and a background
+task rewrites the same slot rows with the LLM ranking once it lands —
+unless the traveler has already confirmed, locked or swapped a slot. Both
+rankings are logged as a "ranking_shadow_compared" RawEvent.
 """
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import time
@@ -25,9 +33,17 @@ from typing import Any
 
 import anthropic
 
-from services.api.generation.fallbacks import get_template_itinerary, run_with_fallbacks
+from services.api.generation.fallbacks import (
+    LLM_RANKING_ERRORS,
+    discard_pending_llm,
+    get_template_itinerary,
+    resolve_ranked,
+    run_speculative,
+    run_with_fallbacks,
+)
 from services.api.generation.slot_assigner import SlotAssignment, assign_slots
 from services.api.generation.ranker import RANKER_MODEL, RANKER_PROMPT_VERSION
+from services.api.generation.ranking_cache import RankingCache
 from services.api.ranking.cant_miss import apply_cant_miss_floor
 from services.api.search.service import ActivitySearchService
 
@@ -41,6 +57,9 @@ _COST_PER_OUTPUT_TOKEN = 15e-6
 # How many candidates to pull from Qdrant before ranking
 CANDIDATE_POOL_SIZE = 30
 
+# Background LLM upgrades in flight (keeps the tasks referenced until done)
+_background_upgrades: set[asyncio.Task] = set()
+
 # Persona query template — interpolated from personaSeed fields
 def _build_persona_query(persona_seed: dict[str, Any], city: str) -> str:
     """
@@ -86,10 +105,16 @@ class GenerationEngine:
         search_service: ActivitySearchService,
         anthropic_client: anthropic.AsyncAnthropic,
         db,  # asyncpg pool/connection
+        *,
+        speculative_budget_s: float | None = None,
+        ranking_cache: RankingCache | None = None,
     ) -> None:
         self._search = search_service
         self._anthropic = anthropic_client
         self._db = db
+        # None = classic cascade (wait up to LLM_TIMEOUT_S for the LLM)
+        self._speculative_budget_s = speculative_budget_s
+        self._ranking_cache = ranking_cache
 
     async def generate(
         self,
@@ -112,6 +137,7 @@ class GenerationEngine:
             "candidatesConsidered": int,
             "logMeta": dict,
             "warning": str | None,
+            "upgradePending": bool,
         }
         """
         pipeline_start = time.monotonic()
@@ -151,71 +177,124 @@ class GenerationEngine:
         # ------------------------------------------------------------------
         # Step 2: Fallback cascade — LLM rank -> deterministic -> PG -> template
         # ------------------------------------------------------------------
-        ranked_meta, resolved_candidates, generation_method, log_meta = await run_with_fallbacks(
-            candidates=candidates,
-            persona_seed=persona_seed,
-            city=city,
-            anthropic_client=self._anthropic,
-            db=self._db,
-            qdrant_available=qdrant_available,
-        )
-
-        # ------------------------------------------------------------------
-        # Step 2b: Apply cant-miss floor (L7 wire-up)
-        # Ensures high-value nodes with cantMiss=true maintain a minimum
-        # score of 0.72, preventing them from being ranked out.
-        # ------------------------------------------------------------------
-        if resolved_candidates and generation_method != "template_fallback":
-            resolved_candidates = await apply_cant_miss_floor(
-                resolved_candidates, self._db,
+        deterministic_meta: list[dict[str, Any]] = []
+        pending_llm: asyncio.Task | None = None
+        if self._speculative_budget_s is None:
+            ranked_meta, resolved_candidates, generation_method, log_meta = await run_with_fallbacks(
+                candidates=candidates,
+                persona_seed=persona_seed,
+                city=city,
+                anthropic_client=self._anthropic,
+                db=self._db,
+                qdrant_available=qdrant_available,
+                ranking_cache=self._ranking_cache,
             )
-
-        # ------------------------------------------------------------------
-        # Step 3: Slot assignment
-        # ------------------------------------------------------------------
-        slots: list[SlotAssignment] = []
-
-        if generation_method == "template_fallback":
-            # Template path — no real ActivityNodes to assign
-            logger.warning("Using template itinerary for trip=%s", trip_id)
         else:
-            slots = assign_slots(
-                ranked_nodes=resolved_candidates,
-                ranked_meta=ranked_meta,
-                trip_start_date=start_date,
-                num_days=num_days,
+            speculative = await run_speculative(
+                candidates=candidates,
+                persona_seed=persona_seed,
+                city=city,
+                anthropic_client=self._anthropic,
+                db=self._db,
+                qdrant_available=qdrant_available,
+                budget_s=self._speculative_budget_s,
+                ranking_cache=self._ranking_cache,
             )
+            ranked_meta = speculative.ranked_meta
+            resolved_candidates = speculative.resolved
+            generation_method = speculative.generation_method
+            log_meta = speculative.log_meta
+            deterministic_meta = speculative.deterministic_meta
+            pending_llm = speculative.pending_llm
+
+        # Until the upgrade task takes it, a pending LLM ranking is ours to cancel
+        try:
+            # ------------------------------------------------------------------
+            # Step 2b: Apply cant-miss floor (L7 wire-up)
+            # Ensures high-value nodes with cantMiss=true maintain a minimum
+            # score of 0.72, preventing them from being ranked out.
+            # ------------------------------------------------------------------
+            if resolved_candidates and generation_method != "template_fallback":
+                resolved_candidates = await apply_cant_miss_floor(
+                    resolved_candidates, self._db,
+                )
 
-        # ------------------------------------------------------------------
-        # Step 4: Persist ItinerarySlot rows
-        # ------------------------------------------------------------------
-        slots_created = 0
-        if slots:
-            slots_created = await self._write_slots(trip_id, slots)
-
-        # ------------------------------------------------------------------
-        # Step 5: Update Trip.generationMethod (stored in personaSeed JSON)
-        # ------------------------------------------------------------------
-        await self._update_trip_generation_method(trip_id, generation_method)
+            # ------------------------------------------------------------------
+            # Step 3: Slot assignment
+            # ------------------------------------------------------------------
+            slots: list[SlotAssignment] = []
+
+            if generation_method == "template_fallback":
+                # Template path — no real ActivityNodes to assign
+                logger.warning("Using template itinerary for trip=%s", trip_id)
+            else:
+                slots = assign_slots(
+                    ranked_nodes=resolved_candidates,
+                    ranked_meta=ranked_meta,
+                    trip_start_date=start_date,
+                    num_days=num_days,
+                )
 
-        # ------------------------------------------------------------------
-        # Step 6: Log candidate pool to RawEvent
-        # ------------------------------------------------------------------
-        await self._log_candidate_pool(
-            user_id=user_id,
-            session_id=session_id,
-            trip_id=trip_id,
-            candidates=candidates,
-            ranked_meta=ranked_meta,
-            generation_method=generation_method,
-            log_meta=log_meta,
-        )
+            # ------------------------------------------------------------------
+            # Step 4: Persist ItinerarySlot rows
+            # ------------------------------------------------------------------
+            slots_created = 0
+            if slots:
+                slots_created = await self._write_slots(trip_id, slots)
+
+            # ------------------------------------------------------------------
+            # Step 5: Update Trip.generationMethod (stored in personaSeed JSON)
+            # ------------------------------------------------------------------
+            await self._update_trip_generation_method(trip_id, generation_method)
+
+            # ------------------------------------------------------------------
+            # Step 6: Log candidate pool to RawEvent
+            # ------------------------------------------------------------------
+            await self._log_candidate_pool(
+                user_id=user_id,
+                session_id=session_id,
+                trip_id=trip_id,
+                candidates=candidates,
+                ranked_meta=ranked_meta,
+                generation_method=generation_method,
+                log_meta=log_meta,
+            )
 
-        # ------------------------------------------------------------------
-        # Step 7: Register prompt version in ModelRegistry
-        # ------------------------------------------------------------------
-        if generation_method == "llm":
-            await self._register_prompt_version(log_meta)
+            # ------------------------------------------------------------------
+            # Step 7: Register prompt version in ModelRegistry
+            # ------------------------------------------------------------------
+            if generation_method == "llm":
+                await self._register_prompt_version(log_meta)
+
+            # ------------------------------------------------------------------
+            # Step 8 (speculative): shadow comparison + background upgrade
+            # ------------------------------------------------------------------
+            if generation_method == "llm" and deterministic_meta:
+                await self._log_ranking_comparison(
+                    user_id=user_id,
+                    session_id=session_id,
+                    trip_id=trip_id,
+                    served_method=generation_method,
+                    llm_meta=ranked_meta,
+                    deterministic_meta=deterministic_meta,
+                    llm_log=log_meta,
+                    upgraded=False,
+                )
+            if pending_llm is not None:
+                self._schedule_upgrade(
+                    pending_llm,
+                    trip_id=trip_id,
+                    user_id=user_id,
+                    session_id=session_id,
+                    candidates=candidates,
+                    deterministic_meta=deterministic_meta,
+                    start_date=start_date,
+                    num_days=num_days,
+                    slots_written=slots_created > 0,
+                )
+        except BaseException:
+            discard_pending_llm(pending_llm)
+            raise
 
         # ------------------------------------------------------------------
         # Summary
@@ -241,8 +320,222 @@ class GenerationEngine:
                 "costEstimateUsd": _estimate_cost(log_meta),
             },
             "warning": warning,
+            "upgradePending": pending_llm is not None,
         }
 
+    # ------------------------------------------------------------------
+    # Speculative upgrade
+    # ------------------------------------------------------------------
+
+    def _schedule_upgrade(self, pending_llm: asyncio.Task, **kwargs: Any) -> asyncio.Task:
+        """Run _upgrade_with_llm() detached from the request."""
+        task = asyncio.create_task(
+            self._upgrade_with_llm(pending_llm, **kwargs),
+            name=f"speculative-upgrade-{kwargs['trip_id']}",
+        )
+        _background_upgrades.add(task)
+
+        def _on_done(t: asyncio.Task) -> None:
+            _background_upgrades.discard(t)
+            if t.cancelled():
+                return
+            exc = t.exception()
+            if exc:
+                logger.error("Speculative upgrade failed: %s", exc, exc_info=exc)
+
+        task.add_done_callback(_on_done)
+        return task
+
+    async def _upgrade_with_llm(
+        self,
+        pending_llm: asyncio.Task,
+        *,
+        trip_id: str,
+        user_id: str,
+        session_id: str,
+        candidates: list[dict[str, Any]],
+        deterministic_meta: list[dict[str, Any]],
+        start_date: datetime,
+        num_days: int,
+        slots_written: bool,
+    ) -> bool:
+        """
+        Wait for the speculative LLM ranking and, if it lands, rewrite the
+        deterministic slots with it. Returns True when the slots were upgraded.
+        """
+        try:
+            llm_meta, llm_log = await pending_llm
+        except LLM_RANKING_ERRORS as exc:
+            logger.warning("Speculative LLM ranking failed for trip=%s (%s)", trip_id, exc)
+            await self._log_ranking_comparison(
+                user_id=user_id,
+                session_id=session_id,
+                trip_id=trip_id,
+                served_method="deterministic_fallback",
+                llm_meta=None,
+                deterministic_meta=deterministic_meta,
+                llm_log={"error": type(exc).__name__},
+                upgraded=False,
+            )
+            return False
+
+        upgraded = False
+        if slots_written:
+            slots = assign_slots(
+                ranked_nodes=resolve_ranked(llm_meta, candidates),
+                ranked_meta=llm_meta,
+                trip_start_date=start_date,
+                num_days=num_days,
+            )
+            upgraded = bool(slots) and await self._replace_slots(trip_id, slots)
+
+        if upgraded:
+            await self._update_trip_generation_method(trip_id, "llm")
+            await self._register_prompt_version(llm_log)
+        logger.info("Speculative LLM ranking landed: trip=%s upgraded=%s", trip_id, upgraded)
+
+        await self._log_ranking_comparison(
+            user_id=user_id,
+            session_id=session_id,
+            trip_id=trip_id,
+            served_method="deterministic_fallback",
+            llm_meta=llm_meta,
+            deterministic_meta=deterministic_meta,
+            llm_log=llm_log,
+            upgraded=upgraded,
+        )
+        return upgraded
+
+    async def _replace_slots(
+        self,
+        trip_id: str,
+        slots: list[SlotAssignment],
+    ) -> bool:
+        """
+        Rewrite the trip's slot rows in place with a new assignment.
+
+        Rows are matched on (dayNumber, sortOrder) and keep their IDs; surplus
+        rows are deleted and missing ones inserted. Nothing is changed if any
+        slot has left the untouched 'proposed' state. Returns True on rewrite.
+        """
+        now = datetime.now(timezone.utc)
+        async with self._db.transaction():
+            rows = await self._db.fetch(
+                """
+                SELECT id, "dayNumber", "sortOrder", status, "isLocked", "wasSwapped"
+                FROM itinerary_slots
+                WHERE "tripId" = $1
+                FOR UPDATE
+                """,
+                trip_id,
+            )
+            if not rows or any(
+                r["status"] != "proposed" or r["isLocked"] or r["wasSwapped"] for r in rows
+            ):
+                logger.info("Skipping speculative upgrade: trip=%s slots already touched", trip_id)
+                return False
+
+            existing = {(r["dayNumber"], r["sortOrder"]): r["id"] for r in rows}
+            updates = []
+            inserts = []
+            for slot in slots:
+                values = (
+                    slot.activity_node_id,
+                    slot.slot_type,
+                    slot.start_time,
+                    slot.end_time,
+                    slot.duration_minutes,
+                    now,
+                )
+                slot_id = existing.pop((slot.day_number, slot.sort_order), None)
+                if slot_id is not None:
+                    updates.append((slot_id, *values))
+                else:
+                    inserts.append(
+                        (str(uuid.uuid4()), trip_id, slot.day_number, slot.sort_order, *values)
+                    )
+
+            if updates:
+                await self._db.executemany(
+                    """
+                    UPDATE itinerary_slots
+                    SET "activityNodeId" = $2, "slotType" = $3,
+                        "startTime" = $4, "endTime" = $5, "durationMinutes" = $6,
+                        "updatedAt" = $7
+                    WHERE id = $1
+                    """,
+                    updates,
+                )
+            if inserts:
+                await self._db.executemany(
+                    """
+                    INSERT INTO itinerary_slots (
+                        id, "tripId", "dayNumber", "sortOrder",
+                        "activityNodeId", "slotType", status,
+                        "startTime", "endTime", "durationMinutes",
+                        "isLocked", "wasSwapped",
+                        "createdAt", "updatedAt"
+                    ) VALUES (
+                        $1, $2, $3, $4,
+                        $5, $6, 'proposed',
+                        $7, $8, $9,
+                        false, false,
+                        $10, $10
+                    )
+                    ON CONFLICT DO NOTHING
+                    """,
+                    inserts,
+                )
+            if existing:
+                await self._db.execute(
+                    "DELETE FROM itinerary_slots WHERE id = ANY($1::text[])",
+                    list(existing.values()),
+                )
+        return True
+
+    async def _log_ranking_comparison(
+        self,
+        user_id: str,
+        session_id: str,
+        trip_id: str,
+        served_method: str,
+        llm_meta: list[dict[str, Any]] | None,
+        deterministic_meta: list[dict[str, Any]],
+        llm_log: dict[str, Any],
+        upgraded: bool,
+    ) -> None:
+        """Log the LLM and deterministic rankings side by side as a RawEvent."""
+        try:
+            payload = {
+                "servedMethod": served_method,
+                "upgraded": upgraded,
+                "llmLogMeta": llm_log,
+                "llmRankedIds": [m["id"] for m in llm_meta] if llm_meta is not None else None,
+                "deterministicRankedIds": [m["id"] for m in deterministic_meta],
+            }
+            await self._db.execute(
+                """
+                INSERT INTO raw_events (
+                    id, "userId", "sessionId", "tripId",
+                    "clientEventId", "eventType", "intentClass",
+                    surface, payload, "createdAt"
+                ) VALUES (
+                    $1, $2, $3, $4,
+                    $5, 'ranking_shadow_compared', 'contextual',
+                    'generation_engine', $6, NOW()
+                )
+                ON CONFLICT ("userId", "clientEventId") DO NOTHING
+                """,
+                str(uuid.uuid4()),
+                user_id,
+                session_id,
+                trip_id,
+                f"gen-shadow-{trip_id}",
+                json.dumps(payload),
+            )
+        except Exception:
+            logger.exception("Failed to log ranking comparison RawEvent for trip=%s", trip_id)
+
     # ------------------------------------------------------------------
     # Private helpers
     # ------------------------------------------------------------------
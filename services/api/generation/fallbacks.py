@@ -9,6 +9,11 @@ Tier order:
 
 Sets Trip.generationMethod:
   "llm" | "deterministic_fallback" | "postgres_fallback" | "template_fallback"
+
+Speculative mode (run_speculative) starts the LLM call and the deterministic
+ranking together and only waits SPECULATIVE_LLM_BUDGET_S for the LLM. If it
+misses the budget the deterministic ranking is served and the still-running
+LLM task is handed back to the caller to upgrade the itinerary later.
 """
 
 from __future__ import annotations
@@ -16,11 +21,13 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+from dataclasses import dataclass
 from typing import Any
 
 import anthropic
 
 from services.api.generation.ranker import rank_candidates_with_llm
+from services.api.generation.ranking_cache import RankingCache
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +37,18 @@ PG_FALLBACK_TIMEOUT_S = 3
 # Minimum nodes to attempt LLM ranking (below this, go straight to deterministic)
 MIN_CANDIDATES_FOR_LLM = 3
 
+# Speculative mode: how long to wait for the LLM before serving the
+# deterministic ranking (the LLM keeps its own LLM_TIMEOUT_S in the background)
+SPECULATIVE_LLM_BUDGET_S = 1.5
+
+# Errors that mean "the LLM ranking is unusable" rather than a bug
+LLM_RANKING_ERRORS = (
+    asyncio.TimeoutError,
+    anthropic.APIError,
+    anthropic.APIConnectionError,
+    ValueError,
+)
+
 # Template itinerary used when everything else is down.
 # Generic enough to be city-agnostic. Slot types are "flex" so they're replaceable.
 _TEMPLATE_ITINERARY: list[dict[str, Any]] = [
@@ -174,6 +193,7 @@ async def run_with_fallbacks(
     anthropic_client: anthropic.AsyncAnthropic,
     db,
     qdrant_available: bool = True,
+    ranking_cache: RankingCache | None = None,
 ) -> tuple[list[dict[str, Any]], list[dict[str, Any]], str, dict[str, Any]]:
     """
     Execute the full fallback cascade.
@@ -185,6 +205,7 @@ async def run_with_fallbacks(
         anthropic_client:  Anthropic async client instance.
         db:                asyncpg connection / pool.
         qdrant_available:  False if Qdrant was already known to be down.
+        ranking_cache:     Optional persona-archetype cache for the LLM tier.
 
     Returns:
         (ranked_meta, resolved_candidates, generation_method, log_meta)
@@ -203,6 +224,8 @@ async def run_with_fallbacks(
                 persona_seed=persona_seed,
                 candidates=candidates,
                 anthropic_client=anthropic_client,
+                cache=ranking_cache,
+                city=city,
             )
             log_meta.update(llm_log)
             node_map = {n["id"]: n for n in candidates}
@@ -212,7 +235,7 @@ async def run_with_fallbacks(
 
         except asyncio.TimeoutError:
             logger.warning("LLM ranker timed out after %ds — falling back to deterministic", 5)
-        except (anthropic.APIError, anthropic.APIConnectionError, ValueError) as exc:
+        except LLM_RANKING_ERRORS as exc:
             logger.warning("LLM ranker failed (%s) — falling back to deterministic", exc)
 
     # --- Tier 2: Deterministic ranking (LLM timeout / error) ---
@@ -244,6 +267,128 @@ async def run_with_fallbacks(
     return [], [], "template_fallback", log_meta
 
 
+# ---------------------------------------------------------------------------
+# Speculative entry point
+# ---------------------------------------------------------------------------
+
+@dataclass
+class SpeculativeRanking:
+    """Result of run_speculative()."""
+    ranked_meta: list[dict[str, Any]]
+    resolved: list[dict[str, Any]]
+    generation_method: str
+    log_meta: dict[str, Any]
+    deterministic_meta: list[dict[str, Any]]
+    """Deterministic ranking of the same candidates (empty when none was computed)."""
+    pending_llm: asyncio.Task | None = None
+    """
+    LLM ranking still in flight when the deterministic ranking was served.
+    Resolves to rank_candidates_with_llm()'s (ranked_list, log_meta) or raises
+    one of LLM_RANKING_ERRORS. The caller owns it and must hand it off or
+    discard_pending_llm() it.
+    """
+
+
+def discard_pending_llm(task: asyncio.Task | None) -> None:
+    """Cancel a speculative LLM task nobody will await (or consume its result)."""
+    if task is None:
+        return
+    if not task.done():
+        task.cancel()
+    elif not task.cancelled():
+        task.exception()  # retrieved: no "exception was never retrieved" warning
+
+
+def resolve_ranked(
+    ranked_meta: list[dict[str, Any]],
+    candidates: list[dict[str, Any]],
+) -> list[dict[str, Any]]:
+    """Map ranked IDs back to their candidate dicts, dropping unknown IDs."""
+    node_map = {n["id"]: n for n in candidates}
+    return [node_map[m["id"]] for m in ranked_meta if m["id"] in node_map]
+
+
+async def run_speculative(
+    *,
+    candidates: list[dict[str, Any]],
+    persona_seed: dict[str, Any],
+    city: str,
+    anthropic_client: anthropic.AsyncAnthropic,
+    db,
+    qdrant_available: bool = True,
+    budget_s: float = SPECULATIVE_LLM_BUDGET_S,
+    ranking_cache: RankingCache | None = None,
+) -> SpeculativeRanking:
+    """
+    Deterministic-first variant of run_with_fallbacks.
+
+    The LLM ranking runs as a task while the deterministic ranking is
+    computed; the LLM result is used only if it lands within ``budget_s``.
+    Otherwise the deterministic ranking is returned as
+    "deterministic_fallback" with ``pending_llm`` set, so latency is bounded
+    by the budget instead of LLM_TIMEOUT_S. Tiers 3-4 are unchanged.
+    """
+    if not (qdrant_available and len(candidates) >= MIN_CANDIDATES_FOR_LLM):
+        ranked_meta, resolved, method, log_meta = await run_with_fallbacks(
+            candidates=candidates,
+            persona_seed=persona_seed,
+            city=city,
+            anthropic_client=anthropic_client,
+            db=db,
+            qdrant_available=qdrant_available,
+            ranking_cache=ranking_cache,
+        )
+        return SpeculativeRanking(ranked_meta, resolved, method, log_meta, deterministic_meta=[])
+
+    llm_task = asyncio.create_task(
+        rank_candidates_with_llm(
+            persona_seed=persona_seed,
+            candidates=candidates,
+            anthropic_client=anthropic_client,
+            cache=ranking_cache,
+            city=city,
+        ),
+        name=f"speculative-llm-rank-{city}",
+    )
+    try:
+        deterministic_meta = _deterministic_rank(candidates, persona_seed)
+        done, _ = await asyncio.wait({llm_task}, timeout=budget_s)
+    except BaseException:
+        # Failed or cancelled before the task could be handed to the caller
+        discard_pending_llm(llm_task)
+        raise
+    log_meta: dict[str, Any] = {
+        "promptVersion": None, "model": None, "latencyMs": None, "speculative": True,
+    }
+
+    if done:
+        try:
+            ranked_meta, llm_log = llm_task.result()
+        except LLM_RANKING_ERRORS as exc:
+            logger.warning("LLM ranker failed (%s) — serving deterministic", exc)
+        else:
+            log_meta.update(llm_log)
+            logger.info("Generation method: llm (within speculative budget)")
+            return SpeculativeRanking(
+                ranked_meta, resolve_ranked(ranked_meta, candidates), "llm",
+                log_meta, deterministic_meta,
+            )
+        pending = None
+    else:
+        logger.info(
+            "LLM ranker missed %.1fs speculative budget — serving deterministic", budget_s,
+        )
+        pending = llm_task
+
+    log_meta["model"] = "deterministic"
+    log_meta["llmPending"] = pending is not None
+    logger.info("Generation method: deterministic_fallback")
+    return SpeculativeRanking(
+        deterministic_meta, resolve_ranked(deterministic_meta, candidates),
+        "deterministic_fallback", log_meta, deterministic_meta, pending,
+    )
+
+
 def get_template_itinerary() -> list[dict[str, Any]]:
     """Return the static template itinerary used as last-resort fallback."""
     return [dict(slot) for slot in _TEMPLATE_ITINERARY]
@@ -32,7 +32,7 @@ from typing import Any
 import anthropic
 
 from services.api.generation.fallbacks import run_with_fallbacks
-from services.api.generation.preference_merger import merge_preferences, score_candidate_per_member
+from services.api.generation.preference_merger import merge_preferences, score_candidates_matrix
 from services.api.generation.slot_assigner import SlotAssignment, assign_slots
 from services.api.generation.ranker import RANKER_MODEL, RANKER_PROMPT_VERSION
 from services.api.search.service import ActivitySearchService
@@ -159,14 +159,11 @@ class GroupGenerationEngine:
         # ------------------------------------------------------------------
         # Step 3: Score each candidate per-member
         # ------------------------------------------------------------------
-        per_member_scores: dict[str, dict[str, float]] = {}
-        for candidate in candidates:
-            node_id = candidate.get("id", "")
-            per_member_scores[node_id] = score_candidate_per_member(
-                candidate=candidate,
-                member_seeds=member_seeds,
-                member_ids=member_ids,
-            )
+        score_matrix = score_candidates_matrix(candidates, member_seeds)
+        per_member_scores: dict[str, dict[str, float]] = {
+            candidate.get("id", ""): dict(zip(member_ids, row.tolist()))
+            for candidate, row in zip(candidates, score_matrix)
+        }
 
         # ------------------------------------------------------------------
         # Step 4: Fallback cascade — same tiers as solo
@@ -12,6 +12,11 @@ Weighting strategy:
 
 The merger is purely functional (no DB access). The group_engine feeds
 it fairnessState from the Trip record.
+
+Candidate scoring has a single-candidate form (score_candidate_per_member)
+and a pool form (score_candidates_matrix) that scores every candidate
+against every member at once: vibe overlap is a boolean tag-matrix product,
+price penalties broadcast over (candidates x members).
 """
 
 from __future__ import annotations
@@ -19,6 +24,8 @@ from __future__ import annotations
 import logging
 from typing import Any
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
@@ -65,6 +72,17 @@ _BUDGET_RANK: dict[str, int] = {"budget": 0, "mid": 1, "splurge": 2}
 _RANK_TO_PACE: dict[int, str] = {v: k for k, v in _PACE_RANK.items()}
 _RANK_TO_BUDGET: dict[int, str] = {v: k for k, v in _BUDGET_RANK.items()}
 
+# Member budget -> target ActivityNode priceLevel
+_BUDGET_TO_PRICE: dict[str, int] = {"budget": 1, "mid": 2, "splurge": 3}
+
+
+def _node_vibe_slugs(candidate: dict[str, Any]) -> set[str]:
+    return {
+        v["slug"]
+        for v in (candidate.get("vibeTags") or [])
+        if isinstance(v, dict) and "slug" in v
+    }
+
 
 def _compute_member_weights(
     member_ids: list[str],
@@ -286,14 +304,10 @@ def score_candidate_per_member(
     Score = vibe_overlap_ratio (using member's vibes vs node's vibeTags)
     adjusted by price distance from member's budget preference.
     """
-    budget_to_price = {"budget": 1, "mid": 2, "splurge": 3}
+    budget_to_price = _BUDGET_TO_PRICE
 
     scores: dict[str, float] = {}
-    node_vibe_slugs: set[str] = {
-        v["slug"]
-        for v in (candidate.get("vibeTags") or [])
-        if isinstance(v, dict) and "slug" in v
-    }
+    node_vibe_slugs = _node_vibe_slugs(candidate)
     node_price = candidate.get("priceLevel")
 
     for mid, seed in zip(member_ids, member_seeds):
@@ -320,3 +334,58 @@ def score_candidate_per_member(
         scores[mid] = max(0.0, vibe_score - price_penalty)
 
     return scores
+
+
+def score_candidates_matrix(
+    candidates: list[dict[str, Any]],
+    member_seeds: list[dict[str, Any]],
+) -> np.ndarray:
+    """
+    score_candidate_per_member() for a whole candidate pool.
+
+    Returns a (len(candidates) x len(member_seeds)) float array; row i,
+    column j is candidate i's score for member j.
+
+    Only member vibes form the tag vocabulary: overlap counts are one
+    product of boolean (candidates x vibes) and (vibes x members) matrices.
+    """
+    n_cand, n_mem = len(candidates), len(member_seeds)
+    if n_cand == 0 or n_mem == 0:
+        return np.zeros((n_cand, n_mem), dtype=np.float64)
+
+    member_vibes = [set(seed.get("vibes", [])) for seed in member_seeds]
+    vocab = {v: k for k, v in enumerate(sorted(set().union(*member_vibes)))}
+    member_tags = np.zeros((len(vocab), n_mem), dtype=np.float64)
+    for j, vibes in enumerate(member_vibes):
+        member_tags[[vocab[v] for v in vibes], j] = 1.0
+
+    node_tags = np.zeros((n_cand, len(vocab)), dtype=np.float64)
+    has_tags = np.zeros(n_cand, dtype=bool)
+    price = np.full(n_cand, np.nan)
+    for i, candidate in enumerate(candidates):
+        slugs = _node_vibe_slugs(candidate)
+        has_tags[i] = bool(slugs)
+        node_tags[i, [vocab[s] for s in slugs if s in vocab]] = 1.0
+        if candidate.get("priceLevel") is not None:
+            price[i] = candidate["priceLevel"]
+
+    # Vibe overlap
+    persona_len = member_tags.sum(axis=0)
+    overlap = node_tags @ member_tags
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ratio = np.minimum(overlap / persona_len, 1.0)
+    vibe_score = np.where(
+        persona_len == 0,
+        0.5,
+        np.where(has_tags[:, None], ratio, 0.1),
+    )
+
+    # Price penalty
+    target = np.array(
+        [_BUDGET_TO_PRICE.get(seed.get("budget", "mid"), 2) for seed in member_seeds],
+        dtype=np.float64,
+    )
+    penalty = np.minimum(np.abs(price[:, None] - target[None, :]) * 0.1, 0.2)
+    penalty = np.where(np.isnan(penalty), 0.0, penalty)
+
+    return np.maximum(0.0, vibe_score - penalty)
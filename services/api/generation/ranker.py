@@ -5,6 +5,9 @@ Uses claude-sonnet-4-6 to rank ActivityNode candidates against
 a persona seed, returning an ordered list with reasoning.
 
 Every call logs: model version, prompt version, latency, token usage.
+With a RankingCache, a cached ranking for the same persona signature and
+candidate set skips the Sonnet call; log_meta then reports zero tokens,
+the cache tier and the cost the hit saved.
 """
 
 from __future__ import annotations
@@ -17,6 +20,8 @@ from typing import Any
 
 import anthropic
 
+from services.api.generation.ranking_cache import RankingCache
+
 logger = logging.getLogger(__name__)
 
 # Prompt version — bump whenever prompt text changes meaningfully
@@ -24,6 +29,10 @@ RANKER_PROMPT_VERSION = "ranker-v1.0"
 RANKER_MODEL = "claude-sonnet-4-6"
 LLM_TIMEOUT_S = 5
 
+# claude-sonnet-4-6 pricing (USD per 1M tokens) — for cache savings
+INPUT_COST_PER_1M = 3.00
+OUTPUT_COST_PER_1M = 15.00
+
 _SYSTEM_PROMPT = """You are a travel itinerary curator for Overplanned.
 Your job is to rank a set of activity candidates for a solo traveler based on
 their behavioral persona. Overplanned is local-first: recommendations come from
@@ -89,19 +98,51 @@ async def rank_candidates_with_llm(
     persona_seed: dict[str, Any],
     candidates: list[dict[str, Any]],
     anthropic_client: anthropic.AsyncAnthropic,
+    *,
+    cache: RankingCache | None = None,
+    city: str | None = None,
 ) -> tuple[list[dict[str, Any]], dict[str, Any]]:
     """
     Rank activity candidates against a persona using claude-sonnet-4-6.
 
+    ``cache`` (with the trip ``city``) serves repeat (persona, candidates)
+    pairs without calling Sonnet and stores fresh rankings.
+
     Returns:
         (ranked_list, log_meta)
         ranked_list: list of {"id", "rank", "slotType", "reasoning"}, sorted rank asc
         log_meta: {"model", "promptVersion", "latencyMs", "inputTokens", "outputTokens"}
+                  plus {"cache", "cacheSavedUsd"} when a cache is used
 
     Raises:
         asyncio.TimeoutError if LLM exceeds LLM_TIMEOUT_S
         anthropic.APIError on Anthropic API errors
     """
+    use_cache = cache is not None and city is not None
+    if use_cache:
+        lookup_start = time.monotonic()
+        cached = await cache.get(RANKER_PROMPT_VERSION, city, persona_seed, candidates)
+        if cached is not None:
+            entry, tier = cached
+            latency_ms = int((time.monotonic() - lookup_start) * 1000)
+            saved_usd = round(entry.cost_usd(INPUT_COST_PER_1M, OUTPUT_COST_PER_1M), 6)
+            logger.info(
+                "LLM ranking served from %s cache: %d candidates in %dms (saved $%.4f)",
+                tier,
+                len(entry.body["ranked"]),
+                latency_ms,
+                saved_usd,
+            )
+            return [dict(m) for m in entry.body["ranked"]], {
+                "model": RANKER_MODEL,
+                "promptVersion": RANKER_PROMPT_VERSION,
+                "latencyMs": latency_ms,
+                "inputTokens": 0,
+                "outputTokens": 0,
+                "cache": tier,
+                "cacheSavedUsd": saved_usd,
+            }
+
     user_prompt = _build_user_prompt(persona_seed, candidates)
     start = time.monotonic()
 
@@ -141,6 +182,18 @@ async def rank_candidates_with_llm(
         "inputTokens": response.usage.input_tokens,
         "outputTokens": response.usage.output_tokens,
     }
+    if use_cache:
+        log_meta["cache"] = "miss"
+        log_meta["cacheSavedUsd"] = 0.0
+        await cache.put(
+            RANKER_PROMPT_VERSION,
+            city,
+            persona_seed,
+            candidates,
+            ranked,
+            input_tokens=response.usage.input_tokens,
+            output_tokens=response.usage.output_tokens,
+        )
 
     logger.info(
         "LLM ranking complete: %d candidates ranked in %dms (in=%d out=%d)",
@@ -0,0 +1,285 @@
+"""
+Persona-archetype cache for LLM candidate rankings.
+
+Solo personas come from a small archetype space (vibes x pace x budget, see
+pipeline/persona_seeder.py::generate_archetypes) and candidate pools are
+per-city, so rank_candidates_with_llm sees the same (persona, candidates)
+pair over and over. A cached ranking is keyed by
+
+    (RANKER_PROMPT_VERSION, city, persona signature, candidate fingerprint)
+
+  persona signature      sorted, lower-cased, de-duplicated vibes + pace +
+                         budget — the only persona fields in the prompt
+  candidate fingerprint  sha256 of the sorted candidate IDs with their
+                         convergenceScore (4 dp)
+
+Two tiers:
+  L1  in-process LRU (bounded, TTL)
+  L2  Redis string per key, JSON body, RANKING_CACHE_TTL_S expiry
+
+Invalidation: every entry records the city's search generation, a Redis
+counter bumped by bump_search_generation() whenever the city's Qdrant index
+is re-synced (pipeline/city_seeder.py). An entry from an older generation is
+a miss. The generation is read in the same pipeline as the L2 entry and
+remembered in-process for _GENERATION_TTL_S so L1 hits need no round trip.
+
+Cache failures never fail ranking: Redis errors are logged and treated as a
+miss / skipped write.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any
+
+from services.api.pipeline.llm_cache import CachedResponse, CacheStats
+
+logger = logging.getLogger(__name__)
+
+RANKING_CACHE_TTL_S = 24 * 3600
+
+_KEY_PREFIX = "llmrank"
+_GENERATION_KEY_TEMPLATE = "search:generation:{city}"
+
+# L1 bounds; the generation is re-read from Redis at most this often per city
+_L1_MAX_ENTRIES = 2048
+_GENERATION_TTL_S = 30.0
+
+
+def city_key(city: str) -> str:
+    """Normalized city slug used in cache and generation keys."""
+    return "-".join(city.strip().lower().replace("_", " ").split())
+
+
+def search_generation_key(city: str) -> str:
+    return _GENERATION_KEY_TEMPLATE.format(city=city_key(city))
+
+
+async def bump_search_generation(redis_client: Any, city: str) -> int | None:
+    """
+    Invalidate every cached ranking for ``city`` (call after a Qdrant re-sync).
+
+    Returns the new generation, or None if Redis was unreachable.
+    """
+    try:
+        generation = int(await redis_client.incr(search_generation_key(city)))
+    except Exception:
+        logger.warning("ranking_cache: generation bump failed for city=%s", city, exc_info=True)
+        return None
+    _generations.pop(city_key(city), None)
+    return generation
+
+
+def persona_signature(persona_seed: dict[str, Any]) -> str:
+    """Canonical form of the persona fields the ranker prompt uses."""
+    vibes = sorted({str(v).strip().lower() for v in persona_seed.get("vibes") or [] if v})
+    pace = str(persona_seed.get("pace") or "moderate").lower()
+    budget = str(persona_seed.get("budget") or "mid").lower()
+    return f"vibes={','.join(vibes)}|pace={pace}|budget={budget}"
+
+
+def candidate_fingerprint(candidates: list[dict[str, Any]]) -> str:
+    """Order-independent hash of candidate IDs and their convergence scores."""
+    parts = sorted(
+        f"{c['id']}:{round(c.get('convergenceScore') or 0.0, 4)}" for c in candidates
+    )
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+
+def ranking_cache_key(
+    prompt_version: str,
+    city: str,
+    persona_seed: dict[str, Any],
+    candidates: list[dict[str, Any]],
+) -> str:
+    persona_hash = hashlib.sha256(persona_signature(persona_seed).encode("utf-8")).hexdigest()[:16]
+    return (
+        f"{_KEY_PREFIX}:{prompt_version}:{city_key(city)}:"
+        f"{persona_hash}:{candidate_fingerprint(candidates)[:32]}"
+    )
+
+
+# ---------------------------------------------------------------------------
+# L1
+# ---------------------------------------------------------------------------
+
+
+class _LocalRankingCache:
+    """Bounded in-process TTL cache of (key, generation) -> CachedResponse."""
+
+    def __init__(self, ttl_s: float, max_entries: int) -> None:
+        self._ttl_s = ttl_s
+        self._max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, int], tuple[float, CachedResponse]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tuple[str, int]) -> CachedResponse | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, response = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return response
+
+    def put(self, key: tuple[str, int], response: CachedResponse) -> None:
+        self._entries[key] = (time.monotonic() + self._ttl_s, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+_local_cache = _LocalRankingCache(RANKING_CACHE_TTL_S, _L1_MAX_ENTRIES)
+
+# city -> (expires_at, generation)
+_generations: dict[str, tuple[float, int]] = {}
+
+
+def clear_ranking_cache() -> None:
+    """Drop every L1 ranking and remembered generation in this process."""
+    _local_cache.clear()
+    _generations.clear()
+
+
+def _known_generation(city: str) -> int | None:
+    entry = _generations.get(city)
+    if entry is None or entry[0] <= time.monotonic():
+        return None
+    return entry[1]
+
+
+def _remember_generation(city: str, generation: int) -> None:
+    _generations[city] = (time.monotonic() + _GENERATION_TTL_S, generation)
+
+
+# ---------------------------------------------------------------------------
+# Public cache
+# ---------------------------------------------------------------------------
+
+
+class RankingCache:
+    """
+    Two-tier ranking cache. ``redis_client`` may be None (L1 only).
+
+    get() returns (CachedResponse, tier) with tier "memory" or "redis", or
+    None on a miss. CachedResponse.body is {"ranked": [...]}, and its token
+    counts are what the original Sonnet call cost.
+    """
+
+    def __init__(self, redis_client: Any = None) -> None:
+        self._redis = redis_client
+        self.stats = CacheStats()
+
+    async def get(
+        self,
+        prompt_version: str,
+        city: str,
+        persona_seed: dict[str, Any],
+        candidates: list[dict[str, Any]],
+    ) -> tuple[CachedResponse, str] | None:
+        key = ranking_cache_key(prompt_version, city, persona_seed, candidates)
+        slug = city_key(city)
+
+        generation = _known_generation(slug)
+        if generation is not None:
+            hit = _local_cache.get((key, generation))
+            if hit is not None:
+                return self._hit(hit, "memory")
+
+        if self._redis is None:
+            generation = generation if generation is not None else 0
+            hit = _local_cache.get((key, generation))
+            return self._hit(hit, "memory") if hit is not None else self._miss()
+
+        try:
+            pipe = self._redis.pipeline(transaction=False)
+            pipe.get(search_generation_key(city))
+            pipe.get(key)
+            raw_generation, raw_entry = await pipe.execute()
+        except Exception:
+            logger.warning("ranking_cache: Redis read failed for %s", key, exc_info=True)
+            return self._miss()
+
+        generation = int(raw_generation or 0)
+        _remember_generation(slug, generation)
+
+        hit = _local_cache.get((key, generation))
+        if hit is not None:
+            return self._hit(hit, "memory")
+
+        if raw_entry is None:
+            return self._miss()
+        try:
+            stored = json.loads(raw_entry)
+            if stored["generation"] != generation:
+                return self._miss()
+            response = CachedResponse(
+                body={"ranked": stored["ranked"]},
+                input_tokens=int(stored["inputTokens"]),
+                output_tokens=int(stored["outputTokens"]),
+            )
+        except (ValueError, KeyError, TypeError):
+            logger.warning("ranking_cache: unreadable entry %s", key)
+            return self._miss()
+
+        _local_cache.put((key, generation), response)
+        return self._hit(response, "redis")
+
+    async def put(
+        self,
+        prompt_version: str,
+        city: str,
+        persona_seed: dict[str, Any],
+        candidates: list[dict[str, Any]],
+        ranked: list[dict[str, Any]],
+        *,
+        input_tokens: int,
+        output_tokens: int,
+    ) -> None:
+        """Store a fresh ranking under the city's current generation."""
+        key = ranking_cache_key(prompt_version, city, persona_seed, candidates)
+        generation = _known_generation(city_key(city)) or 0
+        response = CachedResponse(
+            body={"ranked": [dict(m) for m in ranked]},
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+        )
+        _local_cache.put((key, generation), response)
+        self.stats.writes += 1
+
+        if self._redis is None:
+            return
+        try:
+            await self._redis.set(
+                key,
+                json.dumps({
+                    "generation": generation,
+                    "ranked": response.body["ranked"],
+                    "inputTokens": input_tokens,
+                    "outputTokens": output_tokens,
+                }),
+                ex=RANKING_CACHE_TTL_S,
+            )
+        except Exception:
+            logger.warning("ranking_cache: Redis write failed for %s", key, exc_info=True)
+
+    def _hit(self, response: CachedResponse, tier: str) -> tuple[CachedResponse, str]:
+        self.stats.hits += 1
+        self.stats.saved_input_tokens += response.input_tokens
+        self.stats.saved_output_tokens += response.output_tokens
+        return response, tier
+
+    def _miss(self) -> None:
+        self.stats.misses += 1
+        return None
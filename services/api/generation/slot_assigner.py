@@ -7,14 +7,24 @@ Anchor-first logic:
   3. Fill remaining gaps with flex activities in rank order.
 
 Produces a flat list of ItinerarySlotAssignment objects ready for DB insert.
+
+Packing works in integer minutes from each day's midnight. Every day keeps
+its reserved intervals in a _DayIntervals index — disjoint [start, end)
+pairs in sorted parallel lists — so a free check or insert is a bisect
+rather than a scan of the whole day. When a flex probe is blocked, the probe
+jumps straight to the first whole hour after the blocking interval instead
+of stepping hour by hour; the placements are the same.
+
+assign_slots_batch() packs many trips in one call (synthetic runs, seeding).
 """
 
 from __future__ import annotations
 
 import logging
+from bisect import bisect_right
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from typing import Any, Sequence
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +54,16 @@ _DEFAULT_DURATIONS: dict[str, int] = {
 }
 _FALLBACK_DURATION = 60
 
+# Target flex activities per day
+TARGET_FLEX_PER_DAY = 2
+
+# Precomputed minute offsets from midnight
+_ANCHOR_START_HOUR = 10
+_LUNCH_START_MIN = LUNCH_START[0] * 60 + LUNCH_START[1]
+_LUNCH_END_MIN = LUNCH_END[0] * 60 + LUNCH_END[1]
+_MEAL_STARTS_MIN = (_LUNCH_START_MIN, DINNER_START[0] * 60 + DINNER_START[1])
+_MEAL_MAX_MINUTES = 60
+
 
 @dataclass
 class SlotAssignment:
@@ -63,16 +83,43 @@ def _duration_for(node: dict[str, Any]) -> int:
     return _DEFAULT_DURATIONS.get(category, _FALLBACK_DURATION)
 
 
-def _make_dt(trip_start_date: datetime, day_number: int, hour: int, minute: int) -> datetime:
-    """Build a UTC datetime for day_number (1-indexed) at hour:minute."""
-    base = trip_start_date.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=timezone.utc)
-    return base + timedelta(days=day_number - 1, hours=hour, minutes=minute)
+def _ceil_hour(minute: int) -> int:
+    return -(-minute // 60)
+
 
+class _DayIntervals:
+    """Reserved [start, end) minute intervals of one day, disjoint and sorted."""
 
-def _overlaps(
-    start_a: datetime, end_a: datetime, start_b: datetime, end_b: datetime
-) -> bool:
-    return start_a < end_b and end_a > start_b
+    __slots__ = ("starts", "ends")
+
+    def __init__(self) -> None:
+        self.starts: list[int] = []
+        self.ends: list[int] = []
+
+    def conflict(self, start: int, end: int) -> int | None:
+        """End of a reserved interval overlapping [start, end), or None if free."""
+        i = bisect_right(self.starts, start)
+        # Only the interval starting at or before `start` can reach past it,
+        # and only the next one can begin before `end` (intervals are disjoint).
+        if i and self.ends[i - 1] > start:
+            return self.ends[i - 1]
+        if i < len(self.starts) and self.starts[i] < end:
+            return self.ends[i]
+        return None
+
+    def reserve(self, start: int, end: int) -> None:
+        i = bisect_right(self.starts, start)
+        self.starts.insert(i, start)
+        self.ends.insert(i, end)
+
+
+@dataclass
+class TripSlotRequest:
+    """One trip's input to assign_slots_batch()."""
+    ranked_nodes: list[dict[str, Any]]
+    ranked_meta: list[dict[str, Any]]
+    trip_start_date: datetime
+    num_days: int
 
 
 def assign_slots(
@@ -93,18 +140,43 @@ def assign_slots(
     Returns:
         Sorted list of SlotAssignment (by day, then start_time).
     """
-    assignments: list[SlotAssignment] = []
+    assignments = _pack(ranked_nodes, ranked_meta, trip_start_date, num_days)
+    logger.info(
+        "Slot assignment complete: %d slots across %d days",
+        len(assignments),
+        num_days,
+    )
+    return assignments
+
+
+def assign_slots_batch(trips: Sequence[TripSlotRequest]) -> list[list[SlotAssignment]]:
+    """
+    assign_slots() for many trips at once; results are in input order.
 
-    # Track occupied windows per day: list of (start, end) tuples
-    occupied: dict[int, list[tuple[datetime, datetime]]] = {
-        d: [] for d in range(1, num_days + 1)
-    }
+    Logs one summary line for the batch instead of one per trip.
+    """
+    results = [
+        _pack(t.ranked_nodes, t.ranked_meta, t.trip_start_date, t.num_days)
+        for t in trips
+    ]
+    logger.info(
+        "Batch slot assignment complete: %d trips, %d slots",
+        len(results),
+        sum(len(r) for r in results),
+    )
+    return results
 
-    def _is_free(day: int, start: datetime, end: datetime) -> bool:
-        return all(not _overlaps(start, end, s, e) for s, e in occupied[day])
 
-    def _reserve(day: int, start: datetime, end: datetime) -> None:
-        occupied[day].append((start, end))
+def _pack(
+    ranked_nodes: list[dict[str, Any]],
+    ranked_meta: list[dict[str, Any]],
+    trip_start_date: datetime,
+    num_days: int,
+) -> list[SlotAssignment]:
+    base = trip_start_date.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=timezone.utc)
+    days = [_DayIntervals() for _ in range(num_days + 1)]  # index 0 unused
+    # (day, start_min, end_min, node, meta, slot_type, duration)
+    placed: list[tuple[int, int, int, dict[str, Any], dict[str, Any], str, int]] = []
 
     # Build lookup: node id -> node dict
     node_map: dict[str, dict[str, Any]] = {n["id"]: n for n in ranked_nodes}
@@ -114,8 +186,7 @@ def assign_slots(
     meals = []
     flexes = []
     for meta in ranked_meta:
-        node_id = meta["id"]
-        node = node_map.get(node_id)
+        node = node_map.get(meta["id"])
         if node is None:
             continue
         slot_type = meta.get("slotType", "flex")
@@ -127,133 +198,90 @@ def assign_slots(
         else:
             flexes.append(entry)
 
-    sort_counter = [0]  # mutable counter
-
-    def _next_sort() -> int:
-        sort_counter[0] += 1
-        return sort_counter[0]
-
     # --- Pass 1: Place anchors ---
     # Distribute anchors evenly across days, starting at 10:00
-    anchor_hour = 10
     for day in range(1, num_days + 1):
-        day_anchors = anchors[(day - 1)::num_days] if anchors else []
-        current_hour = anchor_hour
-        for node, meta in day_anchors:
+        intervals = days[day]
+        current_hour = _ANCHOR_START_HOUR
+        for node, meta in anchors[(day - 1)::num_days]:
             duration = _duration_for(node)
-            start = _make_dt(trip_start_date, day, current_hour, 0)
-            end = start + timedelta(minutes=duration)
-            # Skip lunch/dinner windows
-            lunch_start_dt = _make_dt(trip_start_date, day, *LUNCH_START)
-            dinner_start_dt = _make_dt(trip_start_date, day, *DINNER_START)
-            if _overlaps(start, end, lunch_start_dt, lunch_start_dt + timedelta(hours=1)):
+            start = current_hour * 60
+            end = start + duration
+            # Skip the lunch window
+            if start < _LUNCH_END_MIN and end > _LUNCH_START_MIN:
                 current_hour += 2
-                start = _make_dt(trip_start_date, day, current_hour, 0)
-                end = start + timedelta(minutes=duration)
-            if end.hour > DAY_END_HOUR:
+                start = current_hour * 60
+                end = start + duration
+            # Clock hour of the end time (wraps past midnight)
+            if (end // 60) % 24 > DAY_END_HOUR:
                 break
-            if _is_free(day, start, end):
-                _reserve(day, start, end)
-                assignments.append(SlotAssignment(
-                    activity_node_id=node["id"],
-                    day_number=day,
-                    sort_order=_next_sort(),
-                    slot_type="anchor",
-                    start_time=start,
-                    end_time=end,
-                    duration_minutes=duration,
-                    ranking_meta=meta,
-                ))
-                current_hour = end.hour + (1 if end.minute > 0 else 0)
+            if intervals.conflict(start, end) is None:
+                intervals.reserve(start, end)
+                placed.append((day, start, end, node, meta, "anchor", duration))
+                current_hour = (end // 60) % 24 + (1 if end % 60 else 0)
 
     # --- Pass 2: Place meals (lunch then dinner per day) ---
-    meal_iter = iter(meals)
+    meal_idx = 0
     for day in range(1, num_days + 1):
-        for window_start_h, window_start_m, window_end_h, window_end_m in [
-            (*LUNCH_START, *LUNCH_END),
-            (*DINNER_START, *DINNER_END),
-        ]:
-            node_meta = next(meal_iter, None)
-            if node_meta is None:
+        intervals = days[day]
+        for start in _MEAL_STARTS_MIN:
+            if meal_idx >= len(meals):
                 break
-            node, meta = node_meta
-            duration = min(_duration_for(node), 60)  # cap meals at 60 min
-            start = _make_dt(trip_start_date, day, window_start_h, window_start_m)
-            end = start + timedelta(minutes=duration)
-            if _is_free(day, start, end):
-                _reserve(day, start, end)
-                assignments.append(SlotAssignment(
-                    activity_node_id=node["id"],
-                    day_number=day,
-                    sort_order=_next_sort(),
-                    slot_type="meal",
-                    start_time=start,
-                    end_time=end,
-                    duration_minutes=duration,
-                    ranking_meta=meta,
-                ))
+            node, meta = meals[meal_idx]
+            meal_idx += 1
+            duration = min(_duration_for(node), _MEAL_MAX_MINUTES)  # cap meals at 60 min
+            end = start + duration
+            if intervals.conflict(start, end) is None:
+                intervals.reserve(start, end)
+                placed.append((day, start, end, node, meta, "meal", duration))
 
     # --- Pass 3: Fill flex slots in remaining gaps ---
-    # Target ~2-3 flex activities per day depending on density
-    TARGET_FLEX_PER_DAY = 2
-    flex_iter = iter(flexes)
-    exhausted = False
-
+    # A blocked candidate is retried at the next free whole hour; one that
+    # no longer fits before DAY_END_HOUR carries over to the next day.
+    flex_idx = 0
     for day in range(1, num_days + 1):
-        if exhausted:
+        if flex_idx >= len(flexes):
             break
-        placed = 0
-        # Scan from DAY_START_HOUR in 1-hour increments for free windows
+        intervals = days[day]
+        count = 0
         probe_hour = DAY_START_HOUR
-        while placed < TARGET_FLEX_PER_DAY and probe_hour < DAY_END_HOUR:
-            node_meta = next(flex_iter, None)
-            if node_meta is None:
-                exhausted = True
+        while count < TARGET_FLEX_PER_DAY and probe_hour < DAY_END_HOUR:
+            if flex_idx >= len(flexes):
                 break
-            node, meta = node_meta
+            node, meta = flexes[flex_idx]
             duration = _duration_for(node)
-            start = _make_dt(trip_start_date, day, probe_hour, 0)
-            end = start + timedelta(minutes=duration)
-            # Skip if window is busy — advance probe by 1 hour
-            if not _is_free(day, start, end):
-                probe_hour += 1
-                # Put the candidate back by re-wrapping the iterator
-                flex_iter = _prepend(node_meta, flex_iter)
+            start = probe_hour * 60
+            end = start + duration
+            blocked_until = intervals.conflict(start, end)
+            if blocked_until is not None:
+                probe_hour = _ceil_hour(blocked_until)
                 continue
-            _reserve(day, start, end)
-            assignments.append(SlotAssignment(
-                activity_node_id=node["id"],
-                day_number=day,
-                sort_order=_next_sort(),
-                slot_type="flex",
-                start_time=start,
-                end_time=end,
-                duration_minutes=duration,
-                ranking_meta=meta,
-            ))
-            placed += 1
-            probe_hour = end.hour + (1 if end.minute > 0 else 0)
-
-    # Sort final list by day, then chronologically
-    assignments.sort(key=lambda s: (s.day_number, s.start_time))
-
-    # Re-assign sort_order to reflect chronological order within day
-    day_counters: dict[int, int] = {}
-    for assignment in assignments:
-        d = assignment.day_number
-        day_counters[d] = day_counters.get(d, 0) + 1
-        assignment.sort_order = day_counters[d]
-
-    logger.info(
-        "Slot assignment complete: %d slots across %d days",
-        len(assignments),
-        num_days,
-    )
-
+            flex_idx += 1
+            intervals.reserve(start, end)
+            placed.append((day, start, end, node, meta, "flex", duration))
+            count += 1
+            probe_hour = (end // 60) % 24 + (1 if end % 60 else 0)
+
+    # Sort by day, then chronologically; sort_order is the position within the day
+    placed.sort(key=lambda p: (p[0], p[1]))
+    assignments: list[SlotAssignment] = []
+    sort_order = 0
+    current_day = 0
+    day_base = base
+    for day, start, end, node, meta, slot_type, duration in placed:
+        if day != current_day:
+            current_day = day
+            sort_order = 0
+            day_base = base + timedelta(days=day - 1)
+        sort_order += 1
+        assignments.append(SlotAssignment(
+            activity_node_id=node["id"],
+            day_number=day,
+            sort_order=sort_order,
+            slot_type=slot_type,
+            start_time=day_base + timedelta(minutes=start),
+            end_time=day_base + timedelta(minutes=end),
+            duration_minutes=duration,
+            ranking_meta=meta,
+        ))
     return assignments
-
-
-def _prepend(item: Any, iterator):
-    """Yield item then the rest of the iterator."""
-    yield item
-    yield from iterator
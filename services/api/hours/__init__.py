@@ -0,0 +1,31 @@
+"""
+Opening hours package.
+
+Compiles ActivityNode.hours into weekly minute intervals (split shifts,
+past-midnight closes) once per node and answers open/closed for batches of
+(node, local time) pairs.
+"""
+
+from services.api.hours.weekly import (
+    DAY_NAMES,
+    HoursIndex,
+    WeeklyHours,
+    clear_hours_cache,
+    compile_hours,
+    compiled_hours,
+    is_open,
+    open_state,
+    parse_hours_range,
+)
+
+__all__ = [
+    "DAY_NAMES",
+    "HoursIndex",
+    "WeeklyHours",
+    "clear_hours_cache",
+    "compile_hours",
+    "compiled_hours",
+    "is_open",
+    "open_state",
+    "parse_hours_range",
+]
@@ -0,0 +1,342 @@
+"""
+Weekly opening hours — compile ActivityNode.hours once, query vectorized.
+
+ActivityNode.hours is JSON keyed by lower-case day name:
+
+    {"monday": "09:00-17:00", "friday": "11:30-14:00, 17:00-23:30",
+     "saturday": "18:00-02:00", "sunday": "closed"}
+
+Each day value is one or more "HH:MM-HH:MM" ranges (comma/semicolon
+separated, or a JSON list), "closed", or "open 24 hours". A close at or
+before the open time runs past midnight into the next day (Sunday wraps to
+Monday).
+
+Compiled form (WeeklyHours):
+  intervals   sorted, merged [start, end) week-minute pairs, int32 (k, 2);
+              week minute 0 = Monday 00:00, MINUTES_PER_WEEK = 10080
+  known_days  7-bit mask of days whose entry parsed; a day that is missing
+              or unparseable is *unknown*, not closed
+
+Open state is tri-state: True (inside an interval), False (outside every
+interval on a known day), None (unknown). Callers treat unknown as open —
+the safe default the closure trigger has always used.
+
+HoursIndex stacks many nodes' intervals into one array keyed by
+node_position * MINUTES_PER_WEEK + week_minute, so a batch of (node, time)
+queries is a single np.searchsorted.
+
+compiled_hours() caches per node id, invalidated by ActivityNode.updatedAt
+(or the hours payload itself when updatedAt is absent).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DAY_NAMES = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+_ALL_DAYS_MASK = (1 << 7) - 1
+_CLOSED_VALUES = {"closed", "close", "closed all day"}
+_ALWAYS_OPEN_VALUES = {"open 24 hours", "24 hours", "24h", "24/7", "open 24h"}
+
+# Bound on cached compiled nodes (LRU)
+_CACHE_MAX_ENTRIES = 50_000
+
+
+def parse_hours_range(hours_str: str) -> tuple[int, int] | None:
+    """
+    Parse a simple 'HH:MM-HH:MM' hours string into (open_minute, close_minute)
+    offsets from midnight.
+
+    Returns None if the string cannot be parsed.
+
+    Examples:
+        '09:00-22:00' -> (540, 1320)
+        '18:00-02:00' -> (1080, 120)   (close < open: runs past midnight)
+        '00:00-00:00' -> None  (ambiguous — treat as unknown)
+    """
+    try:
+        parts = hours_str.strip().split("-")
+        if len(parts) != 2:
+            return None
+        open_h, open_m = map(int, parts[0].split(":"))
+        close_h, close_m = map(int, parts[1].split(":"))
+        open_minutes = open_h * 60 + open_m
+        close_minutes = close_h * 60 + close_m
+        if open_minutes == close_minutes:
+            return None  # ambiguous
+        return (open_minutes, close_minutes)
+    except (ValueError, AttributeError):
+        return None
+
+
+def _parse_day(value: Any) -> list[tuple[int, int]] | None:
+    """
+    Ranges for one day value as (open, close) minutes; close may exceed
+    MINUTES_PER_DAY for past-midnight closes. [] = closed, None = unparseable.
+    """
+    if isinstance(value, str):
+        text = value.strip().lower()
+        if text in _CLOSED_VALUES:
+            return []
+        if text in _ALWAYS_OPEN_VALUES:
+            return [(0, MINUTES_PER_DAY)]
+        pieces = [p for p in text.replace(";", ",").split(",") if p.strip()]
+    elif isinstance(value, list):
+        pieces = [p for p in value if isinstance(p, str) and p.strip()]
+        if len(pieces) != len(value):
+            return None
+    else:
+        return None
+
+    if not pieces:
+        return None
+
+    ranges: list[tuple[int, int]] = []
+    for piece in pieces:
+        parsed = parse_hours_range(piece)
+        if parsed is None:
+            return None
+        open_minutes, close_minutes = parsed
+        if close_minutes <= open_minutes:
+            close_minutes += MINUTES_PER_DAY
+        ranges.append((open_minutes, close_minutes))
+    return ranges
+
+
+# ---------------------------------------------------------------------------
+# Compiled form
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class WeeklyHours:
+    """One node's compiled week. See the module docstring for the encoding."""
+
+    intervals: np.ndarray
+    known_days: int
+
+    def state_at(self, weekday: int, minute_of_day: int) -> bool | None:
+        """Open state at a local weekday (Monday = 0) and minute of day."""
+        minute = weekday * MINUTES_PER_DAY + minute_of_day
+        starts = self.intervals[:, 0]
+        i = int(np.searchsorted(starts, minute, side="right")) - 1
+        if i >= 0 and minute < self.intervals[i, 1]:
+            return True
+        if self.known_days >> weekday & 1:
+            return False
+        return None
+
+
+def compile_hours(hours_data: Any) -> WeeklyHours | None:
+    """
+    Compile an ActivityNode.hours value (dict or JSON string).
+
+    Returns None when there is no usable hours data at all.
+    """
+    if isinstance(hours_data, str):
+        try:
+            hours_data = json.loads(hours_data)
+        except ValueError:
+            return None
+    if not isinstance(hours_data, dict) or not hours_data:
+        return None
+
+    known_days = 0
+    raw_intervals: list[tuple[int, int]] = []
+    for day, value in hours_data.items():
+        try:
+            weekday = DAY_NAMES.index(str(day).strip().lower())
+        except ValueError:
+            continue
+        ranges = _parse_day(value)
+        if ranges is None:
+            continue
+        known_days |= 1 << weekday
+        base = weekday * MINUTES_PER_DAY
+        for open_minutes, close_minutes in ranges:
+            start, end = base + open_minutes, base + close_minutes
+            if end > MINUTES_PER_WEEK:
+                # Sunday past midnight wraps to Monday morning
+                raw_intervals.append((start, MINUTES_PER_WEEK))
+                raw_intervals.append((0, end - MINUTES_PER_WEEK))
+            else:
+                raw_intervals.append((start, end))
+
+    raw_intervals.sort()
+    merged: list[list[int]] = []
+    for start, end in raw_intervals:
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+
+    intervals = np.array(merged, dtype=np.int32).reshape(-1, 2)
+    return WeeklyHours(intervals=intervals, known_days=known_days & _ALL_DAYS_MASK)
+
+
+class _HoursCache:
+    """Bounded LRU of node id -> (version, WeeklyHours | None)."""
+
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[Any, WeeklyHours | None]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, node_id: str, version: Any) -> tuple[bool, WeeklyHours | None]:
+        entry = self._entries.get(node_id)
+        if entry is None or entry[0] != version:
+            return False, None
+        self._entries.move_to_end(node_id)
+        return True, entry[1]
+
+    def put(self, node_id: str, version: Any, compiled: WeeklyHours | None) -> None:
+        self._entries[node_id] = (version, compiled)
+        self._entries.move_to_end(node_id)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+_cache = _HoursCache(_CACHE_MAX_ENTRIES)
+
+
+def clear_hours_cache() -> None:
+    """Drop every compiled node in this process."""
+    _cache.clear()
+
+
+def _version(node: dict[str, Any]) -> Any:
+    updated_at = node.get("updatedAt")
+    if updated_at is not None:
+        return updated_at
+    hours = node.get("hours")
+    return hours if isinstance(hours, str) else json.dumps(hours, sort_keys=True, default=str)
+
+
+def compiled_hours(node: dict[str, Any]) -> WeeklyHours | None:
+    """compile_hours(node["hours"]), cached per node id and updatedAt."""
+    node_id = node.get("id")
+    if not node_id:
+        return compile_hours(node.get("hours"))
+    version = _version(node)
+    found, compiled = _cache.get(node_id, version)
+    if not found:
+        compiled = compile_hours(node.get("hours"))
+        _cache.put(node_id, version, compiled)
+    return compiled
+
+
+# ---------------------------------------------------------------------------
+# Vectorized lookup
+# ---------------------------------------------------------------------------
+
+
+def week_minutes(local_times: Sequence[datetime]) -> tuple[np.ndarray, np.ndarray]:
+    """(weekday, week_minute) arrays for local datetimes."""
+    weekdays = np.fromiter((t.weekday() for t in local_times), dtype=np.int64, count=len(local_times))
+    minutes = np.fromiter(
+        (t.hour * 60 + t.minute for t in local_times), dtype=np.int64, count=len(local_times)
+    )
+    return weekdays, weekdays * MINUTES_PER_DAY + minutes
+
+
+class HoursIndex:
+    """
+    Compiled hours for a list of nodes, stacked for batch lookups.
+
+    Position i in the index is nodes[i]. Nodes without usable hours are
+    unknown on every day.
+    """
+
+    def __init__(self, nodes: Sequence[dict[str, Any]]) -> None:
+        self.size = len(nodes)
+        compiled = [compiled_hours(node) for node in nodes]
+        self._known_days = np.array(
+            [c.known_days if c is not None else 0 for c in compiled], dtype=np.int64
+        )
+        offsets = [
+            c.intervals + i * MINUTES_PER_WEEK
+            for i, c in enumerate(compiled)
+            if c is not None and len(c.intervals)
+        ]
+        stacked = (
+            np.concatenate(offsets).astype(np.int64)
+            if offsets
+            else np.empty((0, 2), dtype=np.int64)
+        )
+        self._starts = stacked[:, 0]
+        self._ends = stacked[:, 1]
+
+    def open_state(
+        self,
+        positions: np.ndarray,
+        local_times: Sequence[datetime],
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        (open, known) boolean arrays for node positions at local_times.
+
+        ``positions`` and ``local_times`` are paired element-wise.
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        weekdays, minutes = week_minutes(local_times)
+        keys = positions * MINUTES_PER_WEEK + minutes
+
+        i = np.searchsorted(self._starts, keys, side="right") - 1
+        valid = i >= 0
+        # An interval found for an earlier node ends at or before this node's
+        # offset, so the end comparison alone rejects it
+        inside = np.zeros(len(keys), dtype=bool)
+        inside[valid] = keys[valid] < self._ends[i[valid]]
+
+        known_day = (self._known_days[positions] >> weekdays) & 1 == 1
+        return inside, inside | known_day
+
+    def is_open(self, local_times: datetime | Sequence[datetime]) -> np.ndarray:
+        """Open (or unknown) per node; one time broadcasts to every node."""
+        if isinstance(local_times, datetime):
+            local_times = [local_times] * self.size
+        inside, known = self.open_state(np.arange(self.size), local_times)
+        return inside | ~known
+
+
+def open_state(
+    nodes: Sequence[dict[str, Any]],
+    local_times: datetime | Sequence[datetime],
+) -> tuple[np.ndarray, np.ndarray]:
+    """(open, known) per node at its local time; one time broadcasts."""
+    if isinstance(local_times, datetime):
+        local_times = [local_times] * len(nodes)
+    if len(local_times) != len(nodes):
+        raise ValueError(f"got {len(nodes)} nodes but {len(local_times)} local times")
+    return HoursIndex(nodes).open_state(np.arange(len(nodes)), local_times)
+
+
+def is_open(
+    nodes: Sequence[dict[str, Any]],
+    local_times: datetime | Sequence[datetime],
+) -> np.ndarray:
+    """
+    Boolean array: is nodes[i] open at local_times[i] (venue-local datetimes)?
+
+    Unknown hours count as open. Pass a single datetime to test every node at
+    the same time.
+    """
+    inside, known = open_state(nodes, local_times)
+    return inside | ~known
@@ -96,7 +96,7 @@ _PII_PATTERNS: list[tuple[re.Pattern, str]] = [
 
 
 def _scrub_pii(text: str) -> str:
-    """Strip PII patterns from text before storage."""
+    """Strip PII patterns from text before storage (in order, each on the previous output)."""
     for pattern, replacement in _PII_PATTERNS:
         text = pattern.sub(replacement, text)
     return text
@@ -21,6 +21,9 @@ Design:
   - Only source='user_behavioral' signals are used
   - PersonaUpdateRun audit table tracks each execution
   - Idempotency: skips if a successful run already exists for the target date
+  - Each updated user's persona_dimensions.version is bumped and mirrored
+    into Redis (persona_version:{user_id}) so effective_persona() can
+    validate its caches without a Postgres round-trip
 
 Category-to-dimension mapping:
   Accepted food/dining slots     -> food_priority confidence UP
@@ -29,7 +32,7 @@ Category-to-dimension mapping:
   confidence toward 1.0 or 0.0 respectively.
 
 Entry point:
-    async def run_persona_update(pool, target_date=None)
+    async def run_persona_update(pool, target_date=None, *, redis_client=None)
 """
 
 from __future__ import annotations
@@ -40,6 +43,8 @@ import time
 from datetime import date, datetime, timedelta, timezone
 from typing import Any
 
+from services.api.persona.effective import publish_persona_versions
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -187,6 +192,19 @@ SET confidence = EXCLUDED.confidence,
     "updatedAt" = NOW()
 """
 
+# Bump a user's persona version (uniformly across their rows) after an update
+_BUMP_VERSION_SQL = """
+UPDATE persona_dimensions
+SET version = v.next_version
+FROM (
+    SELECT COALESCE(MAX(version), 0) + 1 AS next_version
+    FROM persona_dimensions
+    WHERE "userId" = $1
+) v
+WHERE "userId" = $1
+RETURNING v.next_version
+"""
+
 
 # ---------------------------------------------------------------------------
 # Core logic
@@ -285,14 +303,18 @@ def _build_dimension_updates(
 async def run_persona_update(
     pool: Any,
     target_date: date | None = None,
+    *,
+    redis_client: Any = None,
 ) -> dict[str, Any]:
     """
     Run the nightly persona dimension update for a given target date.
 
     Args:
-        pool:        asyncpg connection pool.
-        target_date: The calendar date whose signals to process.
-                     Defaults to yesterday (UTC).
+        pool:         asyncpg connection pool.
+        target_date:  The calendar date whose signals to process.
+                      Defaults to yesterday (UTC).
+        redis_client: Optional redis.asyncio client. When provided, the bumped
+                      persona versions are published as Redis stamps.
 
     Returns:
         A result dict::
@@ -370,6 +392,7 @@ async def run_persona_update(
 
             users_updated = 0
             dimensions_updated = 0
+            bumped_versions: dict[str, int] = {}
 
             for uid, signals in user_signals.items():
                 # Get current persona dimensions
@@ -406,9 +429,13 @@ async def run_persona_update(
                             "behavioral_ema",
                         )
                         dimensions_updated += 1
+                    new_version = await conn.fetchval(_BUMP_VERSION_SQL, uid)
+                    bumped_versions[uid] = int(new_version or 0)
 
                 users_updated += 1
 
+            await publish_persona_versions(redis_client, bumped_versions)
+
             duration_ms = int((time.monotonic() - start_ts) * 1000)
 
             # Log audit
@@ -503,11 +530,18 @@ async def main() -> None:
     database_url = os.environ["DATABASE_URL"]
 
     pool = await asyncpg.create_pool(database_url, min_size=1, max_size=3)
+    redis_client = None
+    if os.environ.get("REDIS_URL"):
+        import redis.asyncio as aioredis
+
+        redis_client = aioredis.from_url(os.environ["REDIS_URL"], decode_responses=True)
     try:
-        result = await run_persona_update(pool)
+        result = await run_persona_update(pool, redis_client=redis_client)
         print(f"persona_updater complete: {result}")
     finally:
         await pool.close()
+        if redis_client is not None:
+            await redis_client.aclose()
 
 
 if __name__ == "__main__":
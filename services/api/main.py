@@ -10,13 +10,14 @@ from contextlib import asynccontextmanager
 
 import asyncpg
 import redis.asyncio as aioredis
-from fastapi import FastAPI, Request, Response
+from fastapi import FastAPI, Request
 from sqlalchemy.ext.asyncio import async_sessionmaker
 from starlette.responses import JSONResponse
 
 from services.api.config import settings
 from services.api.middleware.cors import setup_cors
 from services.api.middleware.rate_limit import RateLimitMiddleware
+from services.api.middleware.request_id import RequestEnvelopeMiddleware
 from services.api.middleware.sentry import setup_sentry
 from services.api.routers import health, events, embed, search, calendar
 from services.api.routers import generate
@@ -31,6 +32,8 @@ from services.api.routers import admin_seed_viz
 from services.api.routers import backfill as backfill_router
 from services.api.search.qdrant_client import QdrantSearchClient
 from services.api.search.service import ActivitySearchService
+from services.api.weather import WeatherCache, WeatherPrefetcher, WeatherService
+from services.api.spatial import CitySpatialIndexes
 
 
 # Shared redis reference — set during lifespan, read by rate limiter
@@ -108,8 +111,40 @@ async def lifespan(app: FastAPI):
         score_threshold=settings.search_score_threshold,
     )
 
+    # Spatial — per-city node indexes, loaded on first use and rebuilt
+    # after each Qdrant re-sync bumps the city's search generation
+    app.state.spatial_indexes = (
+        CitySpatialIndexes(db_pool, redis_client, max_bytes=settings.spatial_index_max_bytes)
+        if db_pool
+        else None
+    )
+
+    # Weather — one pooled client per process, shared by pivot evaluation;
+    # the prefetcher (opt-in, budget-capped) refreshes active-trip cities
+    # into the Redis cache ahead of the hourly rollover
+    weather_service = WeatherService(
+        api_key=settings.openweathermap_api_key,
+        cache=WeatherCache(redis_client),
+        timeout_s=settings.weather_api_timeout_s,
+    )
+    app.state.weather_service = weather_service
+
+    weather_prefetcher = None
+    if settings.weather_prefetch_enabled and settings.openweathermap_api_key and db_pool:
+        weather_prefetcher = WeatherPrefetcher(
+            weather_service,
+            db_pool,
+            lead_s=settings.weather_prefetch_lead_s,
+            jitter_s=settings.weather_prefetch_jitter_s,
+            max_cities=settings.weather_prefetch_max_cities,
+        )
+        weather_prefetcher.start()
+
     yield
 
+    if weather_prefetcher:
+        await weather_prefetcher.stop()
+    await weather_service.aclose()
     await qdrant_client.close()
     if sa_engine:
         await sa_engine.dispose()
@@ -159,30 +194,7 @@ setup_cors(app)
 
 
 # Request ID injection + body size enforcement
-@app.middleware("http")
-async def request_envelope_middleware(request: Request, call_next) -> Response:
-    request_id = request.headers.get("x-request-id", str(uuid.uuid4()))
-    request.state.request_id = request_id
-
-    # Enforce request body size limit for events batch
-    if request.url.path == "/events/batch" and request.method == "POST":
-        content_length = request.headers.get("content-length")
-        if content_length and int(content_length) > settings.events_request_max_bytes:
-            return JSONResponse(
-                status_code=413,
-                content={
-                    "success": False,
-                    "error": {
-                        "code": "PAYLOAD_TOO_LARGE",
-                        "message": f"Request body exceeds {settings.events_request_max_bytes} bytes.",
-                    },
-                    "requestId": request_id,
-                },
-            )
-
-    response = await call_next(request)
-    response.headers["X-Request-ID"] = request_id
-    return response
+app.add_middleware(RequestEnvelopeMiddleware)
 
 
 # Rate limiting — uses lazy redis reference from lifespan
@@ -192,9 +204,9 @@ class _LazyRateLimitMiddleware(RateLimitMiddleware):
     def __init__(self, app):
         super().__init__(app, redis_client=None)
 
-    async def dispatch(self, request, call_next):
+    async def __call__(self, scope, receive, send):
         self.redis = _redis_holder.get("client")
-        return await super().dispatch(request, call_next)
+        await super().__call__(scope, receive, send)
 
 
 app.add_middleware(_LazyRateLimitMiddleware)
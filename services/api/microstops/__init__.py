@@ -5,7 +5,11 @@ A micro-stop is a lightweight ItinerarySlot (slotType=flex, 15-30 min)
 inserted when the system detects interesting ActivityNodes within 200m of
 the transit path between two anchor/meal slots.
 
+Suggesting for a day or a whole trip costs a constant number of DB round
+trips: one segment query, one exclusion fetch, one spatial query over all
+segments, one sort-order shift and one bulk slot insert.
+
 Public API:
     from services.api.microstops.service import MicroStopService
-    from services.api.microstops.spatial import find_nodes_along_path
+    from services.api.microstops.spatial import find_nodes_along_path, find_nodes_along_paths
 """
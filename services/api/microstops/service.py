@@ -1,15 +1,20 @@
 """
 MicroStopService — orchestrates proximity-based micro-stop suggestions.
 
-Flow:
-  1. Find all transit slots for a given trip day that have both an origin
-     and destination ActivityNode with known lat/lon.
-  2. For each transit slot, call spatial.find_nodes_along_path().
-  3. Filter out nodes already in the itinerary.
-  4. For each candidate, create a lightweight ItinerarySlot (slotType=flex,
-     durationMinutes=15-30, status=proposed) inserted after the transit slot.
-  5. Log a BehavioralSignal (slot_swap with value 0.0 — suggestion shown, not chosen).
-  6. Return a MicroStopResult summary.
+Flow (a constant number of DB round trips for a day or a whole trip):
+  1. Fetch every transit slot of the requested day(s) that has both an
+     origin and destination ActivityNode with known lat/lon, plus the type
+     of the slot that follows it.
+  2. Fetch the nodes already scheduled on those days in one query.
+  3. Run one spatial query over all segments (spatial.find_nodes_along_paths),
+     or, with spatial_indexes, answer from the in-memory city index.
+  4. Pick each segment's top candidate that is not already used that day.
+  5. Shift the following slots with one UPDATE and insert every micro-stop
+     ItinerarySlot (slotType=flex, durationMinutes=15-30, status=proposed)
+     with one bulk INSERT, each immediately after its transit slot. Both run
+     in one transaction; segments that fail validation are skipped with a
+     warning and do not block the others.
+  6. Return a MicroStopResult summary per day.
 
 Design constraints:
   - Micro-stops are NEVER auto-confirmed — always proposed.
@@ -22,14 +27,19 @@ from __future__ import annotations
 
 import logging
 import uuid
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
 from services.api.microstops.spatial import (
     SpatialCandidate,
-    find_nodes_along_path,
+    TransitPath,
+    fetch_scheduled_node_ids,
+    find_nodes_along_paths,
+    find_nodes_in_index,
 )
+from services.api.spatial import CitySpatialIndexes
 
 logger = logging.getLogger(__name__)
 
@@ -54,6 +64,10 @@ class TransitSegment:
     destination_lon: float
     origin_node_id: str | None
     destination_node_id: str | None
+    day_number: int = 0
+    # A flex slot already follows this transit: nothing to insert
+    followed_by_flex: bool = False
+    city: str | None = None
 
 
 @dataclass
@@ -96,11 +110,14 @@ class MicroStopService:
     Proximity-based micro-stop suggestion for mid-trip transit windows.
 
     Injected dependencies for testability:
-      db  — asyncpg connection / pool (same pattern as GenerationEngine)
+      db               — asyncpg connection / pool (same pattern as GenerationEngine)
+      spatial_indexes  — optional in-memory city indexes; segments whose
+                         city has one skip the PostGIS query
     """
 
-    def __init__(self, db: Any) -> None:
+    def __init__(self, db: Any, spatial_indexes: CitySpatialIndexes | None = None) -> None:
         self._db = db
+        self._spatial = spatial_indexes
 
     async def suggest_for_day(
         self,
@@ -116,52 +133,81 @@ class MicroStopService:
         Returns a MicroStopResult with all inserted slot IDs.
         Does NOT raise on partial failures — warnings are collected.
         """
-        result = MicroStopResult(
-            trip_id=trip_id,
-            day_number=day_number,
-            transit_segments_evaluated=0,
-        )
-        session_id = session_id or str(uuid.uuid4())
-
-        # 1. Fetch all transit slots with spatial data
-        segments = await self._fetch_transit_segments(trip_id, day_number)
-        result.transit_segments_evaluated = len(segments)
+        results = await self._suggest(trip_id, [day_number])
+        return results[0]
 
-        if not segments:
-            result.warnings.append("No eligible transit segments found.")
-            return result
+    async def suggest_for_trip(
+        self,
+        *,
+        trip_id: str,
+        user_id: str,
+        day_numbers: list[int] | None = None,
+        session_id: str | None = None,
+    ) -> list[MicroStopResult]:
+        """
+        suggest_for_day() for several days (default: every day with an
+        eligible transit slot) in the same number of round trips as one day.
 
-        # 2. Fetch current sort_order ceiling for the day (to avoid collisions)
-        max_sort_order = await self._fetch_max_sort_order(trip_id, day_number)
+        Returns one MicroStopResult per day, in day order.
+        """
+        return await self._suggest(trip_id, day_numbers)
 
+    async def _suggest(
+        self,
+        trip_id: str,
+        day_numbers: list[int] | None,
+    ) -> list[MicroStopResult]:
+        segments = await self._fetch_transit_segments(trip_id, day_numbers)
+        days = sorted(set(day_numbers)) if day_numbers is not None else sorted(
+            {seg.day_number for seg in segments}
+        )
+        results = {
+            day: MicroStopResult(trip_id=trip_id, day_number=day, transit_segments_evaluated=0)
+            for day in days
+        }
         for segment in segments:
+            results[segment.day_number].transit_segments_evaluated += 1
+        for result in results.values():
+            if not result.transit_segments_evaluated:
+                result.warnings.append("No eligible transit segments found.")
+
+        open_segments = [seg for seg in segments if not seg.followed_by_flex]
+        for seg in segments:
+            if seg.followed_by_flex:
+                logger.debug("Skipping segment %s — flex slot already follows", seg.slot_id)
+
+        if open_segments:
+            planned: list[tuple[int, MicroStopInsertion]] = []
             try:
-                insertion = await self._evaluate_segment(
-                    trip_id=trip_id,
-                    day_number=day_number,
-                    segment=segment,
-                    current_max_sort_order=max_sort_order,
-                )
-                if insertion:
-                    result.insertions.append(insertion)
-                    max_sort_order = insertion.sort_order + 1
+                planned, failed = await self._plan_insertions(trip_id, open_segments)
+                for seg, exc in failed:
+                    results[seg.day_number].warnings.append(
+                        f"Segment {seg.slot_id} failed: {exc}"
+                    )
+                await self._insert_microstops(trip_id, planned)
             except Exception as exc:
-                logger.exception(
-                    "Micro-stop evaluation failed for segment slot=%s", segment.slot_id
-                )
-                result.warnings.append(
-                    f"Segment {segment.slot_id} failed: {exc}"
-                )
-
-        logger.info(
-            "Micro-stops: trip=%s day=%d segments=%d inserted=%d",
-            trip_id,
-            day_number,
-            result.transit_segments_evaluated,
-            result.inserted_count,
-        )
+                # The shift and the insert share a transaction: nothing was written
+                logger.exception("Micro-stop insertion failed for trip=%s", trip_id)
+                failed_ids = {ins.inserted_after_slot_id for _, ins in planned}
+                for seg in open_segments:
+                    if not planned or seg.slot_id in failed_ids:
+                        results[seg.day_number].warnings.append(
+                            f"Segment {seg.slot_id} failed: {exc}"
+                        )
+            else:
+                for day_number, insertion in planned:
+                    results[day_number].insertions.append(insertion)
+
+        for result in results.values():
+            logger.info(
+                "Micro-stops: trip=%s day=%d segments=%d inserted=%d",
+                trip_id,
+                result.day_number,
+                result.transit_segments_evaluated,
+                result.inserted_count,
+            )
 
-        return result
+        return [results[day] for day in days]
 
     # ------------------------------------------------------------------
     # Private helpers
@@ -170,21 +216,24 @@ class MicroStopService:
     async def _fetch_transit_segments(
         self,
         trip_id: str,
-        day_number: int,
+        day_numbers: list[int] | None,
     ) -> list[TransitSegment]:
         """
         Fetch transit slots with origin and destination node coordinates.
 
-        We look at adjacent slot pairs where:
+        We look at adjacent slot pairs (per day) where:
           - The current slot is type=transit, not locked, not terminal
           - The previous slot has an activityNodeId with known lat/lon (origin)
           - The next slot has an activityNodeId with known lat/lon (destination)
+
+        ``day_numbers=None`` covers every day of the trip.
         """
         rows = await self._db.fetch(
             """
             WITH ranked AS (
                 SELECT
                     s.id,
+                    s."dayNumber",
                     s."sortOrder",
                     s."slotType",
                     s."startTime",
@@ -192,20 +241,27 @@ class MicroStopService:
                     s."durationMinutes",
                     s."isLocked",
                     s.status,
-                    LAG(s."activityNodeId") OVER (ORDER BY s."sortOrder") AS origin_node_id,
-                    LEAD(s."activityNodeId") OVER (ORDER BY s."sortOrder") AS dest_node_id
+                    LAG(s."activityNodeId") OVER day_order AS origin_node_id,
+                    LEAD(s."activityNodeId") OVER day_order AS dest_node_id,
+                    LEAD(s."slotType") OVER day_order AS next_slot_type,
+                    LEAD(s."sortOrder") OVER day_order AS next_sort_order
                 FROM itinerary_slots s
                 WHERE s."tripId" = $1
-                  AND s."dayNumber" = $2
+                  AND ($2::int[] IS NULL OR s."dayNumber" = ANY($2::int[]))
+                WINDOW day_order AS (PARTITION BY s."dayNumber" ORDER BY s."sortOrder")
             )
             SELECT
                 r.id AS slot_id,
+                r."dayNumber",
                 r."sortOrder",
                 r."startTime",
                 r."endTime",
                 r."durationMinutes",
                 r.origin_node_id,
                 r.dest_node_id,
+                (r.next_slot_type = 'flex' AND r.next_sort_order = r."sortOrder" + 1)
+                    AS followed_by_flex,
+                orig.city,
                 orig.latitude AS origin_lat,
                 orig.longitude AS origin_lon,
                 dest.latitude AS dest_lat,
@@ -221,10 +277,10 @@ class MicroStopService:
                 AND orig.longitude IS NOT NULL
                 AND dest.latitude IS NOT NULL
                 AND dest.longitude IS NOT NULL
-            ORDER BY r."sortOrder" ASC
+            ORDER BY r."dayNumber" ASC, r."sortOrder" ASC
             """,
             trip_id,
-            day_number,
+            day_numbers,
         )
 
         return [
@@ -240,84 +296,130 @@ class MicroStopService:
                 destination_lon=row["dest_lon"],
                 origin_node_id=row["origin_node_id"],
                 destination_node_id=row["dest_node_id"],
+                day_number=row["dayNumber"],
+                followed_by_flex=bool(row["followed_by_flex"]),
+                city=row["city"],
             )
             for row in rows
         ]
 
-    async def _has_existing_flex_after(
+    async def _plan_insertions(
         self,
         trip_id: str,
-        day_number: int,
-        sort_order: int,
-    ) -> bool:
-        """Check if a flex slot already exists immediately after sort_order."""
-        row = await self._db.fetchrow(
-            """
-            SELECT id FROM itinerary_slots
-            WHERE "tripId" = $1
-              AND "dayNumber" = $2
-              AND "sortOrder" = $3
-              AND "slotType" = 'flex'
-            LIMIT 1
-            """,
-            trip_id,
-            day_number,
-            sort_order + 1,
-        )
-        return row is not None
+        segments: list[TransitSegment],
+    ) -> tuple[list[tuple[int, MicroStopInsertion]], list[tuple[TransitSegment, Exception]]]:
+        """
+        Choose one candidate per segment and compute final sort orders.
 
-    async def _fetch_max_sort_order(self, trip_id: str, day_number: int) -> int:
-        """Return the current maximum sortOrder for the day."""
-        row = await self._db.fetchrow(
-            """
-            SELECT COALESCE(MAX("sortOrder"), 0) AS max_order
-            FROM itinerary_slots
-            WHERE "tripId" = $1 AND "dayNumber" = $2
-            """,
-            trip_id,
-            day_number,
-        )
-        return int(row["max_order"]) if row else 0
+        ``segments`` are ordered by (day, sortOrder). Each insertion lands
+        right after its transit slot; earlier insertions on the same day push
+        it down by one each. A segment that fails validation or whose row
+        cannot be built is skipped without affecting the others.
 
-    async def _evaluate_segment(
-        self,
-        *,
-        trip_id: str,
-        day_number: int,
-        segment: TransitSegment,
-        current_max_sort_order: int,
-    ) -> MicroStopInsertion | None:
-        """
-        Evaluate a single transit segment and insert a micro-stop if appropriate.
-        Returns the insertion record, or None if no suitable candidate found.
+        Returns (day_number, insertion) pairs and (segment, error) failures.
         """
-        # Skip if a flex slot already follows this transit
-        if await self._has_existing_flex_after(trip_id, day_number, segment.sort_order):
-            logger.debug(
-                "Skipping segment %s — flex slot already follows", segment.slot_id
-            )
-            return None
-
-        # Find spatial candidates along the transit path
-        candidates: list[SpatialCandidate] = await find_nodes_along_path(
+        failed: list[tuple[TransitSegment, Exception]] = []
+        valid: list[TransitSegment] = []
+        for seg in segments:
+            try:
+                self._validate_segment(seg)
+            except ValueError as exc:
+                logger.warning("Skipping micro-stop segment slot=%s: %s", seg.slot_id, exc)
+                failed.append((seg, exc))
+            else:
+                valid.append(seg)
+        if not valid:
+            return [], failed
+
+        scheduled = await fetch_scheduled_node_ids(
             db=self._db,
-            origin_lat=segment.origin_lat,
-            origin_lon=segment.origin_lon,
-            destination_lat=segment.destination_lat,
-            destination_lon=segment.destination_lon,
             trip_id=trip_id,
-            day_number=day_number,
-            exclude_node_ids=list(
-                filter(None, [segment.origin_node_id, segment.destination_node_id])
-            ),
+            day_numbers=sorted({seg.day_number for seg in valid}),
         )
-
-        if not candidates:
-            return None
-
-        # Take the top-ranked candidate (already sorted by convergenceScore)
-        top = candidates[0]
-
+        paths = [
+            TransitPath(
+                origin_lat=seg.origin_lat,
+                origin_lon=seg.origin_lon,
+                destination_lat=seg.destination_lat,
+                destination_lon=seg.destination_lon,
+                exclude_node_ids=tuple(
+                    scheduled[seg.day_number].union(
+                        filter(None, [seg.origin_node_id, seg.destination_node_id])
+                    )
+                ),
+            )
+            for seg in valid
+        ]
+        candidates_per_segment = await self._find_candidates(valid, paths)
+
+        planned: list[tuple[int, MicroStopInsertion]] = []
+        used: dict[int, set[str]] = {}
+        inserted_before: dict[int, int] = {}
+        for segment, candidates in zip(valid, candidates_per_segment):
+            day_used = used.setdefault(segment.day_number, set())
+            top = next((c for c in candidates if c.activity_node_id not in day_used), None)
+            if top is None:
+                continue
+
+            shift = inserted_before.get(segment.day_number, 0)
+            try:
+                insertion = self._insertion(segment, top, shift)
+            except Exception as exc:
+                logger.exception(
+                    "Micro-stop evaluation failed for segment slot=%s", segment.slot_id
+                )
+                failed.append((segment, exc))
+                continue
+            day_used.add(top.activity_node_id)
+            inserted_before[segment.day_number] = shift + 1
+            planned.append((segment.day_number, insertion))
+        return planned, failed
+
+    @staticmethod
+    def _validate_segment(segment: TransitSegment) -> None:
+        """Raise ValueError if the segment cannot be searched or placed."""
+        if not isinstance(segment.sort_order, int):
+            raise ValueError(f"invalid sortOrder {segment.sort_order!r}")
+        for lat, lon in (
+            (segment.origin_lat, segment.origin_lon),
+            (segment.destination_lat, segment.destination_lon),
+        ):
+            if not (
+                isinstance(lat, (int, float)) and isinstance(lon, (int, float))
+                and -90.0 <= lat <= 90.0 and -180.0 <= lon <= 180.0
+            ):
+                raise ValueError(f"invalid coordinates ({lat!r}, {lon!r})")
+
+    async def _find_candidates(
+        self,
+        segments: list[TransitSegment],
+        paths: list[TransitPath],
+    ) -> list[list[SpatialCandidate]]:
+        """Index lookups where a city index is available, one SQL query for the rest."""
+        results: list[list[SpatialCandidate] | None] = [None] * len(paths)
+        if self._spatial is not None:
+            indexes = {}
+            for city in {seg.city for seg in segments if seg.city}:
+                indexes[city] = await self._spatial.get(city)
+            for i, (segment, path) in enumerate(zip(segments, paths)):
+                index = indexes.get(segment.city)
+                if index is not None:
+                    results[i] = find_nodes_in_index(index, path)
+
+        remaining = [i for i, r in enumerate(results) if r is None]
+        if remaining:
+            fetched = await find_nodes_along_paths(db=self._db, paths=[paths[i] for i in remaining])
+            for i, candidates in zip(remaining, fetched):
+                results[i] = candidates
+        return results
+
+    @staticmethod
+    def _insertion(
+        segment: TransitSegment,
+        top: SpatialCandidate,
+        shift: int,
+    ) -> MicroStopInsertion:
+        """Build the micro-stop placed after ``segment`` (moved down by ``shift``)."""
         # Calculate timing: start at transit slot end, duration 15-30 min
         duration = top.duration_minutes or 20
         start_time: datetime | None = None
@@ -330,74 +432,115 @@ class MicroStopService:
             start_time = utc_end
             end_time = utc_end + timedelta(minutes=duration)
 
-        # Insert the micro-stop slot
-        new_slot_id = str(uuid.uuid4())
-        # Place it immediately after the transit slot
-        new_sort_order = segment.sort_order + 1
-
-        # Shift existing slots that conflict with this sort_order
-        await self._db.execute(
-            """
-            UPDATE itinerary_slots
-            SET "sortOrder" = "sortOrder" + 1, "updatedAt" = NOW()
-            WHERE "tripId" = $1
-              AND "dayNumber" = $2
-              AND "sortOrder" >= $3
-              AND id != $4
-            """,
-            trip_id,
-            day_number,
-            new_sort_order,
-            segment.slot_id,
-        )
-
-        now = datetime.now(timezone.utc)
-        await self._db.execute(
-            """
-            INSERT INTO itinerary_slots (
-                id, "tripId", "activityNodeId",
-                "dayNumber", "sortOrder",
-                "slotType", status,
-                "startTime", "endTime", "durationMinutes",
-                "isLocked", "wasSwapped",
-                "createdAt", "updatedAt"
-            ) VALUES (
-                $1, $2, $3,
-                $4, $5,
-                'flex', 'proposed',
-                $6, $7, $8,
-                false, false,
-                $9, $9
-            )
-            ON CONFLICT DO NOTHING
-            """,
-            new_slot_id,
-            trip_id,
-            top.activity_node_id,
-            day_number,
-            new_sort_order,
-            start_time,
-            end_time,
-            duration,
-            now,
-        )
-
-        logger.info(
-            "Micro-stop inserted: slot=%s node=%s after_transit=%s duration=%dmin",
-            new_slot_id,
-            top.activity_node_id,
-            segment.slot_id,
-            duration,
-        )
-
         return MicroStopInsertion(
-            new_slot_id=new_slot_id,
+            new_slot_id=str(uuid.uuid4()),
             activity_node_id=top.activity_node_id,
             activity_name=top.name,
             inserted_after_slot_id=segment.slot_id,
-            sort_order=new_sort_order,
+            # Immediately after the transit slot, which itself moved down by
+            # the number of micro-stops inserted earlier that day
+            sort_order=segment.sort_order + shift + 1,
             start_time=start_time,
             end_time=end_time,
             duration_minutes=duration,
             convergence_score=top.convergence_score,
         )
+
+    @asynccontextmanager
+    async def _connection(self):
+        """A single connection: acquired from the pool, or the injected one."""
+        if hasattr(self._db, "acquire"):
+            async with self._db.acquire() as conn:
+                yield conn
+        else:
+            yield self._db
+
+    async def _insert_microstops(
+        self,
+        trip_id: str,
+        planned: list[tuple[int, MicroStopInsertion]],
+    ) -> None:
+        """
+        Make room and insert every planned micro-stop: one UPDATE, one INSERT,
+        in a single transaction.
+
+        An existing slot moves down by the number of micro-stops inserted
+        after transit slots that precede it on its day (original sortOrder).
+        """
+        if not planned:
+            return
+
+        # Original transit sortOrder of each insertion = final order - index - 1
+        after_days: list[int] = []
+        after_orders: list[int] = []
+        per_day: dict[int, int] = {}
+        for day_number, ins in planned:
+            index = per_day.get(day_number, 0)
+            per_day[day_number] = index + 1
+            after_days.append(day_number)
+            after_orders.append(ins.sort_order - index - 1)
+
+        # Shift and insert together, so a failed insert leaves no gaps
+        async with self._connection() as conn, conn.transaction():
+            await conn.execute(
+                """
+                UPDATE itinerary_slots s
+                SET "sortOrder" = s."sortOrder" + shift.n, "updatedAt" = NOW()
+                FROM (
+                    SELECT s2.id, COUNT(*) AS n
+                    FROM itinerary_slots s2
+                    JOIN unnest($2::int[], $3::int[]) AS ins(day_number, after_order)
+                      ON ins.day_number = s2."dayNumber" AND s2."sortOrder" > ins.after_order
+                    WHERE s2."tripId" = $1
+                    GROUP BY s2.id
+                ) AS shift
+                WHERE s.id = shift.id
+                """,
+                trip_id,
+                after_days,
+                after_orders,
+            )
+
+            now = datetime.now(timezone.utc)
+            await conn.execute(
+                """
+                INSERT INTO itinerary_slots (
+                    id, "tripId", "activityNodeId",
+                    "dayNumber", "sortOrder",
+                    "slotType", status,
+                    "startTime", "endTime", "durationMinutes",
+                    "isLocked", "wasSwapped",
+                    "createdAt", "updatedAt"
+                )
+                SELECT
+                    m.id, $1, m.node_id,
+                    m.day_number, m.sort_order,
+                    'flex', 'proposed',
+                    m.start_time, m.end_time, m.duration,
+                    false, false,
+                    $2, $2
+                FROM unnest(
+                    $3::text[], $4::text[], $5::int[], $6::int[],
+                    $7::timestamptz[], $8::timestamptz[], $9::int[]
+                ) AS m(id, node_id, day_number, sort_order, start_time, end_time, duration)
+                ON CONFLICT DO NOTHING
+                """,
+                trip_id,
+                now,
+                [ins.new_slot_id for _, ins in planned],
+                [ins.activity_node_id for _, ins in planned],
+                [day for day, _ in planned],
+                [ins.sort_order for _, ins in planned],
+                [ins.start_time for _, ins in planned],
+                [ins.end_time for _, ins in planned],
+                [ins.duration_minutes for _, ins in planned],
+            )
+
+        for _, ins in planned:
+            logger.info(
+                "Micro-stop inserted: slot=%s node=%s after_transit=%s duration=%dmin",
+                ins.new_slot_id,
+                ins.activity_node_id,
+                ins.inserted_after_slot_id,
+                ins.duration_minutes,
+            )
@@ -20,13 +20,31 @@ Filtering rules:
   - Exclude the origin and destination nodes themselves
   - Exclude nodes already present in the trip itinerary for that day
   - Maximum 5 results per transit segment, ranked by convergenceScore DESC
+
+Batching: find_nodes_along_paths() takes every segment of a day (or trip)
+at once. The segments are passed as parallel arrays, unnested into one
+buffered line per row, and a LATERAL subquery returns each segment's top
+candidates — one round trip regardless of segment count. Exclusions are
+fetched once with fetch_scheduled_node_ids() and passed in as
+(segment index, node id) pairs.
+
+find_nodes_in_index() answers the same question from an in-memory CityIndex
+(services.api.spatial) with no round trip. Its buffer is true metres
+(the SQL buffers in EPSG:3857 metres, which are smaller on the ground away
+from the equator), and it fills only the fields the index carries: price
+level, description, image and neighborhood are None.
 """
 
 from __future__ import annotations
 
 import logging
+from collections import defaultdict
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Iterable, Sequence
+
+import numpy as np
+
+from services.api.spatial import CityIndex
 
 logger = logging.getLogger(__name__)
 
@@ -57,6 +75,17 @@ class SpatialCandidate:
     duration_minutes: int | None  # estimated, sourced from category defaults
 
 
+@dataclass(frozen=True)
+class TransitPath:
+    """One transit segment to search along, with its own excluded node IDs."""
+
+    origin_lat: float
+    origin_lon: float
+    destination_lat: float
+    destination_lon: float
+    exclude_node_ids: tuple[str, ...] = ()
+
+
 # Rough default durations by category for micro-stop scheduling
 _CATEGORY_DEFAULT_DURATION: dict[str, int] = {
     "dining": 30,
@@ -78,6 +107,228 @@ def _estimate_duration(category: str) -> int:
     return min(30, max(15, _CATEGORY_DEFAULT_DURATION.get(category, _DEFAULT_MICRO_DURATION)))
 
 
+_SCHEDULED_NODES_SQL = """
+SELECT "dayNumber", "activityNodeId"
+FROM itinerary_slots
+WHERE "tripId" = $1
+  AND "dayNumber" = ANY($2::int[])
+  AND "activityNodeId" IS NOT NULL
+  AND status NOT IN ('skipped', 'completed')
+"""
+
+_NODES_ALONG_PATHS_SQL = """
+WITH segments AS (
+    SELECT
+        seg.idx,
+        ST_Transform(
+            ST_Buffer(
+                ST_Transform(
+                    ST_SetSRID(
+                        ST_MakeLine(
+                            ST_MakePoint(seg.origin_lon, seg.origin_lat),
+                            ST_MakePoint(seg.dest_lon, seg.dest_lat)
+                        ),
+                        4326
+                    ),
+                    3857
+                ),
+                $5
+            ),
+            4326
+        ) AS zone
+    FROM unnest($1::float8[], $2::float8[], $3::float8[], $4::float8[])
+        WITH ORDINALITY AS seg(origin_lon, origin_lat, dest_lon, dest_lat, idx)
+),
+excluded AS (
+    SELECT ex.idx, ex.node_id
+    FROM unnest($6::int[], $7::text[]) AS ex(idx, node_id)
+)
+SELECT
+    s.idx,
+    c.id,
+    c.name,
+    c.latitude,
+    c.longitude,
+    c.category,
+    c."priceLevel",
+    c."convergenceScore",
+    c."descriptionShort",
+    c."primaryImageUrl",
+    c.neighborhood
+FROM segments s
+CROSS JOIN LATERAL (
+    SELECT
+        an.id,
+        an.name,
+        an.latitude,
+        an.longitude,
+        an.category,
+        an."priceLevel",
+        an."convergenceScore",
+        an."descriptionShort",
+        an."primaryImageUrl",
+        an.neighborhood
+    FROM activity_nodes an
+    WHERE
+        an.status = 'approved'
+        AND an."isCanonical" = true
+        AND (an."convergenceScore" IS NULL OR an."convergenceScore" >= $8)
+        AND NOT EXISTS (
+            SELECT 1 FROM excluded e WHERE e.idx = s.idx AND e.node_id = an.id
+        )
+        AND ST_Within(
+            ST_SetSRID(ST_MakePoint(an.longitude, an.latitude), 4326),
+            s.zone
+        )
+    ORDER BY an."convergenceScore" DESC NULLS LAST
+    LIMIT $9
+) c
+ORDER BY s.idx, c."convergenceScore" DESC NULLS LAST
+"""
+
+
+async def fetch_scheduled_node_ids(
+    *,
+    db: Any,
+    trip_id: str,
+    day_numbers: Sequence[int],
+) -> dict[int, set[str]]:
+    """
+    Node IDs already scheduled (not skipped/completed) per day, in one query.
+
+    Every requested day is present in the result, possibly with an empty set.
+    """
+    rows = await db.fetch(_SCHEDULED_NODES_SQL, trip_id, list(day_numbers))
+    scheduled: dict[int, set[str]] = {day: set() for day in day_numbers}
+    for row in rows:
+        scheduled.setdefault(row["dayNumber"], set()).add(row["activityNodeId"])
+    return scheduled
+
+
+def _candidate(row: Any) -> SpatialCandidate:
+    cat = row["category"]
+    return SpatialCandidate(
+        activity_node_id=row["id"],
+        name=row["name"],
+        latitude=row["latitude"],
+        longitude=row["longitude"],
+        category=cat,
+        price_level=row["priceLevel"],
+        convergence_score=row["convergenceScore"],
+        description_short=row["descriptionShort"],
+        primary_image_url=row["primaryImageUrl"],
+        neighborhood=row["neighborhood"],
+        duration_minutes=_estimate_duration(cat),
+    )
+
+
+def find_nodes_in_index(index: CityIndex, path: TransitPath) -> list[SpatialCandidate]:
+    """
+    find_nodes_along_paths() for one path, answered from a city index.
+
+    Same filters (approved, convergenceScore >= MIN_CONVERGENCE_SCORE or
+    NULL, exclusions) and ranking (convergenceScore DESC NULLS LAST).
+    """
+    mask = index.mask(
+        approved_only=True,
+        min_score=MIN_CONVERGENCE_SCORE,
+        exclude_ids=path.exclude_node_ids,
+    )
+    positions, _ = index.along(
+        path.origin_lat,
+        path.origin_lon,
+        path.destination_lat,
+        path.destination_lon,
+        TRANSIT_BUFFER_METERS,
+        mask,
+    )
+    scores = index.score[positions]
+    ranked = positions[np.argsort(-np.nan_to_num(scores, nan=-np.inf), kind="stable")]
+
+    candidates: list[SpatialCandidate] = []
+    for pos in ranked[:MAX_CANDIDATES]:
+        code = int(index.category[pos])
+        cat = index.category_names[code] if code >= 0 else ""
+        score = float(index.score[pos])
+        candidates.append(
+            SpatialCandidate(
+                activity_node_id=index.ids[pos],
+                name=index.names[pos] if index.names is not None else "",
+                latitude=float(index.lat[pos]),
+                longitude=float(index.lon[pos]),
+                category=cat,
+                price_level=None,
+                convergence_score=None if np.isnan(score) else score,
+                description_short=None,
+                primary_image_url=None,
+                neighborhood=None,
+                duration_minutes=_estimate_duration(cat),
+            )
+        )
+    return candidates
+
+
+async def find_nodes_along_paths(
+    *,
+    db: Any,
+    paths: Sequence[TransitPath],
+    exclude_node_ids: Iterable[str] | None = None,
+) -> list[list[SpatialCandidate]]:
+    """
+    Candidates for many transit segments in a single spatial query.
+
+    Args:
+        db: asyncpg connection / pool.
+        paths: Segments to search; each carries its own exclusions.
+        exclude_node_ids: Node IDs excluded from every segment.
+
+    Returns:
+        One list per path (same order), each up to MAX_CANDIDATES
+        SpatialCandidate objects ranked by convergenceScore. A failed query
+        is logged and yields empty lists.
+    """
+    if not paths:
+        return []
+
+    shared = set(exclude_node_ids or [])
+    excluded_idx: list[int] = []
+    excluded_ids: list[str] = []
+    for idx, path in enumerate(paths, start=1):
+        for node_id in shared.union(path.exclude_node_ids):
+            excluded_idx.append(idx)
+            excluded_ids.append(node_id)
+
+    try:
+        rows = await db.fetch(
+            _NODES_ALONG_PATHS_SQL,
+            [p.origin_lon for p in paths],
+            [p.origin_lat for p in paths],
+            [p.destination_lon for p in paths],
+            [p.destination_lat for p in paths],
+            TRANSIT_BUFFER_METERS,
+            excluded_idx,
+            excluded_ids,
+            MIN_CONVERGENCE_SCORE,
+            MAX_CANDIDATES,
+        )
+    except Exception:
+        logger.exception("Spatial query failed for %d transit paths", len(paths))
+        return [[] for _ in paths]
+
+    by_path: dict[int, list[SpatialCandidate]] = defaultdict(list)
+    for row in rows:
+        by_path[row["idx"]].append(_candidate(row))
+    results = [by_path.get(idx, []) for idx in range(1, len(paths) + 1)]
+
+    logger.info(
+        "Spatial query: %d paths buffer=%dm found=%d",
+        len(paths),
+        TRANSIT_BUFFER_METERS,
+        sum(len(r) for r in results),
+    )
+    return results
+
+
 async def find_nodes_along_path(
     *,
     db: Any,
@@ -93,8 +344,8 @@ async def find_nodes_along_path(
     Find approved ActivityNodes within TRANSIT_BUFFER_METERS of the transit
     path from (origin_lat, origin_lon) to (destination_lat, destination_lon).
 
-    Uses the GIST index on (ST_MakePoint(longitude, latitude)) for fast
-    bounding box pre-filtering via ST_DWithin before the exact buffer check.
+    Single-segment form of find_nodes_along_paths(); nodes already scheduled
+    on (trip_id, day_number) are excluded.
 
     Args:
         db: asyncpg connection / pool.
@@ -107,122 +358,15 @@ async def find_nodes_along_path(
     Returns:
         Up to MAX_CANDIDATES SpatialCandidate objects ranked by convergenceScore.
     """
-    excluded = list(exclude_node_ids or [])
-
-    # Fetch nodes already scheduled today to avoid duplication
-    already_scheduled = await db.fetch(
-        """
-        SELECT "activityNodeId"
-        FROM itinerary_slots
-        WHERE "tripId" = $1
-          AND "dayNumber" = $2
-          AND "activityNodeId" IS NOT NULL
-          AND status NOT IN ('skipped', 'completed')
-        """,
-        trip_id,
-        day_number,
+    scheduled = await fetch_scheduled_node_ids(db=db, trip_id=trip_id, day_numbers=[day_number])
+    path = TransitPath(
+        origin_lat=origin_lat,
+        origin_lon=origin_lon,
+        destination_lat=destination_lat,
+        destination_lon=destination_lon,
+        exclude_node_ids=tuple(exclude_node_ids or ()),
     )
-    excluded.extend(row["activityNodeId"] for row in already_scheduled if row["activityNodeId"])
-
-    # Deduplicate exclusion list
-    excluded_set = list(set(excluded))
-
-    try:
-        rows = await db.fetch(
-            """
-            WITH transit_path AS (
-                SELECT ST_Transform(
-                    ST_SetSRID(
-                        ST_MakeLine(
-                            ST_MakePoint($1, $2),
-                            ST_MakePoint($3, $4)
-                        ),
-                        4326
-                    ),
-                    3857
-                ) AS path_3857
-            ),
-            buffered AS (
-                SELECT ST_Transform(
-                    ST_Buffer(path_3857, $5),
-                    4326
-                ) AS zone
-                FROM transit_path
-            )
-            SELECT
-                an.id,
-                an.name,
-                an.latitude,
-                an.longitude,
-                an.category,
-                an."priceLevel",
-                an."convergenceScore",
-                an."descriptionShort",
-                an."primaryImageUrl",
-                an.neighborhood
-            FROM activity_nodes an, buffered
-            WHERE
-                an.status = 'approved'
-                AND an."isCanonical" = true
-                AND (an."convergenceScore" IS NULL OR an."convergenceScore" >= $6)
-                AND (
-                    $7::text[] IS NULL
-                    OR array_length($7::text[], 1) = 0
-                    OR an.id != ALL($7::text[])
-                )
-                AND ST_Within(
-                    ST_SetSRID(ST_MakePoint(an.longitude, an.latitude), 4326),
-                    buffered.zone
-                )
-            ORDER BY an."convergenceScore" DESC NULLS LAST
-            LIMIT $8
-            """,
-            origin_lon,
-            origin_lat,
-            destination_lon,
-            destination_lat,
-            TRANSIT_BUFFER_METERS,
-            MIN_CONVERGENCE_SCORE,
-            excluded_set if excluded_set else None,
-            MAX_CANDIDATES,
-        )
-    except Exception:
-        logger.exception(
-            "Spatial query failed for path (%f,%f)->(%f,%f)",
-            origin_lat,
-            origin_lon,
-            destination_lat,
-            destination_lon,
-        )
-        return []
-
-    candidates: list[SpatialCandidate] = []
-    for row in rows:
-        cat = row["category"]
-        candidates.append(
-            SpatialCandidate(
-                activity_node_id=row["id"],
-                name=row["name"],
-                latitude=row["latitude"],
-                longitude=row["longitude"],
-                category=cat,
-                price_level=row["priceLevel"],
-                convergence_score=row["convergenceScore"],
-                description_short=row["descriptionShort"],
-                primary_image_url=row["primaryImageUrl"],
-                neighborhood=row["neighborhood"],
-                duration_minutes=_estimate_duration(cat),
-            )
-        )
-
-    logger.info(
-        "Spatial query: path (%f,%f)->(%f,%f) buffer=%dm found=%d",
-        origin_lat,
-        origin_lon,
-        destination_lat,
-        destination_lon,
-        TRANSIT_BUFFER_METERS,
-        len(candidates),
+    results = await find_nodes_along_paths(
+        db=db, paths=[path], exclude_node_ids=scheduled[day_number]
     )
-
-    return candidates
+    return results[0]
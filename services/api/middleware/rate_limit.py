@@ -1,19 +1,49 @@
 """
-Redis-backed sliding window rate limiter.
+Redis-backed rate limiter with an in-process pre-limiter.
 
 Tiers:
   - Anonymous: 10 req/min
   - Authenticated: 60 req/min (general)
   - LLM-triggering endpoints: 5 req/min per user
   - /events/batch: 60 req/min per user
+
+Each tier maps to a RateLimitBackend (pluggable via RateLimitMiddleware's
+``backends`` argument):
+
+  WindowCounterBackend (default)
+      Sliding-window counter: one integer key per client+tier+window,
+      ``INCR`` + ``PEXPIRE`` on the current window and ``GET`` on the previous
+      one in a single round trip. The previous window's count is weighted by
+      how much of it still overlaps the sliding minute. O(1) memory per client.
+
+  SlidingLogBackend
+      The original exact sliding log: one sorted-set member per request
+      (ZREMRANGEBYSCORE, ZCARD, ZADD, EXPIRE). Memory grows with the limit.
+
+A GCRA token bucket in Redis would need an atomic read-compute-write, i.e.
+a Lua script; we keep Redis to plain Redis 6 commands (Memorystore policy,
+see realtime/trip_cache.py), so GCRA runs in-process instead:
+
+  LocalPreLimiter
+      Per-process GCRA state plus a cache of Redis denials. A process only
+      sees part of the traffic, so when its local bucket is already empty the
+      global one certainly is — the request is rejected without touching
+      Redis. Clients Redis has just denied are rejected locally until their
+      Retry-After passes. Bounded LRU, so memory stays flat.
 """
 
+from __future__ import annotations
+
+import math
 import time
-from typing import Callable
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Protocol
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from services.api.config import settings
 
@@ -21,6 +51,12 @@ from services.api.config import settings
 LLM_PREFIXES = ("/ml/", "/llm/", "/generate/")
 EVENTS_BATCH_PATH = "/events/batch"
 
+# All tiers limit over a one-minute window
+WINDOW_SECONDS = 60.0
+
+# Bound on clients tracked by each process's pre-limiter
+_LOCAL_MAX_ENTRIES = 50_000
+
 
 def _get_rate_limit(path: str, is_authenticated: bool) -> tuple[int, str]:
     """Return (limit_per_min, tier_name) for the given path and auth state."""
@@ -48,52 +84,283 @@ def _get_client_key(request: Request) -> tuple[str, bool]:
     return f"ip:{client_ip}", False
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Sliding window rate limiter backed by Redis sorted sets."""
+# ---------------------------------------------------------------------------
+# Decisions + backends
+# ---------------------------------------------------------------------------
 
-    def __init__(self, app, redis_client=None):
-        super().__init__(app)
-        self.redis = redis_client
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        # Skip rate limiting for health checks
-        if request.url.path == "/health":
-            return await call_next(request)
+@dataclass(frozen=True)
+class RateDecision:
+    """Outcome of one rate-limit check."""
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_at: float
+    """Unix time at which the current window ends."""
+    retry_after: float = 0.0
+    """Seconds until the client may retry (denials only)."""
+
+    def headers(self) -> dict[str, str]:
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(int(self.reset_at)),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(max(1, math.ceil(self.retry_after)))
+        return headers
+
+
+class RateLimitBackend(Protocol):
+    """Counts one request for ``key`` in Redis and decides whether to allow it."""
+
+    async def hit(
+        self, redis: Any, key: str, limit: int, period: float, now: float
+    ) -> RateDecision: ...
 
-        if self.redis is None:
-            return await call_next(request)
 
-        client_key, is_authenticated = _get_client_key(request)
-        limit, tier = _get_rate_limit(request.url.path, is_authenticated)
-        window_key = f"ratelimit:{tier}:{client_key}"
+class SlidingLogBackend:
+    """Exact sliding log backed by a Redis sorted set (one member per request)."""
 
-        now = time.time()
-        window_start = now - 60.0  # 1-minute sliding window
+    async def hit(
+        self, redis: Any, key: str, limit: int, period: float, now: float
+    ) -> RateDecision:
+        window_start = now - period
 
-        pipe = self.redis.pipeline()
+        pipe = redis.pipeline()
         # Remove expired entries
-        pipe.zremrangebyscore(window_key, 0, window_start)
+        pipe.zremrangebyscore(key, 0, window_start)
         # Count current entries
-        pipe.zcard(window_key)
+        pipe.zcard(key)
         # Add current request
-        pipe.zadd(window_key, {f"{now}:{id(request)}": now})
+        pipe.zadd(key, {f"{now}:{id(pipe)}": now})
         # Set TTL on the key
-        pipe.expire(window_key, 120)
+        pipe.expire(key, int(period * 2))
         results = await pipe.execute()
 
-        current_count = results[1]
+        current_count = int(results[1] or 0)
+        return RateDecision(
+            allowed=current_count < limit,
+            limit=limit,
+            remaining=max(0, limit - current_count - 1),
+            reset_at=now + period,
+            retry_after=period,
+        )
+
+
+class WindowCounterBackend:
+    """
+    Sliding-window counter over two fixed-window integer keys.
+
+    estimate = previous_count * (1 - elapsed / period) + current_count
+
+    Like the sliding log, denied requests are counted too, so a client
+    hammering past its limit stays limited.
+    """
+
+    async def hit(
+        self, redis: Any, key: str, limit: int, period: float, now: float
+    ) -> RateDecision:
+        window = int(now // period)
+        elapsed = now - window * period
+        current_key = f"{key}:{window}"
+
+        pipe = redis.pipeline(transaction=False)
+        pipe.incr(current_key)
+        pipe.pexpire(current_key, int(period * 2000))
+        pipe.get(f"{key}:{window - 1}")
+        results = await pipe.execute()
+
+        current = int(results[0] or 0)
+        previous = int(results[2] or 0)
+        weight = 1.0 - elapsed / period
+        estimate = previous * weight + current
+        window_end = (window + 1) * period
+
+        allowed = estimate <= limit
+        retry_after = 0.0
+        if not allowed:
+            if current >= limit or previous == 0:
+                retry_after = window_end - now
+            else:
+                # When the previous window's share has decayed enough
+                # that one more request fits.
+                target = period * (1.0 - (limit - current) / previous)
+                retry_after = max(0.0, target - elapsed)
+
+        return RateDecision(
+            allowed=allowed,
+            limit=limit,
+            remaining=max(0, int(limit - estimate)),
+            reset_at=window_end,
+            retry_after=retry_after,
+        )
+
+
+DEFAULT_BACKENDS: dict[str, RateLimitBackend] = {
+    "anon": WindowCounterBackend(),
+    "auth": WindowCounterBackend(),
+    "llm": WindowCounterBackend(),
+    "events": WindowCounterBackend(),
+}
+
+
+# ---------------------------------------------------------------------------
+# In-process pre-limiter
+# ---------------------------------------------------------------------------
 
-        # Build rate limit headers
-        headers = {
-            "X-RateLimit-Limit": str(limit),
-            "X-RateLimit-Remaining": str(max(0, limit - current_count - 1)),
-            "X-RateLimit-Reset": str(int(now + 60)),
-        }
 
-        if current_count >= limit:
-            retry_after = int(60 - (now - window_start))
-            headers["Retry-After"] = str(max(1, retry_after))
-            return JSONResponse(
+class LocalPreLimiter:
+    """
+    Approximate per-process limiter consulted before Redis.
+
+    check() returns a denial when this process alone has already used the
+    client's whole budget (GCRA over the same limit/period) or when Redis
+    denied the client and its Retry-After has not passed; otherwise None,
+    meaning "ask Redis".
+    """
+
+    def __init__(self, max_entries: int = _LOCAL_MAX_ENTRIES) -> None:
+        self._max_entries = max_entries
+        # key -> [theoretical arrival time, blocked_until]
+        self._state: OrderedDict[str, list[float]] = OrderedDict()
+        self.local_denials = 0
+
+    def __len__(self) -> int:
+        return len(self._state)
+
+    def _entry(self, key: str, now: float) -> list[float]:
+        entry = self._state.get(key)
+        if entry is None:
+            entry = [now, 0.0]
+            self._state[key] = entry
+            if len(self._state) > self._max_entries:
+                self._state.popitem(last=False)
+        else:
+            self._state.move_to_end(key)
+        return entry
+
+    def check(self, key: str, limit: int, period: float, now: float) -> RateDecision | None:
+        entry = self._entry(key, now)
+        tat, blocked_until = entry
+
+        if blocked_until > now:
+            self.local_denials += 1
+            return RateDecision(
+                allowed=False,
+                limit=limit,
+                remaining=0,
+                reset_at=blocked_until,
+                retry_after=blocked_until - now,
+            )
+
+        interval = period / limit
+        new_tat = max(tat, now) + interval
+        if new_tat - now > period:
+            self.local_denials += 1
+            return RateDecision(
+                allowed=False,
+                limit=limit,
+                remaining=0,
+                reset_at=now + period,
+                retry_after=new_tat - period - now,
+            )
+        entry[0] = new_tat
+        return None
+
+    def record_denial(self, key: str, decision: RateDecision, now: float) -> None:
+        """Remember a Redis denial so retries inside Retry-After stay local."""
+        entry = self._entry(key, now)
+        entry[1] = now + decision.retry_after
+
+    def clear(self) -> None:
+        self._state.clear()
+
+
+# ---------------------------------------------------------------------------
+# Engine
+# ---------------------------------------------------------------------------
+
+
+class RateLimiter:
+    """Local pre-check, then the tier's Redis backend."""
+
+    def __init__(
+        self,
+        backends: dict[str, RateLimitBackend] | None = None,
+        pre_limiter: LocalPreLimiter | None = None,
+    ) -> None:
+        self.backends = {**DEFAULT_BACKENDS, **(backends or {})}
+        self.pre_limiter = pre_limiter
+
+    async def check(
+        self,
+        redis: Any,
+        tier: str,
+        client_key: str,
+        limit: int,
+        now: float,
+        period: float = WINDOW_SECONDS,
+    ) -> RateDecision:
+        key = f"ratelimit:{tier}:{client_key}"
+        if self.pre_limiter is not None:
+            decision = self.pre_limiter.check(key, limit, period, now)
+            if decision is not None:
+                return decision
+
+        decision = await self.backends[tier].hit(redis, key, limit, period, now)
+        if not decision.allowed and self.pre_limiter is not None:
+            self.pre_limiter.record_denial(key, decision, now)
+        return decision
+
+
+# ---------------------------------------------------------------------------
+# Middleware
+# ---------------------------------------------------------------------------
+
+
+class RateLimitMiddleware:
+    """
+    Applies RateLimiter per request; /health and redis=None bypass it.
+
+    Pure ASGI: allowed responses stream through untouched apart from the
+    X-RateLimit-* headers added to ``http.response.start``.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        redis_client=None,
+        *,
+        backends: dict[str, RateLimitBackend] | None = None,
+        pre_limiter: LocalPreLimiter | None = None,
+    ):
+        self.app = app
+        self.redis = redis_client
+        self.limiter = RateLimiter(
+            backends,
+            pre_limiter if pre_limiter is not None else LocalPreLimiter(),
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Skip rate limiting for non-HTTP traffic and health checks
+        if scope["type"] != "http" or scope["path"] == "/health":
+            await self.app(scope, receive, send)
+            return
+
+        if self.redis is None:
+            await self.app(scope, receive, send)
+            return
+
+        client_key, is_authenticated = _get_client_key(Request(scope))
+        limit, tier = _get_rate_limit(scope["path"], is_authenticated)
+        decision = await self.limiter.check(
+            self.redis, tier, client_key, limit, time.time()
+        )
+
+        headers = decision.headers()
+        if not decision.allowed:
+            response = JSONResponse(
                 status_code=429,
                 content={
                     "success": False,
@@ -101,12 +368,18 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                         "code": "RATE_LIMITED",
                         "message": f"Rate limit exceeded. Max {limit} requests per minute for {tier} tier.",
                     },
-                    "requestId": request.state.__dict__.get("request_id", ""),
+                    "requestId": scope.get("state", {}).get("request_id", ""),
                 },
                 headers=headers,
             )
+            await response(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                response_headers = MutableHeaders(scope=message)
+                for key, value in headers.items():
+                    response_headers[key] = value
+            await send(message)
 
-        response = await call_next(request)
-        for key, value in headers.items():
-            response.headers[key] = value
-        return response
+        await self.app(scope, receive, send_with_headers)
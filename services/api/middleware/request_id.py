@@ -0,0 +1,63 @@
+"""
+Request envelope middleware: request IDs + events batch body limit.
+
+Pure ASGI (no BaseHTTPMiddleware), so responses — including streamed ones
+such as calendar.ics — pass straight through without an extra task or
+memory stream per request.
+
+  - Reads X-Request-ID from the request or mints a uuid4, stores it on
+    ``request.state.request_id`` and echoes it on the response.
+  - Rejects POST /events/batch with 413 when Content-Length exceeds
+    ``settings.events_request_max_bytes``, before the body is read.
+"""
+
+from __future__ import annotations
+
+import uuid
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from services.api.config import settings
+
+EVENTS_BATCH_PATH = "/events/batch"
+
+
+class RequestEnvelopeMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        request_id = headers.get("x-request-id", str(uuid.uuid4()))
+        scope.setdefault("state", {})["request_id"] = request_id
+
+        # Enforce request body size limit for events batch
+        if scope["path"] == EVENTS_BATCH_PATH and scope["method"] == "POST":
+            content_length = headers.get("content-length")
+            if content_length and int(content_length) > settings.events_request_max_bytes:
+                response = JSONResponse(
+                    status_code=413,
+                    content={
+                        "success": False,
+                        "error": {
+                            "code": "PAYLOAD_TOO_LARGE",
+                            "message": f"Request body exceeds {settings.events_request_max_bytes} bytes.",
+                        },
+                        "requestId": request_id,
+                    },
+                )
+                await response(scope, receive, send)
+                return
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["X-Request-ID"] = request_id
+            await send(message)
+
+        await self.app(scope, receive, send_with_request_id)
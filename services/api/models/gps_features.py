@@ -11,6 +11,15 @@ Full feature extraction logic is built but not-yet-active.
 Raw GPS pings are never persisted. Only StayPoints. StayPoints retained
 90 days post-trip.
 
+Pings are processed as a structured array (PING_DTYPE: lat, lng, ts in
+epoch seconds). Stay-point clustering keeps its sequential rule -- a ping
+joins the current cluster if it is within stay_radius_meters of the
+cluster's running centroid -- but evaluates it a window at a time: running
+centroids come from cumulative sums, distances are one vectorized haversine,
+and the first ping that breaks away ends the cluster. Stay-point centroids
+are np.add.reduceat over the cluster bounds, and all stays are matched
+against all slots with one broadcasted distance / overlap test.
+
 CPU-only: pure numpy / math, no PyTorch/TensorFlow.
 """
 
@@ -20,7 +29,8 @@ import logging
 import math
 import os
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timezone
+from typing import Sequence
 
 import numpy as np
 
@@ -29,6 +39,12 @@ logger = logging.getLogger(__name__)
 # Earth radius in meters
 _EARTH_RADIUS_M = 6_371_000
 
+# Structured ping array: decimal degrees and epoch seconds
+PING_DTYPE = np.dtype([("lat", np.float64), ("lng", np.float64), ("ts", np.float64)])
+
+# First clustering window; later windows follow the previous cluster length
+_MIN_WINDOW = 64
+
 
 @dataclass(frozen=True)
 class GPSConfig:
@@ -79,6 +95,73 @@ def haversine_distance(lat1: float, lng1: float, lat2: float, lng2: float) -> fl
     return _EARTH_RADIUS_M * c
 
 
+def haversine_distances(lat1, lng1, lat2, lng2) -> np.ndarray:
+    """Vectorized haversine_distance(); arguments broadcast like numpy arrays."""
+    lat1, lng1, lat2, lng2 = (
+        np.radians(np.asarray(v, dtype=np.float64)) for v in (lat1, lng1, lat2, lng2)
+    )
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    )
+    a = np.clip(a, 0.0, 1.0)
+    return _EARTH_RADIUS_M * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def _epoch_seconds(ts: datetime) -> float:
+    """Epoch seconds; naive datetimes are taken as UTC."""
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.timestamp()
+
+
+def pings_to_array(gps_pings: Sequence[dict]) -> np.ndarray:
+    """Convert ping dicts (lat, lng, timestamp) to a PING_DTYPE array."""
+    pings = np.empty(len(gps_pings), dtype=PING_DTYPE)
+    pings["lat"] = [p["lat"] for p in gps_pings]
+    pings["lng"] = [p["lng"] for p in gps_pings]
+    pings["ts"] = [_epoch_seconds(p["timestamp"]) for p in gps_pings]
+    return pings
+
+
+def cluster_bounds(lat: np.ndarray, lng: np.ndarray, radius_m: float) -> np.ndarray:
+    """Start index of every sequential cluster (see extract_stay_points).
+
+    A ping j joins the cluster started at s if it lies within ``radius_m``
+    of the mean of pings s..j-1. For a cluster start, the running centroids
+    of a whole window of candidates come from one cumulative sum, so the
+    loop runs once per window rather than once per ping. Coordinates are
+    offset by the first ping to keep the sums well conditioned.
+    """
+    n = len(lat)
+    if n == 0:
+        return np.empty(0, dtype=np.int64)
+    dlat = lat - lat[0]
+    dlng = lng - lng[0]
+
+    starts = [0]
+    s = 0
+    window = _MIN_WINDOW
+    while s < n - 1:
+        end = min(s + 1 + window, n)
+        # Centroid of pings s..j-1 for every candidate j in (s, end)
+        counts = np.arange(1, end - s)
+        c_lat = lat[0] + np.cumsum(dlat[s:end - 1]) / counts
+        c_lng = lng[0] + np.cumsum(dlng[s:end - 1]) / counts
+        dist = haversine_distances(c_lat, c_lng, lat[s + 1:end], lng[s + 1:end])
+        outside = np.flatnonzero(dist > radius_m)
+        if outside.size:
+            s = s + 1 + int(outside[0])
+            starts.append(s)
+            window = max(_MIN_WINDOW, 2 * int(outside[0]))
+        elif end == n:
+            break
+        else:
+            # Whole window stayed in: grow it and re-test from the same start
+            window *= 2
+    return np.asarray(starts, dtype=np.int64)
+
+
 class GPSFeatureExtractor:
     """Extract stay points from GPS pings and upgrade completion signals.
 
@@ -109,58 +192,48 @@ class GPSFeatureExtractor:
         """
         if not gps_pings:
             return []
+        timestamps = [p["timestamp"] for p in gps_pings]
+        return self._stay_points(
+            pings_to_array(gps_pings),
+            lambda i: timestamps[i],
+        )
 
-        stay_points: list[StayPoint] = []
-        cluster: list[dict] = [gps_pings[0]]
-
-        for ping in gps_pings[1:]:
-            # Check distance from cluster centroid
-            centroid_lat = np.mean([p["lat"] for p in cluster])
-            centroid_lng = np.mean([p["lng"] for p in cluster])
-
-            dist = haversine_distance(
-                centroid_lat, centroid_lng, ping["lat"], ping["lng"]
-            )
-
-            if dist <= self.config.stay_radius_meters:
-                cluster.append(ping)
-            else:
-                # Finalize current cluster if it qualifies
-                sp = self._finalize_cluster(cluster)
-                if sp is not None:
-                    stay_points.append(sp)
-                # Start new cluster
-                cluster = [ping]
-
-        # Finalize last cluster
-        sp = self._finalize_cluster(cluster)
-        if sp is not None:
-            stay_points.append(sp)
-
-        return stay_points
-
-    def _finalize_cluster(self, cluster: list[dict]) -> StayPoint | None:
-        """Convert a cluster of pings to a StayPoint if duration qualifies."""
-        if not cluster:
-            return None
+    def extract_stay_points_array(self, pings: np.ndarray) -> list[StayPoint]:
+        """extract_stay_points() for a chronologically ordered PING_DTYPE array.
 
-        arrival = cluster[0]["timestamp"]
-        departure = cluster[-1]["timestamp"]
-        duration_minutes = (departure - arrival).total_seconds() / 60.0
+        Arrival and departure times are UTC datetimes.
+        """
+        if len(pings) == 0:
+            return []
+        return self._stay_points(
+            pings,
+            lambda i: datetime.fromtimestamp(float(pings["ts"][i]), tz=timezone.utc),
+        )
 
-        if duration_minutes < self.config.stay_duration_minutes:
-            return None
+    def _stay_points(self, pings: np.ndarray, timestamp_at) -> list[StayPoint]:
+        lat = np.ascontiguousarray(pings["lat"], dtype=np.float64)
+        lng = np.ascontiguousarray(pings["lng"], dtype=np.float64)
+        ts = np.ascontiguousarray(pings["ts"], dtype=np.float64)
 
-        lat = float(np.mean([p["lat"] for p in cluster]))
-        lng = float(np.mean([p["lng"] for p in cluster]))
+        starts = cluster_bounds(lat, lng, self.config.stay_radius_meters)
+        ends = np.append(starts[1:], len(pings)) - 1
+        duration_minutes = (ts[ends] - ts[starts]) / 60.0
+        counts = ends - starts + 1
+        mean_lat = np.add.reduceat(lat, starts) / counts
+        mean_lng = np.add.reduceat(lng, starts) / counts
 
-        return StayPoint(
-            lat=lat,
-            lng=lng,
-            arrival_time=arrival,
-            departure_time=departure,
-            duration_minutes=duration_minutes,
-        )
+        stay_points: list[StayPoint] = []
+        for k in np.flatnonzero(duration_minutes >= self.config.stay_duration_minutes):
+            arrival = timestamp_at(int(starts[k]))
+            departure = timestamp_at(int(ends[k]))
+            stay_points.append(StayPoint(
+                lat=float(mean_lat[k]),
+                lng=float(mean_lng[k]),
+                arrival_time=arrival,
+                departure_time=departure,
+                duration_minutes=(departure - arrival).total_seconds() / 60.0,
+            ))
+        return stay_points
 
     def match_stay_to_slot(
         self,
@@ -195,6 +268,35 @@ class GPSFeatureExtractor:
         earliest_end = min(stay_point.departure_time, slot_end)
         return latest_start < earliest_end
 
+    def match_stays_to_slots(
+        self,
+        stay_points: Sequence[StayPoint],
+        slot_lats: Sequence[float],
+        slot_lngs: Sequence[float],
+        slot_starts: Sequence[datetime],
+        slot_ends: Sequence[datetime],
+    ) -> np.ndarray:
+        """match_stay_to_slot() for every (stay, slot) pair at once.
+
+        Returns:
+            Boolean array of shape (len(stay_points), len(slots)).
+        """
+        if not stay_points or not len(slot_lats):
+            return np.zeros((len(stay_points), len(slot_lats)), dtype=bool)
+
+        sp_lat = np.array([sp.lat for sp in stay_points])[:, None]
+        sp_lng = np.array([sp.lng for sp in stay_points])[:, None]
+        sp_arrival = np.array([_epoch_seconds(sp.arrival_time) for sp in stay_points])[:, None]
+        sp_departure = np.array([_epoch_seconds(sp.departure_time) for sp in stay_points])[:, None]
+        starts = np.array([_epoch_seconds(t) for t in slot_starts])[None, :]
+        ends = np.array([_epoch_seconds(t) for t in slot_ends])[None, :]
+
+        near = haversine_distances(
+            sp_lat, sp_lng, np.asarray(slot_lats)[None, :], np.asarray(slot_lngs)[None, :]
+        ) < self.config.stay_radius_meters
+        overlap = np.maximum(sp_arrival, starts) < np.minimum(sp_departure, ends)
+        return near & overlap
+
     def upgrade_completion_signals(
         self,
         stay_points: list[StayPoint],
@@ -217,32 +319,36 @@ class GPSFeatureExtractor:
         if not self.is_active():
             return []
 
+        candidates = [slot for slot in slots if slot.get("status") == "likely_attended"]
+        if not candidates or not stay_points:
+            return []
+
+        matches = self.match_stays_to_slots(
+            stay_points,
+            [slot["lat"] for slot in candidates],
+            [slot["lng"] for slot in candidates],
+            [slot["start_time"] for slot in candidates],
+            [slot["end_time"] for slot in candidates],
+        )
+        matched = matches.any(axis=0)
+        # One match per slot is sufficient: the first stay point that matches
+        first = matches.argmax(axis=0)
+
         upgrades: list[dict] = []
-        for slot in slots:
-            if slot.get("status") != "likely_attended":
-                continue
-
-            for sp in stay_points:
-                if self.match_stay_to_slot(
-                    sp,
-                    slot["lat"],
-                    slot["lng"],
-                    slot["start_time"],
-                    slot["end_time"],
-                ):
-                    upgrades.append({
-                        "slot_id": slot["id"],
-                        "signal_type": "confirmed_attended",
-                        "signal_value": 1.0,
-                        "signal_weight": 1.0,
-                        "stay_point": {
-                            "lat": sp.lat,
-                            "lng": sp.lng,
-                            "arrival_time": sp.arrival_time.isoformat(),
-                            "departure_time": sp.departure_time.isoformat(),
-                            "duration_minutes": sp.duration_minutes,
-                        },
-                    })
-                    break  # One match per slot is sufficient
+        for j in np.flatnonzero(matched):
+            sp = stay_points[int(first[j])]
+            upgrades.append({
+                "slot_id": candidates[j]["id"],
+                "signal_type": "confirmed_attended",
+                "signal_value": 1.0,
+                "signal_weight": 1.0,
+                "stay_point": {
+                    "lat": sp.lat,
+                    "lng": sp.lng,
+                    "arrival_time": sp.arrival_time.isoformat(),
+                    "departure_time": sp.departure_time.isoformat(),
+                    "duration_minutes": sp.duration_minutes,
+                },
+            })
 
         return upgrades
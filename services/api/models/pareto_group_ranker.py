@@ -12,6 +12,13 @@ For each candidate activity, compute:
 Then find the Pareto-optimal set: candidates where no other candidate is strictly
 better on all three dimensions.
 
+All three objectives are computed at once from a (candidates x members) score
+matrix plus a presence mask (a member may not have ranked every candidate).
+The front is a sort-based skyline: after a lexicographic descending sort, a
+candidate can only be dominated by one that precedes it, so each candidate is
+tested against the front found so far (a block of candidates at a time)
+rather than against every other one.
+
 CPU-only: pure numpy, no PyTorch/TensorFlow.
 """
 
@@ -25,6 +32,21 @@ import numpy as np
 logger = logging.getLogger(__name__)
 
 
+# Rows per skyline step in ParetoGroupRanker.pareto_mask
+_SKYLINE_BLOCK = 256
+
+
+def _dominated_by(points: np.ndarray, others: np.ndarray) -> np.ndarray:
+    """(len(points), len(others)): others[j] >= points[i] everywhere and differs somewhere."""
+    ge = np.ones((len(points), len(others)), dtype=bool)
+    ne = np.zeros_like(ge)
+    for k in range(points.shape[1]):
+        p, o = points[:, k, None], others[None, :, k]
+        ge &= o >= p
+        ne |= o != p
+    return ge & ne
+
+
 @dataclass(frozen=True)
 class ParetoGroupConfig:
     """Configuration for Pareto group ranking."""
@@ -137,11 +159,109 @@ class ParetoGroupRanker:
         Weights: relevance = 1 - fairness_weight - novelty_weight,
                  fairness = fairness_weight, novelty = novelty_weight.
         """
+        return float(np.dot(obj_vector, self._weights()))
+
+    def member_score_matrix(
+        self,
+        candidates: list[str],
+        member_ids: list[str],
+        member_rankings: dict[str, list[tuple[str, float]]],
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """(candidates x members) scores and presence mask from per-member rankings.
+
+        A member's later ranking of the same candidate wins, as in
+        compute_member_scores(). Candidates a member did not rank are absent.
+        """
+        row = {cid: i for i, cid in enumerate(candidates)}
+        scores = np.zeros((len(candidates), len(member_ids)), dtype=np.float64)
+        present = np.zeros_like(scores, dtype=bool)
+        for j, member_id in enumerate(member_ids):
+            for cid, score in member_rankings.get(member_id, ()):
+                i = row.get(cid)
+                if i is not None:
+                    scores[i, j] = score
+                    present[i, j] = True
+        return scores, present
+
+    def objective_matrix(
+        self,
+        candidates: list[str],
+        scores: np.ndarray,
+        present: np.ndarray,
+        member_histories: dict[str, set[str]],
+    ) -> np.ndarray:
+        """(n, 3) objectives [avg_relevance, fairness, novelty] for every candidate.
+
+        Row-wise equivalent of _compute_objective_vector() over the present
+        entries of ``scores``.
+        """
+        n = len(candidates)
+        counts = present.sum(axis=1)
+        masked = np.where(present, scores, 0.0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(counts > 0, masked.sum(axis=1) / counts, 0.0)
+            var = np.where(present, (scores - mean[:, None]) ** 2, 0.0).sum(axis=1) / counts
+            cv = np.minimum(np.sqrt(var) / np.abs(mean), 1.0)
+        fairness = np.where((counts <= 1) | (mean == 0.0), 1.0, 1.0 - cv)
+
+        if member_histories:
+            row = {cid: i for i, cid in enumerate(candidates)}
+            seen = np.zeros(n, dtype=np.int64)
+            for history in member_histories.values():
+                hits = [row[cid] for cid in history if cid in row]
+                seen[hits] += 1
+            n_members = len(member_histories)
+            novelty = (n_members - seen) / n_members
+        else:
+            novelty = np.ones(n)
+
+        return np.column_stack([mean, fairness, novelty]).astype(np.float64)
+
+    def _weights(self) -> np.ndarray:
         fw = self.config.fairness_weight
         nw = self.config.novelty_weight
-        rw = 1.0 - fw - nw
-        weights = np.array([rw, fw, nw], dtype=np.float64)
-        return float(np.dot(obj_vector, weights))
+        return np.array([1.0 - fw - nw, fw, nw], dtype=np.float64)
+
+    @staticmethod
+    def pareto_mask(objectives: np.ndarray, block: int = _SKYLINE_BLOCK) -> np.ndarray:
+        """Boolean mask of non-dominated rows (maximizing every column).
+
+        Sort rows lexicographically descending: a dominating row (>= on all
+        columns, != on one) is then strictly earlier. Rows are taken a block
+        at a time and tested against the front so far and against earlier
+        rows of the same block (dominance is transitive, so a dominated
+        dominator still counts). Identical rows do not dominate each other.
+        """
+        n = len(objectives)
+        keep = np.zeros(n, dtype=bool)
+        if n == 0:
+            return keep
+        order = np.lexsort(-objectives.T[::-1])
+        points = objectives[order]
+        front = points[:0]
+        for start in range(0, n, block):
+            rows = np.arange(start, min(start + block, n))
+            # Front first (usually small), then earlier rows of the block
+            rows = rows[~_dominated_by(points[rows], front).any(axis=1)]
+            within = _dominated_by(points[rows], points[rows])
+            rows = rows[~np.tril(within, k=-1).any(axis=1)]
+            keep[order[rows]] = True
+            front = np.concatenate([front, points[rows]])
+        return keep
+
+    def _front(
+        self,
+        candidates: list[str],
+        scores: np.ndarray,
+        present: np.ndarray,
+        member_histories: dict[str, set[str]],
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Front indices sorted by weighted aggregate (descending, stable) and their aggregates."""
+        objectives = self.objective_matrix(candidates, scores, present, member_histories)
+        weighted = objectives @ self._weights()
+        idx = np.flatnonzero(self.pareto_mask(objectives))
+        idx = idx[np.argsort(-weighted[idx], kind="stable")]
+        return idx, weighted[idx]
 
     def find_pareto_front(
         self,
@@ -160,38 +280,33 @@ class ParetoGroupRanker:
         if not candidates:
             return []
 
-        all_scores = self.compute_member_scores(member_rankings)
-
-        # Compute objective vectors for all candidates
-        obj_vectors: dict[str, np.ndarray] = {}
-        for cid in candidates:
-            c_scores = all_scores.get(cid, {})
-            obj_vectors[cid] = self._compute_objective_vector(
-                cid, c_scores, member_histories
-            )
-
-        # Find non-dominated set
-        non_dominated: list[str] = []
-        for cid in candidates:
-            dominated = False
-            for other_cid in candidates:
-                if cid == other_cid:
-                    continue
-                ov_other = obj_vectors[other_cid]
-                ov_self = obj_vectors[cid]
-                # other dominates self if all >= and at least one >
-                if np.all(ov_other >= ov_self) and np.any(ov_other > ov_self):
-                    dominated = True
-                    break
-            if not dominated:
-                non_dominated.append(cid)
-
-        # Sort by weighted aggregate, descending
-        non_dominated.sort(
-            key=lambda cid: self._weighted_aggregate(obj_vectors[cid]),
-            reverse=True,
+        scores, present = self.member_score_matrix(
+            candidates, list(member_rankings), member_rankings
         )
-        return non_dominated
+        idx, _ = self._front(candidates, scores, present, member_histories)
+        return [candidates[i] for i in idx]
+
+    def rank_scores(
+        self,
+        candidates: list[str],
+        scores: np.ndarray,
+        member_histories: dict[str, set[str]],
+        top_k: int = 10,
+        present: np.ndarray | None = None,
+    ) -> list[tuple[str, float]]:
+        """rank_group() for a prebuilt (candidates x members) score matrix.
+
+        ``present`` marks which entries are real scores (default: all).
+
+        Returns:
+            List of (candidate_id, weighted_score) tuples, descending.
+        """
+        if not candidates:
+            return []
+        if present is None:
+            present = np.ones(scores.shape, dtype=bool)
+        idx, weighted = self._front(candidates, scores, present, member_histories)
+        return [(candidates[i], float(w)) for i, w in zip(idx[:top_k], weighted[:top_k])]
 
     def rank_group(
         self,
@@ -202,8 +317,8 @@ class ParetoGroupRanker:
         """Full group ranking pipeline.
 
         1. Collect all candidate IDs from member rankings.
-        2. Find the Pareto front.
-        3. Rank by weighted aggregate.
+        2. Build the (candidates x members) score matrix once.
+        3. Find the Pareto front and rank it by weighted aggregate.
         4. Return top_k results.
 
         Args:
@@ -221,19 +336,9 @@ class ParetoGroupRanker:
                 all_candidates.add(cid)
 
         candidates = list(all_candidates)
-        pareto_front = self.find_pareto_front(
-            candidates, member_rankings, member_histories
+        scores, present = self.member_score_matrix(
+            candidates, list(member_rankings), member_rankings
+        )
+        return self.rank_scores(
+            candidates, scores, member_histories, top_k=top_k, present=present
         )
-
-        # Compute weighted scores for the Pareto front
-        all_scores = self.compute_member_scores(member_rankings)
-        results: list[tuple[str, float]] = []
-        for cid in pareto_front:
-            c_scores = all_scores.get(cid, {})
-            obj_vec = self._compute_objective_vector(cid, c_scores, member_histories)
-            weighted = self._weighted_aggregate(obj_vec)
-            results.append((cid, weighted))
-
-        # Already sorted by find_pareto_front, but re-sort to be safe
-        results.sort(key=lambda x: x[1], reverse=True)
-        return results[:top_k]
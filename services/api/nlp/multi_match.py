@@ -0,0 +1,225 @@
+"""
+Single-pass multi-pattern matching for pattern families.
+
+Several hot paths used to loop over a list of compiled regexes and run each
+one against the same text. This module compiles a whole family once and
+scans the text once:
+
+  KeywordMatcher — Aho–Corasick automaton over literal keywords/phrases
+                   (case-insensitive, optional word-boundary anchoring).
+                   Reports overlapping hits, so "local" and "local food"
+                   both fire on the same span, matching per-regex semantics.
+
+  RegexFamily    — one combined alternation of arbitrary regexes, each
+                   wrapped in a named group so every hit carries its pattern
+                   ID and that pattern's own capture groups. Matches are
+                   leftmost-first and non-overlapping across the family.
+
+Both return Hit objects in text order. Pure text-in / hits-out, no I/O.
+
+Used by:
+  - nlp/patterns.py (DIMENSION_MATCHER for rule-based preference extraction)
+  - scrapers/arctic_shift.py (local-indicator and venue-hint families)
+  - import_pipeline/chatgpt_import.py (PII scrubbing)
+"""
+
+from __future__ import annotations
+
+import re
+from collections import deque
+from dataclasses import dataclass
+from typing import Iterable, Mapping, Sequence
+
+
+@dataclass(frozen=True, slots=True)
+class Hit:
+    """A single pattern hit: which pattern fired, where, and its captures."""
+    pattern_id: str
+    start: int
+    end: int
+    text: str
+    groups: tuple[str | None, ...] = ()
+
+
+def _is_word(ch: str) -> bool:
+    """Mirror of re's unicode \\w for a single character."""
+    return ch.isalnum() or ch == "_"
+
+
+def _fold(text: str) -> str:
+    """Lowercase text without changing its length (offsets must stay valid)."""
+    folded = text.lower()
+    if len(folded) == len(text):
+        return folded
+    # A handful of characters (e.g. "İ") expand when lowercased — fold them
+    # one by one and leave expanding characters untouched.
+    return "".join(
+        low if len(low := ch.lower()) == 1 else ch for ch in text
+    )
+
+
+# ---------------------------------------------------------------------------
+# Aho–Corasick keyword matcher
+# ---------------------------------------------------------------------------
+
+class KeywordMatcher:
+    """
+    Aho–Corasick automaton over a table of (pattern_id, literal) entries.
+
+    Matching is case-insensitive. With word_boundary=True a hit is only
+    reported where `\\b<literal>\\b` would match, so results are identical to
+    running re.compile(rf"\\b{re.escape(literal)}\\b", re.IGNORECASE) per entry.
+    """
+
+    def __init__(
+        self,
+        entries: Iterable[tuple[str, str]],
+        *,
+        word_boundary: bool = True,
+    ) -> None:
+        self.word_boundary = word_boundary
+        # Trie as parallel arrays: state -> {char: next_state}
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        # state -> [(pattern_id, literal_length), ...] including fail-chain outputs
+        self._out: list[list[tuple[str, int]]] = [[]]
+        self.pattern_ids: list[str] = []
+
+        for pattern_id, literal in entries:
+            if not literal:
+                raise ValueError(f"Empty literal for pattern {pattern_id!r}")
+            self.pattern_ids.append(pattern_id)
+            state = 0
+            for ch in _fold(literal):
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append((pattern_id, len(literal)))
+
+        self._build_fail_links()
+
+    def _build_fail_links(self) -> None:
+        queue: deque[int] = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def __len__(self) -> int:
+        return len(self.pattern_ids)
+
+    def scan(self, text: str) -> list[Hit]:
+        """Return every hit in one pass, ordered by end offset then length."""
+        if not text:
+            return []
+
+        folded = _fold(text)
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        check_bounds = self.word_boundary
+        n = len(text)
+
+        hits: list[Hit] = []
+        state = 0
+        for i, ch in enumerate(folded):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            end = i + 1
+            for pattern_id, length in out[state]:
+                start = end - length
+                if check_bounds:
+                    before = start > 0 and _is_word(text[start - 1])
+                    after = end < n and _is_word(text[end])
+                    if before == _is_word(text[start]) or after == _is_word(text[end - 1]):
+                        continue
+                hits.append(Hit(pattern_id, start, end, text[start:end]))
+        return hits
+
+    def first_hits(self, text: str) -> dict[str, Hit]:
+        """Return the first (leftmost) hit per pattern ID — re.search semantics."""
+        first: dict[str, Hit] = {}
+        for hit in self.scan(text):
+            if hit.pattern_id not in first:
+                first[hit.pattern_id] = hit
+        return first
+
+
+# ---------------------------------------------------------------------------
+# Combined-alternation regex family
+# ---------------------------------------------------------------------------
+
+class RegexFamily:
+    """
+    A family of regexes compiled into one alternation with named groups.
+
+    Each member keeps its own flags (applied as a scoped inline flag group)
+    and its own capture groups, exposed on Hit.groups. Earlier members win
+    when several could match at the same position.
+    """
+
+    _SCOPED_FLAGS = (
+        (re.IGNORECASE, "i"),
+        (re.MULTILINE, "m"),
+        (re.DOTALL, "s"),
+        (re.VERBOSE, "x"),
+    )
+
+    def __init__(self, patterns: Sequence[tuple[str, re.Pattern[str]]]) -> None:
+        if not patterns:
+            raise ValueError("RegexFamily requires at least one pattern")
+
+        self.pattern_ids: list[str] = [pattern_id for pattern_id, _ in patterns]
+        parts: list[str] = []
+        for idx, (_, pattern) in enumerate(patterns):
+            on = "".join(c for flag, c in self._SCOPED_FLAGS if pattern.flags & flag)
+            off = "".join(c for flag, c in self._SCOPED_FLAGS if not pattern.flags & flag)
+            scope = f"(?{on}-{off}:" if off else f"(?{on}:"
+            parts.append(f"(?P<_p{idx}>{scope}{pattern.pattern}))")
+        self.regex = re.compile("|".join(parts))
+
+        # group number of each member's named wrapper + its inner group count
+        self._slots: list[tuple[int, int]] = [
+            (self.regex.groupindex[f"_p{idx}"], pattern.groups)
+            for idx, (_, pattern) in enumerate(patterns)
+        ]
+
+    def __len__(self) -> int:
+        return len(self.pattern_ids)
+
+    def _to_hit(self, match: re.Match[str]) -> Hit:
+        idx = int(match.lastgroup[2:])  # type: ignore[index]
+        group_no, n_inner = self._slots[idx]
+        groups = tuple(match.group(g) for g in range(group_no + 1, group_no + 1 + n_inner))
+        return Hit(self.pattern_ids[idx], match.start(), match.end(), match.group(0), groups)
+
+    def scan(self, text: str) -> list[Hit]:
+        """Return all non-overlapping hits in text order."""
+        return [self._to_hit(m) for m in self.regex.finditer(text)]
+
+    def search(self, text: str) -> Hit | None:
+        """Return the leftmost hit, or None."""
+        match = self.regex.search(text)
+        return self._to_hit(match) if match else None
+
+    def sub(self, text: str, replacements: Mapping[str, str]) -> str:
+        """Replace each hit with the literal replacement for its pattern ID."""
+        ids = self.pattern_ids
+
+        def _replace(match: re.Match[str]) -> str:
+            return replacements[ids[int(match.lastgroup[2:])]]  # type: ignore[index]
+
+        return self.regex.sub(_replace, text)
@@ -7,6 +7,11 @@ pattern specs. Each spec is a dict with:
   - "value":      the dimension value to assign when matched
   - "confidence": float — 0.6 keyword | 0.8 phrase | 0.9 explicit statement
   - "is_phrase":  True when the pattern is a multi-word phrase (for doc clarity)
+  - "keyword":    the literal the pattern was compiled from
+
+DIMENSION_MATCHER compiles every keyword in the registry into a single
+Aho–Corasick automaton (see nlp/multi_match.py) so the extractor scans the
+text once instead of once per pattern. Pattern IDs are "<dimension>:<index>".
 
 Dimensions covered by rules (most common in natural language):
   energy_level, social_orientation, budget_orientation,
@@ -21,12 +26,15 @@ from __future__ import annotations
 import re
 from typing import TypedDict
 
+from services.api.nlp.multi_match import KeywordMatcher
+
 
 class PatternSpec(TypedDict):
     pattern: re.Pattern[str]
     value: str
     confidence: float
     is_phrase: bool
+    keyword: str
 
 
 def _kw(word: str, value: str, confidence: float = 0.6) -> PatternSpec:
@@ -36,6 +44,7 @@ def _kw(word: str, value: str, confidence: float = 0.6) -> PatternSpec:
         value=value,
         confidence=confidence,
         is_phrase=False,
+        keyword=word,
     )
 
 
@@ -46,6 +55,7 @@ def _ph(phrase: str, value: str, confidence: float = 0.8) -> PatternSpec:
         value=value,
         confidence=confidence,
         is_phrase=True,
+        keyword=phrase,
     )
 
 
@@ -56,6 +66,7 @@ def _ex(phrase: str, value: str) -> PatternSpec:
         value=value,
         confidence=0.9,
         is_phrase=True,
+        keyword=phrase,
     )
 
 
@@ -302,6 +313,19 @@ DIMENSION_PATTERNS: dict[str, list[PatternSpec]] = {
     ],
 }
 
+# Single-pass matcher over every keyword above. IDs resolve back to specs
+# via DIMENSION_PATTERN_INDEX.
+DIMENSION_PATTERN_INDEX: dict[str, tuple[str, PatternSpec]] = {
+    f"{dimension}:{i}": (dimension, spec)
+    for dimension, specs in DIMENSION_PATTERNS.items()
+    for i, spec in enumerate(specs)
+}
+
+DIMENSION_MATCHER = KeywordMatcher(
+    (pattern_id, spec["keyword"])
+    for pattern_id, (_, spec) in DIMENSION_PATTERN_INDEX.items()
+)
+
 # Ordered list of all valid persona dimension keys (closed enum)
 VALID_DIMENSIONS: frozenset[str] = frozenset({
     "energy_level",
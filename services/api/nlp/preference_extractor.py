@@ -29,7 +29,8 @@ import anthropic
 from pydantic import BaseModel, field_validator, model_validator
 
 from services.api.nlp.patterns import (
-    DIMENSION_PATTERNS,
+    DIMENSION_MATCHER,
+    DIMENSION_PATTERN_INDEX,
     VALID_DIMENSIONS,
     VALID_VALUES,
 )
@@ -196,9 +197,10 @@ def extract_preferences_rules(text: str) -> list[PreferenceSignal]:
     """
     Extract preference signals using regex pattern matching.
 
-    Runs all patterns from DIMENSION_PATTERNS against the input text.
-    For each dimension, keeps the single highest-confidence match to
-    avoid double-counting. Case-insensitive, word-boundary anchored.
+    Scans the text once with DIMENSION_MATCHER (an Aho–Corasick automaton
+    over every keyword in DIMENSION_PATTERNS) and resolves each hit back to
+    its pattern spec. For each dimension, keeps the single highest-confidence
+    match to avoid double-counting. Case-insensitive, word-boundary anchored.
 
     Args:
         text: raw input text (any length)
@@ -213,36 +215,36 @@ def extract_preferences_rules(text: str) -> list[PreferenceSignal]:
     # best_match[dimension][value] = (confidence, matched_snippet)
     best_match: dict[str, dict[str, tuple[float, str]]] = {}
 
-    for dimension, specs in DIMENSION_PATTERNS.items():
-        for spec in specs:
-            pattern = spec["pattern"]
-            value = spec["value"]
-            confidence = spec["confidence"]
-
-            # Skip values outside the closed enum
-            valid_vals = VALID_VALUES.get(dimension, frozenset())
-            if value not in valid_vals:
-                logger.debug(
-                    "Pattern value %r not in valid values for %s — skipping",
-                    value, dimension,
-                )
-                continue
-
-            match = pattern.search(text)
-            if match is None:
-                continue
+    # first_hits preserves re.search semantics: leftmost hit per pattern.
+    # Resolve in registry order so ties break exactly as before.
+    hits = DIMENSION_MATCHER.first_hits(text)
+    for pattern_id, (dimension, spec) in DIMENSION_PATTERN_INDEX.items():
+        hit = hits.get(pattern_id)
+        if hit is None:
+            continue
+        value = spec["value"]
+        confidence = spec["confidence"]
+
+        # Skip values outside the closed enum
+        valid_vals = VALID_VALUES.get(dimension, frozenset())
+        if value not in valid_vals:
+            logger.debug(
+                "Pattern value %r not in valid values for %s — skipping",
+                value, dimension,
+            )
+            continue
 
-            # Capture a snippet of surrounding context for source_text
-            start = max(0, match.start() - 20)
-            end = min(len(text), match.end() + 20)
-            snippet = text[start:end].strip()
+        # Capture a snippet of surrounding context for source_text
+        start = max(0, hit.start - 20)
+        end = min(len(text), hit.end + 20)
+        snippet = text[start:end].strip()
 
-            if dimension not in best_match:
-                best_match[dimension] = {}
+        if dimension not in best_match:
+            best_match[dimension] = {}
 
-            existing = best_match[dimension].get(value)
-            if existing is None or confidence > existing[0]:
-                best_match[dimension][value] = (confidence, snippet)
+        existing = best_match[dimension].get(value)
+        if existing is None or confidence > existing[0]:
+            best_match[dimension][value] = (confidence, snippet)
 
     # Flatten: one signal per (dimension, value) — keep highest confidence
     signals: list[PreferenceSignal] = []
@@ -18,12 +18,21 @@ Usage:
 
 from __future__ import annotations
 
-from services.api.persona.effective import effective_persona, get_persona_for_ranking
+from services.api.persona.effective import (
+    clear_persona_cache,
+    effective_persona,
+    get_persona_for_ranking,
+    persona_seed_from_snapshot,
+    publish_persona_versions,
+)
 from services.api.persona.types import DimensionValue, PersonaSnapshot
 
 __all__ = [
     "effective_persona",
     "get_persona_for_ranking",
+    "persona_seed_from_snapshot",
+    "publish_persona_versions",
+    "clear_persona_cache",
     "PersonaSnapshot",
     "DimensionValue",
 ]
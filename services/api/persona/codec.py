@@ -0,0 +1,515 @@
+"""
+Compact binary codec for persona state stored in Redis.
+
+Two record kinds share one framing:
+
+    byte 0    kind tag   b"T" trip state (TripPersonaCache) | b"S" PersonaSnapshot
+    byte 1    codec version (currently 1)
+    ...       kind-specific body
+
+Trip state body (v1):
+    u16       presence mask over TRIP_DIMENSIONS (bit i = dimension i present)
+    f32[n]    packed values of the present dimensions, in TRIP_DIMENSIONS order
+    varint    nightly_sync_version
+    varint    last_updated, microseconds since the Unix epoch (0 = unknown)
+    varint    count of extra (non-standard) dimensions, each:
+                varint name length, utf-8 name, f32 value
+
+PersonaSnapshot body (v1):
+    varint    persona version (persona_dimensions.version)
+    f32       overall confidence
+    varint    resolved_at, microseconds since the Unix epoch (0 = unknown)
+    table     string table: varint count, varint byte length, then the strings
+              as one NUL-separated utf-8 block; strings below are indices
+              into it
+    u8        index width for the dimension refs: 1 (u8) or 2 (u16)
+    u16       presence mask over SNAPSHOT_DIMENSIONS
+    f32[n]    packed confidences of the present dimensions
+    idx[2n]   packed (value index, source index) pairs
+    varint    count of extra dimensions, each: varint name, value and source
+              indices, f32 confidence
+    u8        flags — bit 0: source_breakdown equals {dim: dimension source}
+    [table]   explicit source_breakdown (varint dim index, varint source index)
+              pairs when bit 0 is clear
+    table     negative tag affinities: varint count, then (tag index,
+              zigzag varint of round(weight * 10_000)) each
+
+Dimension orders are part of the wire format: append only, never reorder.
+
+Redis clients in this app use decode_responses=True, so blobs travel as
+base64 text (to_wire / from_wire). Even with that overhead an entry is a
+fraction of the size of the per-field string hash it replaces.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import functools
+import struct
+from datetime import datetime, timezone
+from typing import Any
+
+from services.api.persona.types import DimensionValue, PersonaSnapshot
+
+CODEC_VERSION = 1
+
+_KIND_TRIP_STATE = 0x54  # "T"
+_KIND_SNAPSHOT = 0x53  # "S"
+
+# Wire order for TripPersonaCache float dimensions (append only)
+TRIP_DIMENSIONS: tuple[str, ...] = (
+    "food_priority",
+    "culture_engagement",
+    "nature_preference",
+    "nightlife_interest",
+    "pace_preference",
+    "energy_level",
+    "authenticity_preference",
+    "budget_orientation",
+    "social_orientation",
+)
+
+# Wire order for PersonaSnapshot categorical dimensions (append only)
+SNAPSHOT_DIMENSIONS: tuple[str, ...] = (
+    "energy_level",
+    "social_orientation",
+    "planning_style",
+    "budget_orientation",
+    "food_priority",
+    "culture_engagement",
+    "nature_preference",
+    "nightlife_interest",
+    "authenticity_preference",
+    "pace_preference",
+)
+
+# Tag affinity weights are quantized to this resolution
+_AFFINITY_SCALE = 10_000
+
+# Decoded float32 values are rounded to this many places, matching the
+# precision the string hash used to store
+_DECODE_PRECISION = 6
+_DECODE_SCALE = 1e6
+# Adding and subtracting 1.5 * 2**52 rounds a double to an integer (half to
+# even) in two float ops, far cheaper than round(x, ndigits). Exact while
+# |x| < 2**51, i.e. |value| below ~2.2e9 at _DECODE_SCALE.
+_ROUNDER = 6_755_399_441_055_744.0
+_ROUNDER_LIMIT = 2e9
+
+_FLAG_DERIVED_SOURCES = 0x01
+
+# struct codes for the packed dimension refs, by index width
+_REF_FORMATS = {1: "B", 2: "H"}
+
+_TRIP_INDEX = {name: i for i, name in enumerate(TRIP_DIMENSIONS)}
+_SNAPSHOT_INDEX = {name: i for i, name in enumerate(SNAPSHOT_DIMENSIONS)}
+
+_HEADER = struct.Struct("<BB")
+_TRIP_HEADER = struct.Struct("<BBH")  # kind, version, presence mask
+_U16 = struct.Struct("<H")
+_F32 = struct.Struct("<f")
+
+# Packed arrays by element count, so no format string is built per call
+_TRIP_VALUES = tuple(struct.Struct(f"<{n}f") for n in range(len(TRIP_DIMENSIONS) + 1))
+_SNAPSHOT_CONFIDENCES = tuple(
+    struct.Struct(f"<{n}f") for n in range(len(SNAPSHOT_DIMENSIONS) + 1)
+)
+_SNAPSHOT_REFS = {
+    width: tuple(struct.Struct(f"<{2 * n}{code}") for n in range(len(SNAPSHOT_DIMENSIONS) + 1))
+    for width, code in _REF_FORMATS.items()
+}
+
+
+class CodecError(ValueError):
+    """Raised when a blob is truncated, corrupt, or of an unknown kind/version."""
+
+
+# ---------------------------------------------------------------------------
+# Primitives
+# ---------------------------------------------------------------------------
+
+
+def _put_varint(out: bytearray, value: int) -> None:
+    if value < 0:
+        raise CodecError(f"varint must be non-negative, got {value}")
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _get_varint(buf: bytes, pos: int) -> tuple[int, int]:
+    byte = buf[pos]
+    if byte < 0x80:
+        return byte, pos + 1
+    result = byte & 0x7F
+    shift = 7
+    for byte in buf[pos + 1:pos + 10]:
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos + shift // 7 + 1
+        shift += 7
+    raise IndexError("varint runs past end of blob")
+
+
+def _zigzag(value: int) -> int:
+    return (value << 1) ^ (value >> 63)
+
+
+def _unzigzag(value: int) -> int:
+    return (value >> 1) ^ -(value & 1)
+
+
+def _put_str(out: bytearray, text: str) -> None:
+    data = text.encode("utf-8")
+    _put_varint(out, len(data))
+    out += data
+
+
+def _get_str(buf: bytes, pos: int) -> tuple[str, int]:
+    length, pos = _get_varint(buf, pos)
+    end = pos + length
+    if end > len(buf):
+        raise CodecError("string runs past end of blob")
+    return buf[pos:end].decode("utf-8"), end
+
+
+def _iso_to_micros(iso: str | None) -> int:
+    if not iso:
+        return 0
+    try:
+        dt = datetime.fromisoformat(iso)
+    except (TypeError, ValueError):
+        return 0
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    micros = round(dt.timestamp() * 1_000_000)
+    return micros if micros > 0 else 0
+
+
+@functools.lru_cache(maxsize=4096)
+def _micros_to_iso(micros: int) -> str | None:
+    if micros == 0:
+        return None
+    return datetime.fromtimestamp(micros / 1_000_000, tz=timezone.utc).isoformat()
+
+
+def _round_f32(value: float) -> float:
+    """round(value, _DECODE_PRECISION) for a decoded float32 of any magnitude."""
+    if -_ROUNDER_LIMIT < value < _ROUNDER_LIMIT:
+        return (value * _DECODE_SCALE + _ROUNDER - _ROUNDER) / _DECODE_SCALE
+    return round(value, _DECODE_PRECISION)
+
+
+def _present(order: tuple[str, ...], mask: int) -> tuple[str, ...]:
+    """Dimension names selected by a presence mask, in wire order."""
+    return tuple(name for i, name in enumerate(order) if mask >> i & 1)
+
+
+# Every presence mask resolved up front; a decode indexes by mask & _*_MASK
+_TRIP_MASK = (1 << len(TRIP_DIMENSIONS)) - 1
+_SNAPSHOT_MASK = (1 << len(SNAPSHOT_DIMENSIONS)) - 1
+_TRIP_PRESENT = tuple(_present(TRIP_DIMENSIONS, m) for m in range(_TRIP_MASK + 1))
+_SNAPSHOT_PRESENT = tuple(_present(SNAPSHOT_DIMENSIONS, m) for m in range(_SNAPSHOT_MASK + 1))
+
+
+def _check_header(blob: bytes, kind: int) -> None:
+    if len(blob) < _HEADER.size:
+        raise CodecError("blob shorter than header")
+    blob_kind, version = _HEADER.unpack_from(blob, 0)
+    if blob_kind != kind:
+        raise CodecError(f"unexpected record kind 0x{blob_kind:02x}")
+    if version != CODEC_VERSION:
+        raise CodecError(f"unsupported codec version {version}")
+
+
+# ---------------------------------------------------------------------------
+# Trip state
+# ---------------------------------------------------------------------------
+
+
+def encode_trip_state(
+    dimensions: dict[str, float],
+    *,
+    nightly_sync_version: int,
+    last_updated: str | None = None,
+) -> bytes:
+    """Encode TripPersonaCache dimension floats plus sync metadata."""
+    mask = 0
+    values: list[float] = []
+    extras: list[tuple[str, float]] = []
+    for name in TRIP_DIMENSIONS:
+        if name in dimensions:
+            mask |= 1 << _TRIP_INDEX[name]
+            values.append(float(dimensions[name]))
+    for name, value in dimensions.items():
+        if name not in _TRIP_INDEX:
+            extras.append((name, float(value)))
+
+    out = bytearray(_HEADER.pack(_KIND_TRIP_STATE, CODEC_VERSION))
+    out += _U16.pack(mask)
+    out += _TRIP_VALUES[len(values)].pack(*values)
+    _put_varint(out, int(nightly_sync_version))
+    _put_varint(out, _iso_to_micros(last_updated))
+    _put_varint(out, len(extras))
+    for name, value in extras:
+        _put_str(out, name)
+        out += _F32.pack(value)
+    return bytes(out)
+
+
+def decode_trip_state(blob: bytes) -> dict[str, Any]:
+    """
+    Decode a trip state blob into the dict shape TripPersonaCache returns:
+    dimension floats plus ``nightly_sync_version`` and ``last_updated``.
+    """
+    if len(blob) < _TRIP_HEADER.size:
+        _check_header(blob, _KIND_TRIP_STATE)
+        raise CodecError("corrupt trip state blob: truncated presence mask")
+    kind, version, mask = _TRIP_HEADER.unpack_from(blob, 0)
+    if kind != _KIND_TRIP_STATE or version != CODEC_VERSION:
+        _check_header(blob, _KIND_TRIP_STATE)
+    try:
+        pos = _TRIP_HEADER.size
+        present = _TRIP_PRESENT[mask & _TRIP_MASK]
+        values = _TRIP_VALUES[len(present)]
+        # Trip dimensions are clamped to [0, 1]: the rounding trick is exact
+        result: dict[str, Any] = {
+            name: (value * _DECODE_SCALE + _ROUNDER - _ROUNDER) / _DECODE_SCALE
+            for name, value in zip(present, values.unpack_from(blob, pos))
+        }
+        result.update(_trip_meta(blob[pos + values.size:]))
+    except (IndexError, struct.error, UnicodeDecodeError) as exc:
+        raise CodecError(f"corrupt trip state blob: {exc}") from exc
+    return result
+
+
+@functools.lru_cache(maxsize=4096)
+def _trip_meta(tail: bytes) -> tuple[tuple[str, Any], ...]:
+    """
+    Fields after a trip state's packed values, as (name, value) pairs:
+    nightly_sync_version, extra dimensions, then last_updated if known.
+
+    Cached by the tail bytes: an entry is read many times between writes,
+    and formatting last_updated is the most expensive step of a decode.
+    """
+    version, pos = _get_varint(tail, 0)
+    micros, pos = _get_varint(tail, pos)
+    n_extra, pos = _get_varint(tail, pos)
+    fields: list[tuple[str, Any]] = [("nightly_sync_version", version)]
+    for _ in range(n_extra):
+        name, pos = _get_str(tail, pos)
+        (value,) = _F32.unpack_from(tail, pos)
+        pos += _F32.size
+        fields.append((name, _round_f32(value)))
+    last_updated = _micros_to_iso(micros)
+    if last_updated is not None:
+        fields.append(("last_updated", last_updated))
+    return tuple(fields)
+
+
+# ---------------------------------------------------------------------------
+# PersonaSnapshot
+# ---------------------------------------------------------------------------
+
+
+class _StringTable:
+    def __init__(self) -> None:
+        self.strings: list[str] = []
+        self._index: dict[str, int] = {}
+
+    def ref(self, text: str) -> int:
+        idx = self._index.get(text)
+        if idx is None:
+            if "\0" in text:
+                raise CodecError(f"NUL byte in string {text!r}")
+            idx = self._index[text] = len(self.strings)
+            self.strings.append(text)
+        return idx
+
+    def pack(self) -> bytes:
+        return "\0".join(self.strings).encode("utf-8")
+
+
+def encode_snapshot(snapshot: PersonaSnapshot, version: int) -> bytes:
+    """Encode a PersonaSnapshot (user/trip ids come from the cache key)."""
+    table = _StringTable()
+
+    mask = 0
+    confidences: list[float] = []
+    refs: list[int] = []
+    for name in SNAPSHOT_DIMENSIONS:
+        dv = snapshot.dimensions.get(name)
+        if dv is None:
+            continue
+        mask |= 1 << _SNAPSHOT_INDEX[name]
+        confidences.append(dv.confidence)
+        refs.append(table.ref(dv.value))
+        refs.append(table.ref(dv.source))
+
+    extras = bytearray()
+    extra_dims = [
+        (name, dv) for name, dv in snapshot.dimensions.items() if name not in _SNAPSHOT_INDEX
+    ]
+    _put_varint(extras, len(extra_dims))
+    for name, dv in extra_dims:
+        _put_varint(extras, table.ref(name))
+        _put_varint(extras, table.ref(dv.value))
+        _put_varint(extras, table.ref(dv.source))
+        extras += _F32.pack(dv.confidence)
+
+    derived = {name: dv.source for name, dv in snapshot.dimensions.items()}
+    tail = bytearray()
+    if snapshot.source_breakdown == derived:
+        tail.append(_FLAG_DERIVED_SOURCES)
+    else:
+        tail.append(0)
+        _put_varint(tail, len(snapshot.source_breakdown))
+        for name, source in snapshot.source_breakdown.items():
+            _put_varint(tail, table.ref(name))
+            _put_varint(tail, table.ref(source))
+
+    _put_varint(tail, len(snapshot.negative_tag_affinities))
+    for tag, weight in snapshot.negative_tag_affinities.items():
+        _put_varint(tail, table.ref(tag))
+        _put_varint(tail, _zigzag(round(weight * _AFFINITY_SCALE)))
+
+    out = bytearray(_HEADER.pack(_KIND_SNAPSHOT, CODEC_VERSION))
+    _put_varint(out, int(version))
+    out += _F32.pack(snapshot.confidence)
+    _put_varint(out, _iso_to_micros(snapshot.resolved_at))
+    strings = table.pack()
+    _put_varint(out, len(table.strings))
+    _put_varint(out, len(strings))
+    out += strings
+    if len(table.strings) > 0xFFFF:
+        raise CodecError("string table too large")
+    ref_width = 1 if len(table.strings) <= 0xFF else 2
+    out.append(ref_width)
+    out += _U16.pack(mask)
+    out += _SNAPSHOT_CONFIDENCES[len(confidences)].pack(*confidences)
+    out += _SNAPSHOT_REFS[ref_width][len(confidences)].pack(*refs)
+    out += extras
+    out += tail
+    return bytes(out)
+
+
+def decode_snapshot(
+    blob: bytes,
+    user_id: str,
+    trip_id: str | None,
+) -> tuple[PersonaSnapshot, int]:
+    """
+    Decode a snapshot blob. Returns (snapshot, persona version); the
+    snapshot is marked cache_hit=True.
+    """
+    _check_header(blob, _KIND_SNAPSHOT)
+    try:
+        pos = _HEADER.size
+        version, pos = _get_varint(blob, pos)
+        (confidence,) = _F32.unpack_from(blob, pos)
+        pos += _F32.size
+        micros, pos = _get_varint(blob, pos)
+
+        n_strings, pos = _get_varint(blob, pos)
+        table_len, pos = _get_varint(blob, pos)
+        end = pos + table_len
+        if end > len(blob):
+            raise CodecError("string table runs past end of blob")
+        strings = blob[pos:end].decode("utf-8").split("\0") if n_strings else []
+        if len(strings) != n_strings:
+            raise CodecError("string table count mismatch")
+        pos = end
+
+        ref_width = blob[pos]
+        ref_arrays = _SNAPSHOT_REFS.get(ref_width)
+        if ref_arrays is None:
+            raise CodecError(f"bad index width {ref_width}")
+        pos += 1
+        (mask,) = _U16.unpack_from(blob, pos)
+        pos += _U16.size
+        present = _SNAPSHOT_PRESENT[mask & _SNAPSHOT_MASK]
+        n = len(present)
+        confidences = _SNAPSHOT_CONFIDENCES[n]
+        conf_values = confidences.unpack_from(blob, pos)
+        pos += confidences.size
+        ref_array = ref_arrays[n]
+        refs = ref_array.unpack_from(blob, pos)
+        pos += ref_array.size
+
+        dimensions: dict[str, DimensionValue] = {
+            name: DimensionValue(
+                value=strings[value_idx],
+                confidence=(conf * _DECODE_SCALE + _ROUNDER - _ROUNDER) / _DECODE_SCALE,
+                source=strings[source_idx],
+            )
+            for name, conf, value_idx, source_idx in zip(
+                present, conf_values, refs[::2], refs[1::2]
+            )
+        }
+
+        n_extra, pos = _get_varint(blob, pos)
+        for _ in range(n_extra):
+            name_idx, pos = _get_varint(blob, pos)
+            value_idx, pos = _get_varint(blob, pos)
+            source_idx, pos = _get_varint(blob, pos)
+            (conf,) = _F32.unpack_from(blob, pos)
+            pos += _F32.size
+            dimensions[strings[name_idx]] = DimensionValue(
+                value=strings[value_idx],
+                confidence=_round_f32(conf),
+                source=strings[source_idx],
+            )
+
+        flags = blob[pos]
+        pos += 1
+        if flags & _FLAG_DERIVED_SOURCES:
+            source_breakdown = {name: dv.source for name, dv in dimensions.items()}
+        else:
+            source_breakdown = {}
+            n_sources, pos = _get_varint(blob, pos)
+            for _ in range(n_sources):
+                name_idx, pos = _get_varint(blob, pos)
+                source_idx, pos = _get_varint(blob, pos)
+                source_breakdown[strings[name_idx]] = strings[source_idx]
+
+        negative_tag_affinities: dict[str, float] = {}
+        n_tags, pos = _get_varint(blob, pos)
+        for _ in range(n_tags):
+            tag_idx, pos = _get_varint(blob, pos)
+            raw_weight, pos = _get_varint(blob, pos)
+            negative_tag_affinities[strings[tag_idx]] = _unzigzag(raw_weight) / _AFFINITY_SCALE
+    except (IndexError, struct.error, UnicodeDecodeError) as exc:
+        raise CodecError(f"corrupt snapshot blob: {exc}") from exc
+
+    snapshot = PersonaSnapshot(
+        user_id=user_id,
+        trip_id=trip_id,
+        dimensions=dimensions,
+        negative_tag_affinities=negative_tag_affinities,
+        source_breakdown=source_breakdown,
+        confidence=round(confidence, 4),
+        cache_hit=True,
+        resolved_at=_micros_to_iso(micros) or datetime.now(timezone.utc).isoformat(),
+    )
+    return snapshot, version
+
+
+# ---------------------------------------------------------------------------
+# Redis wire form
+# ---------------------------------------------------------------------------
+
+
+def to_wire(blob: bytes) -> str:
+    """Text form of a blob for Redis clients created with decode_responses=True."""
+    return base64.b64encode(blob).decode("ascii")
+
+
+def from_wire(raw: str | bytes) -> bytes:
+    """Inverse of to_wire(); accepts str or bytes replies."""
+    try:
+        # What base64.b64decode(validate=True) runs, minus its str/bytes wrapper
+        return binascii.a2b_base64(raw, strict_mode=True)
+    except (binascii.Error, ValueError) as exc:
+        raise CodecError(f"blob is not valid base64: {exc}") from exc
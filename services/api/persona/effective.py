@@ -5,6 +5,7 @@ RankingOrchestrator and generation code NEVER read PersonaDimension directly.
 This function resolves the priority stack and returns a unified PersonaSnapshot.
 
 Priority stack (highest wins):
+  0. L0 in-process snapshot cache — keyed by (user, trip, city, version)
   1. TripPersonaCache (Redis) — if trip active and cache version matches DB
   2. persona_dimensions (DB) — base priors + nightly batch updates
   3. cf_persona_blend (DB) — blended at 0.5x (if >=5 neighbors, >=50 warm users)
@@ -13,15 +14,35 @@ Priority stack (highest wins):
 
 Negative tag affinities from persona_dimensions.negativeTagAffinities are
 included in the snapshot for Qdrant query-time exclusion weighting.
+
+Version validation never touches Postgres on the warm path: the user's
+persona_dimensions.version is mirrored into Redis (persona_version:{user_id})
+by the nightly persona_updater and re-mirrored on every DB read. A warm
+read is one Redis GET plus a dict lookup; a cold stamp costs one query that
+returns version and dimensions together.
+
+Trip-scoped snapshots live in the TripPersonaCache hash as one binary
+``snapshot`` field (persona.codec) stamped with the persona version. DB
+resolves with a trip context write it through; entries in the older
+per-field JSON layout are read and rewritten on first touch.
 """
 
 from __future__ import annotations
 
 import json
 import logging
+import time
+from collections import OrderedDict
 from datetime import datetime, timezone
 from typing import Any
 
+from services.api.persona.codec import (
+    CodecError,
+    decode_snapshot,
+    encode_snapshot,
+    from_wire,
+    to_wire,
+)
 from services.api.persona.types import DimensionValue, PersonaSnapshot
 from services.api.priors.destination_prior import (
     CONFIDENCE_GATE,
@@ -37,6 +58,33 @@ logger = logging.getLogger(__name__)
 # Redis key format for TripPersonaCache
 _CACHE_KEY_TEMPLATE = "trip_persona_cache:{user_id}:{trip_id}"
 
+# Hash field holding the binary snapshot (persona.codec) inside the
+# TripPersonaCache hash; the per-field JSON layout below predates it.
+# A snapshot resolved with a destination prior lives in its own
+# "snapshot@<city_slug>" field, so it is never served for another city.
+_SNAPSHOT_FIELD = "snapshot"
+_CITY_SNAPSHOT_FIELD_PREFIX = "snapshot@"
+_LEGACY_SNAPSHOT_FIELDS = (
+    "dimensions",
+    "negative_tag_affinities",
+    "source_breakdown",
+    "confidence",
+    "resolved_at",
+)
+
+# Redis key mirroring persona_dimensions.version for a user
+_VERSION_KEY_TEMPLATE = "persona_version:{user_id}"
+
+# Version stamp TTL — rewritten nightly and on every DB read. Kept short so
+# a stamp that could be neither published nor dropped is not trusted for long.
+_VERSION_STAMP_TTL_SECONDS = 24 * 3600
+
+# L0 in-process snapshot cache. The version in the key handles nightly
+# updates; the TTL bounds staleness from mid-trip session merges, which
+# update the TripPersonaCache hash without bumping the version.
+_L0_TTL_SECONDS = 30.0
+_L0_MAX_ENTRIES = 10_000
+
 # Default confidence assigned to dimensions when no DB data is found
 _DEFAULT_CONFIDENCE = 0.5
 
@@ -79,11 +127,190 @@ def _cache_key(user_id: str, trip_id: str) -> str:
     return _CACHE_KEY_TEMPLATE.format(user_id=user_id, trip_id=trip_id)
 
 
+def _version_key(user_id: str) -> str:
+    return _VERSION_KEY_TEMPLATE.format(user_id=user_id)
+
+
+def _snapshot_field(city_slug: str | None) -> str:
+    if city_slug is None:
+        return _SNAPSHOT_FIELD
+    return _CITY_SNAPSHOT_FIELD_PREFIX + city_slug
+
+
+class _SnapshotCache:
+    """
+    Bounded in-process TTL cache of resolved PersonaSnapshots (L0).
+
+    Entries are keyed by (user_id, trip_id, city_slug, version), so a version
+    bump makes old entries unreachable; they age out via TTL / LRU eviction.
+    Cached snapshots are shared between callers and must be treated as
+    read-only.
+    """
+
+    def __init__(self, ttl_s: float, max_entries: int) -> None:
+        self._ttl_s = ttl_s
+        self._max_entries = max_entries
+        self._entries: OrderedDict[tuple, tuple[float, PersonaSnapshot]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tuple) -> PersonaSnapshot | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, snapshot = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return snapshot
+
+    def put(self, key: tuple, snapshot: PersonaSnapshot) -> None:
+        self._entries[key] = (time.monotonic() + self._ttl_s, snapshot)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+_snapshot_cache = _SnapshotCache(_L0_TTL_SECONDS, _L0_MAX_ENTRIES)
+
+
+def clear_persona_cache() -> None:
+    """Drop every L0 snapshot in this process (tests, admin resets)."""
+    _snapshot_cache.clear()
+
+
+async def _read_version_stamp(user_id: str, redis_client: Any) -> int | None:
+    """Return the mirrored persona version, or None on miss / Redis error."""
+    try:
+        raw = await redis_client.get(_version_key(user_id))
+    except Exception:
+        logger.warning(
+            "effective_persona: version stamp read failed for user=%s", user_id, exc_info=True
+        )
+        return None
+    if raw is None:
+        return None
+    try:
+        return int(raw)
+    except (ValueError, TypeError):
+        return None
+
+
+async def publish_persona_versions(redis_client: Any, versions: dict[str, int]) -> None:
+    """
+    Mirror persona_dimensions.version into Redis for each user.
+
+    Called by the nightly persona_updater after it bumps versions, and by
+    effective_persona() whenever a DB read finds the stamp missing or behind.
+    One pipelined round-trip. On failure the users' stamps are deleted, since
+    a stamp left behind the DB version would keep validating stale caches;
+    readers fall back to a DB read when the stamp is missing. Errors are
+    logged, never raised.
+    """
+    if redis_client is None or not versions:
+        return
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for user_id, version in versions.items():
+            pipe.set(_version_key(user_id), int(version), ex=_VERSION_STAMP_TTL_SECONDS)
+        await pipe.execute()
+        return
+    except Exception:
+        logger.warning(
+            "effective_persona: version stamp publish failed for %d users; dropping their stamps",
+            len(versions),
+            exc_info=True,
+        )
+    try:
+        await redis_client.delete(*(_version_key(user_id) for user_id in versions))
+    except Exception:
+        logger.error(
+            "effective_persona: could not drop version stamps for %d users; "
+            "they may be stale for up to %ds",
+            len(versions),
+            _VERSION_STAMP_TTL_SECONDS,
+            exc_info=True,
+        )
+
+
+def _decode_legacy_snapshot(
+    fields: dict[str, str],
+    user_id: str,
+    trip_id: str,
+) -> PersonaSnapshot:
+    """Build a PersonaSnapshot from the pre-codec per-field JSON hash layout."""
+    raw_dims: dict[str, dict] = json.loads(fields["dimensions"])
+    dimensions = {
+        dim: DimensionValue(
+            value=v["value"],
+            confidence=float(v["confidence"]),
+            source=v.get("source", "trip_cache"),
+        )
+        for dim, v in raw_dims.items()
+    }
+
+    neg_tags_raw = fields.get("negative_tag_affinities")
+    source_raw = fields.get("source_breakdown")
+    confidence_raw = fields.get("confidence")
+
+    return PersonaSnapshot(
+        user_id=user_id,
+        trip_id=trip_id,
+        dimensions=dimensions,
+        negative_tag_affinities=json.loads(neg_tags_raw) if neg_tags_raw else {},
+        source_breakdown=json.loads(source_raw) if source_raw else {},
+        confidence=float(confidence_raw) if confidence_raw else 0.5,
+        cache_hit=True,
+        resolved_at=fields.get("resolved_at") or _now_iso(),
+    )
+
+
+async def _write_snapshot_cache(
+    redis_client: Any,
+    key: str,
+    snapshot: PersonaSnapshot,
+    version: int,
+    *,
+    city_slug: str | None = None,
+    drop_legacy: bool = False,
+) -> None:
+    """
+    Store the binary snapshot in the TripPersonaCache hash at ``key``, in
+    the field for ``city_slug`` (the destination prior it was resolved with).
+
+    The hash's lifetime belongs to TripPersonaCache (EXPIREAT trip end + 48h).
+    If the write created the key — no TTL comes back — there is no active
+    trip entry to ride along with, so the key is removed again rather than
+    left without an expiry.
+    """
+    try:
+        pipe = redis_client.pipeline(transaction=True)
+        pipe.hset(
+            key, mapping={_snapshot_field(city_slug): to_wire(encode_snapshot(snapshot, version))}
+        )
+        if drop_legacy:
+            pipe.hdel(key, *_LEGACY_SNAPSHOT_FIELDS)
+        pipe.ttl(key)
+        results = await pipe.execute()
+        if results and results[-1] == -1:
+            await redis_client.delete(key)
+    except Exception:
+        logger.warning(
+            "effective_persona: snapshot cache write failed key=%s", key, exc_info=True
+        )
+
+
 async def _try_redis_cache(
     user_id: str,
     trip_id: str,
     redis_client: Any,
     db_version: int | None,
+    city_slug: str | None = None,
 ) -> PersonaSnapshot | None:
     """
     Attempt to read a PersonaSnapshot from TripPersonaCache.
@@ -91,9 +318,11 @@ async def _try_redis_cache(
     Returns a fully populated PersonaSnapshot on a valid cache hit,
     or None on miss, version mismatch, or any Redis error.
 
-    Version check: the cached hash must contain a 'nightly_sync_version'
-    field that equals the DB version. If db_version is None (DB not yet
-    read), version check is skipped and the cache hit is accepted as-is.
+    The snapshot is a binary field for ``city_slug`` carrying its own persona
+    version. Entries in the older per-field JSON layout hold no destination
+    prior: they are still read without a city (version from
+    'nightly_sync_version') and rewritten to the binary field.
+    If either version is unknown the check is skipped and the hit accepted.
     """
     if redis_client is None:
         return None
@@ -104,81 +333,58 @@ async def _try_redis_cache(
         if not raw:
             logger.debug("effective_persona: cache miss key=%s", key)
             return None
+        fields = {
+            (k.decode() if isinstance(k, bytes) else k): (
+                v.decode() if isinstance(v, bytes) else v
+            )
+            for k, v in raw.items()
+        }
 
-        # Version guard
-        cached_version_raw = raw.get("nightly_sync_version") or raw.get(b"nightly_sync_version")
-        if cached_version_raw is not None and db_version is not None:
+        field = _snapshot_field(city_slug)
+        legacy = field not in fields
+        cached_version: int | None
+        if not legacy:
             try:
-                cached_version = int(cached_version_raw)
-            except (ValueError, TypeError):
-                cached_version = -1
-
-            if cached_version != db_version:
-                logger.debug(
-                    "effective_persona: cache stale key=%s cached_v=%s db_v=%s",
-                    key,
-                    cached_version_raw,
-                    db_version,
+                snapshot, cached_version = decode_snapshot(
+                    from_wire(fields[field]), user_id, trip_id
                 )
+            except CodecError:
+                logger.warning("effective_persona: corrupt snapshot key=%s", key, exc_info=True)
                 return None
-
-        # Deserialize the snapshot from the Redis hash
-        dims_raw = raw.get("dimensions") or raw.get(b"dimensions")
-        neg_tags_raw = raw.get("negative_tag_affinities") or raw.get(b"negative_tag_affinities")
-        source_raw = raw.get("source_breakdown") or raw.get(b"source_breakdown")
-        confidence_raw = raw.get("confidence") or raw.get(b"confidence")
-        resolved_raw = raw.get("resolved_at") or raw.get(b"resolved_at")
-
-        if dims_raw is None:
-            logger.debug("effective_persona: cache entry missing 'dimensions' key=%s", key)
+        elif city_slug is not None or "dimensions" not in fields:
+            logger.debug("effective_persona: cache miss key=%s field=%s", key, field)
             return None
+        else:
+            snapshot = _decode_legacy_snapshot(fields, user_id, trip_id)
+            cached_version_raw = fields.get("nightly_sync_version")
+            try:
+                cached_version = int(cached_version_raw) if cached_version_raw is not None else None
+            except (ValueError, TypeError):
+                cached_version = -1
 
-        if isinstance(dims_raw, bytes):
-            dims_raw = dims_raw.decode()
-        if isinstance(neg_tags_raw, bytes):
-            neg_tags_raw = neg_tags_raw.decode() if neg_tags_raw else None
-        if isinstance(source_raw, bytes):
-            source_raw = source_raw.decode() if source_raw else None
-        if isinstance(confidence_raw, bytes):
-            confidence_raw = confidence_raw.decode() if confidence_raw else None
-        if isinstance(resolved_raw, bytes):
-            resolved_raw = resolved_raw.decode() if resolved_raw else None
-
-        raw_dims: dict[str, dict] = json.loads(dims_raw)
-        dimensions = {
-            dim: DimensionValue(
-                value=v["value"],
-                confidence=float(v["confidence"]),
-                source=v.get("source", "trip_cache"),
+        # Version guard
+        if cached_version is not None and db_version is not None and cached_version != db_version:
+            logger.debug(
+                "effective_persona: cache stale key=%s cached_v=%s db_v=%s",
+                key,
+                cached_version,
+                db_version,
             )
-            for dim, v in raw_dims.items()
-        }
+            return None
 
-        negative_tag_affinities: dict[str, float] = (
-            json.loads(neg_tags_raw) if neg_tags_raw else {}
-        )
-        source_breakdown: dict[str, str] = (
-            json.loads(source_raw) if source_raw else {}
-        )
-        confidence = float(confidence_raw) if confidence_raw is not None else 0.5
-        resolved_at = resolved_raw or _now_iso()
+        if legacy:
+            stamp = cached_version if cached_version is not None else db_version
+            if stamp is not None:
+                await _write_snapshot_cache(
+                    redis_client, key, snapshot, stamp, drop_legacy=True
+                )
 
         logger.debug(
             "effective_persona: cache hit key=%s dims=%d",
             key,
-            len(dimensions),
-        )
-
-        return PersonaSnapshot(
-            user_id=user_id,
-            trip_id=trip_id,
-            dimensions=dimensions,
-            negative_tag_affinities=negative_tag_affinities,
-            source_breakdown=source_breakdown,
-            confidence=confidence,
-            cache_hit=True,
-            resolved_at=resolved_at,
+            len(snapshot.dimensions),
         )
+        return snapshot
 
     except Exception:
         logger.warning(
@@ -349,6 +555,7 @@ async def effective_persona(
     Resolve and return the effective persona for a user, optionally scoped to a trip.
 
     Priority stack (highest wins):
+      0. L0 in-process cache — when redis_client is provided (version from the stamp)
       1. TripPersonaCache (Redis) — only when trip_id is provided and version matches DB
       2. PersonaDimension (DB) — base priors and nightly EMA updates
       3. cf_persona_blend — collaborative filtering blend (stub, no-op until V2)
@@ -358,12 +565,14 @@ async def effective_persona(
         user_id:      The user whose persona to resolve.
         trip_id:      Optional trip context. If provided, enables Redis cache lookup.
         pool:         asyncpg connection pool. Required for DB reads.
-        redis_client: redis.asyncio client. If None, cache layer is skipped gracefully.
+        redis_client: redis.asyncio client. If None, the L0 and trip cache layers
+                      are skipped gracefully and every call reads the DB.
         city_slug:    City slug for destination prior injection (e.g. 'austin', 'bend').
                       If None, destination prior layer is skipped.
 
     Returns:
-        PersonaSnapshot with all resolved dimensions.
+        PersonaSnapshot with all resolved dimensions. Snapshots served from
+        L0 are shared — do not mutate them.
 
     Raises:
         Exception: If the DB read fails. DB failure is fatal — we cannot serve
@@ -373,69 +582,66 @@ async def effective_persona(
         raise ValueError("effective_persona: 'pool' is required (asyncpg connection pool)")
 
     # ------------------------------------------------------------------
-    # Step 1: Determine DB version for cache validation (lightweight fetch)
-    # We need the version before reading the cache so we can validate freshness.
-    # If Redis is not available, skip the version pre-fetch and go straight to DB.
-    # ------------------------------------------------------------------
-    db_version: int | None = None
-    db_dimensions: dict[str, DimensionValue] | None = None
-    db_neg_tags: dict[str, float] | None = None
-    db_source_breakdown: dict[str, str] | None = None
-
-    # ------------------------------------------------------------------
-    # Step 2: Try TripPersonaCache (only if trip_id + redis available)
+    # Step 1: Resolve the persona version from the Redis stamp (no Postgres).
+    # A missing stamp costs one query that returns version + dimensions;
+    # the result is reused below instead of a second read.
     # ------------------------------------------------------------------
-    if trip_id is not None and redis_client is not None:
-        # To validate cache version we first do a lightweight DB version read.
-        # This is a small extra query but prevents serving stale persona data.
-        # If this fails it's fatal (DB is required).
-        try:
-            async with pool.acquire() as _conn:
-                version_rows = await _conn.fetch(
-                    'SELECT version FROM persona_dimensions WHERE "userId" = $1 LIMIT 1',
+    version: int | None = None
+    db_result: tuple[dict[str, DimensionValue], dict[str, float], dict[str, str], int] | None = None
+    l0_key: tuple | None = None
+
+    if redis_client is not None:
+        version = await _read_version_stamp(user_id, redis_client)
+        if version is None:
+            db_result = await _read_persona_from_db(user_id, pool)
+            version = db_result[3]
+            await publish_persona_versions(redis_client, {user_id: version})
+
+        # --------------------------------------------------------------
+        # Step 2: L0 in-process snapshot cache
+        # --------------------------------------------------------------
+        l0_key = (user_id, trip_id, city_slug, version)
+        snapshot = _snapshot_cache.get(l0_key)
+        if snapshot is not None:
+            logger.debug(
+                "effective_persona: L0 hit user=%s trip=%s v=%s", user_id, trip_id, version
+            )
+            return snapshot
+
+        # --------------------------------------------------------------
+        # Step 3: TripPersonaCache (only with a trip context)
+        # --------------------------------------------------------------
+        if trip_id is not None:
+            cached = await _try_redis_cache(user_id, trip_id, redis_client, version, city_slug)
+            if cached is not None:
+                _snapshot_cache.put(l0_key, cached)
+                logger.info(
+                    "effective_persona: served from cache user=%s trip=%s",
                     user_id,
+                    trip_id,
                 )
-            db_version = version_rows[0]["version"] if version_rows else 0
-        except Exception:
-            logger.warning(
-                "effective_persona: version pre-fetch failed for user=%s, "
-                "proceeding without version check",
-                user_id,
-                exc_info=True,
-            )
-            db_version = None
-
-        cached = await _try_redis_cache(user_id, trip_id, redis_client, db_version)
-        if cached is not None:
-            logger.info(
-                "effective_persona: served from cache user=%s trip=%s",
-                user_id,
-                trip_id,
-            )
-            return cached
+                return cached
 
     # ------------------------------------------------------------------
-    # Step 3: Read PersonaDimension from DB
+    # Step 4: Read PersonaDimension from DB (unless Step 1 already did)
     # ------------------------------------------------------------------
-    logger.debug("effective_persona: reading DB for user=%s", user_id)
-    (
-        db_dimensions,
-        db_neg_tags,
-        db_source_breakdown,
-        resolved_db_version,
-    ) = await _read_persona_from_db(user_id, pool)
-
-    dimensions = db_dimensions
-    negative_tag_affinities = db_neg_tags
-    source_breakdown = db_source_breakdown
+    if db_result is None:
+        logger.debug("effective_persona: reading DB for user=%s", user_id)
+        db_result = await _read_persona_from_db(user_id, pool)
+    dimensions, negative_tag_affinities, source_breakdown, resolved_db_version = db_result
+
+    if l0_key is not None and resolved_db_version != version:
+        # Stamp was behind the DB (e.g. a write that did not publish) — fix it
+        await publish_persona_versions(redis_client, {user_id: resolved_db_version})
+        l0_key = (user_id, trip_id, city_slug, resolved_db_version)
 
     # ------------------------------------------------------------------
-    # Step 4: CF persona blend (stub — no-op until cf_persona_blend exists)
+    # Step 5: CF persona blend (stub — no-op until cf_persona_blend exists)
     # ------------------------------------------------------------------
     dimensions = _try_cf_blend(dimensions)
 
     # ------------------------------------------------------------------
-    # Step 5: Apply destination prior for low-confidence dimensions
+    # Step 6: Apply destination prior for low-confidence dimensions
     # ------------------------------------------------------------------
     if city_slug is not None:
         dimensions, source_breakdown = _apply_prior_to_dimensions(
@@ -443,7 +649,7 @@ async def effective_persona(
         )
 
     # ------------------------------------------------------------------
-    # Step 6: Compute overall confidence and assemble snapshot
+    # Step 7: Compute overall confidence and assemble snapshot
     # ------------------------------------------------------------------
     overall_confidence = _compute_overall_confidence(dimensions)
 
@@ -458,6 +664,17 @@ async def effective_persona(
         resolved_at=_now_iso(),
     )
 
+    if l0_key is not None:
+        _snapshot_cache.put(l0_key, snapshot)
+        if trip_id is not None:
+            await _write_snapshot_cache(
+                redis_client,
+                _cache_key(user_id, trip_id),
+                snapshot,
+                resolved_db_version,
+                city_slug=city_slug,
+            )
+
     logger.info(
         "effective_persona: resolved user=%s trip=%s dims=%d confidence=%.3f cache_hit=False",
         user_id,
@@ -514,7 +731,14 @@ async def get_persona_for_ranking(
         redis_client=redis_client,
         city_slug=city_slug,
     )
+    return persona_seed_from_snapshot(snapshot)
 
+
+def persona_seed_from_snapshot(snapshot: PersonaSnapshot) -> dict[str, Any]:
+    """
+    Convert a resolved PersonaSnapshot to the flat persona_seed dict
+    documented on get_persona_for_ranking().
+    """
     # Extract pace from persona dimensions
     pace_dim = snapshot.dimensions.get("pace_preference")
     if pace_dim is not None:
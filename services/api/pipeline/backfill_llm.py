@@ -11,6 +11,10 @@ All calls:
   - Use anthropic.AsyncAnthropic (reads ANTHROPIC_API_KEY from env)
   - Log model version, latency, and cost estimate at INFO level
   - Raise on unrecoverable errors; caller decides retry/abort policy
+  - Accept an optional LLMWorkScheduler so callers running many submissions
+    concurrently can share one concurrency/RPM/TPM budget
+  - Go through the content-addressed response cache (pipeline/llm_cache.py),
+    so re-processing an unchanged submission costs nothing
 
 Prompt injection defense:
   - System/user separation enforced everywhere
@@ -28,6 +32,9 @@ from typing import Optional
 
 import anthropic
 
+from services.api.pipeline.llm_cache import LLMResponseCache, get_default_cache
+from services.api.pipeline.llm_scheduler import LLMWorkScheduler
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -87,24 +94,85 @@ def _log_llm_call(
     input_cpm: float,
     output_cpm: float,
     context: str = "",
+    cached: bool = False,
 ) -> None:
     cost_usd = (
         (input_tokens / 1_000_000) * input_cpm
         + (output_tokens / 1_000_000) * output_cpm
     )
+    # A cache hit is not billed — report its original cost as saved instead
     logger.info(
         "llm_call model=%s prompt_version=%s latency_s=%.3f "
-        "input_tokens=%d output_tokens=%d cost_usd=%.6f context=%s",
+        "input_tokens=%d output_tokens=%d cost_usd=%.6f cache_hit=%s "
+        "saved_usd=%.6f context=%s",
         model,
         prompt_version,
         latency_s,
         input_tokens,
         output_tokens,
-        cost_usd,
+        0.0 if cached else cost_usd,
+        cached,
+        cost_usd if cached else 0.0,
         context,
     )
 
 
+async def _create_message(
+    client: anthropic.AsyncAnthropic,
+    scheduler: Optional[LLMWorkScheduler],
+    *,
+    prompt_version: str,
+    cache: Optional[LLMResponseCache] = None,
+    **kwargs,
+) -> tuple[anthropic.types.Message, bool]:
+    """
+    Call client.messages.create, routed through the scheduler when given.
+
+    Checks the response cache (default: get_default_cache()) first.
+    Returns (message, served_from_cache). A live response is not cached
+    here: callers pass it to _store_message() once it has parsed.
+    """
+    cache = cache if cache is not None else get_default_cache()
+    if cache is not None:
+        entry = cache.get(kwargs["model"], prompt_version, kwargs)
+        if entry is not None:
+            try:
+                return anthropic.types.Message.model_validate(entry.body), True
+            except Exception as exc:
+                logger.warning("Evicting unusable cached message: %s", exc)
+                cache.evict(kwargs["model"], prompt_version, kwargs, entry)
+
+    if scheduler is None:
+        response = await client.messages.create(**kwargs)
+    else:
+        prompt_chars = len(kwargs.get("system", "")) + sum(
+            len(m["content"]) for m in kwargs.get("messages", [])
+        )
+        response = await scheduler.submit(
+            lambda: client.messages.create(**kwargs),
+            estimated_tokens=prompt_chars // 4 + kwargs.get("max_tokens", 0),
+            tokens_used=lambda r: r.usage.input_tokens + r.usage.output_tokens,
+        )
+
+    return response, False
+
+
+def _store_message(
+    response: anthropic.types.Message,
+    *,
+    prompt_version: str,
+    cached: bool,
+    request: dict,
+    cache: Optional[LLMResponseCache] = None,
+) -> None:
+    """Cache a live response under its request once the caller has parsed it."""
+    if cached:
+        return
+    cache = cache if cache is not None else get_default_cache()
+    if cache is not None:
+        cache.put(request["model"], prompt_version, request, response.model_dump(mode="json"))
+
+
 # ---------------------------------------------------------------------------
 # Data structures (shared)
 # ---------------------------------------------------------------------------
@@ -205,6 +273,8 @@ async def extract_cities(
     client: anthropic.AsyncAnthropic,
     text: str,
     city_hint: Optional[str],
+    *,
+    scheduler: Optional[LLMWorkScheduler] = None,
 ) -> list[ExtractedCity]:
     """
     Extract the ordered list of cities visited from diary text using Haiku.
@@ -223,16 +293,20 @@ async def extract_cities(
         text=text[:8000],
     )
 
+    request = dict(
+        model=HAIKU_MODEL,
+        max_tokens=1024,
+        system=_CITY_EXTRACT_SYSTEM,
+        tools=[_CITY_EXTRACT_TOOL],
+        tool_choice={"type": "any"},
+        messages=[{"role": "user", "content": user_msg}],
+    )
+
     t0 = time.monotonic()
     try:
-        response = await asyncio.wait_for(
-            client.messages.create(
-                model=HAIKU_MODEL,
-                max_tokens=1024,
-                system=_CITY_EXTRACT_SYSTEM,
-                tools=[_CITY_EXTRACT_TOOL],
-                tool_choice={"type": "any"},
-                messages=[{"role": "user", "content": user_msg}],
+        response, cached = await asyncio.wait_for(
+            _create_message(
+                client, scheduler, prompt_version=CITY_EXTRACT_PROMPT_VERSION, **request
             ),
             timeout=10.0,
         )
@@ -257,6 +331,7 @@ async def extract_cities(
         input_cpm=HAIKU_INPUT_CPM,
         output_cpm=HAIKU_OUTPUT_CPM,
         context="extract_cities",
+        cached=cached,
     )
 
     tool_input: dict = {}
@@ -274,6 +349,10 @@ async def extract_cities(
         logger.warning("extract_cities: 'cities' field is not a list — returning empty")
         return []
 
+    _store_message(
+        response, prompt_version=CITY_EXTRACT_PROMPT_VERSION, cached=cached, request=request
+    )
+
     results: list[ExtractedCity] = []
     for item in raw_cities:
         if not isinstance(item, dict):
@@ -384,6 +463,8 @@ Classify the following travel diary entry:
 async def classify_submission(
     client: anthropic.AsyncAnthropic,
     text: str,
+    *,
+    scheduler: Optional[LLMWorkScheduler] = None,
 ) -> str:
     """
     Classify submission as 'tier_3' or 'tier_4' using Haiku.
@@ -393,13 +474,17 @@ async def classify_submission(
     """
     user_msg = _CLASSIFY_USER_TEMPLATE.format(text=text[:8000])  # cap context
 
-    t0 = time.monotonic()
-    response = await client.messages.create(
+    request = dict(
         model=HAIKU_MODEL,
         max_tokens=16,  # one word answer
         system=_CLASSIFY_SYSTEM,
         messages=[{"role": "user", "content": user_msg}],
     )
+
+    t0 = time.monotonic()
+    response, cached = await _create_message(
+        client, scheduler, prompt_version=CLASSIFY_PROMPT_VERSION, **request
+    )
     latency = time.monotonic() - t0
 
     input_tok = response.usage.input_tokens
@@ -414,6 +499,7 @@ async def classify_submission(
         input_cpm=HAIKU_INPUT_CPM,
         output_cpm=HAIKU_OUTPUT_CPM,
         context="classify_submission",
+        cached=cached,
     )
 
     raw = ""
@@ -423,6 +509,9 @@ async def classify_submission(
 
     tier = raw.strip().lower()
     if tier in ("tier_3", "tier_4"):
+        _store_message(
+            response, prompt_version=CLASSIFY_PROMPT_VERSION, cached=cached, request=request
+        )
         return tier
 
     logger.warning(
@@ -519,6 +608,8 @@ async def extract_venues(
     client: anthropic.AsyncAnthropic,
     text: str,
     city_hint: Optional[str],
+    *,
+    scheduler: Optional[LLMWorkScheduler] = None,
 ) -> list[ExtractedVenue]:
     """
     Extract venues from free-form diary text using Sonnet with tool use.
@@ -532,8 +623,7 @@ async def extract_venues(
         text=text[:9500],  # leave headroom for system + tool schema tokens
     )
 
-    t0 = time.monotonic()
-    response = await client.messages.create(
+    request = dict(
         model=SONNET_MODEL,
         max_tokens=4096,
         system=_EXTRACT_SYSTEM,
@@ -541,6 +631,11 @@ async def extract_venues(
         tool_choice={"type": "any"},  # force tool use — no prose fallback
         messages=[{"role": "user", "content": user_msg}],
     )
+
+    t0 = time.monotonic()
+    response, cached = await _create_message(
+        client, scheduler, prompt_version=EXTRACT_PROMPT_VERSION, **request
+    )
     latency = time.monotonic() - t0
 
     input_tok = response.usage.input_tokens
@@ -555,6 +650,7 @@ async def extract_venues(
         input_cpm=SONNET_INPUT_CPM,
         output_cpm=SONNET_OUTPUT_CPM,
         context="extract_venues",
+        cached=cached,
     )
 
     # Pull tool use block
@@ -573,6 +669,10 @@ async def extract_venues(
         logger.warning("extract_venues: 'venues' field is not a list")
         return []
 
+    _store_message(
+        response, prompt_version=EXTRACT_PROMPT_VERSION, cached=cached, request=request
+    )
+
     results: list[ExtractedVenue] = []
     for item in raw_venues:
         if not isinstance(item, dict):
@@ -659,6 +759,8 @@ async def validate_venues(
     client: anthropic.AsyncAnthropic,
     venues: list[ExtractedVenue],
     city: str,
+    *,
+    scheduler: Optional[LLMWorkScheduler] = None,
 ) -> list[Optional[ExtractedVenue]]:
     """
     Validate extracted venues for plausibility using Haiku.
@@ -686,15 +788,19 @@ async def validate_venues(
         venues_json=json.dumps(venues_payload, ensure_ascii=False, indent=2),
     )
 
+    request = dict(
+        model=HAIKU_MODEL,
+        max_tokens=2048,
+        system=_VALIDATE_SYSTEM,
+        tools=[_VALIDATE_TOOL],
+        tool_choice={"type": "any"},
+        messages=[{"role": "user", "content": user_msg}],
+    )
+
     t0 = time.monotonic()
     try:
-        response = await client.messages.create(
-            model=HAIKU_MODEL,
-            max_tokens=2048,
-            system=_VALIDATE_SYSTEM,
-            tools=[_VALIDATE_TOOL],
-            tool_choice={"type": "any"},
-            messages=[{"role": "user", "content": user_msg}],
+        response, cached = await _create_message(
+            client, scheduler, prompt_version=VALIDATE_PROMPT_VERSION, **request
         )
     except Exception as exc:
         logger.error("validate_venues LLM call failed: %s — failing open", exc)
@@ -714,6 +820,7 @@ async def validate_venues(
         input_cpm=HAIKU_INPUT_CPM,
         output_cpm=HAIKU_OUTPUT_CPM,
         context="validate_venues",
+        cached=cached,
     )
 
     # Parse tool response
@@ -728,6 +835,14 @@ async def validate_venues(
         return list(venues)
 
     raw_results = tool_input.get("results", [])
+    if not isinstance(raw_results, list):
+        logger.warning("validate_venues: 'results' field is not a list — failing open")
+        return list(venues)
+
+    _store_message(
+        response, prompt_version=VALIDATE_PROMPT_VERSION, cached=cached, request=request
+    )
+
     # Build lookup: name -> keep
     keep_map: dict[str, bool] = {}
     reason_map: dict[str, str] = {}
@@ -22,9 +22,11 @@ Status progression:
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import math
+import weakref
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Optional
@@ -42,6 +44,7 @@ from services.api.pipeline.backfill_llm import (
     validate_venues,
 )
 from services.api.pipeline.entity_resolution import normalize_name
+from services.api.pipeline.llm_scheduler import LLMWorkScheduler, SchedulerConfig
 
 logger = logging.getLogger(__name__)
 
@@ -68,6 +71,38 @@ TIER_WEIGHTS = {
 # Quality gate: minimum extractable venues to proceed
 MIN_VENUES_FOR_PROCEED = 3
 
+# Provider limits shared by every backfill running in the process
+LLM_MAX_CONCURRENCY = 4
+LLM_REQUESTS_PER_MINUTE = 50
+LLM_TOKENS_PER_MINUTE = 50_000
+
+# One scheduler per event loop (its locks are loop-bound)
+_schedulers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, LLMWorkScheduler]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_scheduler() -> LLMWorkScheduler:
+    """
+    The scheduler every process_backfill on this loop routes its LLM calls
+    through. Submissions run as concurrent background tasks, so sharing one
+    keeps them jointly under the provider limits. No abort_on: one trip's
+    fatal error must not stop the others.
+    """
+    loop = asyncio.get_running_loop()
+    scheduler = _schedulers.get(loop)
+    if scheduler is None:
+        scheduler = LLMWorkScheduler(
+            SchedulerConfig(
+                max_concurrency=LLM_MAX_CONCURRENCY,
+                requests_per_minute=LLM_REQUESTS_PER_MINUTE,
+                tokens_per_minute=LLM_TOKENS_PER_MINUTE,
+            ),
+            name="backfill",
+        )
+        _schedulers[loop] = scheduler
+    return scheduler
+
 
 # ---------------------------------------------------------------------------
 # Haversine
@@ -672,6 +707,7 @@ async def process_backfill(pool: asyncpg.Pool, backfill_trip_id: str) -> None:
     a reason. On success, status is set to 'complete'.
     """
     anthropic_client = anthropic.AsyncAnthropic()  # reads ANTHROPIC_API_KEY from env
+    scheduler = _get_scheduler()
 
     async with pool.acquire() as conn:
         # ------------------------------------------------------------------
@@ -704,7 +740,9 @@ async def process_backfill(pool: asyncpg.Pool, backfill_trip_id: str) -> None:
         await _update_status(conn, backfill_trip_id, "processing")
 
         try:
-            tier = await classify_submission(anthropic_client, raw_text)
+            tier = await classify_submission(
+                anthropic_client, raw_text, scheduler=scheduler
+            )
         except Exception as exc:
             logger.exception(
                 "process_backfill: stage 1 classify failed for %s: %s",
@@ -724,7 +762,7 @@ async def process_backfill(pool: asyncpg.Pool, backfill_trip_id: str) -> None:
         extracted_cities: list[ExtractedCity] = []
         try:
             extracted_cities = await extract_cities(
-                anthropic_client, raw_text, city_hint
+                anthropic_client, raw_text, city_hint, scheduler=scheduler
             )
         except Exception as exc:
             logger.exception(
@@ -780,7 +818,9 @@ async def process_backfill(pool: asyncpg.Pool, backfill_trip_id: str) -> None:
             cities_context = primary_city
 
         try:
-            venues = await extract_venues(anthropic_client, raw_text, cities_context)
+            venues = await extract_venues(
+                anthropic_client, raw_text, cities_context, scheduler=scheduler
+            )
         except Exception as exc:
             logger.exception(
                 "process_backfill: stage 2 extraction failed for %s: %s",
@@ -813,7 +853,9 @@ async def process_backfill(pool: asyncpg.Pool, backfill_trip_id: str) -> None:
         # Stage 2.5: LLM validation
         # ------------------------------------------------------------------
         try:
-            validated = await validate_venues(anthropic_client, venues, primary_city)
+            validated = await validate_venues(
+                anthropic_client, venues, primary_city, scheduler=scheduler
+            )
         except Exception as exc:
             logger.exception(
                 "process_backfill: stage 2.5 validation failed for %s: %s",
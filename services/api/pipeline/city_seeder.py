@@ -47,6 +47,8 @@ from services.api.pipeline.vibe_extraction import run_extraction
 from services.api.pipeline.rule_inference import run_rule_inference
 from services.api.pipeline.convergence import run_convergence_scoring
 from services.api.pipeline import qdrant_sync
+from services.api.generation.ranking_cache import bump_search_generation
+from services.api.spatial import CitySpatialIndexes, invalidate_spatial_index
 from services.api.scrapers.blog_rss import BlogRssScraper, FeedSource
 from services.api.scrapers.atlas_obscura import AtlasObscuraScraper
 from services.api.scrapers.arctic_shift import ArcticShiftScraper
@@ -497,7 +499,9 @@ async def _step_entity_resolution(
 
     Runs incremental resolution on nodes created since the scrape started.
     """
-    resolver = EntityResolver(pool)
+    # The scrape just added nodes: rebuild the city's index on first use
+    invalidate_spatial_index(city)
+    resolver = EntityResolver(pool, spatial_indexes=CitySpatialIndexes(pool))
 
     # Use the scrape start time as the since threshold
     scrape_step = progress.steps.get(PipelineStep.SCRAPE.value)
@@ -575,10 +579,28 @@ async def _step_convergence(
     Step 5: Convergence + authority scoring.
 
     Scores all canonical nodes based on cross-source convergence.
+    Full scoring for the initial seed; re-runs only rescore nodes whose
+    signals or vibe tags changed since the last error-free scoring pass.
     """
-    stats = await run_convergence_scoring(pool)
+    # The step is already IN_PROGRESS here, so the watermark comes from the
+    # metrics of the last successful run (a failed run leaves them untouched).
+    convergence_step = progress.steps.get(PipelineStep.CONVERGENCE.value)
+    scored_through = convergence_step.metrics.get("scored_through") if convergence_step else None
+
+    if scored_through:
+        since = datetime.fromisoformat(scored_through).replace(tzinfo=None)
+        stats = await run_convergence_scoring(pool, since=since)
+    else:
+        stats = await run_convergence_scoring(pool)
+
+    # A failed batch's nodes were not rescored, so only an error-free pass
+    # advances the watermark; otherwise the next run starts from the old one.
+    if stats.errors == 0:
+        scored_through = stats.started_at.isoformat()
 
     return {
+        "mode": stats.mode,
+        "scored_through": scored_through,
         "nodes_processed": stats.nodes_processed,
         "nodes_updated": stats.nodes_updated,
         "nodes_skipped": stats.nodes_skipped,
@@ -616,17 +638,21 @@ async def _step_qdrant_sync(
         # Full sync for first run
         stats = await qdrant_sync.run_full_sync(pool, embedding_service)
 
-    progress.nodes_indexed = stats.nodes_upserted
+    progress.nodes_indexed = stats.nodes_upserted + stats.nodes_payload_only
 
     return {
         "mode": stats.mode,
         "nodes_fetched": stats.nodes_fetched,
         "nodes_embedded": stats.nodes_embedded,
         "nodes_upserted": stats.nodes_upserted,
+        "nodes_payload_only": stats.nodes_payload_only,
         "nodes_skipped": stats.nodes_skipped,
         "errors": stats.errors,
         "embedding_time_s": round(stats.embedding_time_s, 2),
         "upsert_time_s": round(stats.upsert_time_s, 2),
+        "throughput_nodes_per_s": stats.stage_throughput(),
+        "embed_queue_peak": stats.embed_queue_peak,
+        "upsert_queue_peak": stats.upsert_queue_peak,
         "error_details": stats.error_details[:10],
     }
 
@@ -644,6 +670,7 @@ async def seed_city(
     skip_scrape: bool = False,
     skip_llm: bool = False,
     force_restart: bool = False,
+    redis_client=None,
 ) -> SeedResult:
     """
     Seed a city end-to-end with checkpoint/resume.
@@ -663,6 +690,8 @@ async def seed_city(
         skip_scrape: If True, skip the scraping step (useful for re-processing).
         skip_llm: If True, skip LLM extraction (saves API cost during dev).
         force_restart: If True, ignore existing progress and start fresh.
+        redis_client: If set, a completed Qdrant sync bumps the city's search
+            generation, invalidating cached LLM rankings for the city.
 
     Returns:
         SeedResult with aggregate counters and per-step outcomes.
@@ -928,6 +957,9 @@ async def seed_city(
         try:
             metrics = await _step_qdrant_sync(pool, city, embedding_service, progress)
             result.nodes_indexed = progress.nodes_indexed
+            if redis_client is not None:
+                metrics["search_generation"] = await bump_search_generation(redis_client, city)
+            invalidate_spatial_index(city)
             _mark_step_done(progress, PipelineStep.QDRANT_SYNC, metrics)
             result.steps_completed += 1
         except Exception as exc:
@@ -1013,6 +1045,8 @@ async def main() -> None:
     parser = argparse.ArgumentParser(description="Seed a city with all data sources")
     parser.add_argument("city", help="City name/slug (e.g. tokyo, new-york)")
     parser.add_argument("--database-url", default=os.environ.get("DATABASE_URL"))
+    parser.add_argument("--redis-url", default=os.environ.get("REDIS_URL"),
+                        help="Bump the city's search generation after Qdrant sync")
     parser.add_argument("--skip-scrape", action="store_true", help="Skip scraping step")
     parser.add_argument("--skip-llm", action="store_true", help="Skip LLM extraction")
     parser.add_argument("--force-restart", action="store_true", help="Ignore existing progress")
@@ -1031,6 +1065,11 @@ async def main() -> None:
     from services.api.embedding.service import EmbeddingService
     embedding_service = EmbeddingService()
 
+    redis_client = None
+    if args.redis_url:
+        import redis.asyncio as aioredis
+        redis_client = aioredis.from_url(args.redis_url, decode_responses=True)
+
     pool = await asyncpg.create_pool(args.database_url)
     try:
         result = await seed_city(
@@ -1040,6 +1079,7 @@ async def main() -> None:
             skip_llm=args.skip_llm,
             force_restart=args.force_restart,
             embedding_service=embedding_service,
+            redis_client=redis_client,
         )
 
         if not result.success:
@@ -1049,6 +1089,8 @@ async def main() -> None:
         logger.info("Seed complete: %s", result)
     finally:
         await pool.close()
+        if redis_client is not None:
+            await redis_client.aclose()
 
 
 if __name__ == "__main__":
@@ -17,9 +17,17 @@ Also computes per-node:
     Stored in convergence output / canary report (no DB column yet).
 
 Runs after entity resolution and vibe tag extraction.
-Writes convergenceScore, authorityScore, and tourist_score to ActivityNode.
+Writes convergenceScore, authorityScore, sourceCount and tourist_score to
+ActivityNode — one set-based UPDATE ... FROM unnest(...) per batch, with
+batches running concurrently on pooled connections.
+
+Incremental mode (since=...) only rescores nodes that gained quality signals
+or vibe tags after the given time, or absorbed a node merged into them by
+entity resolution after it (the merge re-points signals and tags without
+touching their createdAt, but stamps the loser's updatedAt).
 """
 
+import asyncio
 import json
 import logging
 from dataclasses import dataclass
@@ -70,6 +78,9 @@ _HARMONIC_EPSILON = 1e-9
 _VIBE_CONF_SOURCE_CAP = 5.0    # cap source diversity at 5 unique sources
 _VIBE_CONF_MENTION_CAP = 20.0  # cap mention count normalisation at 20
 
+# Batches scored in parallel, each on its own pooled connection
+SCORING_CONCURRENCY = 4
+
 
 # ---------------------------------------------------------------------------
 # Stats
@@ -83,7 +94,9 @@ class ConvergenceStats:
     nodes_skipped: int = 0  # no quality signals
     vibe_boosts_applied: int = 0
     tourist_scores_written: int = 0
+    batches: int = 0
     errors: int = 0
+    mode: str = "full"  # "full" or "incremental"
     started_at: Optional[datetime] = None
     finished_at: Optional[datetime] = None
 
@@ -238,75 +251,211 @@ def compute_vibe_confidence(
     return round(numerator / denominator, 4)
 
 
+@dataclass
+class NodeScore:
+    """Scores computed for one node in a batch, ready to persist."""
+    node_id: str
+    convergence: float
+    authority: float
+    source_count: int
+    tourist_score: Optional[float]
+    vibe_confidence: float
+    vibe_boost: bool
+
+
+def _parse_metadata(raw_meta) -> Optional[dict]:
+    """extractionMetadata may be stored as a JSON string or already a dict."""
+    if isinstance(raw_meta, dict):
+        return raw_meta
+    if isinstance(raw_meta, str):
+        try:
+            meta = json.loads(raw_meta)
+        except (ValueError, TypeError):
+            return None
+        return meta if isinstance(meta, dict) else None
+    return None
+
+
+def score_nodes(
+    node_ids: list[str],
+    signal_rows,
+    vibe_agreement_ids: set[str],
+) -> list[NodeScore]:
+    """
+    Score a batch of nodes in one pass over their grouped quality signals.
+
+    Args:
+        node_ids: Nodes to score, in output order.
+        signal_rows: quality_signals rows (activityNodeId, sourceName,
+            sourceAuthority, signalType, extractionMetadata) for those nodes.
+        vibe_agreement_ids: Nodes with 3+ sources agreeing on one vibe tag.
+
+    Returns:
+        One NodeScore per node that has at least one signal. Nodes without
+        signals are omitted (their scores are left untouched).
+    """
+    # Group by node — per node we track, in one pass:
+    #   first-seen (source, resolved authority, signal type) per source name,
+    #   total mention count, and overrated_flag count.
+    grouped: dict[str, tuple[dict[str, tuple[float, str]], list[int]]] = {}
+    for row in signal_rows:
+        nid = row["activityNodeId"]
+        entry = grouped.get(nid)
+        if entry is None:
+            entry = grouped[nid] = ({}, [0, 0])
+        sources, counts = entry
+
+        source_name = row["sourceName"]
+        if source_name not in sources:
+            sources[source_name] = (
+                resolve_authority(source_name, row["sourceAuthority"]),
+                row.get("signalType") or "mention",
+            )
+        counts[0] += 1
+        meta = _parse_metadata(row.get("extractionMetadata"))
+        if meta and meta.get("overrated_flag") is True:
+            counts[1] += 1
+
+    scores: list[NodeScore] = []
+    for nid in node_ids:
+        entry = grouped.get(nid)
+        if entry is None:
+            continue
+        sources, (total_mentions, overrated_count) = entry
+
+        has_vibe = nid in vibe_agreement_ids
+        unique_sources = len(sources)
+        scores.append(NodeScore(
+            node_id=nid,
+            convergence=compute_convergence_score(unique_sources, has_vibe),
+            authority=compute_authority_score_with_local_weighting(
+                [(name, auth, stype) for name, (auth, stype) in sources.items()]
+            ),
+            source_count=unique_sources,
+            tourist_score=compute_tourist_score(overrated_count, total_mentions),
+            vibe_confidence=compute_vibe_confidence(unique_sources, total_mentions),
+            vibe_boost=has_vibe,
+        ))
+    return scores
+
+
 # ---------------------------------------------------------------------------
 # Main runner
 # ---------------------------------------------------------------------------
 
+async def _select_target_nodes(
+    conn: asyncpg.Connection,
+    *,
+    node_ids: Optional[list[str]],
+    since: Optional[datetime],
+) -> list[str]:
+    """Canonical node IDs to score, optionally limited to IDs and/or changes since a time."""
+    conditions = ['an."isCanonical" = true']
+    params: list = []
+
+    if node_ids:
+        params.append(node_ids)
+        conditions.append(f"an.id = ANY(${len(params)}::text[])")
+
+    if since is not None:
+        params.append(since)
+        p = f"${len(params)}"
+        conditions.append(
+            f"""(
+              EXISTS (
+                SELECT 1 FROM quality_signals qs
+                WHERE qs."activityNodeId" = an.id AND qs."createdAt" > {p}
+              )
+              OR EXISTS (
+                SELECT 1 FROM activity_node_vibe_tags vt
+                WHERE vt."activityNodeId" = an.id AND vt."createdAt" > {p}
+              )
+              OR EXISTS (
+                SELECT 1 FROM activity_nodes merged
+                WHERE merged."resolvedToId" = an.id AND merged."updatedAt" > {p}
+              )
+            )"""
+        )
+
+    rows = await conn.fetch(
+        f"""
+        SELECT an.id FROM activity_nodes an
+        WHERE {" AND ".join(conditions)}
+        ORDER BY an."createdAt"
+        """,
+        *params,
+    )
+    return [r["id"] for r in rows]
+
+
 async def run_convergence_scoring(
     pool: asyncpg.Pool,
     *,
     batch_size: int = 500,
     node_ids: Optional[list[str]] = None,
+    since: Optional[datetime] = None,
+    concurrency: int = SCORING_CONCURRENCY,
 ) -> ConvergenceStats:
     """
-    Score all canonical ActivityNodes for convergence and authority.
+    Score canonical ActivityNodes for convergence and authority.
+
+    Each batch is fetched, scored in memory and written back with a single
+    set-based UPDATE on its own pooled connection; up to `concurrency`
+    batches run at once.
 
     Args:
         pool: asyncpg connection pool.
-        batch_size: Nodes per DB round-trip.
+        batch_size: Nodes per batch (one signal fetch + one UPDATE).
         node_ids: Optional specific node IDs. If None, scores all canonical nodes.
+        since: Incremental mode — only rescore nodes that gained quality
+            signals or vibe tags, or absorbed a merged node, after this time.
+        concurrency: Max batches in flight (bounded by pool size).
 
     Returns:
         ConvergenceStats with processing counts.
     """
-    stats = ConvergenceStats(started_at=datetime.now(timezone.utc))
+    stats = ConvergenceStats(
+        started_at=datetime.now(timezone.utc),
+        mode="incremental" if since is not None else "full",
+    )
 
     async with pool.acquire() as conn:
-        # 1. Get target nodes
-        if node_ids:
-            nodes = await conn.fetch(
-                """
-                SELECT id FROM activity_nodes
-                WHERE id = ANY($1::text[])
-                  AND "isCanonical" = true
-                """,
-                node_ids,
-            )
-        else:
-            nodes = await conn.fetch(
-                """
-                SELECT id FROM activity_nodes
-                WHERE "isCanonical" = true
-                ORDER BY "createdAt"
-                """,
-            )
-
-        logger.info("Convergence scoring: %d nodes to process", len(nodes))
+        all_node_ids = await _select_target_nodes(conn, node_ids=node_ids, since=since)
 
-        # 2. Process in batches
-        all_node_ids = [r["id"] for r in nodes]
+    logger.info(
+        "Convergence scoring (%s): %d nodes to process", stats.mode, len(all_node_ids)
+    )
 
-        for offset in range(0, len(all_node_ids), batch_size):
-            batch_ids = all_node_ids[offset : offset + batch_size]
+    semaphore = asyncio.Semaphore(max(1, concurrency))
 
+    async def run_batch(offset: int) -> None:
+        batch_ids = all_node_ids[offset : offset + batch_size]
+        async with semaphore:
             try:
-                updated = await _score_batch(conn, batch_ids, stats)
+                async with pool.acquire() as batch_conn:
+                    updated = await _score_batch(batch_conn, batch_ids, stats)
                 stats.nodes_updated += updated
+                stats.batches += 1
             except Exception:
                 logger.exception(
                     "Convergence scoring failed for batch at offset %d", offset
                 )
                 stats.errors += 1
 
+    await asyncio.gather(*(
+        run_batch(offset) for offset in range(0, len(all_node_ids), batch_size)
+    ))
+
     stats.finished_at = datetime.now(timezone.utc)
     logger.info(
         "Convergence scoring complete: %d processed, %d updated, %d skipped, "
-        "%d vibe boosts, %d tourist scores written, %d errors",
+        "%d vibe boosts, %d tourist scores written, %d batches, %d errors",
         stats.nodes_processed,
         stats.nodes_updated,
         stats.nodes_skipped,
         stats.vibe_boosts_applied,
         stats.tourist_scores_written,
+        stats.batches,
         stats.errors,
     )
     return stats
@@ -319,7 +468,7 @@ async def _score_batch(
 ) -> int:
     """Score a batch of nodes. Returns count of nodes actually updated."""
 
-    # Fetch quality signals grouped by node (include signalType for local weighting
+    # Fetch quality signals for the batch (include signalType for local weighting
     # and extractionMetadata for tourist_score aggregation)
     signals = await conn.fetch(
         """
@@ -335,38 +484,10 @@ async def _score_batch(
         node_ids,
     )
 
-    # Group signals by node — store (source_name, authority, signal_type, metadata)
-    NodeSignalRow = tuple[str, Optional[float], str, Optional[dict]]
-    node_signals: dict[str, list[NodeSignalRow]] = {}
-    for row in signals:
-        nid = row["activityNodeId"]
-        if nid not in node_signals:
-            node_signals[nid] = []
-
-        # extractionMetadata may be stored as a JSON string or already a dict
-        raw_meta = row.get("extractionMetadata")
-        meta: Optional[dict] = None
-        if raw_meta is not None:
-            if isinstance(raw_meta, str):
-                try:
-                    meta = json.loads(raw_meta)
-                except (ValueError, TypeError):
-                    meta = None
-            elif isinstance(raw_meta, dict):
-                meta = raw_meta
-
-        node_signals[nid].append((
-            row["sourceName"],
-            row["sourceAuthority"],
-            row.get("signalType") or "mention",
-            meta,
-        ))
-
-    # Fetch vibe tag source counts per node — how many distinct sources
-    # wrote the same vibe tag for a given node
+    # Nodes where 3+ distinct sources wrote the same vibe tag
     vibe_agreement = await conn.fetch(
         """
-        SELECT "activityNodeId", "vibeTagId", COUNT(DISTINCT source) AS source_count
+        SELECT DISTINCT "activityNodeId"
         FROM activity_node_vibe_tags
         WHERE "activityNodeId" = ANY($1::text[])
         GROUP BY "activityNodeId", "vibeTagId"
@@ -374,93 +495,46 @@ async def _score_batch(
         """,
         node_ids,
     )
-
-    # Set of node IDs that have vibe tag agreement (3+ sources on same tag)
     nodes_with_vibe_agreement: set[str] = {r["activityNodeId"] for r in vibe_agreement}
 
-    # Score each node
-    updated = 0
-    for nid in node_ids:
-        stats.nodes_processed += 1
-
-        all_signals = node_signals.get(nid)
-        if not all_signals:
-            stats.nodes_skipped += 1
-            continue
+    scores = score_nodes(node_ids, signals, nodes_with_vibe_agreement)
 
-        # Deduplicate by source_name — keep the first occurrence per source for
-        # convergence counting, but accumulate all for local-weighted authority.
-        # We also keep all rows for tourist_score aggregation (per-mention).
-        seen_sources: set[str] = set()
-        unique_source_triples: list[tuple[str, float, str]] = []
-        for source_name, db_authority, signal_type, _meta in all_signals:
-            if source_name not in seen_sources:
-                seen_sources.add(source_name)
-                authority = resolve_authority(source_name, db_authority)
-                unique_source_triples.append((source_name, authority, signal_type))
-
-        has_vibe = nid in nodes_with_vibe_agreement
-        if has_vibe:
-            stats.vibe_boosts_applied += 1
+    stats.nodes_processed += len(node_ids)
+    stats.nodes_skipped += len(node_ids) - len(scores)
+    if not scores:
+        return 0
 
-        convergence = compute_convergence_score(len(seen_sources), has_vibe)
-
-        # Authority with local 3x weighting
-        authority = compute_authority_score_with_local_weighting(unique_source_triples)
+    # One set-based write for the batch. tourist_score is only overwritten
+    # when it crosses a threshold (NULL in the array keeps the existing value).
+    await conn.execute(
+        """
+        UPDATE activity_nodes AS an
+        SET "convergenceScore" = s.convergence,
+            "authorityScore" = s.authority,
+            "sourceCount" = s.source_count,
+            tourist_score = COALESCE(s.tourist_score, an.tourist_score),
+            "updatedAt" = NOW()
+        FROM unnest($1::text[], $2::float8[], $3::float8[], $4::int[], $5::float8[])
+            AS s(id, convergence, authority, source_count, tourist_score)
+        WHERE an.id = s.id
+        """,
+        [s.node_id for s in scores],
+        [s.convergence for s in scores],
+        [s.authority for s in scores],
+        [s.source_count for s in scores],
+        [s.tourist_score for s in scores],
+    )
 
-        # Tourist score — aggregate overrated_flag from extraction metadata
-        overrated_count = sum(
-            1 for _sn, _sa, _st, meta in all_signals
-            if meta and meta.get("overrated_flag") is True
-        )
-        total_mentions = len(all_signals)
-        tourist_score = compute_tourist_score(overrated_count, total_mentions)
-
-        # Vibe confidence — harmonic mean of source diversity + mention count
-        vibe_confidence = compute_vibe_confidence(len(seen_sources), total_mentions)
-
-        # Write convergence + authority + tourist_score back to ActivityNode.
-        # tourist_score is only written when it crosses a threshold (not None).
-        if tourist_score is not None:
-            await conn.execute(
-                """
-                UPDATE activity_nodes
-                SET "convergenceScore" = $1,
-                    "authorityScore" = $2,
-                    "sourceCount" = $3,
-                    tourist_score = $4,
-                    "updatedAt" = NOW()
-                WHERE id = $5
-                """,
-                convergence,
-                authority,
-                len(seen_sources),
-                tourist_score,
-                nid,
-            )
+    for s in scores:
+        if s.vibe_boost:
+            stats.vibe_boosts_applied += 1
+        if s.tourist_score is not None:
             stats.tourist_scores_written += 1
-        else:
-            await conn.execute(
-                """
-                UPDATE activity_nodes
-                SET "convergenceScore" = $1,
-                    "authorityScore" = $2,
-                    "sourceCount" = $3,
-                    "updatedAt" = NOW()
-                WHERE id = $4
-                """,
-                convergence,
-                authority,
-                len(seen_sources),
-                nid,
-            )
-
         logger.debug(
             "Node %s: convergence=%.3f authority=%.3f tourist=%s vibe_confidence=%.3f",
-            nid, convergence, authority,
-            f"{tourist_score:.3f}" if tourist_score is not None else "unchanged",
-            vibe_confidence,
+            s.node_id, s.convergence, s.authority,
+            f"{s.tourist_score:.3f}" if s.tourist_score is not None else "unchanged",
+            s.vibe_confidence,
         )
-        updated += 1
 
-    return updated
+    return len(scores)
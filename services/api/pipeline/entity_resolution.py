@@ -4,7 +4,8 @@ Entity resolution for ActivityNodes — the "7-Eleven problem."
 Resolves multiple references to the same real-world venue into a single
 canonical ActivityNode through a 4-tier matching cascade:
   1. External ID match (foursquareId / googlePlaceId)
-  2. Geocode proximity (PostGIS ST_DWithin < 50m) + same category
+  2. Geocode proximity (PostGIS ST_DWithin < 50m, or the in-memory city
+     index from services.api.spatial) + same category
   3. Fuzzy name (pg_trgm similarity > 0.7 on canonicalName)
   4. Content hash (SHA-256 of normalized name + lat + lng + category)
 
@@ -26,6 +27,8 @@ from uuid import uuid4
 
 import asyncpg
 
+from services.api.spatial import CitySpatialIndexes, discard_node
+
 logger = logging.getLogger(__name__)
 
 
@@ -246,6 +249,10 @@ class EntityResolver:
         resolver = EntityResolver(pool)
         stats = await resolver.resolve_incremental()   # after each scrape
         stats = await resolver.resolve_full_sweep()     # weekly cron
+
+    With ``spatial_indexes`` the Tier 2 geocode check is answered from the
+    node's in-memory city index instead of a PostGIS query per node; merged
+    losers are discarded from loaded indexes as merges commit.
     """
 
     # Geocode proximity threshold in meters
@@ -254,8 +261,9 @@ class EntityResolver:
     # pg_trgm similarity threshold
     FUZZY_THRESHOLD = 0.7
 
-    def __init__(self, pool: asyncpg.Pool):
+    def __init__(self, pool: asyncpg.Pool, spatial_indexes: Optional[CitySpatialIndexes] = None):
         self.pool = pool
+        self.spatial_indexes = spatial_indexes
 
     # ------------------------------------------------------------------
     # Public API
@@ -471,7 +479,14 @@ class EntityResolver:
         Excludes exact-coordinate matches (distance < 1m) — those are
         fallback city-center coordinates from LLM extraction, not real
         geocoded positions.
+
+        When a city index is available the same check runs in memory
+        (haversine distance, same-city nodes only).
         """
+        indexed = await self._match_geocode_indexed(node)
+        if indexed is not None:
+            return indexed
+
         matches = await conn.fetch(
             """
             SELECT id, "canonicalName"
@@ -511,6 +526,35 @@ class EntityResolver:
 
         return candidates
 
+    async def _match_geocode_indexed(
+        self, node: asyncpg.Record
+    ) -> Optional[list[MergeCandidate]]:
+        """Tier 2 from the city index; None when no index is available."""
+        if self.spatial_indexes is None or not node["city"]:
+            return None
+        if node["latitude"] is None or node["longitude"] is None:
+            return None
+        index = await self.spatial_indexes.get(node["city"])
+        if index is None:
+            return None
+
+        mask = index.mask(category=node["category"], exclude_ids=[node["id"]])
+        positions, dist = index.within(
+            node["latitude"], node["longitude"], self.PROXIMITY_METERS, mask
+        )
+
+        candidates = []
+        for pos in positions[dist > 1.0]:
+            winner_id, loser_id = self._pick_winner(None, index.ids[pos], node["id"])
+            candidates.append(MergeCandidate(
+                winner_id=winner_id,
+                loser_id=loser_id,
+                tier=MatchTier.GEOCODE,
+                confidence=0.85,
+                detail=f"within {self.PROXIMITY_METERS}m, same category={node['category']}",
+            ))
+        return candidates
+
     async def _match_fuzzy_name(
         self, conn: asyncpg.Connection, node: asyncpg.Record
     ) -> list[MergeCandidate]:
@@ -898,6 +942,9 @@ class EntityResolver:
                 candidate.winner_id,
             )
 
+        if self.spatial_indexes is not None:
+            discard_node(candidate.loser_id)
+
         logger.info(
             "Merge complete: %s → %s | signals=%d tags=%d tier=%s",
             candidate.loser_id[:8],
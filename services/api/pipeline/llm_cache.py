@@ -0,0 +1,363 @@
+"""
+Content-addressed response cache for pipeline LLM calls.
+
+Re-running a pipeline step (seed_city with force_restart, vibe extraction
+after a crash, a research job retry) re-sends byte-identical requests:
+same model, same prompt version, same node name/description/excerpts.
+LLMResponseCache stores each response body that parsed and validated under
+
+    sha256(model, prompt_version, normalized request payload)
+
+in a local SQLite file, so a replay is served from disk without a network
+round-trip, a scheduler slot, or a bill.
+
+Normalization: strings are NFC-normalized, CRLF folded to LF and stripped;
+dict keys are sorted. Anything that changes the meaning of the request
+(system prompt, max_tokens, tools) is part of the payload and therefore of
+the key. Bump the caller's PROMPT_VERSION to invalidate old entries.
+
+Callers put() a body only after it parsed and validated, and evict() an
+entry whose replay fails to parse (treating it as a miss), so a malformed
+response is never served twice.
+
+The file is bounded: an entry older than ttl_s is a miss (and is deleted),
+and every PRUNE_EVERY writes the table is trimmed to max_rows, dropping the
+least-hit, then oldest, entries first.
+
+Config (env, read when the default cache is first requested):
+  LLM_CACHE_PATH      SQLite file (default services/api/data/llm_cache/
+                      responses.sqlite3, independent of the working directory)
+  LLM_CACHE_DISABLED  "1"/"true" turns the default cache off
+  LLM_CACHE_TTL_DAYS  entry lifetime in days (default 30; 0 = no expiry)
+  LLM_CACHE_MAX_ROWS  row cap (default 50000; 0 = unbounded)
+
+Used by:
+  - pipeline/vibe_extraction.py (_call_haiku)
+  - pipeline/llm_fallback_seeder.py (_call_haiku_extract)
+  - pipeline/research_llm.py (Pass A / Pass B)
+  - pipeline/backfill_llm.py (_create_message / _store_message)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import unicodedata
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Anchored to services/api/data, not the process working directory
+DEFAULT_CACHE_PATH = (
+    Path(__file__).resolve().parent.parent / "data" / "llm_cache" / "responses.sqlite3"
+)
+
+DEFAULT_TTL_DAYS = 30
+DEFAULT_MAX_ROWS = 50_000
+# Writes between max_rows trims (a trim is a table scan; a write is not)
+PRUNE_EVERY = 200
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_responses (
+    key            TEXT PRIMARY KEY,
+    model          TEXT NOT NULL,
+    prompt_version TEXT NOT NULL,
+    body           TEXT NOT NULL,
+    input_tokens   INTEGER NOT NULL DEFAULT 0,
+    output_tokens  INTEGER NOT NULL DEFAULT 0,
+    created_at     TEXT NOT NULL,
+    hit_count      INTEGER NOT NULL DEFAULT 0
+)
+"""
+
+_INDEX = "CREATE INDEX IF NOT EXISTS llm_responses_created_at ON llm_responses (created_at)"
+
+
+def _now_iso() -> str:
+    # Fixed width so created_at compares correctly as text
+    return datetime.now(timezone.utc).isoformat(timespec="microseconds")
+
+
+def _normalize(value: Any) -> Any:
+    """Canonical form of a request payload for hashing."""
+    if isinstance(value, str):
+        return unicodedata.normalize("NFC", value).replace("\r\n", "\n").strip()
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def cache_key(model: str, prompt_version: str, payload: dict) -> str:
+    """Content address for one request: hex sha256 of the normalized triple."""
+    canonical = json.dumps(
+        [model, prompt_version, _normalize(payload)],
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CachedResponse:
+    """A stored response body plus the usage it originally cost."""
+    body: dict
+    input_tokens: int
+    output_tokens: int
+
+    def cost_usd(self, input_cost_per_1m: float, output_cost_per_1m: float) -> float:
+        """What this response cost when it was first fetched (= saved on a hit)."""
+        return (
+            (self.input_tokens / 1_000_000) * input_cost_per_1m
+            + (self.output_tokens / 1_000_000) * output_cost_per_1m
+        )
+
+
+@dataclass
+class CacheStats:
+    """Lifetime counters for one cache instance."""
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+    expired: int = 0
+    pruned: int = 0
+    saved_input_tokens: int = 0
+    saved_output_tokens: int = 0
+    errors: list[str] = field(default_factory=list)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class LLMResponseCache:
+    """
+    SQLite-backed response cache. See module docstring.
+
+    Lookups and writes are synchronous single-row statements against a WAL
+    database (sub-millisecond), so they are called inline from async code.
+    A cache failure never fails the caller: errors are logged and treated
+    as a miss / skipped write.
+
+    ttl_s / max_rows of None (or 0) disable expiry / the row cap.
+    """
+
+    def __init__(
+        self,
+        path: Path | str = DEFAULT_CACHE_PATH,
+        *,
+        ttl_s: Optional[float] = DEFAULT_TTL_DAYS * 86400,
+        max_rows: Optional[int] = DEFAULT_MAX_ROWS,
+    ) -> None:
+        self.path = Path(path)
+        self.ttl_s = ttl_s or None
+        self.max_rows = max_rows or None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.execute(_INDEX)
+        self._conn.commit()
+        self.prune()
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()
+        return count
+
+    def _cutoff(self) -> Optional[str]:
+        if self.ttl_s is None:
+            return None
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.ttl_s)
+        return cutoff.isoformat(timespec="microseconds")
+
+    def get(self, model: str, prompt_version: str, payload: dict) -> Optional[CachedResponse]:
+        """Return the stored response for this request, or None (also when expired)."""
+        key = cache_key(model, prompt_version, payload)
+        cutoff = self._cutoff()
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT body, input_tokens, output_tokens, created_at"
+                    " FROM llm_responses WHERE key = ?",
+                    (key,),
+                ).fetchone()
+                if row is not None and cutoff is not None and row[3] < cutoff:
+                    self._conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                    self._conn.commit()
+                    self.stats.expired += 1
+                    row = None
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE llm_responses SET hit_count = hit_count + 1 WHERE key = ?",
+                        (key,),
+                    )
+                    self._conn.commit()
+        except sqlite3.Error as exc:
+            logger.warning("LLM cache read failed (%s): %s", self.path, exc)
+            self.stats.errors.append(str(exc))
+            row = None
+
+        body = None
+        if row is not None:
+            try:
+                body = json.loads(row[0])
+            except ValueError:
+                logger.warning("LLM cache entry %s is not valid JSON; evicting", key[:12])
+                self.evict(model, prompt_version, payload)
+        if not isinstance(body, dict):
+            self.stats.misses += 1
+            return None
+
+        entry = CachedResponse(body=body, input_tokens=row[1], output_tokens=row[2])
+        self.stats.hits += 1
+        self.stats.saved_input_tokens += entry.input_tokens
+        self.stats.saved_output_tokens += entry.output_tokens
+        return entry
+
+    def put(self, model: str, prompt_version: str, payload: dict, body: dict) -> None:
+        """Store a successful response body. Token usage is read from body["usage"]."""
+        usage = body.get("usage") or {}
+        try:
+            with self._lock:
+                self._conn.execute(
+                    """
+                    INSERT OR REPLACE INTO llm_responses
+                        (key, model, prompt_version, body, input_tokens, output_tokens, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        cache_key(model, prompt_version, payload),
+                        model,
+                        prompt_version,
+                        json.dumps(body, ensure_ascii=False),
+                        int(usage.get("input_tokens") or 0),
+                        int(usage.get("output_tokens") or 0),
+                        _now_iso(),
+                    ),
+                )
+                self._conn.commit()
+        except (sqlite3.Error, TypeError, ValueError) as exc:
+            logger.warning("LLM cache write failed (%s): %s", self.path, exc)
+            self.stats.errors.append(str(exc))
+            return
+        self.stats.writes += 1
+        if self.stats.writes % PRUNE_EVERY == 0:
+            self.prune()
+
+    def prune(self) -> int:
+        """
+        Delete expired entries, then trim to max_rows (least-hit, then oldest,
+        go first). Returns rows deleted.
+        """
+        cutoff = self._cutoff()
+        deleted = 0
+        try:
+            with self._lock:
+                if cutoff is not None:
+                    cur = self._conn.execute(
+                        "DELETE FROM llm_responses WHERE created_at < ?", (cutoff,),
+                    )
+                    deleted += max(cur.rowcount, 0)
+                if self.max_rows is not None:
+                    cur = self._conn.execute(
+                        """
+                        DELETE FROM llm_responses WHERE key IN (
+                            SELECT key FROM llm_responses
+                            ORDER BY hit_count DESC, created_at DESC
+                            LIMIT -1 OFFSET ?
+                        )
+                        """,
+                        (self.max_rows,),
+                    )
+                    deleted += max(cur.rowcount, 0)
+                self._conn.commit()
+        except sqlite3.Error as exc:
+            logger.warning("LLM cache prune failed (%s): %s", self.path, exc)
+            self.stats.errors.append(str(exc))
+            return 0
+        self.stats.pruned += deleted
+        return deleted
+
+    def evict(
+        self,
+        model: str,
+        prompt_version: str,
+        payload: dict,
+        entry: Optional[CachedResponse] = None,
+    ) -> None:
+        """
+        Delete one entry (e.g. a body that no longer parses). Pass the entry
+        get() returned to count that lookup as a miss instead of a hit.
+        """
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "DELETE FROM llm_responses WHERE key = ?",
+                    (cache_key(model, prompt_version, payload),),
+                )
+                self._conn.commit()
+        except sqlite3.Error as exc:
+            logger.warning("LLM cache evict failed (%s): %s", self.path, exc)
+            self.stats.errors.append(str(exc))
+        self.stats.evictions += 1
+        if entry is not None:
+            self.stats.hits -= 1
+            self.stats.misses += 1
+            self.stats.saved_input_tokens -= entry.input_tokens
+            self.stats.saved_output_tokens -= entry.output_tokens
+
+    def clear(self, prompt_version: Optional[str] = None) -> int:
+        """Delete all entries (or one prompt version's). Returns rows deleted."""
+        with self._lock:
+            if prompt_version is None:
+                cur = self._conn.execute("DELETE FROM llm_responses")
+            else:
+                cur = self._conn.execute(
+                    "DELETE FROM llm_responses WHERE prompt_version = ?", (prompt_version,),
+                )
+            self._conn.commit()
+        return cur.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_default_cache: Optional[LLMResponseCache] = None
+
+
+def get_default_cache() -> Optional[LLMResponseCache]:
+    """
+    Process-wide cache at LLM_CACHE_PATH, or None when LLM_CACHE_DISABLED
+    is set or the file cannot be opened. LLM_CACHE_TTL_DAYS and
+    LLM_CACHE_MAX_ROWS override the eviction bounds.
+    """
+    global _default_cache
+    if os.environ.get("LLM_CACHE_DISABLED", "").lower() in ("1", "true", "yes"):
+        return None
+    if _default_cache is None:
+        path = os.environ.get("LLM_CACHE_PATH") or DEFAULT_CACHE_PATH
+        try:
+            ttl_days = float(os.environ.get("LLM_CACHE_TTL_DAYS") or DEFAULT_TTL_DAYS)
+            max_rows = int(os.environ.get("LLM_CACHE_MAX_ROWS") or DEFAULT_MAX_ROWS)
+            _default_cache = LLMResponseCache(path, ttl_s=ttl_days * 86400, max_rows=max_rows)
+        except (OSError, sqlite3.Error, ValueError) as exc:
+            logger.warning("LLM response cache unavailable at %s: %s", path, exc)
+            return None
+    return _default_cache
@@ -51,6 +51,8 @@ from services.api.pipeline.gcs_raw_store import (
     write_raw_signals_to_gcs,
     write_geocoded_venues_to_gcs,
 )
+from services.api.pipeline.llm_cache import LLMResponseCache, get_default_cache
+from services.api.pipeline.llm_scheduler import LLMWorkScheduler, SchedulerConfig
 
 logger = logging.getLogger(__name__)
 
@@ -66,6 +68,11 @@ BATCH_SIZE = 5  # signals per LLM call (excerpts can be long)
 MAX_RETRIES = 3
 RETRY_BACKOFF_BASE = 2.0
 
+# Concurrency + provider limits for the shared LLM scheduler
+MAX_CONCURRENCY = 6
+REQUESTS_PER_MINUTE = 50
+TOKENS_PER_MINUTE = 50_000
+
 # Haiku pricing (per 1M tokens, Feb 2026)
 INPUT_COST_PER_1M = 0.80
 OUTPUT_COST_PER_1M = 4.00
@@ -135,6 +142,9 @@ class FallbackStats:
     total_output_tokens: int = 0
     estimated_cost_usd: float = 0.0
     latency_seconds: float = 0.0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    cache_saved_usd: float = 0.0
     errors: list[str] = field(default_factory=list)
 
 
@@ -251,25 +261,36 @@ def _build_user_prompt(city_name: str, excerpts: list[dict[str, str]]) -> str:
 # LLM client
 # ---------------------------------------------------------------------------
 
+def _build_payload(city_name: str, excerpts: list[dict[str, str]]) -> dict:
+    """Messages API request body for one batch (also the response cache key)."""
+    return {
+        "model": MODEL_NAME,
+        "max_tokens": 1024,
+        "system": SYSTEM_PROMPT,
+        "messages": [{"role": "user", "content": _build_user_prompt(city_name, excerpts)}],
+    }
+
+
+def _response_text(body: dict) -> str:
+    return "".join(
+        block["text"] for block in body.get("content", []) if block.get("type") == "text"
+    )
+
+
 async def _call_haiku_extract(
     client: httpx.AsyncClient,
     api_key: str,
     city_name: str,
     excerpts: list[dict[str, str]],
+    cache: Optional[LLMResponseCache] = None,
 ) -> tuple[list[dict], int, int]:
     """
     Call Haiku to extract venues from signal excerpts.
 
+    Responses that parse and validate are written to `cache` when given.
     Returns (venue_dicts, input_tokens, output_tokens).
     """
-    user_prompt = _build_user_prompt(city_name, excerpts)
-
-    payload = {
-        "model": MODEL_NAME,
-        "max_tokens": 1024,
-        "system": SYSTEM_PROMPT,
-        "messages": [{"role": "user", "content": user_prompt}],
-    }
+    payload = _build_payload(city_name, excerpts)
 
     resp = await client.post(
         "https://api.anthropic.com/v1/messages",
@@ -287,36 +308,19 @@ async def _call_haiku_extract(
     input_tokens = body.get("usage", {}).get("input_tokens", 0)
     output_tokens = body.get("usage", {}).get("output_tokens", 0)
 
-    # Extract text
-    text = ""
-    for block in body.get("content", []):
-        if block.get("type") == "text":
-            text += block["text"]
-
+    text = _response_text(body)
     venues = _parse_extraction_response(text)
+    # Cache only bodies that parsed and validated; a malformed one must not be replayed
+    if cache is not None and _is_cacheable(text, venues):
+        cache.put(MODEL_NAME, PROMPT_VERSION, payload, body)
     return venues, input_tokens, output_tokens
 
 
-def _parse_extraction_response(text: str) -> list[dict]:
-    """
-    Parse LLM response text into a list of venue dicts.
-
-    Returns [] on parse failure. Tolerates markdown code fences.
-    """
+def _decode_response_json(text: str) -> Any:
+    """JSON value of the response text (bare or in a code fence), or None."""
     text = text.strip()
-
-    def _extract(data: Any) -> list[dict]:
-        if isinstance(data, dict):
-            venues = data.get("venues", [])
-            if isinstance(venues, list):
-                return venues
-        if isinstance(data, list):
-            return data
-        return []
-
-    # Direct JSON parse
     try:
-        return _extract(json.loads(text))
+        return json.loads(text)
     except json.JSONDecodeError:
         pass
 
@@ -327,14 +331,43 @@ def _parse_extraction_response(text: str) -> list[dict]:
             if block.startswith("json"):
                 block = block[4:].strip()
             try:
-                return _extract(json.loads(block))
+                return json.loads(block)
             except json.JSONDecodeError:
                 continue
+    return None
+
+
+def _parse_extraction_response(text: str) -> list[dict]:
+    """
+    Parse LLM response text into a list of venue dicts.
 
-    logger.error("Failed to parse LLM extraction response: %s", text[:200])
+    Returns [] on parse failure. Tolerates markdown code fences.
+    """
+    data = _decode_response_json(text)
+    if isinstance(data, dict):
+        venues = data.get("venues", [])
+        if isinstance(venues, list):
+            return venues
+        return []
+    if isinstance(data, list):
+        return data
+    if data is None:
+        logger.error("Failed to parse LLM extraction response: %s", text.strip()[:200])
     return []
 
 
+def _is_cacheable(text: str, venues: list[dict]) -> bool:
+    """True when the response parsed and every venue validates without error."""
+    if _decode_response_json(text) is None:
+        return False
+    try:
+        for raw in venues:
+            _validate_venue(raw, set())
+    except Exception:
+        return False
+    return True
+
+
 # ---------------------------------------------------------------------------
 # Venue validation + dedup
 # ---------------------------------------------------------------------------
@@ -1127,6 +1160,11 @@ async def _log_to_model_registry(
             "total_output_tokens": stats.total_output_tokens,
             "estimated_cost_usd": round(stats.estimated_cost_usd, 6),
             "latency_seconds": round(stats.latency_seconds, 2),
+            "cache_hits": stats.cache_hits,
+            "cache_hit_rate": round(
+                stats.cache_hits / (stats.cache_hits + stats.cache_misses), 4,
+            ) if stats.cache_hits + stats.cache_misses else 0.0,
+            "cache_saved_usd": round(stats.cache_saved_usd, 6),
             "errors": stats.errors[:20],
         }),
         now,
@@ -1147,21 +1185,23 @@ async def _extract_batch(
     stopwords: set[str],
     city_slug: str,
     stats: FallbackStats,
+    scheduler: Optional[LLMWorkScheduler] = None,
+    cache: Optional[LLMResponseCache] = None,
 ) -> tuple[list[ExtractedVenue], list[SignalVenueLink]]:
     """
     Send a batch of signals to Haiku for venue extraction.
 
+    With a scheduler, 429s go through scheduler.throttle() so every
+    concurrent batch backs off together.
+
     Returns (extracted_venues, signal_venue_links).
     """
-    excerpts = [
-        {"source_name": s["source_name"], "raw_excerpt": s["raw_excerpt"]}
-        for s in signals
-    ]
+    excerpts = _batch_excerpts(signals)
 
     for attempt in range(MAX_RETRIES):
         try:
             raw_venues, in_tok, out_tok = await _call_haiku_extract(
-                client, api_key, city_name, excerpts,
+                client, api_key, city_name, excerpts, cache,
             )
             stats.total_input_tokens += in_tok
             stats.total_output_tokens += out_tok
@@ -1182,7 +1222,10 @@ async def _extract_batch(
                     "Haiku API %d, retry %d/%d in %.1fs",
                     status, attempt + 1, MAX_RETRIES, wait,
                 )
-                await asyncio.sleep(wait)
+                if status == 429 and scheduler is not None:
+                    await scheduler.throttle(wait)
+                else:
+                    await asyncio.sleep(wait)
                 continue
 
             msg = f"HTTP {status}: {exc.response.text[:200]}"
@@ -1203,6 +1246,57 @@ async def _extract_batch(
     else:
         return [], []
 
+    return _finish_batch(raw_venues, signals, stopwords, city_slug, stats)
+
+
+def _batch_excerpts(signals: list[dict]) -> list[dict[str, str]]:
+    return [
+        {"source_name": s["source_name"], "raw_excerpt": s["raw_excerpt"]}
+        for s in signals
+    ]
+
+
+def _lookup_cached_batch(
+    cache: LLMResponseCache,
+    city_name: str,
+    signals: list[dict],
+    stopwords: set[str],
+    city_slug: str,
+    stats: FallbackStats,
+) -> Optional[tuple[list[ExtractedVenue], list[SignalVenueLink]]]:
+    """
+    Serve a batch from the response cache, or None on a miss. An entry that
+    no longer parses or validates is evicted and treated as a miss.
+    """
+    payload = _build_payload(city_name, _batch_excerpts(signals))
+    entry = cache.get(MODEL_NAME, PROMPT_VERSION, payload)
+    if entry is None:
+        stats.cache_misses += 1
+        return None
+    try:
+        text = _response_text(entry.body)
+        if _decode_response_json(text) is None:
+            raise ValueError("cached body has no JSON payload")
+        result = _finish_batch(_parse_extraction_response(text), signals, stopwords, city_slug, stats)
+    except Exception as exc:
+        logger.warning("Evicting unusable cached extraction batch for %s: %s", city_name, exc)
+        cache.evict(MODEL_NAME, PROMPT_VERSION, payload, entry)
+        stats.cache_misses += 1
+        return None
+    stats.cache_hits += 1
+    stats.cache_saved_usd += entry.cost_usd(INPUT_COST_PER_1M, OUTPUT_COST_PER_1M)
+    stats.signals_processed += len(signals)
+    return result
+
+
+def _finish_batch(
+    raw_venues: list[dict],
+    signals: list[dict],
+    stopwords: set[str],
+    city_slug: str,
+    stats: FallbackStats,
+) -> tuple[list[ExtractedVenue], list[SignalVenueLink]]:
+    """Validate a batch's raw venues and link them back to its signals."""
     # Validate extracted venues
     all_venues: list[ExtractedVenue] = []
     for raw in raw_venues:
@@ -1306,27 +1400,49 @@ async def run_llm_fallback(
     all_venues: list[ExtractedVenue] = []
     all_links: list[SignalVenueLink] = []
 
-    async with httpx.AsyncClient() as client:
-        for i in range(0, len(signals), BATCH_SIZE):
-            batch = signals[i:i + BATCH_SIZE]
-            logger.info(
-                "Processing batch %d/%d (%d signals)",
-                (i // BATCH_SIZE) + 1,
-                (len(signals) + BATCH_SIZE - 1) // BATCH_SIZE,
-                len(batch),
-            )
+    batches = [signals[i:i + BATCH_SIZE] for i in range(0, len(signals), BATCH_SIZE)]
+    scheduler = LLMWorkScheduler(
+        SchedulerConfig(
+            max_concurrency=MAX_CONCURRENCY,
+            requests_per_minute=REQUESTS_PER_MINUTE,
+            tokens_per_minute=TOKENS_PER_MINUTE,
+            backoff_base_s=RETRY_BACKOFF_BASE,
+        ),
+        abort_on=(NonRetryableAPIError,),
+        name="llm_fallback",
+    )
+    cache = get_default_cache()
 
-            try:
-                venues, links = await _extract_batch(
-                    client, api_key, city_config.name, batch,
-                    stopwords, city_slug, stats,
+    async with httpx.AsyncClient() as client:
+        logger.info(
+            "Extracting %d batches (%d signals) with concurrency=%d",
+            len(batches), len(signals), MAX_CONCURRENCY,
+        )
+        outcomes = await scheduler.map(
+            lambda batch: _extract_batch(
+                client, api_key, city_config.name, batch,
+                stopwords, city_slug, stats, scheduler, cache,
+            ),
+            batches,
+            estimate_tokens=lambda batch: sum(len(s["raw_excerpt"]) for s in batch) // 4 + 1024,
+            lookup=(
+                lambda batch: _lookup_cached_batch(
+                    cache, city_config.name, batch, stopwords, city_slug, stats,
                 )
+            ) if cache is not None else None,
+        )
+
+        # Collect in batch order so dedup is deterministic
+        for outcome in outcomes:
+            if outcome.value is not None:
+                venues, links = outcome.value
                 all_venues.extend(venues)
                 all_links.extend(links)
-            except NonRetryableAPIError as exc:
-                stats.errors.append(str(exc))
-                logger.error("Aborting: non-retryable API error")
-                break
+            elif outcome.error is not None and not isinstance(outcome.error, NonRetryableAPIError):
+                stats.errors.append(f"Batch {outcome.index + 1} failed: {outcome.error}")
+        if scheduler.aborted is not None:
+            stats.errors.append(str(scheduler.aborted))
+            logger.error("Aborting: non-retryable API error")
 
         # 3. Dedup extracted venues
         deduped = _dedup_venues(all_venues, city_slug)
@@ -1388,12 +1504,15 @@ async def run_llm_fallback(
         logger.warning("Failed to log to ModelRegistry (non-fatal): %s", exc)
 
     logger.info(
-        "=== Fallback seeder %s: extracted=%d created=%d relinked=%d cost=$%.4f %.1fs ===",
+        "=== Fallback seeder %s: extracted=%d created=%d relinked=%d cost=$%.4f "
+        "cache_hits=%d saved=$%.4f %.1fs ===",
         city_slug,
         stats.venues_extracted,
         stats.venues_created,
         stats.signals_relinked,
         stats.estimated_cost_usd,
+        stats.cache_hits,
+        stats.cache_saved_usd,
         stats.latency_seconds,
     )
 
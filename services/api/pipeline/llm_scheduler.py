@@ -0,0 +1,416 @@
+"""
+Rate-governed async work scheduler for pipeline LLM calls.
+
+Pipeline extraction steps (vibe tagging, fallback seeding, research passes,
+backfill) all make many independent Anthropic calls. Awaiting them one at a
+time leaves the wall clock dominated by round-trips; firing them all at once
+trips provider rate limits. LLMWorkScheduler sits between the two:
+
+  - bounded concurrency (adaptive: halves on 429, creeps back up on success)
+  - token buckets on both requests/min and tokens/min
+  - a global pause on 429 so every worker backs off together
+  - a global abort when a caller-declared fatal error (NonRetryableAPIError)
+    is raised — nothing new is dispatched after that
+  - ordered result collection, optionally flushed in fixed-size batches
+    so callers can stream writes (e.g. _write_vibe_tags) while work continues
+
+Usage:
+    scheduler = LLMWorkScheduler(SchedulerConfig(max_concurrency=8),
+                                 abort_on=(NonRetryableAPIError,))
+    outcomes = await scheduler.map(call_one, items, on_batch=write, batch_size=10)
+
+Per-call retry policy stays with the caller: retry loops call
+`await scheduler.throttle(wait)` instead of asyncio.sleep on a 429 so the
+backoff is shared across all in-flight work.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Generic, Optional, Sequence, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Conservative defaults: Anthropic tier-1 limits (50 RPM, 50k input TPM).
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_REQUESTS_PER_MINUTE = 50
+DEFAULT_TOKENS_PER_MINUTE = 50_000
+
+# Bucket capacity expressed as seconds of refill — caps the initial burst.
+BURST_SECONDS = 10.0
+
+
+class SchedulerAborted(Exception):
+    """Raised by submit() once the scheduler has been aborted by a fatal error."""
+
+    def __init__(self, cause: BaseException) -> None:
+        super().__init__(f"Scheduler aborted: {cause}")
+        self.cause = cause
+
+
+@dataclass
+class SchedulerConfig:
+    """Limits for one scheduler. One scheduler per provider model/limit pool."""
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+    min_concurrency: int = 1
+    requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE
+    tokens_per_minute: float = DEFAULT_TOKENS_PER_MINUTE
+    backoff_base_s: float = 2.0
+    backoff_max_s: float = 60.0
+
+
+@dataclass
+class SchedulerStats:
+    """Counters for one scheduler's lifetime."""
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    aborted: int = 0  # items never dispatched because of a global abort
+    bypassed: int = 0  # items served by map(lookup=...) without a dispatch
+    rate_limited: int = 0
+    peak_in_flight: int = 0
+    concurrency_limit: int = 0
+    throttled_seconds: float = 0.0
+    tokens_reserved: int = 0
+    tokens_used: int = 0
+
+
+@dataclass
+class JobOutcome(Generic[T, R]):
+    """Result slot for one item passed to map(). Returned in input order."""
+    index: int
+    item: T
+    value: Optional[R] = None
+    error: Optional[BaseException] = None
+    started: bool = False
+
+
+class TokenBucket:
+    """
+    Async token bucket refilled continuously at `per_minute / 60` per second.
+
+    acquire() waits (FIFO) until enough tokens are available. debit() lets a
+    caller reconcile an estimate after the fact; the balance may go negative,
+    which simply delays the next acquire.
+    """
+
+    def __init__(
+        self,
+        per_minute: float,
+        *,
+        burst: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if per_minute <= 0:
+            raise ValueError("per_minute must be positive")
+        self.rate = per_minute / 60.0
+        self.capacity = burst if burst is not None else max(1.0, self.rate * BURST_SECONDS)
+        self._tokens = self.capacity
+        self._clock = clock
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    @property
+    def available(self) -> float:
+        self._refill()
+        return self._tokens
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        # A request larger than the bucket could never be satisfied — clamp it.
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                await asyncio.sleep((amount - self._tokens) / self.rate)
+
+    def debit(self, amount: float) -> None:
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens - amount)
+
+
+def _is_rate_limit_error(exc: BaseException) -> bool:
+    """True for a 429 from either httpx or the anthropic SDK."""
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status == 429
+
+
+class LLMWorkScheduler:
+    """
+    Shared async scheduler for rate-limited LLM work. See module docstring.
+
+    Not thread-safe; create and use it within one event loop.
+    """
+
+    def __init__(
+        self,
+        config: Optional[SchedulerConfig] = None,
+        *,
+        abort_on: tuple[type[BaseException], ...] = (),
+        name: str = "llm",
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.config = config or SchedulerConfig()
+        self.name = name
+        self.abort_on = abort_on
+        self.stats = SchedulerStats(concurrency_limit=self.config.max_concurrency)
+
+        self._clock = clock
+        self._requests = TokenBucket(self.config.requests_per_minute, clock=clock)
+        self._tokens = TokenBucket(self.config.tokens_per_minute, clock=clock)
+        self._limit = self.config.max_concurrency
+        self._in_flight = 0
+        self._success_streak = 0
+        self._consecutive_429 = 0
+        self._resume_at = 0.0
+        self._slots = asyncio.Condition()
+        self._abort: Optional[BaseException] = None
+
+    # -- state -------------------------------------------------------------
+
+    @property
+    def aborted(self) -> Optional[BaseException]:
+        """The fatal error that aborted the scheduler, if any."""
+        return self._abort
+
+    @property
+    def concurrency_limit(self) -> int:
+        return self._limit
+
+    # -- backoff -----------------------------------------------------------
+
+    def _note_rate_limited(self, retry_after: Optional[float]) -> float:
+        """Record a 429: shrink concurrency and push the global resume time."""
+        self.stats.rate_limited += 1
+        self._consecutive_429 += 1
+        self._success_streak = 0
+        self._limit = max(self.config.min_concurrency, self._limit // 2)
+        self.stats.concurrency_limit = self._limit
+
+        if retry_after is None:
+            retry_after = self.config.backoff_base_s ** self._consecutive_429
+        wait = min(self.config.backoff_max_s, max(0.0, retry_after))
+        self._resume_at = max(self._resume_at, self._clock() + wait)
+        logger.warning(
+            "%s scheduler: rate limited (429 #%d) — concurrency=%d, pausing %.1fs",
+            self.name, self._consecutive_429, self._limit, wait,
+        )
+        return wait
+
+    def _note_success(self) -> None:
+        self._consecutive_429 = 0
+        self._success_streak += 1
+        # Additive increase: one extra slot per `limit` consecutive successes
+        if self._limit < self.config.max_concurrency and self._success_streak >= self._limit:
+            self._limit += 1
+            self._success_streak = 0
+            self.stats.concurrency_limit = self._limit
+
+    async def _wait_for_resume(self) -> None:
+        while True:
+            delay = self._resume_at - self._clock()
+            if delay <= 0:
+                return
+            self.stats.throttled_seconds += delay
+            await asyncio.sleep(delay)
+
+    async def throttle(self, retry_after: Optional[float] = None) -> None:
+        """
+        Report a 429 from inside a job and wait out the shared backoff.
+
+        Call this from a retry loop in place of asyncio.sleep(wait).
+        """
+        self._note_rate_limited(retry_after)
+        await self._wait_for_resume()
+
+    # -- dispatch ----------------------------------------------------------
+
+    async def _acquire_slot(self) -> None:
+        async with self._slots:
+            await self._slots.wait_for(lambda: self._in_flight < self._limit)
+            self._in_flight += 1
+            self.stats.peak_in_flight = max(self.stats.peak_in_flight, self._in_flight)
+
+    async def _release_slot(self) -> None:
+        async with self._slots:
+            self._in_flight -= 1
+            self._slots.notify_all()
+
+    async def submit(
+        self,
+        fn: Callable[[], Awaitable[R]],
+        *,
+        estimated_tokens: int = 0,
+        tokens_used: Optional[Callable[[R], int]] = None,
+    ) -> R:
+        """
+        Run one call under the scheduler's limits and return its result.
+
+        Raises SchedulerAborted if the scheduler was aborted before dispatch.
+        Errors from fn propagate unchanged; abort_on errors also abort the
+        scheduler and 429s also trigger the shared backoff.
+        """
+        if self._abort is not None:
+            raise SchedulerAborted(self._abort)
+
+        await self._acquire_slot()
+        try:
+            await self._wait_for_resume()
+            await self._requests.acquire(1)
+            if estimated_tokens:
+                await self._tokens.acquire(estimated_tokens)
+            if self._abort is not None:
+                raise SchedulerAborted(self._abort)
+
+            self.stats.submitted += 1
+            self.stats.tokens_reserved += estimated_tokens
+            try:
+                result = await fn()
+            except self.abort_on as exc:
+                if self._abort is None:
+                    self._abort = exc
+                    logger.error("%s scheduler: aborting on fatal error: %s", self.name, exc)
+                self.stats.failed += 1
+                raise
+            except Exception as exc:
+                if _is_rate_limit_error(exc):
+                    self._note_rate_limited(None)
+                self.stats.failed += 1
+                raise
+
+            self.stats.completed += 1
+            self._note_success()
+            if tokens_used is not None:
+                used = int(tokens_used(result) or 0)
+                self.stats.tokens_used += used
+                self._tokens.debit(used - estimated_tokens)
+            return result
+        finally:
+            await self._release_slot()
+
+    async def map(
+        self,
+        fn: Callable[[T], Awaitable[R]],
+        items: Sequence[T],
+        *,
+        estimate_tokens: Optional[Callable[[T], int]] = None,
+        tokens_used: Optional[Callable[[R], int]] = None,
+        on_batch: Optional[Callable[[list[JobOutcome[T, R]]], Awaitable[None]]] = None,
+        batch_size: int = 10,
+        lookup: Optional[Callable[[T], Optional[R]]] = None,
+        stop_on_error: bool = False,
+    ) -> list[JobOutcome[T, R]]:
+        """
+        Run fn over items concurrently; return one JobOutcome per item, in order.
+
+        Errors are captured per item (outcome.error) rather than raised.
+        After an abort, undispatched items come back with started=False.
+        When on_batch is given it is awaited with consecutive runs of
+        `batch_size` finished outcomes, in input order, as soon as each run
+        is complete; a final partial run is flushed before map returns. If
+        on_batch raises, in-flight calls are cancelled, nothing further is
+        dispatched, and the exception propagates out of map.
+
+        lookup is an optional synchronous fast path (e.g. a response cache):
+        a non-None return becomes the item's value without taking a slot or
+        any rate-limit budget. If lookup raises, the item is dispatched live.
+
+        stop_on_error makes any item error behave like an abort for the rest
+        of this map() call only: items not yet dispatched come back with
+        started=False, while calls already in flight finish.
+        """
+        outcomes: list[JobOutcome[T, R]] = [
+            JobOutcome(index=i, item=item) for i, item in enumerate(items)
+        ]
+        if not outcomes:
+            return outcomes
+
+        done = [False] * len(outcomes)
+        next_index = 0
+        stopped = False
+        flush_from = 0
+        pending: list[JobOutcome[T, R]] = []
+        flush_lock = asyncio.Lock()
+
+        async def _flush(final: bool = False) -> None:
+            nonlocal flush_from, pending
+            if on_batch is None:
+                return
+            async with flush_lock:
+                while flush_from < len(outcomes) and done[flush_from]:
+                    pending.append(outcomes[flush_from])
+                    flush_from += 1
+                    if len(pending) >= batch_size:
+                        batch, pending = pending, []
+                        await on_batch(batch)
+                if final and pending:
+                    batch, pending = pending, []
+                    await on_batch(batch)
+
+        async def _worker() -> None:
+            nonlocal next_index, stopped
+            while next_index < len(outcomes):
+                outcome = outcomes[next_index]
+                next_index += 1
+                if self._abort is None and not stopped and lookup is not None:
+                    try:
+                        cached = lookup(outcome.item)
+                    except Exception as exc:
+                        # A broken fast path must not lose the item: make the live call
+                        logger.warning("%s scheduler: lookup failed, calling live: %s", self.name, exc)
+                        cached = None
+                    if cached is not None:
+                        outcome.value = cached
+                        outcome.started = True
+                        self.stats.bypassed += 1
+                if self._abort is None and not stopped and not outcome.started:
+                    estimate = estimate_tokens(outcome.item) if estimate_tokens else 0
+                    try:
+                        outcome.value = await self.submit(
+                            lambda item=outcome.item: fn(item),
+                            estimated_tokens=estimate,
+                            tokens_used=tokens_used,
+                        )
+                        outcome.started = True
+                    except SchedulerAborted:
+                        pass
+                    except Exception as exc:
+                        outcome.started = True
+                        outcome.error = exc
+                        if stop_on_error:
+                            stopped = True
+                if not outcome.started:
+                    self.stats.aborted += 1
+                done[outcome.index] = True
+                await _flush()
+
+        # TaskGroup, not gather: if on_batch raises, the sibling workers are
+        # cancelled instead of carrying on with LLM calls nobody will read
+        workers = min(self.config.max_concurrency, len(outcomes))
+        try:
+            async with asyncio.TaskGroup() as tg:
+                for _ in range(workers):
+                    tg.create_task(_worker())
+        except ExceptionGroup as group:
+            # Surface the original error (e.g. from on_batch) rather than the group
+            exc: BaseException = group
+            while isinstance(exc, BaseExceptionGroup):
+                exc = exc.exceptions[0]
+            raise exc from None
+        await _flush(final=True)
+        return outcomes
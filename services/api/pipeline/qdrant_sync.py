@@ -5,7 +5,7 @@ Generates embeddings via nomic-embed-text-v1.5 (768 dim) and upserts
 canonical ActivityNodes into the Qdrant ``activity_nodes`` collection.
 
 Two sync modes:
-  - Full sync: re-embed and upsert ALL canonical nodes.
+  - Full sync: upsert ALL canonical nodes.
   - Incremental sync: only nodes with updatedAt > last sync timestamp.
 
 Embedding text formula:
@@ -13,17 +13,35 @@ Embedding text formula:
 
 Payload stored alongside each vector:
     id, city, category, priceLevel, convergenceScore, authorityScore,
-    vibeTagSlugs, isCanonical
+    vibeTagSlugs, isCanonical, text_fingerprint
+
+text_fingerprint hashes the embedding text (plus the embedding model name).
+Nodes whose fingerprint matches the stored point — e.g. after a convergence
+re-scoring run that only moved scores — get a payload-only set_payload
+instead of a re-embed + full upsert.
+
+Full and incremental syncs run as a streaming pipeline so DB reads,
+embedding (CPU) and Qdrant upserts (network) overlap:
+
+    reader ──embed queue──▶ embed workers ──upsert queue──▶ upserters
+    (keyset pages)          (thread pool)                   (wait=False)
+
+Queues are bounded (QUEUE_DEPTH batches) so memory stays flat regardless of
+city size. Upserts are fire-and-acknowledge; a final wait=True write acts
+as the consistency barrier before the parity check.
 
 Runs after convergence scoring (M-008) and before city seeder (M-010).
 """
 
+import asyncio
+import hashlib
 import logging
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Optional
+from typing import AsyncIterator, Optional
 from uuid import UUID
 
 import asyncpg
@@ -31,6 +49,8 @@ from qdrant_client import AsyncQdrantClient
 from qdrant_client.models import (
     Distance,
     PointStruct,
+    SetPayload,
+    SetPayloadOperation,
     VectorParams,
 )
 
@@ -42,9 +62,14 @@ logger = logging.getLogger(__name__)
 
 COLLECTION_NAME = "activity_nodes"
 VECTOR_DIM = 768
-BATCH_SIZE = 100  # nodes per Qdrant upsert batch
+BATCH_SIZE = 100  # nodes per Qdrant upsert batch (and per DB page)
 EMBED_BATCH_SIZE = 32  # texts per embedding batch
 
+# Streaming pipeline
+EMBED_WORKERS = 2  # threads running embed_batch concurrently
+UPSERT_CONCURRENCY = 4  # in-flight wait=False upserts
+QUEUE_DEPTH = 4  # batches buffered between stages
+
 # Env-based Qdrant connection (matches foundation config.py pattern)
 _QDRANT_URL = os.environ.get("QDRANT_URL", "http://localhost:6333")
 _QDRANT_API_KEY = os.environ.get("QDRANT_API_KEY", "") or None
@@ -61,14 +86,32 @@ class SyncStats:
     nodes_fetched: int = 0
     nodes_embedded: int = 0
     nodes_upserted: int = 0
+    nodes_payload_only: int = 0  # fingerprint unchanged — payload refreshed, no re-embed
     nodes_skipped: int = 0
     errors: int = 0
     embedding_time_s: float = 0.0
     upsert_time_s: float = 0.0
+    read_time_s: float = 0.0
+    fingerprint_time_s: float = 0.0
+    barrier_time_s: float = 0.0
+    pages_read: int = 0
+    embed_queue_peak: int = 0
+    upsert_queue_peak: int = 0
     started_at: Optional[datetime] = None
     finished_at: Optional[datetime] = None
     error_details: list[str] = field(default_factory=list)
 
+    def stage_throughput(self) -> dict[str, float]:
+        """Nodes per second of busy time for each pipeline stage."""
+        def _rate(count: int, seconds: float) -> float:
+            return round(count / seconds, 1) if seconds > 0 else 0.0
+
+        return {
+            "read": _rate(self.nodes_fetched, self.read_time_s),
+            "embed": _rate(self.nodes_embedded, self.embedding_time_s),
+            "upsert": _rate(self.nodes_upserted + self.nodes_payload_only, self.upsert_time_s),
+        }
+
 
 # ---------------------------------------------------------------------------
 # Embedding text construction
@@ -122,21 +165,7 @@ async def ensure_collection(client: AsyncQdrantClient) -> None:
 # DB queries
 # ---------------------------------------------------------------------------
 
-async def _fetch_canonical_nodes(
-    pool: asyncpg.Pool,
-    *,
-    since: Optional[datetime] = None,
-    node_ids: Optional[list[str]] = None,
-) -> list[asyncpg.Record]:
-    """
-    Fetch canonical ActivityNodes with their vibe tag slugs.
-
-    Args:
-        since: If set, only nodes with updatedAt > since (incremental mode).
-        node_ids: If set, only these specific node IDs.
-    """
-    base_query = """
-        SELECT
+_NODE_COLUMNS = """
             an.id,
             an.name,
             an.city,
@@ -151,6 +180,27 @@ async def _fetch_canonical_nodes(
                 array_agg(DISTINCT vt.slug) FILTER (WHERE vt.slug IS NOT NULL),
                 ARRAY[]::text[]
             ) AS vibe_tag_slugs
+"""
+
+
+async def _fetch_canonical_nodes(
+    pool: asyncpg.Pool,
+    *,
+    since: Optional[datetime] = None,
+    node_ids: Optional[list[str]] = None,
+) -> list[asyncpg.Record]:
+    """
+    Fetch canonical ActivityNodes with their vibe tag slugs.
+
+    Loads the whole result set — used for explicit node-ID lists. Full and
+    incremental syncs stream through _iter_node_pages instead.
+
+    Args:
+        since: If set, only nodes with updatedAt > since (incremental mode).
+        node_ids: If set, only these specific node IDs.
+    """
+    base_query = f"""
+        SELECT {_NODE_COLUMNS}
         FROM activity_nodes an
         LEFT JOIN activity_node_vibe_tags anvt ON anvt."activityNodeId" = an.id
         LEFT JOIN vibe_tags vt ON vt.id = anvt."vibeTagId"
@@ -179,6 +229,81 @@ async def _fetch_canonical_nodes(
         return await conn.fetch(base_query, *params)
 
 
+async def _fetch_node_page(
+    pool: asyncpg.Pool,
+    *,
+    since: Optional[datetime] = None,
+    after: Optional[tuple[datetime, str]] = None,
+    limit: int = BATCH_SIZE,
+) -> list[asyncpg.Record]:
+    """
+    One keyset page of canonical nodes ordered by ("updatedAt", id).
+
+    The page is chosen on activity_nodes alone (index-friendly, no OFFSET),
+    then joined to its vibe tags.
+
+    Args:
+        since: If set, only nodes with updatedAt > since (incremental mode).
+        after: (updatedAt, id) of the last row of the previous page.
+        limit: Page size.
+    """
+    conditions = ['"isCanonical" = true']
+    params: list = []
+
+    if since is not None:
+        params.append(since)
+        conditions.append(f'"updatedAt" > ${len(params)}')
+
+    if after is not None:
+        params.extend(after)
+        conditions.append(f'("updatedAt", id) > (${len(params) - 1}, ${len(params)})')
+
+    params.append(limit)
+    query = f"""
+        WITH page AS (
+            SELECT id
+            FROM activity_nodes
+            WHERE {" AND ".join(conditions)}
+            ORDER BY "updatedAt" ASC, id ASC
+            LIMIT ${len(params)}
+        )
+        SELECT {_NODE_COLUMNS}
+        FROM page
+        JOIN activity_nodes an ON an.id = page.id
+        LEFT JOIN activity_node_vibe_tags anvt ON anvt."activityNodeId" = an.id
+        LEFT JOIN vibe_tags vt ON vt.id = anvt."vibeTagId"
+        GROUP BY an.id
+        ORDER BY an."updatedAt" ASC, an.id ASC
+    """
+
+    async with pool.acquire() as conn:
+        return await conn.fetch(query, *params)
+
+
+async def _iter_node_pages(
+    pool: asyncpg.Pool,
+    stats: SyncStats,
+    *,
+    since: Optional[datetime] = None,
+    page_size: Optional[int] = None,
+) -> AsyncIterator[list[asyncpg.Record]]:
+    """Yield keyset pages of canonical nodes until the table is exhausted."""
+    page_size = page_size or BATCH_SIZE
+    after: Optional[tuple[datetime, str]] = None
+    while True:
+        t0 = time.monotonic()
+        page = await _fetch_node_page(pool, since=since, after=after, limit=page_size)
+        stats.read_time_s += time.monotonic() - t0
+        if not page:
+            return
+        stats.pages_read += 1
+        stats.nodes_fetched += len(page)
+        yield page
+        if len(page) < page_size:
+            return
+        after = (page[-1]["updatedAt"], page[-1]["id"])
+
+
 async def _get_canonical_count(pool: asyncpg.Pool) -> int:
     """Count canonical ActivityNodes in Postgres."""
     async with pool.acquire() as conn:
@@ -191,17 +316,44 @@ async def _get_canonical_count(pool: asyncpg.Pool) -> int:
 # Core sync logic
 # ---------------------------------------------------------------------------
 
-async def _embed_and_upsert(
-    client: AsyncQdrantClient,
-    embedding_service,
-    nodes: list[asyncpg.Record],
-    stats: SyncStats,
-) -> None:
-    """Embed a batch of nodes and upsert to Qdrant."""
+def text_fingerprint(text: str, model_name: str = "") -> str:
+    """
+    Stable fingerprint of an embedding input (and the model that embeds it).
 
-    # Build embedding texts
-    texts: list[str] = []
-    valid_nodes: list[asyncpg.Record] = []
+    Stored in the point payload; an unchanged fingerprint means the stored
+    vector is still valid and only the payload needs refreshing.
+    """
+    return hashlib.sha256(f"{model_name}\x00{text}".encode("utf-8")).hexdigest()[:32]
+
+
+def _build_payload(node: asyncpg.Record) -> dict:
+    """Qdrant payload for one node (filterable fields, no vector inputs)."""
+    return {
+        "id": node["id"],
+        "city": (node["city"] or "").lower(),
+        "category": node["category"],
+        "price_level": node["priceLevel"],
+        "convergence_score": float(node["convergenceScore"] or 0),
+        "authority_score": float(node["authorityScore"] or 0),
+        "vibe_tag_slugs": list(node["vibe_tag_slugs"]),
+        "is_canonical": True,
+    }
+
+
+@dataclass
+class _PreparedNode:
+    """A fetched node with its embedding text and fingerprint."""
+    record: asyncpg.Record
+    text: str
+    fingerprint: str
+
+    @property
+    def payload(self) -> dict:
+        return {**_build_payload(self.record), "text_fingerprint": self.fingerprint}
+
+
+def _prepare_nodes(nodes: list[asyncpg.Record], model_name: str) -> list[_PreparedNode]:
+    prepared = []
     for node in nodes:
         text = build_embedding_text(
             name=node["name"],
@@ -209,19 +361,72 @@ async def _embed_and_upsert(
             category=node["category"],
             vibe_tag_slugs=list(node["vibe_tag_slugs"]),
         )
-        texts.append(text)
-        valid_nodes.append(node)
+        prepared.append(_PreparedNode(node, text, text_fingerprint(text, model_name)))
+    return prepared
 
-    if not texts:
-        return
 
-    # Generate embeddings
+async def _split_unchanged(
+    client: AsyncQdrantClient,
+    nodes: list[_PreparedNode],
+    stats: SyncStats,
+) -> tuple[list[_PreparedNode], list[_PreparedNode]]:
+    """
+    Split nodes into (needs_embedding, payload_only) by comparing their
+    fingerprint with the one stored on the existing Qdrant point.
+
+    If the lookup fails every node is treated as changed — the sync falls
+    back to re-embedding rather than skipping anything.
+    """
+    t0 = time.monotonic()
+    try:
+        records = await client.retrieve(
+            collection_name=COLLECTION_NAME,
+            ids=[n.record["id"] for n in nodes],
+            with_payload=["text_fingerprint"],
+            with_vectors=False,
+        )
+    except Exception as exc:
+        logger.warning("Fingerprint lookup failed (%d nodes), re-embedding: %s", len(nodes), exc)
+        return nodes, []
+    finally:
+        stats.fingerprint_time_s += time.monotonic() - t0
+
+    stored = {str(r.id): (r.payload or {}).get("text_fingerprint") for r in records}
+    changed: list[_PreparedNode] = []
+    unchanged: list[_PreparedNode] = []
+    for node in nodes:
+        if stored.get(str(node.record["id"])) == node.fingerprint:
+            unchanged.append(node)
+        else:
+            changed.append(node)
+    return changed, unchanged
+
+
+async def _embed_nodes(
+    embedding_service,
+    nodes: list[_PreparedNode],
+    stats: SyncStats,
+    executor: Optional[ThreadPoolExecutor] = None,
+) -> list[PointStruct]:
+    """
+    Embed a batch of nodes off the event loop and build Qdrant points.
+
+    Returns [] (and records the error) if the embedding call fails.
+    """
+    if not nodes:
+        return []
+    texts = [n.text for n in nodes]
+
+    loop = asyncio.get_running_loop()
     t0 = time.monotonic()
     try:
-        vectors = embedding_service.embed_batch(
-            texts,
-            batch_size=EMBED_BATCH_SIZE,
-            is_query=False,  # indexing documents, not queries
+        vectors = await loop.run_in_executor(
+            executor,
+            lambda: embedding_service.embed_batch(
+                texts,
+                batch_size=EMBED_BATCH_SIZE,
+                is_query=False,  # indexing documents, not queries
+            ),
         )
         stats.embedding_time_s += time.monotonic() - t0
         stats.nodes_embedded += len(vectors)
@@ -229,43 +434,181 @@ async def _embed_and_upsert(
         stats.errors += len(texts)
         stats.error_details.append(f"Embedding batch failed: {exc}")
         logger.exception("Embedding batch failed (%d texts)", len(texts))
-        return
+        return []
 
-    # Build Qdrant points
-    points: list[PointStruct] = []
-    for node, vector in zip(valid_nodes, vectors):
-        node_id = node["id"]
-        # Use UUID as Qdrant point ID (string format)
-        payload = {
-            "id": node_id,
-            "city": (node["city"] or "").lower(),
-            "category": node["category"],
-            "price_level": node["priceLevel"],
-            "convergence_score": float(node["convergenceScore"] or 0),
-            "authority_score": float(node["authorityScore"] or 0),
-            "vibe_tag_slugs": list(node["vibe_tag_slugs"]),
-            "is_canonical": True,
-        }
-        points.append(PointStruct(
-            id=node_id,
-            vector=vector,
-            payload=payload,
-        ))
-
-    # Upsert to Qdrant
-    t1 = time.monotonic()
-    try:
-        await client.upsert(
-            collection_name=COLLECTION_NAME,
-            points=points,
-            wait=True,
+    # Use UUID as Qdrant point ID (string format)
+    return [
+        PointStruct(id=node.record["id"], vector=vector, payload=node.payload)
+        for node, vector in zip(nodes, vectors)
+    ]
+
+
+def _payload_updates(nodes: list[_PreparedNode]) -> list[SetPayloadOperation]:
+    """One set_payload per node — vectors are left untouched."""
+    return [
+        SetPayloadOperation(
+            set_payload=SetPayload(payload=node.payload, points=[node.record["id"]]),
         )
-        stats.upsert_time_s += time.monotonic() - t1
-        stats.nodes_upserted += len(points)
+        for node in nodes
+    ]
+
+
+# A write batch is either full points (embedded) or payload-only updates
+_WriteBatch = list[PointStruct] | list[SetPayloadOperation]
+
+
+async def _send(client: AsyncQdrantClient, batch: _WriteBatch, *, wait: bool) -> None:
+    if isinstance(batch[0], PointStruct):
+        await client.upsert(collection_name=COLLECTION_NAME, points=batch, wait=wait)
+    else:
+        await client.batch_update_points(
+            collection_name=COLLECTION_NAME, update_operations=batch, wait=wait,
+        )
+
+
+async def _write_batch(
+    client: AsyncQdrantClient,
+    batch: _WriteBatch,
+    stats: SyncStats,
+    *,
+    wait: bool = True,
+) -> bool:
+    """Send one write batch. Returns False (and records the error) on failure."""
+    payload_only = not isinstance(batch[0], PointStruct)
+    t0 = time.monotonic()
+    try:
+        await _send(client, batch, wait=wait)
     except Exception as exc:
-        stats.errors += len(points)
-        stats.error_details.append(f"Qdrant upsert failed: {exc}")
-        logger.exception("Qdrant upsert failed (%d points)", len(points))
+        kind = "payload update" if payload_only else "upsert"
+        stats.errors += len(batch)
+        stats.error_details.append(f"Qdrant {kind} failed: {exc}")
+        logger.exception("Qdrant %s failed (%d points)", kind, len(batch))
+        return False
+    stats.upsert_time_s += time.monotonic() - t0
+    if payload_only:
+        stats.nodes_payload_only += len(batch)
+    else:
+        stats.nodes_upserted += len(batch)
+    return True
+
+
+async def _sync_batch(
+    client: AsyncQdrantClient,
+    embedding_service,
+    nodes: list[asyncpg.Record],
+    stats: SyncStats,
+    *,
+    reembed: bool = False,
+    executor: Optional[ThreadPoolExecutor] = None,
+) -> list[_WriteBatch]:
+    """Fingerprint, split and embed one page. Returns the write batches to send."""
+    prepared = _prepare_nodes(nodes, getattr(embedding_service, "model_name", ""))
+    if reembed:
+        changed, unchanged = prepared, []
+    else:
+        changed, unchanged = await _split_unchanged(client, prepared, stats)
+
+    batches: list[_WriteBatch] = []
+    if unchanged:
+        batches.append(_payload_updates(unchanged))
+    points = await _embed_nodes(embedding_service, changed, stats, executor)
+    if points:
+        batches.append(points)
+    return batches
+
+
+async def _embed_and_upsert(
+    client: AsyncQdrantClient,
+    embedding_service,
+    nodes: list[asyncpg.Record],
+    stats: SyncStats,
+) -> None:
+    """Sync one batch of nodes to Qdrant (wait=True), skipping unchanged vectors."""
+    for batch in await _sync_batch(client, embedding_service, nodes, stats):
+        await _write_batch(client, batch, stats)
+
+
+async def _run_pipeline(
+    client: AsyncQdrantClient,
+    pool: asyncpg.Pool,
+    embedding_service,
+    stats: SyncStats,
+    *,
+    since: Optional[datetime] = None,
+    reembed: bool = False,
+) -> None:
+    """
+    Stream canonical nodes through read → embed → upsert with bounded overlap.
+
+    Embedding runs on EMBED_WORKERS threads; writes are sent with
+    wait=False by UPSERT_CONCURRENCY tasks. Nodes whose text fingerprint
+    matches the stored point skip embedding and get a payload-only update
+    (unless reembed=True). Once everything is acknowledged, the last batch
+    is re-sent with wait=True: Qdrant applies updates to a collection in
+    order, so that write returning means every earlier write has been
+    applied too. A DB error cancels all stages and propagates.
+    """
+    embed_q: asyncio.Queue[Optional[list[asyncpg.Record]]] = asyncio.Queue(QUEUE_DEPTH)
+    upsert_q: asyncio.Queue[Optional[_WriteBatch]] = asyncio.Queue(QUEUE_DEPTH)
+    last_batch: Optional[_WriteBatch] = None
+
+    async def _read() -> None:
+        async for page in _iter_node_pages(pool, stats, since=since):
+            await embed_q.put(page)
+            stats.embed_queue_peak = max(stats.embed_queue_peak, embed_q.qsize())
+            logger.info(
+                "%s sync progress: fetched=%d embedded=%d upserted=%d payload_only=%d",
+                stats.mode, stats.nodes_fetched, stats.nodes_embedded,
+                stats.nodes_upserted, stats.nodes_payload_only,
+            )
+        for _ in range(EMBED_WORKERS):
+            await embed_q.put(None)
+
+    async def _embed_worker(executor: ThreadPoolExecutor) -> None:
+        while (nodes := await embed_q.get()) is not None:
+            batches = await _sync_batch(
+                client, embedding_service, nodes, stats, reembed=reembed, executor=executor,
+            )
+            for batch in batches:
+                await upsert_q.put(batch)
+                stats.upsert_queue_peak = max(stats.upsert_queue_peak, upsert_q.qsize())
+
+    async def _embed_stage() -> None:
+        with ThreadPoolExecutor(EMBED_WORKERS, thread_name_prefix="qdrant-embed") as executor:
+            async with asyncio.TaskGroup() as tg:
+                for _ in range(EMBED_WORKERS):
+                    tg.create_task(_embed_worker(executor))
+        for _ in range(UPSERT_CONCURRENCY):
+            await upsert_q.put(None)
+
+    async def _upsert_worker() -> None:
+        nonlocal last_batch
+        while (batch := await upsert_q.get()) is not None:
+            if await _write_batch(client, batch, stats, wait=False):
+                last_batch = batch
+
+    try:
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(_read())
+            tg.create_task(_embed_stage())
+            for _ in range(UPSERT_CONCURRENCY):
+                tg.create_task(_upsert_worker())
+    except ExceptionGroup as group:
+        # Surface the original error (e.g. asyncpg) rather than the group
+        exc: BaseException = group
+        while isinstance(exc, BaseExceptionGroup):
+            exc = exc.exceptions[0]
+        raise exc from None
+
+    if last_batch:
+        t0 = time.monotonic()
+        try:
+            await _send(client, last_batch, wait=True)
+        except Exception as exc:
+            stats.errors += 1
+            stats.error_details.append(f"Qdrant write barrier failed: {exc}")
+            logger.exception("Qdrant write barrier failed")
+        stats.barrier_time_s = time.monotonic() - t0
 
 
 # ---------------------------------------------------------------------------
@@ -278,15 +621,20 @@ async def run_full_sync(
     *,
     qdrant_url: Optional[str] = None,
     qdrant_api_key: Optional[str] = None,
+    reembed: bool = False,
 ) -> SyncStats:
     """
-    Full sync: re-embed and upsert ALL canonical ActivityNodes.
+    Full sync: upsert ALL canonical ActivityNodes.
+
+    Nodes whose embedding text is unchanged keep their vector and only get
+    a payload update, unless reembed=True.
 
     Args:
         pool: asyncpg connection pool.
         embedding_service: EmbeddingService instance (from foundation).
         qdrant_url: Override Qdrant URL (default from env).
         qdrant_api_key: Override Qdrant API key (default from env).
+        reembed: Re-embed every node regardless of fingerprint.
 
     Returns:
         SyncStats with processing counts.
@@ -300,19 +648,8 @@ async def run_full_sync(
     try:
         await ensure_collection(client)
 
-        nodes = await _fetch_canonical_nodes(pool)
-        stats.nodes_fetched = len(nodes)
-        logger.info("Full sync: %d canonical nodes to process", len(nodes))
-
-        # Process in batches
-        for offset in range(0, len(nodes), BATCH_SIZE):
-            batch = nodes[offset : offset + BATCH_SIZE]
-            await _embed_and_upsert(client, embedding_service, batch, stats)
-            logger.info(
-                "Full sync progress: %d/%d upserted",
-                stats.nodes_upserted,
-                stats.nodes_fetched,
-            )
+        await _run_pipeline(client, pool, embedding_service, stats, reembed=reembed)
+        logger.info("Full sync: %d canonical nodes processed", stats.nodes_fetched)
 
         # Validate: Qdrant count should match Postgres canonical count
         await _validate_parity(client, pool, stats)
@@ -332,6 +669,7 @@ async def run_incremental_sync(
     *,
     qdrant_url: Optional[str] = None,
     qdrant_api_key: Optional[str] = None,
+    reembed: bool = False,
 ) -> SyncStats:
     """
     Incremental sync: only nodes updated after `since`.
@@ -342,6 +680,7 @@ async def run_incremental_sync(
         since: Only sync nodes with updatedAt > this timestamp.
         qdrant_url: Override Qdrant URL (default from env).
         qdrant_api_key: Override Qdrant API key (default from env).
+        reembed: Re-embed every node regardless of fingerprint.
 
     Returns:
         SyncStats with processing counts.
@@ -355,23 +694,20 @@ async def run_incremental_sync(
     try:
         await ensure_collection(client)
 
-        nodes = await _fetch_canonical_nodes(pool, since=since)
-        stats.nodes_fetched = len(nodes)
+        await _run_pipeline(
+            client, pool, embedding_service, stats, since=since, reembed=reembed,
+        )
         logger.info(
             "Incremental sync: %d nodes changed since %s",
-            len(nodes),
+            stats.nodes_fetched,
             since.isoformat(),
         )
 
-        if not nodes:
+        if not stats.nodes_fetched:
             logger.info("No changed nodes — nothing to sync")
             stats.finished_at = datetime.now(timezone.utc)
             return stats
 
-        for offset in range(0, len(nodes), BATCH_SIZE):
-            batch = nodes[offset : offset + BATCH_SIZE]
-            await _embed_and_upsert(client, embedding_service, batch, stats)
-
     finally:
         await client.close()
 
@@ -514,18 +850,26 @@ def _log_summary(stats: SyncStats) -> None:
     if stats.started_at and stats.finished_at:
         duration = (stats.finished_at - stats.started_at).total_seconds()
 
+    throughput = stats.stage_throughput()
     logger.info(
         "Qdrant sync complete [%s]: fetched=%d embedded=%d upserted=%d "
-        "skipped=%d errors=%d embed_time=%.1fs upsert_time=%.1fs total=%.1fs",
+        "payload_only=%d skipped=%d errors=%d embed_time=%.1fs upsert_time=%.1fs total=%.1fs "
+        "nodes/s read=%.1f embed=%.1f upsert=%.1f queue_peak embed=%d upsert=%d",
         stats.mode,
         stats.nodes_fetched,
         stats.nodes_embedded,
         stats.nodes_upserted,
+        stats.nodes_payload_only,
         stats.nodes_skipped,
         stats.errors,
         stats.embedding_time_s,
         stats.upsert_time_s,
         duration,
+        throughput["read"],
+        throughput["embed"],
+        throughput["upsert"],
+        stats.embed_queue_peak,
+        stats.upsert_queue_peak,
     )
     if stats.error_details:
         for err in stats.error_details[:10]:
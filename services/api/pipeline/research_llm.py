@@ -7,6 +7,8 @@ from typing import Optional
 
 import httpx
 
+from services.api.pipeline.llm_cache import LLMResponseCache, get_default_cache
+from services.api.pipeline.llm_scheduler import LLMWorkScheduler, SchedulerConfig
 from services.api.pipeline.source_bundle import SourceBundle, filter_snippets_for_venues
 
 logger = logging.getLogger(__name__)
@@ -19,6 +21,9 @@ RETRY_BACKOFF_BASE = 2.0
 INPUT_COST_PER_1M = 3.00
 OUTPUT_COST_PER_1M = 15.00
 PASS_B_BATCH_SIZE = 50
+PASS_B_MAX_CONCURRENCY = 4
+REQUESTS_PER_MINUTE = 50
+TOKENS_PER_MINUTE = 40_000
 MAX_TAGS_PER_VENUE = 8
 
 _NON_RETRYABLE_PATTERNS = frozenset({
@@ -248,21 +253,35 @@ def parse_pass_b_response(text: str, valid_tags: Optional[set[str]] = None) -> l
     return result
 
 
+def _build_payload(system_prompt: str, user_prompt: str, max_tokens: int) -> dict:
+    return {"model": MODEL_NAME, "max_tokens": max_tokens,
+            "system": system_prompt,
+            "messages": [{"role": "user", "content": user_prompt}]}
+
+
+def _response_text(body: dict) -> str:
+    return "".join(b["text"] for b in body.get("content", []) if b.get("type") == "text")
+
+
 async def _call_llm(
     client: httpx.AsyncClient,
     api_key: str,
     system_prompt: str,
     user_prompt: str,
     max_tokens: int = 2048,
+    scheduler: Optional[LLMWorkScheduler] = None,
 ) -> dict:
-    """Make a single LLM API call with retry logic."""
+    """Make a single LLM API call with retry logic.
+
+    With a scheduler, 429s go through scheduler.throttle() so concurrent
+    calls share the backoff. Callers cache the body only once it parsed.
+    """
+    payload = _build_payload(system_prompt, user_prompt, max_tokens)
     for attempt in range(MAX_RETRIES):
         try:
             resp = await client.post(
                 "https://api.anthropic.com/v1/messages",
-                json={"model": MODEL_NAME, "max_tokens": max_tokens,
-                      "system": system_prompt,
-                      "messages": [{"role": "user", "content": user_prompt}]},
+                json=payload,
                 headers={"x-api-key": api_key, "anthropic-version": "2023-06-01",
                          "content-type": "application/json"},
                 timeout=120.0)
@@ -271,7 +290,10 @@ async def _call_llm(
                 wait = RETRY_BACKOFF_BASE ** (attempt + 1)
                 logger.warning("LLM API %d, retrying in %.1fs (%d/%d)",
                                resp.status_code, wait, attempt + 1, MAX_RETRIES)
-                await asyncio.sleep(wait)
+                if resp.status_code == 429 and scheduler is not None:
+                    await scheduler.throttle(wait)
+                else:
+                    await asyncio.sleep(wait)
                 continue
 
             body_text = resp.text
@@ -302,20 +324,43 @@ async def run_pass_a(
     *,
     api_key: str,
     client: Optional[httpx.AsyncClient] = None,
+    cache: Optional[LLMResponseCache] = None,
 ) -> dict:
-    """Execute Pass A: City Synthesis."""
+    """Execute Pass A: City Synthesis.
+
+    A byte-identical earlier request is served from the response cache
+    (default: get_default_cache()); its tokens are reported as saved, not spent.
+    """
     user_prompt = build_pass_a_prompt(bundle)
+    cache = cache if cache is not None else get_default_cache()
+    payload = _build_payload(PASS_A_SYSTEM, user_prompt, 2048)
+    entry = cache.get(MODEL_NAME, PROMPT_VERSION_A, payload) if cache else None
+    if entry is not None:
+        text = _response_text(entry.body)
+        try:
+            parsed = parse_pass_a_response(text)
+        except Exception as exc:
+            logger.warning("Evicting unusable cached Pass A response: %s", exc)
+            cache.evict(MODEL_NAME, PROMPT_VERSION_A, payload, entry)
+        else:
+            return {"parsed": parsed, "raw_text": text,
+                    "input_tokens": 0, "output_tokens": 0, "cache_hits": 1,
+                    "cache_saved_usd": entry.cost_usd(INPUT_COST_PER_1M, OUTPUT_COST_PER_1M)}
+
     own_client = client is None
     if own_client:
         client = httpx.AsyncClient()
     try:
         body = await _call_llm(client, api_key, PASS_A_SYSTEM, user_prompt, max_tokens=2048)
-        text = "".join(b["text"] for b in body.get("content", []) if b.get("type") == "text")
+        text = _response_text(body)
         input_tokens = body.get("usage", {}).get("input_tokens", 0)
         output_tokens = body.get("usage", {}).get("output_tokens", 0)
         parsed = parse_pass_a_response(text)
+        if cache is not None:
+            cache.put(MODEL_NAME, PROMPT_VERSION_A, payload, body)
         return {"parsed": parsed, "raw_text": text,
-                "input_tokens": input_tokens, "output_tokens": output_tokens}
+                "input_tokens": input_tokens, "output_tokens": output_tokens,
+                "cache_hits": 0, "cache_saved_usd": 0.0}
     finally:
         if own_client:
             await client.aclose()
@@ -329,36 +374,96 @@ async def run_pass_b(
     *,
     api_key: str,
     client: Optional[httpx.AsyncClient] = None,
+    scheduler: Optional[LLMWorkScheduler] = None,
+    cache: Optional[LLMResponseCache] = None,
 ) -> dict:
-    """Execute Pass B: Venue Signals. Batched at 50 venues/call."""
+    """Execute Pass B: Venue Signals. Batched at 50 venues/call.
+
+    Batches run concurrently through an LLMWorkScheduler; venues are
+    returned in batch order. No new batch is dispatched once one fails,
+    and the first failing batch's error is raised.
+    Cached batches (default cache: get_default_cache()) skip the scheduler.
+    """
+    cache = cache if cache is not None else get_default_cache()
     own_client = client is None
     if own_client:
         client = httpx.AsyncClient()
+    if scheduler is None:
+        scheduler = LLMWorkScheduler(
+            SchedulerConfig(
+                max_concurrency=PASS_B_MAX_CONCURRENCY,
+                requests_per_minute=REQUESTS_PER_MINUTE,
+                tokens_per_minute=TOKENS_PER_MINUTE,
+                backoff_base_s=RETRY_BACKOFF_BASE,
+            ),
+            abort_on=(NonRetryableAPIError,),
+            name="research_pass_b",
+        )
+
+    batches = [venue_names[i:i + PASS_B_BATCH_SIZE]
+               for i in range(0, len(venue_names), PASS_B_BATCH_SIZE)]
+    vtags = set(vibe_vocabulary) if vibe_vocabulary else None
+
+    cache_hits = 0
+    cache_saved_usd = 0.0
+
+    async def _run_batch(batch: list[str]) -> tuple[list[dict], int, int]:
+        user_prompt = build_pass_b_prompt(bundle, pass_a_synthesis, batch, vibe_vocabulary)
+        body = await _call_llm(client, api_key, PASS_B_SYSTEM, user_prompt,
+                               max_tokens=4096, scheduler=scheduler)
+        input_t = body.get("usage", {}).get("input_tokens", 0)
+        output_t = body.get("usage", {}).get("output_tokens", 0)
+        venues = parse_pass_b_response(_response_text(body), valid_tags=vtags)
+        if cache is not None:
+            cache.put(MODEL_NAME, PROMPT_VERSION_B,
+                      _build_payload(PASS_B_SYSTEM, user_prompt, 4096), body)
+        return venues, input_t, output_t
+
+    def _lookup_batch(batch: list[str]) -> Optional[tuple[list[dict], int, int]]:
+        nonlocal cache_hits, cache_saved_usd
+        user_prompt = build_pass_b_prompt(bundle, pass_a_synthesis, batch, vibe_vocabulary)
+        payload = _build_payload(PASS_B_SYSTEM, user_prompt, 4096)
+        entry = cache.get(MODEL_NAME, PROMPT_VERSION_B, payload)
+        if entry is None:
+            return None
+        try:
+            venues = parse_pass_b_response(_response_text(entry.body), valid_tags=vtags)
+        except Exception as exc:
+            logger.warning("Evicting unusable cached Pass B response: %s", exc)
+            cache.evict(MODEL_NAME, PROMPT_VERSION_B, payload, entry)
+            return None
+        cache_hits += 1
+        cache_saved_usd += entry.cost_usd(INPUT_COST_PER_1M, OUTPUT_COST_PER_1M)
+        return venues, 0, 0
 
     all_venues: list[dict] = []
     total_input = 0
     total_output = 0
 
     try:
-        for i in range(0, max(len(venue_names), 1), PASS_B_BATCH_SIZE):
-            batch = venue_names[i:i + PASS_B_BATCH_SIZE]
-            if not batch:
-                break
-            user_prompt = build_pass_b_prompt(bundle, pass_a_synthesis, batch, vibe_vocabulary)
-            body = await _call_llm(client, api_key, PASS_B_SYSTEM, user_prompt, max_tokens=4096)
-            text = "".join(b["text"] for b in body.get("content", []) if b.get("type") == "text")
-            input_t = body.get("usage", {}).get("input_tokens", 0)
-            output_t = body.get("usage", {}).get("output_tokens", 0)
+        outcomes = await scheduler.map(
+            _run_batch, batches,
+            # Prompt size is dominated by the shared bundle; scale by venue count
+            estimate_tokens=lambda batch: 2000 + 40 * len(batch) + 4096,
+            tokens_used=lambda r: r[1] + r[2],
+            lookup=_lookup_batch if cache is not None else None,
+            stop_on_error=True,
+        )
+        if scheduler.aborted is not None:
+            raise scheduler.aborted
+        for outcome in outcomes:
+            if outcome.error is not None:
+                raise outcome.error
+            batch_venues, input_t, output_t = outcome.value
             total_input += input_t
             total_output += output_t
-            vtags = set(vibe_vocabulary) if vibe_vocabulary else None
-            batch_venues = parse_pass_b_response(text, valid_tags=vtags)
             all_venues.extend(batch_venues)
             logger.info("Pass B batch %d: %d venues, %d/%d tokens",
-                        i // PASS_B_BATCH_SIZE + 1, len(batch_venues), input_t, output_t)
+                        outcome.index + 1, len(batch_venues), input_t, output_t)
 
         return {"venues": all_venues,
-                "total_input_tokens": total_input, "total_output_tokens": total_output}
+                "total_input_tokens": total_input, "total_output_tokens": total_output,
+                "cache_hits": cache_hits, "cache_saved_usd": cache_saved_usd}
     finally:
         if own_client:
             await client.aclose()
@@ -397,6 +397,9 @@ async def run_research_pipeline(
             "venues_researched": len(venue_signals),
             "venues_resolved": resolved_count, "venues_unresolved": unresolved_count,
             "cost_usd": cost, "flagged_for_review": flagged_count,
+            "cache_hits": pass_a_result.get("cache_hits", 0) + pass_b_result.get("cache_hits", 0),
+            "cache_saved_usd": (pass_a_result.get("cache_saved_usd", 0.0)
+                                + pass_b_result.get("cache_saved_usd", 0.0)),
             "warnings": validation.warnings, "write_back": write_back}
 
     except NonRetryableAPIError as exc:
@@ -15,6 +15,8 @@ Extraction rules (from vibe-vocabulary.md + heuristics-addendum.md):
   - Contradictory pairs flagged for human review
   - Results written to ActivityNodeVibeTag with source = "llm_extraction"
   - Every extraction batch logged in ModelRegistry with cost + latency
+  - Responses cached by content hash (pipeline/llm_cache.py); replays after
+    a crash are served from disk and counted as cache hits, not spend
   - Per-mention extraction details logged to data/extraction_logs/{city}.jsonl
 """
 
@@ -25,12 +27,19 @@ import time
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Literal, Optional
+from typing import Any, Literal, Optional
 from uuid import uuid4
 
 import asyncpg
 import httpx
 
+from services.api.pipeline.llm_cache import LLMResponseCache, get_default_cache
+from services.api.pipeline.llm_scheduler import (
+    JobOutcome,
+    LLMWorkScheduler,
+    SchedulerConfig,
+)
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -92,10 +101,15 @@ MODEL_NAME = "claude-haiku-4-5-20251001"
 PROMPT_VERSION = "vibe-extract-v2"
 CONFIDENCE_THRESHOLD = 0.75
 MAX_TAGS_PER_SOURCE = 5
-BATCH_SIZE = 10
+BATCH_SIZE = 10  # results per _write_vibe_tags flush
 MAX_RETRIES = 3
 RETRY_BACKOFF_BASE = 2.0  # exponential backoff seconds
 
+# Concurrency + provider limits for the shared LLM scheduler
+MAX_CONCURRENCY = 8
+REQUESTS_PER_MINUTE = 50
+TOKENS_PER_MINUTE = 50_000
+
 # Haiku pricing (per 1M tokens, as of Feb 2026)
 INPUT_COST_PER_1M = 0.80   # USD
 OUTPUT_COST_PER_1M = 4.00  # USD
@@ -177,6 +191,7 @@ class ExtractionResult:
     flagged_contradictions: list[tuple[str, str]]
     input_tokens: int
     output_tokens: int
+    cached: bool = False  # served from the response cache (tokens not billed)
 
 
 @dataclass
@@ -190,6 +205,9 @@ class BatchStats:
     total_output_tokens: int = 0
     estimated_cost_usd: float = 0.0
     latency_seconds: float = 0.0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    cache_saved_usd: float = 0.0
     errors: list[str] = field(default_factory=list)
 
 
@@ -253,21 +271,25 @@ def _build_user_prompt(node: NodeInput) -> str:
 # LLM client
 # ---------------------------------------------------------------------------
 
+def _build_payload(node: NodeInput) -> dict:
+    """Messages API request body for one node (also the response cache key)."""
+    return {
+        "model": MODEL_NAME,
+        "max_tokens": 768,
+        "system": SYSTEM_PROMPT,
+        "messages": [{"role": "user", "content": _build_user_prompt(node)}],
+    }
+
+
 async def _call_haiku(
     client: httpx.AsyncClient,
     api_key: str,
     node: NodeInput,
+    cache: Optional[LLMResponseCache] = None,
 ) -> ExtractionResult:
     """Call Haiku for a single node, parse and validate response."""
 
-    user_prompt = _build_user_prompt(node)
-
-    payload = {
-        "model": MODEL_NAME,
-        "max_tokens": 768,
-        "system": SYSTEM_PROMPT,
-        "messages": [{"role": "user", "content": user_prompt}],
-    }
+    payload = _build_payload(node)
 
     resp = await client.post(
         "https://api.anthropic.com/v1/messages",
@@ -281,15 +303,50 @@ async def _call_haiku(
     )
     resp.raise_for_status()
     body = resp.json()
+    result = _parse_haiku_body(node, body)
+    # Cache only bodies that parsed; a malformed one must not be replayed
+    if cache is not None and _decode_response_json(_response_text(body)) is not None:
+        cache.put(MODEL_NAME, PROMPT_VERSION, payload, body)
+    return result
+
+
+def _lookup_cached(
+    cache: LLMResponseCache,
+    node: NodeInput,
+) -> Optional[ExtractionResult]:
+    """
+    Return the extraction for a byte-identical earlier request, if cached.
+    An entry that no longer parses is evicted and treated as a miss.
+    """
+    payload = _build_payload(node)
+    entry = cache.get(MODEL_NAME, PROMPT_VERSION, payload)
+    if entry is None:
+        return None
+    try:
+        if _decode_response_json(_response_text(entry.body)) is None:
+            raise ValueError("cached body has no JSON payload")
+        result = _parse_haiku_body(node, entry.body)
+    except Exception as exc:
+        logger.warning("Evicting unusable cached extraction for node %s: %s", node.id, exc)
+        cache.evict(MODEL_NAME, PROMPT_VERSION, payload, entry)
+        return None
+    result.cached = True
+    return result
+
+
+def _response_text(body: dict) -> str:
+    return "".join(
+        block.get("text", "") for block in body.get("content", []) if block.get("type") == "text"
+    )
+
 
+def _parse_haiku_body(node: NodeInput, body: dict) -> ExtractionResult:
+    """Turn a Messages API response body into a validated ExtractionResult."""
     input_tokens = body.get("usage", {}).get("input_tokens", 0)
     output_tokens = body.get("usage", {}).get("output_tokens", 0)
 
     # Extract text content from response
-    text = ""
-    for block in body.get("content", []):
-        if block.get("type") == "text":
-            text += block["text"]
+    text = _response_text(body)
 
     # Parse JSON from response text
     tag_list, raw_metadata = _parse_extraction_response(text)
@@ -348,30 +405,11 @@ async def _call_haiku(
     )
 
 
-def _parse_extraction_response(text: str) -> tuple[list[dict], dict]:
-    """
-    Parse LLM response text into (tag_list, raw_metadata).
-
-    Returns ([], {}) on parse failure — caller handles empty gracefully.
-    Tolerates markdown code fences.
-    """
+def _decode_response_json(text: str) -> Any:
+    """JSON value of the response text (bare or in a code fence), or None."""
     text = text.strip()
-
-    def _extract_from_data(data: dict | list) -> tuple[list[dict], dict]:
-        if isinstance(data, dict):
-            tags = data.get("tags", [])
-            metadata = data.get("metadata", {})
-            if isinstance(tags, list):
-                return tags, (metadata if isinstance(metadata, dict) else {})
-        if isinstance(data, list):
-            # Legacy: bare tag list with no metadata
-            return data, {}
-        return [], {}
-
-    # Try direct JSON parse
     try:
-        data = json.loads(text)
-        return _extract_from_data(data)
+        return json.loads(text)
     except json.JSONDecodeError:
         pass
 
@@ -382,12 +420,31 @@ def _parse_extraction_response(text: str) -> tuple[list[dict], dict]:
             if block.startswith("json"):
                 block = block[4:].strip()
             try:
-                data = json.loads(block)
-                return _extract_from_data(data)
+                return json.loads(block)
             except json.JSONDecodeError:
                 continue
+    return None
+
+
+def _parse_extraction_response(text: str) -> tuple[list[dict], dict]:
+    """
+    Parse LLM response text into (tag_list, raw_metadata).
 
-    logger.error("Failed to parse extraction response: %s", text[:200])
+    Returns ([], {}) on parse failure — caller handles empty gracefully.
+    Tolerates markdown code fences.
+    """
+    data = _decode_response_json(text)
+    if isinstance(data, dict):
+        tags = data.get("tags", [])
+        metadata = data.get("metadata", {})
+        if isinstance(tags, list):
+            return tags, (metadata if isinstance(metadata, dict) else {})
+        return [], {}
+    if isinstance(data, list):
+        # Legacy: bare tag list with no metadata
+        return data, {}
+    if data is None:
+        logger.error("Failed to parse extraction response: %s", text.strip()[:200])
     return [], {}
 
 
@@ -635,6 +692,7 @@ async def _log_to_model_registry(
             "confidence_threshold": CONFIDENCE_THRESHOLD,
             "max_tags_per_source": MAX_TAGS_PER_SOURCE,
             "batch_size": BATCH_SIZE,
+            "max_concurrency": MAX_CONCURRENCY,
         }),
         json.dumps({
             "nodes_processed": stats.nodes_processed,
@@ -645,6 +703,11 @@ async def _log_to_model_registry(
             "total_output_tokens": stats.total_output_tokens,
             "estimated_cost_usd": round(stats.estimated_cost_usd, 6),
             "latency_seconds": round(stats.latency_seconds, 2),
+            "cache_hits": stats.cache_hits,
+            "cache_hit_rate": round(
+                stats.cache_hits / (stats.cache_hits + stats.cache_misses), 4,
+            ) if stats.cache_hits + stats.cache_misses else 0.0,
+            "cache_saved_usd": round(stats.cache_saved_usd, 6),
             "errors": stats.errors[:20],  # cap error log size
         }),
         now,
@@ -682,21 +745,53 @@ def _write_dead_letter(
     return len(nodes)
 
 
+def _estimate_tokens(node: NodeInput) -> int:
+    """Rough pre-call token estimate (~4 chars/token + max output)."""
+    chars = len(SYSTEM_PROMPT) + len(_build_user_prompt(node))
+    return chars // 4 + 768
+
+
+def _make_scheduler() -> LLMWorkScheduler:
+    return LLMWorkScheduler(
+        SchedulerConfig(
+            max_concurrency=MAX_CONCURRENCY,
+            requests_per_minute=REQUESTS_PER_MINUTE,
+            tokens_per_minute=TOKENS_PER_MINUTE,
+            backoff_base_s=RETRY_BACKOFF_BASE,
+        ),
+        abort_on=(NonRetryableAPIError,),
+        name="vibe_extraction",
+    )
+
+
 async def extract_vibe_tags_batch(
     pool: asyncpg.Pool,
     api_key: str,
     nodes: list[NodeInput],
+    *,
+    scheduler: Optional[LLMWorkScheduler] = None,
+    cache: Optional[LLMResponseCache] = None,
 ) -> tuple[list[ExtractionResult], BatchStats]:
     """
     Extract vibe tags for a batch of nodes via Haiku.
 
+    Nodes are extracted concurrently through an LLMWorkScheduler (bounded
+    concurrency, RPM/TPM buckets, shared 429 backoff). Results are collected
+    in input order and written every BATCH_SIZE nodes while extraction
+    continues. Nodes whose request is already in the response cache
+    (defaults to get_default_cache()) skip the scheduler entirely.
+
     Returns (results, stats). Failures are logged in stats.errors
     and the batch continues — one bad node doesn't kill the run.
-    Non-retryable errors (billing, auth) abort immediately and write
-    remaining nodes to the dead letter queue.
+    Non-retryable errors (billing, auth) abort the scheduler and write
+    every node that did not complete to the dead letter queue.
     """
     stats = BatchStats()
     results: list[ExtractionResult] = []
+    if not nodes:
+        return results, stats
+    scheduler = scheduler or _make_scheduler()
+    cache = cache if cache is not None else get_default_cache()
 
     # Pre-fetch quality excerpts for the batch
     node_ids = [n.id for n in nodes]
@@ -704,37 +799,66 @@ async def extract_vibe_tags_batch(
     for node in nodes:
         node.quality_excerpts = excerpts.get(node.id, [])
 
-    start = time.monotonic()
-
-    async with httpx.AsyncClient() as client:
-        for idx, node in enumerate(nodes):
-            try:
-                result = await _extract_single_node(client, api_key, node, stats)
-                if result:
-                    results.append(result)
-            except NonRetryableAPIError as exc:
-                # Abort batch — write remaining unprocessed nodes to DLQ
-                remaining = nodes[idx:]
-                city = remaining[0].city if remaining else "unknown"
-                _write_dead_letter(city, remaining, str(exc))
-                stats.errors.append(str(exc))
-                break
+    tag_id_map: dict[str, str] = {}
 
-    stats.latency_seconds = time.monotonic() - start
+    async def _flush(outcomes: list[JobOutcome[NodeInput, Optional[ExtractionResult]]]) -> None:
+        flushed = [o.value for o in outcomes if o.value is not None]
+        if not flushed:
+            return
+        results.extend(flushed)
 
-    # Write tags to DB
-    if results:
-        all_slugs = {t.tag_slug for r in results for t in r.tags}
-        tag_id_map = await _resolve_vibe_tag_ids(pool, all_slugs)
-        stats.tags_written = await _write_vibe_tags(pool, results, tag_id_map)
+        new_slugs = {t.tag_slug for r in flushed for t in r.tags} - tag_id_map.keys()
+        if new_slugs:
+            tag_id_map.update(await _resolve_vibe_tag_ids(pool, new_slugs))
+        stats.tags_written += await _write_vibe_tags(pool, flushed, tag_id_map)
 
         # Append extraction log for canary review (grouped by city)
         city_groups: dict[str, list[ExtractionResult]] = {}
-        for r in results:
+        for r in flushed:
             city_groups.setdefault(r.city, []).append(r)
         for city, city_results in city_groups.items():
             _write_extraction_log(city_results, city)
 
+    def _lookup(node: NodeInput) -> Optional[ExtractionResult]:
+        result = _lookup_cached(cache, node)
+        if result is None:
+            stats.cache_misses += 1
+        else:
+            _record_result(stats, node, result)
+        return result
+
+    start = time.monotonic()
+
+    async with httpx.AsyncClient() as client:
+        outcomes = await scheduler.map(
+            lambda node: _extract_single_node(client, api_key, node, stats, scheduler, cache),
+            nodes,
+            estimate_tokens=_estimate_tokens,
+            tokens_used=lambda r: (r.input_tokens + r.output_tokens) if r else 0,
+            on_batch=_flush,
+            batch_size=BATCH_SIZE,
+            lookup=_lookup if cache is not None else None,
+        )
+
+    stats.latency_seconds = time.monotonic() - start
+
+    if scheduler.aborted is not None:
+        # Abort — write every node that didn't produce a result to DLQ
+        remaining = [
+            o.item for o in outcomes
+            if not o.started or isinstance(o.error, NonRetryableAPIError)
+        ]
+        if remaining:
+            _write_dead_letter(remaining[0].city, remaining, str(scheduler.aborted))
+        stats.errors.append(str(scheduler.aborted))
+
+    for outcome in outcomes:
+        if outcome.error is not None and not isinstance(outcome.error, NonRetryableAPIError):
+            msg = f"Unhandled error for node {outcome.item.id}: {outcome.error}"
+            stats.errors.append(msg)
+            stats.nodes_skipped += 1
+            logger.error(msg)
+
     # Compute cost
     stats.estimated_cost_usd = (
         (stats.total_input_tokens / 1_000_000) * INPUT_COST_PER_1M
@@ -744,25 +868,43 @@ async def extract_vibe_tags_batch(
     return results, stats
 
 
+def _record_result(stats: BatchStats, node: NodeInput, result: ExtractionResult) -> None:
+    """Fold one node's extraction into the batch stats."""
+    stats.nodes_processed += 1
+    if result.cached:
+        stats.cache_hits += 1
+        stats.cache_saved_usd += (
+            (result.input_tokens / 1_000_000) * INPUT_COST_PER_1M
+            + (result.output_tokens / 1_000_000) * OUTPUT_COST_PER_1M
+        )
+    else:
+        stats.total_input_tokens += result.input_tokens
+        stats.total_output_tokens += result.output_tokens
+    stats.contradictions_flagged += len(result.flagged_contradictions)
+
+    if not result.tags:
+        stats.nodes_skipped += 1
+        logger.info("No tags above threshold for node %s (%s)", node.id, node.name)
+
+
 async def _extract_single_node(
     client: httpx.AsyncClient,
     api_key: str,
     node: NodeInput,
     stats: BatchStats,
+    scheduler: Optional[LLMWorkScheduler] = None,
+    cache: Optional[LLMResponseCache] = None,
 ) -> Optional[ExtractionResult]:
-    """Extract tags for a single node with retries."""
+    """
+    Extract tags for a single node with retries.
+
+    With a scheduler, 429s go through scheduler.throttle() so the backoff
+    pauses every in-flight extraction, not just this one.
+    """
     for attempt in range(MAX_RETRIES):
         try:
-            result = await _call_haiku(client, api_key, node)
-            stats.nodes_processed += 1
-            stats.total_input_tokens += result.input_tokens
-            stats.total_output_tokens += result.output_tokens
-            stats.contradictions_flagged += len(result.flagged_contradictions)
-
-            if not result.tags:
-                stats.nodes_skipped += 1
-                logger.info("No tags above threshold for node %s (%s)", node.id, node.name)
-
+            result = await _call_haiku(client, api_key, node, cache)
+            _record_result(stats, node, result)
             return result
 
         except httpx.HTTPStatusError as exc:
@@ -773,7 +915,11 @@ async def _extract_single_node(
                     "Haiku API %d for node %s, retry %d/%d in %.1fs",
                     status, node.id, attempt + 1, MAX_RETRIES, wait,
                 )
-                await asyncio.sleep(wait)
+                if status == 429 and scheduler is not None:
+                    retry_after = exc.response.headers.get("retry-after")
+                    await scheduler.throttle(float(retry_after) if retry_after else wait)
+                else:
+                    await asyncio.sleep(wait)
                 continue
             # Check for non-retryable account-level errors — abort entire run
             body_lower = exc.response.text.lower()
@@ -837,47 +983,24 @@ async def run_extraction(
 
     logger.info("Found %d untagged nodes to process", len(nodes))
 
-    # Process in batches to avoid holding too many connections
-    all_stats = BatchStats()
-
-    for i in range(0, len(nodes), BATCH_SIZE):
-        batch = nodes[i : i + BATCH_SIZE]
-        logger.info(
-            "Processing batch %d/%d (%d nodes)",
-            (i // BATCH_SIZE) + 1,
-            (len(nodes) + BATCH_SIZE - 1) // BATCH_SIZE,
-            len(batch),
-        )
-
-        _, batch_stats = await extract_vibe_tags_batch(pool, api_key, batch)
-
-        # Accumulate stats
-        all_stats.nodes_processed += batch_stats.nodes_processed
-        all_stats.tags_written += batch_stats.tags_written
-        all_stats.nodes_skipped += batch_stats.nodes_skipped
-        all_stats.contradictions_flagged += batch_stats.contradictions_flagged
-        all_stats.total_input_tokens += batch_stats.total_input_tokens
-        all_stats.total_output_tokens += batch_stats.total_output_tokens
-        all_stats.estimated_cost_usd += batch_stats.estimated_cost_usd
-        all_stats.latency_seconds += batch_stats.latency_seconds
-        all_stats.errors.extend(batch_stats.errors)
-
-        # Non-retryable error hit — write remaining batches to DLQ and stop
-        if any("Non-retryable" in e for e in batch_stats.errors):
-            remaining_nodes = nodes[i + BATCH_SIZE:]
-            if remaining_nodes:
-                city = remaining_nodes[0].city if remaining_nodes else "unknown"
-                _write_dead_letter(city, remaining_nodes, batch_stats.errors[-1])
-            logger.error("Aborting extraction: non-retryable API error")
-            break
+    # One scheduler for the whole run — extraction runs concurrently and
+    # tags are written every BATCH_SIZE nodes as results arrive in order.
+    _, all_stats = await extract_vibe_tags_batch(
+        pool, api_key, nodes, scheduler=_make_scheduler(),
+    )
+    if any("Non-retryable" in e for e in all_stats.errors):
+        logger.error("Aborted extraction: non-retryable API error")
 
     # Log to model registry
     registry_id = await _log_to_model_registry(pool, all_stats)
     logger.info(
-        "Extraction complete: %d nodes → %d tags, cost=$%.4f, registry=%s",
+        "Extraction complete: %d nodes → %d tags, cost=$%.4f "
+        "(cache: %d hits, saved $%.4f), registry=%s",
         all_stats.nodes_processed,
         all_stats.tags_written,
         all_stats.estimated_cost_usd,
+        all_stats.cache_hits,
+        all_stats.cache_saved_usd,
         registry_id,
     )
 
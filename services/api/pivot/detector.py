@@ -1,15 +1,18 @@
 """
 PivotDetector — orchestrates all pivot triggers and writes PivotEvent records.
 
-Flow per slot evaluation:
-  1. Fetch current weather for trip city (shared across all slots in one run)
-  2. Run each trigger against the slot
-  3. On first firing trigger:
-     a. Check MAX_PIVOT_DEPTH=1 (no cascading pivots)
-     b. Query ActivitySearchService for ranked alternatives (same city, different node)
-     c. Insert PivotEvent(status=proposed) into Postgres
-     d. Return PivotEvent dict to caller
-  4. Log all trigger evaluations as BehavioralSignals
+Flow per trip evaluation (evaluate_trip and evaluate_slot share it):
+  1. Prefetch a TripContext in one pass: current weather for the trip city,
+     the resolved trip timezone, and the activity nodes (with compiled hours)
+     for every slot — nested activityNode dicts are used as-is, the rest are
+     loaded with a single activity_nodes query
+  2. Run the pure triggers (check()) over all slots as a batch; the first
+     firing trigger per slot wins. MAX_PIVOT_DEPTH=1 (no cascading pivots)
+  3. Query ActivitySearchService for alternatives for every fired slot
+     concurrently — one search per distinct query, bounded by
+     MAX_CONCURRENT_SEARCHES
+  4. Insert all PivotEvent(status=proposed) rows with one bulk INSERT
+  5. Return the PivotEvent dicts to the caller
 
 MAX_PIVOT_DEPTH enforcement:
   A slot is skipped if ItinerarySlot.wasSwapped is True.
@@ -22,15 +25,20 @@ Database writes:
 Alternative ranking strategy:
   Uses ActivitySearchService.search() with a natural-language query derived
   from the original slot's category + vibe tags. Top MAX_ALTERNATIVES results
-  are stored as PivotEvent.alternativeIds (ordered by score).
+  are stored as PivotEvent.alternativeIds (ordered by score). Slots whose
+  queries match share one search; each still excludes its own original node.
 """
 
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
 import uuid
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any
+from zoneinfo import ZoneInfo
 
 from services.api.pivot.triggers import (
     WeatherTrigger,
@@ -38,7 +46,9 @@ from services.api.pivot.triggers import (
     TimeOverrunTrigger,
     UserMoodTrigger,
     TriggerResult,
+    resolve_trip_timezone,
 )
+from services.api.hours import WeeklyHours, compiled_hours
 from services.api.weather.service import WeatherService
 
 logger = logging.getLogger(__name__)
@@ -49,6 +59,42 @@ MAX_ALTERNATIVES = 5
 # Prevents cascading pivots — slots that were already swapped in cannot be re-pivoted
 MAX_PIVOT_DEPTH = 1
 
+# Upper bound on in-flight alternative searches per trip evaluation
+MAX_CONCURRENT_SEARCHES = 8
+
+_TERMINAL_STATUSES = {"completed", "skipped", "archived"}
+
+
+@dataclass
+class TripContext:
+    """
+    Everything trigger evaluation needs for one trip, fetched once.
+
+    Attributes:
+        trip:            Trip record dict.
+        trip_tz:         Resolved ZoneInfo for Trip.timezone (UTC fallback).
+        weather_summary: WeatherService.get_weather() result for the trip city.
+        now_utc:         Evaluation timestamp shared by every slot.
+        nodes:           activityNodeId -> ActivityNode dict (id, name, hours,
+                         googlePlaceId, updatedAt).
+        hours:           activityNodeId -> compiled WeeklyHours (None = no hours).
+    """
+
+    trip: dict[str, Any]
+    trip_tz: ZoneInfo
+    weather_summary: dict[str, Any] | None
+    now_utc: datetime
+    nodes: dict[str, dict[str, Any]] = field(default_factory=dict)
+    hours: dict[str, WeeklyHours | None] = field(default_factory=dict)
+
+    def venue(self, slot: dict[str, Any]) -> tuple[dict[str, Any], WeeklyHours | None]:
+        """The slot's ActivityNode and its compiled hours (None = compile on demand)."""
+        node_id = slot.get("activityNodeId") or ""
+        shared = self.nodes.get(node_id)
+        node = slot.get("activityNode") or shared or {}
+        weekly_hours = self.hours.get(node_id) if node is shared else None
+        return node, weekly_hours
+
 
 def _build_alternative_query(slot: dict[str, Any]) -> str:
     """
@@ -84,9 +130,9 @@ class PivotDetector:
         detector = PivotDetector(db=db_pool, search_service=search, weather_service=weather)
         events = await detector.evaluate_trip(trip, slots)
 
-    One PivotDetector instance is created per request/background job and
-    shares a single weather fetch across all slots in the trip (cache handles
-    the rest).
+    One PivotDetector instance is created per request/background job. Each
+    evaluation prefetches one TripContext, so weather, timezone and venue
+    hours are resolved once per trip rather than once per slot.
     """
 
     def __init__(
@@ -127,32 +173,23 @@ class PivotDetector:
 
         Args:
             trip:               Trip record dict (id, city, timezone, ...).
-            slots:              List of ItinerarySlot dicts (with activityNode nested).
+            slots:              List of ItinerarySlot dicts (activityNode nested
+                                or loaded by activityNodeId).
             user_mood_slot_id:  If set, the UserMoodTrigger fires for this slot only.
             user_id:            Required when user_mood_slot_id is set.
 
         Returns:
             List of created PivotEvent dicts (may be empty if no triggers fired).
         """
-        # Fetch weather once for the whole trip — WeatherCache returns in-memory
-        # for the same hour; no repeated OpenWeatherMap calls.
-        city = trip.get("city", "")
-        weather_summary = await self._weather.get_weather(city) if city else None
-
-        now_utc = datetime.now(timezone.utc)
-        pivot_events: list[dict[str, Any]] = []
+        context = await self._prefetch_context(trip, slots)
 
+        fired: list[tuple[dict[str, Any], TriggerResult]] = []
         for slot in slots:
-            event = await self._evaluate_slot(
-                slot=slot,
-                trip=trip,
-                weather_summary=weather_summary,
-                now_utc=now_utc,
-                user_mood_slot_id=user_mood_slot_id,
-                user_id=user_id,
-            )
-            if event is not None:
-                pivot_events.append(event)
+            result = self._check_slot(slot, context, user_mood_slot_id, user_id)
+            if result is not None:
+                fired.append((slot, result))
+
+        pivot_events = await self._create_pivot_events(fired, trip)
 
         logger.info(
             "PivotDetector: trip=%s evaluated %d slots, %d pivot events created",
@@ -177,77 +214,113 @@ class PivotDetector:
 
         Returns a PivotEvent dict or None.
         """
-        city = trip.get("city", "")
-        weather_summary = await self._weather.get_weather(city) if city else None
-        now_utc = datetime.now(timezone.utc)
+        context = await self._prefetch_context(trip, [slot])
         user_mood_slot_id = slot.get("id") if user_mood else None
 
-        return await self._evaluate_slot(
-            slot=slot,
-            trip=trip,
-            weather_summary=weather_summary,
-            now_utc=now_utc,
-            user_mood_slot_id=user_mood_slot_id,
-            user_id=user_id,
-        )
+        result = self._check_slot(slot, context, user_mood_slot_id, user_id)
+        if result is None:
+            return None
+        events = await self._create_pivot_events([(slot, result)], trip)
+        return events[0]
 
     # -------------------------------------------------------------------------
     # Internal
     # -------------------------------------------------------------------------
 
-    async def _evaluate_slot(
+    async def _prefetch_context(
         self,
-        slot: dict[str, Any],
         trip: dict[str, Any],
-        weather_summary: dict[str, Any] | None,
-        now_utc: datetime,
+        slots: list[dict[str, Any]],
+    ) -> TripContext:
+        """
+        Resolve weather, timezone and venue hours for a trip in one pass.
+
+        Weather is fetched once for the city. Slots that carry a nested
+        activityNode use it directly; the remaining activityNodeIds are loaded
+        with one activity_nodes query. Hours are compiled once per node
+        (cached across trips by updatedAt). A failed node query is logged and
+        leaves those slots without hours (the closure trigger does not fire
+        without hours — the safe default).
+        """
+        city = trip.get("city", "")
+        weather_summary = await self._weather.get_weather(city) if city else None
+        context = TripContext(
+            trip=trip,
+            trip_tz=resolve_trip_timezone(trip),
+            weather_summary=weather_summary,
+            now_utc=datetime.now(timezone.utc),
+        )
+
+        missing: set[str] = set()
+        for slot in slots:
+            node_id = slot.get("activityNodeId")
+            if slot.get("activityNode"):
+                if node_id:
+                    context.nodes.setdefault(node_id, slot["activityNode"])
+            elif node_id:
+                missing.add(node_id)
+        missing -= context.nodes.keys()
+
+        if missing and self._db is not None:
+            try:
+                rows = await self._db.fetch(
+                    """
+                    SELECT id, name, hours, "googlePlaceId", "updatedAt"
+                    FROM activity_nodes
+                    WHERE id = ANY($1::text[])
+                    """,
+                    sorted(missing),
+                )
+                for row in rows:
+                    node = dict(row)
+                    if isinstance(node.get("hours"), str):
+                        node["hours"] = json.loads(node["hours"])
+                    context.nodes[node["id"]] = node
+            except Exception:
+                logger.warning(
+                    "PivotDetector: activity node prefetch failed for trip=%s",
+                    trip.get("id"),
+                    exc_info=True,
+                )
+
+        for node_id, node in context.nodes.items():
+            context.hours[node_id] = compiled_hours(node)
+
+        return context
+
+    def _check_slot(
+        self,
+        slot: dict[str, Any],
+        context: TripContext,
         user_mood_slot_id: str | None,
         user_id: str,
-    ) -> dict[str, Any] | None:
+    ) -> TriggerResult | None:
         """
-        Run all triggers against one slot. Creates a PivotEvent on first match.
+        Run all triggers against one slot. Returns the first firing TriggerResult.
 
         MAX_PIVOT_DEPTH enforcement:
           Slots with wasSwapped=True are skipped entirely — they were already
           a pivot replacement and cannot be re-pivoted.
         """
         slot_id = slot.get("id", "")
-        slot_was_swapped = slot.get("wasSwapped", False)
 
         # Enforce MAX_PIVOT_DEPTH = 1
-        if slot_was_swapped:
+        if slot.get("wasSwapped", False):
             logger.debug(
                 "Slot %s skipped (wasSwapped=True, MAX_PIVOT_DEPTH=%d)", slot_id, MAX_PIVOT_DEPTH
             )
             return None
 
         # Skip already-terminal slots
-        slot_status = slot.get("status", "")
-        if slot_status in {"completed", "skipped", "archived"}:
-            return None
-
-        # Run triggers in priority order — first one that fires wins
-        result = await self._run_triggers(
-            slot=slot,
-            trip=trip,
-            weather_summary=weather_summary,
-            now_utc=now_utc,
-            user_mood_slot_id=user_mood_slot_id,
-            user_id=user_id,
-        )
-
-        if result is None or not result.triggered:
+        if slot.get("status", "") in _TERMINAL_STATUSES:
             return None
 
-        # Trigger fired — fetch alternatives and create PivotEvent
-        return await self._create_pivot_event(slot, trip, result)
+        return self._run_triggers(slot, context, user_mood_slot_id, user_id)
 
-    async def _run_triggers(
+    def _run_triggers(
         self,
         slot: dict[str, Any],
-        trip: dict[str, Any],
-        weather_summary: dict[str, Any] | None,
-        now_utc: datetime,
+        context: TripContext,
         user_mood_slot_id: str | None,
         user_id: str,
     ) -> TriggerResult | None:
@@ -261,10 +334,11 @@ class PivotDetector:
           4. TimeOverrunTrigger  (time management — schedule drift)
         """
         slot_id = slot.get("id", "")
+        trip = context.trip
 
         # 1. User mood — explicit, only for the flagged slot
         if user_mood_slot_id and slot_id == user_mood_slot_id:
-            result = await self._mood_trigger.evaluate(
+            result = self._mood_trigger.check(
                 slot=slot,
                 trip=trip,
                 user_id=user_id,
@@ -275,30 +349,35 @@ class PivotDetector:
                 return result
 
         # 2. Weather
-        result = await self._weather_trigger.evaluate(
+        result = self._weather_trigger.check(
             slot=slot,
             trip=trip,
-            weather_summary=weather_summary,
+            weather_summary=context.weather_summary,
         )
         if result.triggered:
             logger.info("WeatherTrigger fired for slot=%s: %s", slot_id, result.reason)
             return result
 
         # 3. Venue closure
-        result = await self._closure_trigger.evaluate(
+        activity_node, weekly_hours = context.venue(slot)
+        result = self._closure_trigger.check(
             slot=slot,
             trip=trip,
-            now_utc=now_utc,
+            now_utc=context.now_utc,
+            trip_tz=context.trip_tz,
+            activity_node=activity_node,
+            weekly_hours=weekly_hours,
         )
         if result.triggered:
             logger.info("VenueClosureTrigger fired for slot=%s: %s", slot_id, result.reason)
             return result
 
         # 4. Time overrun
-        result = await self._overrun_trigger.evaluate(
+        result = self._overrun_trigger.check(
             slot=slot,
             trip=trip,
-            now_utc=now_utc,
+            now_utc=context.now_utc,
+            trip_tz=context.trip_tz,
         )
         if result.triggered:
             logger.info("TimeOverrunTrigger fired for slot=%s: %s", slot_id, result.reason)
@@ -308,21 +387,50 @@ class PivotDetector:
 
     async def _fetch_alternatives(
         self,
-        slot: dict[str, Any],
+        slots: list[dict[str, Any]],
         trip: dict[str, Any],
-    ) -> list[str]:
+    ) -> list[list[str]]:
         """
-        Query ActivitySearchService for ranked alternative ActivityNode IDs.
+        Query ActivitySearchService for ranked alternative ActivityNode IDs
+        for every slot, concurrently.
 
-        Excludes the current slot's activityNodeId from results.
+        Slots with the same alternative query share one search (at most
+        MAX_CONCURRENT_SEARCHES in flight). Each slot's list excludes its own
+        activityNodeId.
 
         Returns:
-            List of ActivityNode ID strings (up to MAX_ALTERNATIVES), ordered by score.
+            One list of ActivityNode ID strings (up to MAX_ALTERNATIVES, ordered
+            by score) per slot, in slot order.
         """
-        original_node_id = slot.get("activityNodeId")
         city = trip.get("city", "")
-        query = _build_alternative_query(slot)
-
+        queries = [_build_alternative_query(slot) for slot in slots]
+        distinct = list(dict.fromkeys(queries))
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_SEARCHES)
+
+        async def search(query: str) -> list[dict[str, Any]]:
+            async with semaphore:
+                return await self._search_alternatives(query, city)
+
+        results = dict(zip(distinct, await asyncio.gather(*(search(q) for q in distinct))))
+
+        alternatives: list[list[str]] = []
+        for slot, query in zip(slots, queries):
+            original_node_id = slot.get("activityNodeId")
+            alternative_ids: list[str] = []
+            for node in results[query]:
+                node_id = node.get("id")
+                if not node_id:
+                    continue
+                if node_id == original_node_id:
+                    continue  # Exclude the current activity
+                alternative_ids.append(node_id)
+                if len(alternative_ids) >= MAX_ALTERNATIVES:
+                    break
+            alternatives.append(alternative_ids)
+        return alternatives
+
+    async def _search_alternatives(self, query: str, city: str) -> list[dict[str, Any]]:
+        """One alternatives search. Failures are logged and return no results."""
         # Fetch one extra in case we need to exclude the original
         fetch_limit = MAX_ALTERNATIVES + 1
 
@@ -335,41 +443,27 @@ class PivotDetector:
             )
         except Exception:
             logger.exception(
-                "ActivitySearchService failed while fetching pivot alternatives for slot=%s",
-                slot.get("id"),
+                "ActivitySearchService failed while fetching pivot alternatives for query=%r",
+                query,
             )
             return []
 
-        results = search_result.get("results", [])
-
-        alternative_ids: list[str] = []
-        for node in results:
-            node_id = node.get("id")
-            if not node_id:
-                continue
-            if node_id == original_node_id:
-                continue  # Exclude the current activity
-            alternative_ids.append(node_id)
-            if len(alternative_ids) >= MAX_ALTERNATIVES:
-                break
-
         if search_result.get("warning"):
             logger.warning(
-                "Search warning while fetching alternatives for slot=%s: %s",
-                slot.get("id"),
+                "Search warning while fetching alternatives for query=%r: %s",
+                query,
                 search_result["warning"],
             )
 
-        return alternative_ids
+        return search_result.get("results", [])
 
-    async def _create_pivot_event(
+    async def _create_pivot_events(
         self,
-        slot: dict[str, Any],
+        fired: list[tuple[dict[str, Any], TriggerResult]],
         trip: dict[str, Any],
-        trigger_result: TriggerResult,
-    ) -> dict[str, Any]:
+    ) -> list[dict[str, Any]]:
         """
-        Fetch alternatives and write a PivotEvent row to the database.
+        Fetch alternatives for every fired slot and write all PivotEvent rows.
 
         PivotEvent fields:
           id              — new UUID
@@ -383,57 +477,60 @@ class PivotDetector:
           status          — 'proposed'
           createdAt       — now
 
-        Returns the PivotEvent dict (not a DB row object — callers get a plain dict).
+        Returns the PivotEvent dicts (not DB row objects — callers get plain dicts).
         """
-        alternative_ids = await self._fetch_alternatives(slot, trip)
+        if not fired:
+            return []
 
-        pivot_event_id = str(uuid.uuid4())
-        now_utc = datetime.now(timezone.utc)
+        all_alternatives = await self._fetch_alternatives([slot for slot, _ in fired], trip)
 
-        original_node_id = slot.get("activityNodeId") or ""
+        now_utc = datetime.now(timezone.utc)
         trip_id = trip.get("id", "")
-        slot_id = slot.get("id", "")
+        pivot_events: list[dict[str, Any]] = []
 
-        pivot_event: dict[str, Any] = {
-            "id": pivot_event_id,
-            "tripId": trip_id,
-            "slotId": slot_id,
-            "triggerType": trigger_result.trigger_type,
-            "triggerPayload": trigger_result.payload,
-            "originalNodeId": original_node_id,
-            "alternativeIds": alternative_ids,
-            "selectedNodeId": None,
-            "status": "proposed",
-            "resolvedAt": None,
-            "responseTimeMs": None,
-            "createdAt": now_utc.isoformat(),
-        }
+        for (slot, trigger_result), alternative_ids in zip(fired, all_alternatives):
+            pivot_event: dict[str, Any] = {
+                "id": str(uuid.uuid4()),
+                "tripId": trip_id,
+                "slotId": slot.get("id", ""),
+                "triggerType": trigger_result.trigger_type,
+                "triggerPayload": trigger_result.payload,
+                "originalNodeId": slot.get("activityNodeId") or "",
+                "alternativeIds": alternative_ids,
+                "selectedNodeId": None,
+                "status": "proposed",
+                "resolvedAt": None,
+                "responseTimeMs": None,
+                "createdAt": now_utc.isoformat(),
+            }
+            pivot_events.append(pivot_event)
+
+            logger.info(
+                "PivotEvent created: id=%s trigger=%s slot=%s alternatives=%d",
+                pivot_event["id"],
+                trigger_result.trigger_type,
+                pivot_event["slotId"],
+                len(alternative_ids),
+            )
 
         # Write to database
-        await self._persist_pivot_event(pivot_event)
-
-        logger.info(
-            "PivotEvent created: id=%s trigger=%s slot=%s alternatives=%d",
-            pivot_event_id,
-            trigger_result.trigger_type,
-            slot_id,
-            len(alternative_ids),
-        )
+        await self._persist_pivot_events(pivot_events)
 
-        return pivot_event
+        return pivot_events
 
-    async def _persist_pivot_event(self, pivot_event: dict[str, Any]) -> None:
+    async def _persist_pivot_events(self, pivot_events: list[dict[str, Any]]) -> None:
         """
-        Insert a PivotEvent row into Postgres.
+        Insert PivotEvent rows into Postgres with one statement.
 
-        Uses asyncpg-style parameter binding via $N placeholders.
-        Does NOT raise — failures are logged and swallowed so the
-        in-memory pivot_event dict is still returned to the caller.
+        Columns are bound as parallel arrays and expanded with unnest();
+        alternativeIds (a ragged text[] per row) travels as a JSON array string.
+        Does NOT raise — failures are logged and swallowed so the in-memory
+        pivot_event dicts are still returned to the caller.
         """
-        import json as _json
+        event_ids = [e["id"] for e in pivot_events]
 
         if self._db is None:
-            logger.warning("No DB pool — PivotEvent %s not persisted", pivot_event["id"])
+            logger.warning("No DB pool — PivotEvents %s not persisted", event_ids)
             return
 
         sql = """
@@ -441,28 +538,39 @@ class PivotDetector:
                 id, "tripId", "slotId", "triggerType", "triggerPayload",
                 "originalNodeId", "alternativeIds", "selectedNodeId",
                 status, "resolvedAt", "responseTimeMs", "createdAt"
-            ) VALUES (
-                $1, $2, $3, $4, $5::jsonb,
-                $6, $7, $8,
-                $9, $10, $11, $12
+            )
+            SELECT
+                e.id, e.trip_id, e.slot_id, e.trigger_type::"PivotTrigger", e.trigger_payload::jsonb,
+                e.original_node_id,
+                ARRAY(SELECT jsonb_array_elements_text(e.alternative_ids::jsonb)),
+                e.selected_node_id,
+                e.status::"PivotStatus", e.resolved_at, e.response_time_ms, e.created_at
+            FROM unnest(
+                $1::text[], $2::text[], $3::text[], $4::text[], $5::text[],
+                $6::text[], $7::text[], $8::text[],
+                $9::text[], $10::timestamptz[], $11::int[], $12::timestamptz[]
+            ) AS e(
+                id, trip_id, slot_id, trigger_type, trigger_payload,
+                original_node_id, alternative_ids, selected_node_id,
+                status, resolved_at, response_time_ms, created_at
             )
             ON CONFLICT (id) DO NOTHING
         """
         try:
             await self._db.execute(
                 sql,
-                pivot_event["id"],
-                pivot_event["tripId"],
-                pivot_event["slotId"],
-                pivot_event["triggerType"],
-                _json.dumps(pivot_event["triggerPayload"]),
-                pivot_event["originalNodeId"],
-                pivot_event["alternativeIds"],          # asyncpg handles str[] natively
-                pivot_event["selectedNodeId"],
-                pivot_event["status"],
-                pivot_event["resolvedAt"],
-                pivot_event["responseTimeMs"],
-                datetime.fromisoformat(pivot_event["createdAt"]),
+                event_ids,
+                [e["tripId"] for e in pivot_events],
+                [e["slotId"] for e in pivot_events],
+                [e["triggerType"] for e in pivot_events],
+                [json.dumps(e["triggerPayload"]) for e in pivot_events],
+                [e["originalNodeId"] for e in pivot_events],
+                [json.dumps(e["alternativeIds"]) for e in pivot_events],
+                [e["selectedNodeId"] for e in pivot_events],
+                [e["status"] for e in pivot_events],
+                [e["resolvedAt"] for e in pivot_events],
+                [e["responseTimeMs"] for e in pivot_events],
+                [datetime.fromisoformat(e["createdAt"]) for e in pivot_events],
             )
         except Exception:
-            logger.exception("Failed to persist PivotEvent %s to DB", pivot_event["id"])
+            logger.exception("Failed to persist PivotEvents %s to DB", event_ids)
@@ -9,6 +9,10 @@ Design principles:
   - Triggers do NOT call external services directly — dependencies are injected.
   - Each trigger is independently testable with no external side effects.
   - Timezone-awareness is mandatory: all datetime comparisons use Trip.timezone.
+  - Each trigger exposes a synchronous check() holding the logic; evaluate()
+    is the async wrapper. PivotDetector calls check() directly when it runs a
+    whole trip as one batch, passing the pre-resolved timezone, nodes and
+    compiled hours from its TripContext.
 
 Trigger registry (mirrors PivotTrigger enum):
   weather_change  -> WeatherTrigger
@@ -19,12 +23,21 @@ Trigger registry (mirrors PivotTrigger enum):
 
 from __future__ import annotations
 
+import json
 import logging
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Any
 from zoneinfo import ZoneInfo
 
+from services.api.hours import (
+    DAY_NAMES,
+    WeeklyHours,
+    compiled_hours,
+    parse_hours_range,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -100,6 +113,15 @@ class WeatherTrigger:
         Returns:
             TriggerResult
         """
+        return self.check(slot, trip, weather_summary)
+
+    def check(
+        self,
+        slot: dict[str, Any],
+        trip: dict[str, Any],
+        weather_summary: dict[str, Any] | None = None,
+    ) -> TriggerResult:
+        """Synchronous core of evaluate()."""
         category = slot.get("category") or slot.get("slotType", "")
 
         if not self._weather.is_outdoor_slot(category):
@@ -142,38 +164,39 @@ class WeatherTrigger:
 # VenueClosureTrigger
 # ---------------------------------------------------------------------------
 
-def _parse_hours_range(hours_str: str) -> tuple[int, int] | None:
-    """
-    Parse a simple 'HH:MM-HH:MM' hours string into (open_minute, close_minute)
-    offsets from midnight.
+_DAY_NAMES = DAY_NAMES
 
-    Returns None if the string cannot be parsed.
+# Kept under its historical name; the parser lives in services.api.hours
+_parse_hours_range = parse_hours_range
 
-    Examples:
-        '09:00-22:00' -> (540, 1320)
-        '00:00-00:00' -> None  (ambiguous — treat as unknown)
-    """
+
+@lru_cache(maxsize=256)
+def _zone(name: str) -> ZoneInfo | None:
     try:
-        parts = hours_str.strip().split("-")
-        if len(parts) != 2:
-            return None
-        open_h, open_m = map(int, parts[0].split(":"))
-        close_h, close_m = map(int, parts[1].split(":"))
-        open_minutes = open_h * 60 + open_m
-        close_minutes = close_h * 60 + close_m
-        if open_minutes == close_minutes:
-            return None  # ambiguous
-        return (open_minutes, close_minutes)
-    except (ValueError, AttributeError):
+        return ZoneInfo(name)
+    except Exception:
         return None
 
 
+def resolve_trip_timezone(trip: dict[str, Any]) -> ZoneInfo:
+    """ZoneInfo for Trip.timezone, falling back to UTC when it is invalid."""
+    trip_tz_str = trip.get("timezone", "UTC")
+    trip_tz = _zone(trip_tz_str) if isinstance(trip_tz_str, str) else None
+    if trip_tz is None:
+        logger.warning("Invalid timezone %r for trip %s, defaulting to UTC", trip_tz_str, trip.get("id"))
+        return _zone("UTC")
+    return trip_tz
+
+
 class VenueClosureTrigger:
     """
     Fires when a venue is closed at the scheduled slot start time.
 
     Data source: ActivityNode.hours JSON field from Postgres.
     Hours format expected: {"monday": "09:00-22:00", "tuesday": "09:00-22:00", ...}
+    Split shifts ("11:00-14:00, 17:00-22:00") and past-midnight closes
+    ("18:00-02:00") are supported; hours are compiled once per node by
+    services.api.hours and cached by ActivityNode.updatedAt.
 
     Timezone awareness: uses Trip.timezone for local-time comparison.
 
@@ -181,7 +204,7 @@ class VenueClosureTrigger:
     """
 
     TRIGGER_TYPE = "venue_closed"
-    _DAY_NAMES = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+    _DAY_NAMES = _DAY_NAMES
 
     async def evaluate(
         self,
@@ -195,21 +218,42 @@ class VenueClosureTrigger:
             trip:    Trip dict (needs timezone).
             now_utc: Override current time (for testing). Defaults to datetime.now(UTC).
         """
-        activity_node = slot.get("activityNode") or {}
-        hours_data: dict[str, str] | None = activity_node.get("hours")
+        return self.check(slot, trip, now_utc)
+
+    def check(
+        self,
+        slot: dict[str, Any],
+        trip: dict[str, Any],
+        now_utc: datetime | None = None,
+        *,
+        trip_tz: ZoneInfo | None = None,
+        activity_node: dict[str, Any] | None = None,
+        weekly_hours: WeeklyHours | None = None,
+    ) -> TriggerResult:
+        """
+        Synchronous core of evaluate().
+
+        trip_tz, activity_node and weekly_hours let a batch caller pass values
+        resolved once per trip / node; each defaults to resolving from the
+        slot and trip.
+        """
+        if activity_node is None:
+            activity_node = slot.get("activityNode") or {}
+        hours_data: dict[str, Any] | str | None = activity_node.get("hours")
+        if weekly_hours is None and hours_data:
+            weekly_hours = compiled_hours(activity_node)
 
-        if not hours_data:
+        if not hours_data or weekly_hours is None:
             return TriggerResult.no_trigger(
                 self.TRIGGER_TYPE,
                 reason="No hours data available for venue",
             )
+        if isinstance(hours_data, str):
+            hours_data = json.loads(hours_data)
 
         trip_tz_str = trip.get("timezone", "UTC")
-        try:
-            trip_tz = ZoneInfo(trip_tz_str)
-        except Exception:
-            logger.warning("Invalid timezone %r for trip %s, defaulting to UTC", trip_tz_str, trip.get("id"))
-            trip_tz = ZoneInfo("UTC")
+        if trip_tz is None:
+            trip_tz = resolve_trip_timezone(trip)
 
         now = (now_utc or datetime.now(timezone.utc)).astimezone(trip_tz)
 
@@ -231,24 +275,20 @@ class VenueClosureTrigger:
         day_name = self._DAY_NAMES[slot_time.weekday()]
         day_hours = hours_data.get(day_name)
 
-        if not day_hours:
-            return TriggerResult.no_trigger(
-                self.TRIGGER_TYPE,
-                reason=f"No hours for {day_name}",
-            )
-
-        parsed = _parse_hours_range(day_hours)
-        if parsed is None:
+        state = weekly_hours.state_at(slot_time.weekday(), slot_time.hour * 60 + slot_time.minute)
+        if state is None:
+            # Day missing or unparseable, and no earlier range runs into it
+            if not day_hours:
+                return TriggerResult.no_trigger(
+                    self.TRIGGER_TYPE,
+                    reason=f"No hours for {day_name}",
+                )
             return TriggerResult.no_trigger(
                 self.TRIGGER_TYPE,
                 reason=f"Could not parse hours string: {day_hours!r}",
             )
 
-        open_minutes, close_minutes = parsed
-        current_minutes = slot_time.hour * 60 + slot_time.minute
-
-        is_open = open_minutes <= current_minutes < close_minutes
-        if is_open:
+        if state:
             return TriggerResult.no_trigger(
                 self.TRIGGER_TYPE,
                 reason=f"Venue open at {slot_time.strftime('%H:%M')} ({day_name})",
@@ -304,6 +344,17 @@ class TimeOverrunTrigger:
             trip:    Trip dict (needs timezone).
             now_utc: Override for current time (testing).
         """
+        return self.check(slot, trip, now_utc)
+
+    def check(
+        self,
+        slot: dict[str, Any],
+        trip: dict[str, Any],
+        now_utc: datetime | None = None,
+        *,
+        trip_tz: ZoneInfo | None = None,
+    ) -> TriggerResult:
+        """Synchronous core of evaluate(); trip_tz may be passed pre-resolved."""
         slot_status = slot.get("status", "")
         if slot_status not in self._ACTIVE_STATUSES:
             return TriggerResult.no_trigger(
@@ -349,10 +400,8 @@ class TimeOverrunTrigger:
             )
 
         trip_tz_str = trip.get("timezone", "UTC")
-        try:
-            trip_tz = ZoneInfo(trip_tz_str)
-        except Exception:
-            trip_tz = ZoneInfo("UTC")
+        if trip_tz is None:
+            trip_tz = (_zone(trip_tz_str) if isinstance(trip_tz_str, str) else None) or _zone("UTC")
 
         payload = {
             "slot_id": slot.get("id"),
@@ -401,6 +450,16 @@ class UserMoodTrigger:
             user_id:      ID of the user who sent the signal.
             mood_signal:  Signal label (default: 'not_feeling_it').
         """
+        return self.check(slot, trip, user_id, mood_signal)
+
+    def check(
+        self,
+        slot: dict[str, Any],
+        trip: dict[str, Any],
+        user_id: str = "",
+        mood_signal: str = "not_feeling_it",
+    ) -> TriggerResult:
+        """Synchronous core of evaluate()."""
         # Slot must not already be completed or skipped
         slot_status = slot.get("status", "")
         if slot_status in {"completed", "skipped"}:
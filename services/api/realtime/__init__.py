@@ -17,7 +17,7 @@ Usage:
 
 from __future__ import annotations
 
-from services.api.realtime.session_delta import SessionPersonaDelta
+from services.api.realtime.session_delta import SessionPersonaDelta, SessionSignal
 from services.api.realtime.trip_cache import TripPersonaCache
 
-__all__ = ["SessionPersonaDelta", "TripPersonaCache"]
+__all__ = ["SessionPersonaDelta", "SessionSignal", "TripPersonaCache"]
@@ -16,6 +16,10 @@ This class never writes to the PersonaDimension DB table. It only
 accumulates deltas that are later merged into TripPersonaCache via
 flush_to_trip_cache().
 
+Writes are pipelined server-side increments (HINCRBYFLOAT / HINCRBY inside
+MULTI/EXEC), so each flush is one round-trip and concurrent signals for the
+same session never overwrite each other.
+
 Graceful degradation: all operations are no-ops when redis is None.
 """
 
@@ -24,7 +28,7 @@ from __future__ import annotations
 import json
 import logging
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, NamedTuple
 
 logger = logging.getLogger(__name__)
 
@@ -161,6 +165,33 @@ def _redis_key(user_id: str, session_id: str) -> str:
     return f"session_delta:{user_id}:{session_id}"
 
 
+def _signal_adjustments(
+    signal_type: str,
+    activity_category: str | None,
+    trip_phase: str,
+) -> dict[str, float]:
+    """Return {"<dimension>_adj": adjustment} for one signal (empty if non-directional)."""
+    direction = _signal_direction(signal_type)
+    category = (activity_category or "").lower()
+    if direction is None or category not in _CATEGORY_DIMENSION_MAP:
+        return {}
+
+    phase_w = _phase_weight(trip_phase)
+    return {
+        f"{mapping['dimension']}_adj": direction * mapping["weight"] * phase_w * _STEP_SIZE
+        for mapping in _CATEGORY_DIMENSION_MAP[category]
+    }
+
+
+class SessionSignal(NamedTuple):
+    """One behavioral signal for apply_signals()."""
+    user_id: str
+    session_id: str
+    signal_type: str
+    activity_category: str | None
+    trip_phase: str
+
+
 class SessionPersonaDelta:
     """
     L1 ephemeral per-session persona accumulator.
@@ -168,6 +199,7 @@ class SessionPersonaDelta:
     Usage:
         delta = SessionPersonaDelta(app.state.redis)
         await delta.apply_signal(user_id, session_id, "slot_confirm", "restaurant", "active")
+        await delta.apply_signals([SessionSignal(...), ...])  # one round-trip
         adjustments = await delta.get_delta(user_id, session_id)
         await delta.flush_to_trip_cache(user_id, session_id, trip_id, trip_cache)
     """
@@ -210,56 +242,68 @@ class SessionPersonaDelta:
                                signals not tied to a specific activity.
             trip_phase:        e.g. "pre_trip", "active", "post_trip".
         """
-        if self._redis is None:
-            return
+        await self.apply_signals([
+            SessionSignal(user_id, session_id, signal_type, activity_category, trip_phase)
+        ])
 
-        key = _redis_key(user_id, session_id)
-        direction = _signal_direction(signal_type)
-        phase_w = _phase_weight(trip_phase)
-        category = (activity_category or "").lower()
+    async def apply_signals(self, signals: list[SessionSignal]) -> int:
+        """
+        Apply a batch of behavioral signals in one Redis round-trip.
 
-        try:
-            # Build the field updates for this signal
-            updates: dict[str, str] = {
-                "last_updated": datetime.now(timezone.utc).isoformat(),
-            }
-
-            if direction is not None and category in _CATEGORY_DIMENSION_MAP:
-                for mapping in _CATEGORY_DIMENSION_MAP[category]:
-                    dim = mapping["dimension"]
-                    weight: float = mapping["weight"]
-                    adj = direction * weight * phase_w * _STEP_SIZE
-                    field = f"{dim}_adj"
-                    # Fetch current value and accumulate
-                    raw = await self._redis.hget(key, field)
-                    current = float(raw) if raw is not None else 0.0
-                    updates[field] = str(round(current + adj, 6))
-
-            # Increment signal_count
-            await self._redis.hincrby(key, "signal_count", 1)
-
-            # Write accumulated dimension adjustments + timestamp
-            if len(updates) > 1 or "last_updated" in updates:
-                await self._redis.hset(key, mapping=updates)
-
-            # Reset sliding TTL
-            await self._redis.expire(key, _SESSION_TTL_SECONDS)
+        Signals are folded per session key in Python, then written as one
+        MULTI/EXEC pipeline: HINCRBYFLOAT per touched dimension, HINCRBY
+        signal_count, HSET last_updated and EXPIRE per key. The increments
+        are server-side, so concurrent writers for the same session never
+        lose updates (no read-modify-write, no Lua).
 
-            logger.debug(
-                "session_delta apply_signal: key=%s signal_type=%s category=%s phase=%s",
-                key,
-                signal_type,
-                category,
-                trip_phase,
-            )
+        Args:
+            signals: SessionSignal tuples (or plain 5-tuples in the same order).
 
+        Returns:
+            Number of signals applied; 0 when Redis is unavailable or the
+            pipeline fails.
+        """
+        if self._redis is None or not signals:
+            return 0
+
+        # key -> (signal_count, {field: summed adjustment})
+        folded: dict[str, tuple[int, dict[str, float]]] = {}
+        for signal in signals:
+            user_id, session_id, signal_type, activity_category, trip_phase = signal
+            key = _redis_key(user_id, session_id)
+            count, adjustments = folded.get(key, (0, {}))
+            for field, adj in _signal_adjustments(
+                signal_type, activity_category, trip_phase
+            ).items():
+                adjustments[field] = adjustments.get(field, 0.0) + adj
+            folded[key] = (count + 1, adjustments)
+
+        now = datetime.now(timezone.utc).isoformat()
+        try:
+            pipe = self._redis.pipeline(transaction=True)
+            for key, (count, adjustments) in folded.items():
+                for field, adj in adjustments.items():
+                    pipe.hincrbyfloat(key, field, round(adj, 6))
+                pipe.hincrby(key, "signal_count", count)
+                pipe.hset(key, mapping={"last_updated": now})
+                # Reset sliding TTL
+                pipe.expire(key, _SESSION_TTL_SECONDS)
+            await pipe.execute()
         except Exception:
             logger.warning(
-                "session_delta apply_signal failed: key=%s signal_type=%s",
-                key,
-                signal_type,
+                "session_delta apply_signals failed: keys=%s signals=%d",
+                list(folded),
+                len(signals),
                 exc_info=True,
             )
+            return 0
+
+        logger.debug(
+            "session_delta apply_signals: %d signals across %d sessions",
+            len(signals),
+            len(folded),
+        )
+        return len(signals)
 
     async def get_delta(self, user_id: str, session_id: str) -> dict[str, Any]:
         """
@@ -11,6 +11,16 @@ When a session ends, SessionPersonaDelta.flush_to_trip_cache() calls
 merge_session_delta() here, which applies the float adjustments from L1
 onto the base persona dimensions stored in this hash.
 
+Storage layout (per key, a Redis hash):
+  state                       base64 binary blob (persona.codec trip state):
+                              packed float32 dimensions, nightly_sync_version,
+                              last_updated
+  signal_count_since_nightly  int, bumped atomically with HINCRBY
+
+Entries written before the binary codec stored one string field per
+dimension. Readers migrate such a hash in place the first time they see it
+(HSET state + HDEL the old fields), so the key's EXPIREAT survives.
+
 On the next app open, recommendation code reads get_cached_persona() instead
 of hitting the PersonaDimension DB table. This gives within-trip persona
 adaptation at Redis latency rather than Postgres query latency.
@@ -25,38 +35,61 @@ is None, allowing the app to fall back to direct DB reads.
 GCP Cloud Memorystore compatibility:
 - No Cluster-mode commands
 - No Lua scripts
-- Uses only standard Redis 6+ commands (HSET, HGETALL, EXPIREAT, DEL)
+- Uses only standard Redis 6+ commands (HSET, HDEL, HGETALL, HINCRBY,
+  EXPIREAT, DEL, WATCH/MULTI/EXEC)
 """
 
 from __future__ import annotations
 
-import json
 import logging
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
+from redis.exceptions import WatchError
+
+from services.api.persona.codec import (
+    TRIP_DIMENSIONS,
+    CodecError,
+    decode_trip_state,
+    encode_trip_state,
+    from_wire,
+    to_wire,
+)
+
 logger = logging.getLogger(__name__)
 
 # How long after the trip end date we keep the cache alive (seconds)
 _POST_TRIP_BUFFER_SECONDS = 48 * 60 * 60  # 48 hours
 
-# Persona dimension keys stored in the trip hash (without _adj suffix)
-_DIMENSION_KEYS = [
-    "food_priority",
-    "culture_engagement",
-    "nature_preference",
-    "nightlife_interest",
-    "pace_preference",
-    "energy_level",
-    "authenticity_preference",
-    "budget_orientation",
-    "social_orientation",
-]
+# Persona dimension keys stored in the trip state (without _adj suffix)
+_DIMENSION_KEYS = list(TRIP_DIMENSIONS)
+
+_STATE_FIELD = "state"
+_COUNT_FIELD = "signal_count_since_nightly"
+
+# Per-field layout written before the binary codec. Everything in a legacy
+# hash except these metadata fields and the effective-persona cache's own
+# fields (which share the key, plus its "snapshot@<city>" fields) is a
+# dimension float.
+_LEGACY_META_FIELDS = ("nightly_sync_version", "last_updated")
+_SHARED_FIELDS = frozenset({
+    _STATE_FIELD,
+    _COUNT_FIELD,
+    "snapshot",
+    "dimensions",
+    "negative_tag_affinities",
+    "source_breakdown",
+    "confidence",
+    "resolved_at",
+})
 
 # Bounds for clamping merged persona values
 _PERSONA_MIN = 0.05
 _PERSONA_MAX = 0.98
 
+# Optimistic merge attempts before a session delta is dropped
+_MERGE_ATTEMPTS = 5
+
 
 def _redis_key(user_id: str, trip_id: str) -> str:
     return f"trip_persona_cache:{user_id}:{trip_id}"
@@ -81,19 +114,6 @@ def _expiry_timestamp(trip_end_date: datetime) -> int:
     return int(expiry.timestamp())
 
 
-def _encode_hash(data: dict[str, Any]) -> dict[str, str]:
-    """Serialize a persona dict to flat string values for Redis HSET."""
-    result: dict[str, str] = {}
-    for k, v in data.items():
-        if isinstance(v, (int, float)):
-            result[k] = str(v)
-        elif isinstance(v, str):
-            result[k] = v
-        else:
-            result[k] = json.dumps(v)
-    return result
-
-
 def _decode_hash(raw: dict) -> dict[str, Any]:
     """Deserialize Redis HGETALL bytes/strings back to typed Python values."""
     result: dict[str, Any] = {}
@@ -117,6 +137,74 @@ def _decode_hash(raw: dict) -> dict[str, Any]:
     return result
 
 
+def _legacy_dimensions(decoded: dict[str, Any]) -> dict[str, float]:
+    """Dimension floats from a _decode_hash() result of a pre-codec entry."""
+    return {
+        field: value
+        for field, value in decoded.items()
+        if field not in _SHARED_FIELDS
+        and field not in _LEGACY_META_FIELDS
+        and not field.startswith("snapshot@")
+        and isinstance(value, float)
+    }
+
+
+def _encode_state(
+    dimensions: dict[str, float], version: int, last_updated: str
+) -> str:
+    """Binary trip state for the ``state`` hash field, in Redis text form."""
+    return to_wire(
+        encode_trip_state(
+            dimensions, nightly_sync_version=version, last_updated=last_updated
+        )
+    )
+
+
+def _parse_entry(key: str, raw: dict) -> tuple[dict[str, Any] | None, list[str] | None]:
+    """
+    Decode an HGETALL result into the get_cached_persona() dict shape.
+
+    Returns (persona, legacy_fields): persona is None when the hash holds no
+    trip state (missing, corrupt, or only effective-persona fields);
+    legacy_fields lists the dimension fields of a pre-codec per-field hash
+    (decoded with _decode_hash()) and is None for the binary layout.
+    """
+    if not raw:
+        return None, None
+    fields = {
+        (k.decode() if isinstance(k, bytes) else k): v for k, v in raw.items()
+    }
+
+    legacy_fields = None
+    blob = fields.get(_STATE_FIELD)
+    if blob is not None:
+        try:
+            persona = decode_trip_state(from_wire(blob))
+        except CodecError:
+            # Unreadable blob: treat as a miss so the caller re-seeds
+            logger.warning("trip_persona_cache corrupt state: key=%s", key, exc_info=True)
+            return None, None
+    else:
+        legacy = _decode_hash(fields)
+        dimensions = _legacy_dimensions(legacy)
+        if not dimensions and "nightly_sync_version" not in legacy:
+            return None, None
+        persona = {
+            **dimensions,
+            "nightly_sync_version": legacy.get("nightly_sync_version", 0),
+        }
+        if "last_updated" in legacy:
+            persona["last_updated"] = legacy["last_updated"]
+        legacy_fields = list(dimensions)
+
+    count = fields.get(_COUNT_FIELD)
+    try:
+        persona[_COUNT_FIELD] = int(count) if count is not None else 0
+    except (TypeError, ValueError):
+        persona[_COUNT_FIELD] = 0
+    return persona, legacy_fields
+
+
 class TripPersonaCache:
     """
     L2 trip-scoped persona cache backed by Redis.
@@ -173,11 +261,10 @@ class TripPersonaCache:
 
         key = _redis_key(user_id, trip_id)
         try:
-            raw = await self._redis.hgetall(key)
-            if not raw:
+            persona = await self._load(key)
+            if persona is None:
                 logger.debug("trip_persona_cache miss: key=%s", key)
                 return None
-            persona = _decode_hash(raw)
             logger.debug(
                 "trip_persona_cache hit: key=%s signal_count=%s",
                 key,
@@ -220,17 +307,16 @@ class TripPersonaCache:
 
         key = _redis_key(user_id, trip_id)
         now_iso = datetime.now(timezone.utc).isoformat()
-
-        payload: dict[str, Any] = {**persona_dict}
-        payload["nightly_sync_version"] = version
-        payload["signal_count_since_nightly"] = 0
-        payload["last_updated"] = now_iso
-
         expiry_ts = _expiry_timestamp(trip_end_date)
 
         try:
-            await self._redis.hset(key, mapping=_encode_hash(payload))
-            await self._redis.expireat(key, expiry_ts)
+            state = _encode_state(persona_dict, version, now_iso)
+            pipe = self._redis.pipeline(transaction=True)
+            pipe.hset(key, mapping={_STATE_FIELD: state, _COUNT_FIELD: 0})
+            # Drop any pre-codec per-field layout left on the key
+            pipe.hdel(key, *_DIMENSION_KEYS, *_LEGACY_META_FIELDS)
+            pipe.expireat(key, expiry_ts)
+            await pipe.execute()
             logger.info(
                 "trip_persona_cache set: key=%s version=%d expiry_ts=%d",
                 key,
@@ -259,6 +345,10 @@ class TripPersonaCache:
         ``signal_count_since_nightly`` is incremented by the session's
         ``signal_count`` field.
 
+        The read-modify-write runs under WATCH/MULTI and is retried (up to
+        _MERGE_ATTEMPTS times) when a concurrent writer, such as another
+        session's flush, changes the entry in between, so no delta is lost.
+
         If the trip cache does not yet exist, this is a no-op (the delta
         will be applied the next time set_cached_persona() is called via
         a DB read + merge).
@@ -275,48 +365,32 @@ class TripPersonaCache:
         key = _redis_key(user_id, trip_id)
 
         try:
-            # Check the cache exists before merging
-            raw = await self._redis.hgetall(key)
-            if not raw:
-                logger.debug(
-                    "trip_persona_cache merge: cache does not exist yet, skipping: key=%s",
+            for _ in range(_MERGE_ATTEMPTS):
+                async with self._redis.pipeline(transaction=True) as pipe:
+                    try:
+                        merged = await self._merge_watched(pipe, key, delta_dict)
+                    except WatchError:
+                        # Another writer changed the entry between read and write
+                        continue
+                if merged is None:
+                    logger.debug(
+                        "trip_persona_cache merge: cache does not exist yet, skipping: key=%s",
+                        key,
+                    )
+                    return
+                session_signals, dims_updated = merged
+                logger.info(
+                    "trip_persona_cache merge: key=%s session_signals=%d dims_updated=%d",
                     key,
+                    session_signals,
+                    dims_updated,
                 )
                 return
 
-            current = _decode_hash(raw)
-            updates: dict[str, str] = {}
-
-            # Apply dimension adjustments
-            for adj_field, adj_value in delta_dict.items():
-                if not adj_field.endswith("_adj"):
-                    continue
-                # "food_priority_adj" -> "food_priority"
-                dim = adj_field[:-4]
-                if dim not in _DIMENSION_KEYS:
-                    continue
-                if not isinstance(adj_value, (int, float)):
-                    continue
-
-                current_val = float(current.get(dim, 0.5))
-                merged = current_val + float(adj_value)
-                clamped = max(_PERSONA_MIN, min(_PERSONA_MAX, merged))
-                updates[dim] = str(round(clamped, 6))
-
-            # Increment signal count
-            session_signals = int(delta_dict.get("signal_count", 0))
-            if session_signals > 0:
-                await self._redis.hincrby(key, "signal_count_since_nightly", session_signals)
-
-            # Write dimension updates + timestamp
-            updates["last_updated"] = datetime.now(timezone.utc).isoformat()
-            await self._redis.hset(key, mapping=updates)
-
-            logger.info(
-                "trip_persona_cache merge: key=%s session_signals=%d dims_updated=%d",
+            logger.warning(
+                "trip_persona_cache merge dropped after %d conflicting writes: key=%s",
+                _MERGE_ATTEMPTS,
                 key,
-                session_signals,
-                len(updates) - 1,  # exclude last_updated
             )
 
         except Exception:
@@ -352,11 +426,16 @@ class TripPersonaCache:
 
         key = _redis_key(user_id, trip_id)
         try:
-            raw = await self._redis.hget(key, "nightly_sync_version")
-            if raw is None:
-                return False
-            value_str = raw.decode() if isinstance(raw, bytes) else raw
-            cached_version = int(value_str)
+            blob = await self._redis.hget(key, _STATE_FIELD)
+            if blob is not None:
+                cached_version = decode_trip_state(from_wire(blob))["nightly_sync_version"]
+            else:
+                # Pre-codec entry
+                raw = await self._redis.hget(key, "nightly_sync_version")
+                if raw is None:
+                    return False
+                value_str = raw.decode() if isinstance(raw, bytes) else raw
+                cached_version = int(value_str)
             is_fresh = cached_version == current_db_version
             logger.debug(
                 "trip_persona_cache check_version: key=%s cached=%d db=%d fresh=%s",
@@ -395,3 +474,95 @@ class TripPersonaCache:
             logger.warning(
                 "trip_persona_cache invalidate failed: key=%s", key, exc_info=True
             )
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    async def _merge_watched(
+        self, pipe: Any, key: str, delta_dict: dict[str, Any]
+    ) -> tuple[int, int] | None:
+        """
+        One optimistic merge attempt: WATCH the key, read and merge it, then
+        write in MULTI/EXEC. Raises WatchError if the key changed after the
+        read. Returns (session_signals, dims_updated), or None on a miss.
+        """
+        await pipe.watch(key)
+        current, legacy_fields = _parse_entry(key, await pipe.hgetall(key))
+        if current is None:
+            return None
+
+        dimensions = {
+            k: v for k, v in current.items()
+            if k not in _LEGACY_META_FIELDS and k != _COUNT_FIELD
+        }
+        dims_updated = 0
+
+        # Apply dimension adjustments
+        for adj_field, adj_value in delta_dict.items():
+            if not adj_field.endswith("_adj"):
+                continue
+            # "food_priority_adj" -> "food_priority"
+            dim = adj_field[:-4]
+            if dim not in _DIMENSION_KEYS:
+                continue
+            if not isinstance(adj_value, (int, float)):
+                continue
+
+            current_val = float(dimensions.get(dim, 0.5))
+            merged = current_val + float(adj_value)
+            clamped = max(_PERSONA_MIN, min(_PERSONA_MAX, merged))
+            dimensions[dim] = round(clamped, 6)
+            dims_updated += 1
+
+        state = _encode_state(
+            dimensions,
+            int(current.get("nightly_sync_version", 0)),
+            datetime.now(timezone.utc).isoformat(),
+        )
+        session_signals = int(delta_dict.get("signal_count", 0))
+
+        # Rewrite the state blob; the signal count stays an atomic HINCRBY
+        pipe.multi()
+        pipe.hset(key, mapping={_STATE_FIELD: state})
+        if legacy_fields is not None:
+            # Migrate a pre-codec hash in the same transaction
+            pipe.hdel(key, *legacy_fields, *_LEGACY_META_FIELDS)
+        if session_signals > 0:
+            pipe.hincrby(key, _COUNT_FIELD, session_signals)
+        await pipe.execute()
+        return session_signals, dims_updated
+
+    async def _load(self, key: str) -> dict[str, Any] | None:
+        """
+        Read one entry into the get_cached_persona() dict shape.
+
+        A pre-codec per-field hash is rewritten to the binary layout in
+        place. Returns None when the key holds no trip state (missing, or
+        only effective-persona fields).
+        """
+        persona, legacy_fields = _parse_entry(key, await self._redis.hgetall(key))
+        if persona is not None and legacy_fields is not None:
+            await self._migrate_legacy(key, persona, legacy_fields)
+        return persona
+
+    async def _migrate_legacy(
+        self, key: str, persona: dict[str, Any], dimension_fields: list[str]
+    ) -> None:
+        """Replace a per-field hash with the binary state; keeps the key's TTL."""
+        dimensions = {k: persona[k] for k in dimension_fields}
+        state = _encode_state(
+            dimensions,
+            int(persona["nightly_sync_version"]),
+            persona.get("last_updated") or datetime.now(timezone.utc).isoformat(),
+        )
+        try:
+            pipe = self._redis.pipeline(transaction=True)
+            pipe.hset(key, mapping={_STATE_FIELD: state})
+            pipe.hdel(key, *dimension_fields, *_LEGACY_META_FIELDS)
+            await pipe.execute()
+            logger.info("trip_persona_cache migrated legacy hash: key=%s", key)
+        except Exception:
+            logger.warning(
+                "trip_persona_cache legacy migration failed: key=%s", key, exc_info=True
+            )
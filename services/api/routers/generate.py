@@ -18,8 +18,10 @@ import anthropic
 from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel, Field, field_validator
 
+from services.api.config import settings
 from services.api.generation.engine import GenerationEngine
-from services.api.persona import effective_persona, get_persona_for_ranking
+from services.api.generation.ranking_cache import RankingCache
+from services.api.persona import effective_persona, persona_seed_from_snapshot
 
 logger = logging.getLogger(__name__)
 
@@ -140,11 +142,16 @@ async def generate_itinerary(body: GenerateRequest, request: Request) -> dict:
     # Build GenerationEngine dependencies
     # ------------------------------------------------------------------
     anthropic_client = anthropic.AsyncAnthropic()  # reads ANTHROPIC_API_KEY from env
+    redis_client = getattr(request.app.state, "redis", None)
 
     engine = GenerationEngine(
         search_service=search_service,
         anthropic_client=anthropic_client,
         db=db,
+        speculative_budget_s=(
+            settings.generation_speculative_budget_s if settings.generation_speculative else None
+        ),
+        ranking_cache=RankingCache(redis_client),
     )
 
     # ------------------------------------------------------------------
@@ -155,7 +162,6 @@ async def generate_itinerary(body: GenerateRequest, request: Request) -> dict:
     # L1 wire-up: use effective_persona() instead of raw Trip.personaSeed.
     # This resolves the full priority stack: TripPersonaCache (Redis) >
     # PersonaDimension (DB/EMA) > CF blend > destination prior.
-    redis_client = getattr(request.app.state, "redis", None)
     persona_snapshot = await effective_persona(
         user_id=body.userId,
         trip_id=body.tripId,
@@ -163,7 +169,7 @@ async def generate_itinerary(body: GenerateRequest, request: Request) -> dict:
         redis_client=redis_client,
         city_slug=city,
     )
-    persona_seed: dict = get_persona_for_ranking(persona_snapshot)
+    persona_seed: dict = persona_seed_from_snapshot(persona_snapshot)
     start_date: datetime = _ensure_utc(trip_row["startDate"])
     end_date: datetime = _ensure_utc(trip_row["endDate"])
 
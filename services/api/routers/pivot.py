@@ -1,4 +1,5 @@
 """
+POST /pivot/evaluate    — Run pivot triggers over a trip's slots, create PivotEvents.
 POST /pivot/cascade     — Re-solve same-day downstream slots after a pivot swap.
 POST /microstops/suggest — Propose micro-stops for a trip day's transit windows.
 
@@ -21,6 +22,7 @@ from services.api.pivot.cascade import (
     evaluate_cascade,
     fetch_same_day_slots,
 )
+from services.api.pivot.detector import PivotDetector
 from services.api.microstops.service import MicroStopService
 
 logger = logging.getLogger(__name__)
@@ -48,6 +50,100 @@ def _validate_uuid(value: str, field: str) -> str:
     return value
 
 
+# ---------------------------------------------------------------------------
+# Evaluate endpoint
+# ---------------------------------------------------------------------------
+
+
+class EvaluateRequest(BaseModel):
+    tripId: str = Field(..., min_length=36, max_length=36)
+    dayNumber: int | None = Field(
+        default=None,
+        ge=1,
+        description="Limit evaluation to one trip day. Omit for the whole trip.",
+    )
+    moodSlotId: str | None = Field(
+        default=None,
+        description='Slot the user flagged as "not feeling it" (fires UserMoodTrigger).',
+    )
+
+    @field_validator("tripId", "moodSlotId")
+    @classmethod
+    def must_be_uuid(cls, v: str | None) -> str | None:
+        if v is None:
+            return v
+        try:
+            uuid.UUID(v)
+        except ValueError as exc:
+            raise ValueError(f"Must be a valid UUID, got: {v!r}") from exc
+        return v
+
+
+@router.post("/pivot/evaluate")
+async def evaluate_pivots(body: EvaluateRequest, request: Request) -> dict:
+    """
+    Evaluate a trip's slots for pivot triggers and create PivotEvents.
+
+    Uses the process-wide WeatherService from app state, so weather comes from
+    the shared Redis cache (kept warm by the prefetcher) or last-known-good
+    rather than a fresh OpenWeatherMap call per request.
+    """
+    user_id = _require_user_id(request)
+    db = request.app.state.db
+
+    if db is None:
+        raise HTTPException(status_code=503, detail="Database unavailable")
+
+    weather_service = getattr(request.app.state, "weather_service", None)
+    if weather_service is None:
+        raise HTTPException(status_code=503, detail="Weather service unavailable")
+
+    trip_row = await db.fetchrow(
+        "SELECT id, city, timezone FROM trips WHERE id = $1",
+        body.tripId,
+    )
+    if not trip_row:
+        raise HTTPException(status_code=404, detail="Trip not found")
+
+    rows = await db.fetch(
+        """
+        SELECT
+            s.id, s."activityNodeId", s."dayNumber", s."sortOrder",
+            s."startTime", s."endTime", s."slotType", s.status,
+            s."wasSwapped", an.category
+        FROM itinerary_slots s
+        LEFT JOIN activity_nodes an ON an.id = s."activityNodeId"
+        WHERE s."tripId" = $1
+          AND ($2::int IS NULL OR s."dayNumber" = $2)
+        ORDER BY s."dayNumber" ASC, s."sortOrder" ASC
+        """,
+        body.tripId,
+        body.dayNumber,
+    )
+
+    detector = PivotDetector(
+        db=db,
+        search_service=request.app.state.search_service,
+        weather_service=weather_service,
+    )
+    events = await detector.evaluate_trip(
+        dict(trip_row),
+        [dict(row) for row in rows],
+        user_mood_slot_id=body.moodSlotId,
+        user_id=user_id,
+    )
+
+    return {
+        "success": True,
+        "data": {
+            "tripId": body.tripId,
+            "slotsEvaluated": len(rows),
+            "pivotEvents": events,
+        },
+        "requestId": request.state.request_id,
+    }
+
+
 # ---------------------------------------------------------------------------
 # Cascade endpoint
 # ---------------------------------------------------------------------------
@@ -216,7 +312,10 @@ async def suggest_microstops(body: MicroStopRequest, request: Request) -> dict:
     if db is None:
         raise HTTPException(status_code=503, detail="Database unavailable")
 
-    service = MicroStopService(db=db)
+    service = MicroStopService(
+        db=db,
+        spatial_indexes=getattr(request.app.state, "spatial_indexes", None),
+    )
 
     result = await service.suggest_for_day(
         trip_id=body.tripId,
@@ -23,6 +23,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Set
 
+from services.api.nlp.multi_match import RegexFamily
+
 from .base import BaseScraper, SourceRegistry, DeadLetterQueue
 
 logger = logging.getLogger(__name__)
@@ -133,6 +135,11 @@ LOCAL_INDICATOR_PATTERNS = [
     re.compile(r"\blocal\s+here\b", re.IGNORECASE),
 ]
 
+# All indicators compiled into one alternation — one scan per post.
+LOCAL_INDICATOR_FAMILY = RegexFamily(
+    [(f"local_{i}", p) for i, p in enumerate(LOCAL_INDICATOR_PATTERNS)]
+)
+
 
 def detect_is_local(text: str) -> bool:
     """
@@ -143,10 +150,7 @@ def detect_is_local(text: str) -> bool:
 
     Returns True if any pattern matches.
     """
-    for pattern in LOCAL_INDICATOR_PATTERNS:
-        if pattern.search(text):
-            return True
-    return False
+    return LOCAL_INDICATOR_FAMILY.search(text) is not None
 
 
 # ---------------------------------------------------------------------------
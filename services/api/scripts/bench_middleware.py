@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Middleware stack benchmark — BaseHTTPMiddleware vs pure ASGI.
+
+Builds the same app twice (the health, search and events routers behind
+CORS, the request envelope and the rate limiter, in main.py's order) and
+drives it with an in-process ASGI client: no sockets, no HTTP parsing, so
+the numbers isolate per-request framework and middleware overhead.
+
+  before  request envelope via @app.middleware("http") and
+          RateLimitMiddleware on BaseHTTPMiddleware (the previous code,
+          reproduced below)
+  after   RequestEnvelopeMiddleware + RateLimitMiddleware as raw ASGI
+
+Redis is an in-memory stub with no round-trip cost and the tier limits are
+raised so no request is denied; every request takes the full allowed path.
+Reports requests/sec and p50/p99 latency per endpoint.
+
+Run:
+    cd services/api && python3 scripts/bench_middleware.py
+    cd services/api && python3 scripts/bench_middleware.py --requests 20000 --concurrency 32
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import statistics
+import sys
+import time
+import uuid
+from contextlib import asynccontextmanager
+
+# ---------------------------------------------------------------------------
+# Ensure services.api is importable
+# ---------------------------------------------------------------------------
+_script_dir = os.path.dirname(os.path.abspath(__file__))
+_repo_root = os.path.dirname(os.path.dirname(os.path.dirname(_script_dir)))
+if _repo_root not in sys.path:
+    sys.path.insert(0, _repo_root)
+
+from fastapi import FastAPI, Request  # noqa: E402
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+from starlette.responses import JSONResponse  # noqa: E402
+
+from services.api.config import settings  # noqa: E402
+from services.api.middleware.cors import setup_cors  # noqa: E402
+from services.api.middleware.rate_limit import (  # noqa: E402
+    LocalPreLimiter,
+    RateLimiter,
+    RateLimitMiddleware,
+    _get_client_key,
+    _get_rate_limit,
+)
+from services.api.middleware.request_id import RequestEnvelopeMiddleware  # noqa: E402
+from services.api.routers import events, health, search  # noqa: E402
+
+
+# ---------------------------------------------------------------------------
+# App state stubs
+# ---------------------------------------------------------------------------
+
+
+class _Redis:
+    """Window-counter subset of Redis with free round trips."""
+
+    def __init__(self) -> None:
+        self.strings: dict[str, int] = {}
+
+    def pipeline(self, transaction: bool = True) -> "_Pipeline":
+        return _Pipeline(self)
+
+
+class _Pipeline:
+    def __init__(self, redis: _Redis) -> None:
+        self._redis = redis
+        self._results: list = []
+
+    def incr(self, key):
+        value = self._redis.strings.get(key, 0) + 1
+        self._redis.strings[key] = value
+        self._results.append(value)
+
+    def pexpire(self, key, ms):
+        self._results.append(True)
+
+    def get(self, key):
+        self._results.append(self._redis.strings.get(key))
+
+    async def execute(self):
+        return self._results
+
+
+class _Transaction:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _DB:
+    def transaction(self):
+        return _Transaction()
+
+    async def execute(self, *args):
+        return None
+
+
+class _SearchService:
+    async def search(self, query, city, filters=None, limit=20):
+        return {"results": [], "count": 0, "warning": None}
+
+
+# ---------------------------------------------------------------------------
+# The previous BaseHTTPMiddleware stack
+# ---------------------------------------------------------------------------
+
+
+async def _legacy_request_envelope(request: Request, call_next):
+    request_id = request.headers.get("x-request-id", str(uuid.uuid4()))
+    request.state.request_id = request_id
+
+    if request.url.path == "/events/batch" and request.method == "POST":
+        content_length = request.headers.get("content-length")
+        if content_length and int(content_length) > settings.events_request_max_bytes:
+            return JSONResponse(
+                status_code=413,
+                content={
+                    "success": False,
+                    "error": {
+                        "code": "PAYLOAD_TOO_LARGE",
+                        "message": f"Request body exceeds {settings.events_request_max_bytes} bytes.",
+                    },
+                    "requestId": request_id,
+                },
+            )
+
+    response = await call_next(request)
+    response.headers["X-Request-ID"] = request_id
+    return response
+
+
+class _LegacyRateLimitMiddleware(BaseHTTPMiddleware):
+    def __init__(self, app, redis_client=None):
+        super().__init__(app)
+        self.redis = redis_client
+        self.limiter = RateLimiter(pre_limiter=LocalPreLimiter())
+
+    async def dispatch(self, request: Request, call_next):
+        if request.url.path == "/health" or self.redis is None:
+            return await call_next(request)
+
+        client_key, is_authenticated = _get_client_key(request)
+        limit, tier = _get_rate_limit(request.url.path, is_authenticated)
+        decision = await self.limiter.check(self.redis, tier, client_key, limit, time.time())
+
+        headers = decision.headers()
+        if not decision.allowed:
+            return JSONResponse(
+                status_code=429,
+                content={"success": False, "error": {"code": "RATE_LIMITED"}},
+                headers=headers,
+            )
+
+        response = await call_next(request)
+        for key, value in headers.items():
+            response.headers[key] = value
+        return response
+
+
+def _build_app(stack: str) -> FastAPI:
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        yield
+
+    app = FastAPI(lifespan=lifespan)
+    app.include_router(health.router)
+    app.include_router(events.router)
+    app.include_router(search.router)
+    app.state.settings = settings
+    app.state.db = _DB()
+    app.state.search_service = _SearchService()
+
+    redis = _Redis()
+    setup_cors(app)
+    if stack == "before":
+        app.middleware("http")(_legacy_request_envelope)
+        app.add_middleware(_LegacyRateLimitMiddleware, redis_client=redis)
+    else:
+        app.add_middleware(RequestEnvelopeMiddleware)
+        app.add_middleware(RateLimitMiddleware, redis_client=redis)
+    return app
+
+
+# ---------------------------------------------------------------------------
+# In-process ASGI client
+# ---------------------------------------------------------------------------
+
+
+def _events_body(n: int) -> bytes:
+    return json.dumps({
+        "events": [
+            {
+                "userId": "user-1",
+                "sessionId": "session-1",
+                "clientEventId": f"evt-{i}",
+                "eventType": "card_view",
+                "intentClass": "implicit",
+                "payload": {"position": i},
+            }
+            for i in range(n)
+        ]
+    }).encode()
+
+
+def _endpoints(events_per_batch: int) -> dict[str, tuple[str, str, bytes, bytes]]:
+    """name -> (method, path, query_string, body)"""
+    return {
+        "GET /health": ("GET", "/health", b"", b""),
+        "GET /search": ("GET", "/search", b"q=coffee&city=lisbon&limit=10", b""),
+        "POST /events/batch": ("POST", "/events/batch", b"", _events_body(events_per_batch)),
+    }
+
+
+async def _call(app, method: str, path: str, query: bytes, body: bytes) -> int:
+    headers = [
+        (b"host", b"bench"),
+        (b"x-forwarded-for", b"10.0.0.1"),
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode()),
+    ]
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query,
+        "root_path": "",
+        "headers": headers,
+        "client": ("10.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+    sent = False
+    status = 0
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await asyncio.sleep(3600)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def _drive(app, endpoint: tuple, requests: int, concurrency: int) -> tuple[float, list[float]]:
+    latencies: list[float] = []
+
+    async def one() -> None:
+        t0 = time.perf_counter()
+        status = await _call(app, *endpoint)
+        latencies.append(time.perf_counter() - t0)
+        if status != 200:
+            raise RuntimeError(f"{endpoint[0]} {endpoint[1]} returned {status}")
+
+    gc.collect()
+    start = time.perf_counter()
+    for i in range(0, requests, concurrency):
+        await asyncio.gather(*(one() for _ in range(min(concurrency, requests - i))))
+    return time.perf_counter() - start, latencies
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--requests", type=int, default=10_000, help="requests per endpoint per stack")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--events-per-batch", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=3, help="best-of rounds")
+    args = parser.parse_args()
+
+    # Keep every request on the allowed path
+    for tier in ("anon", "auth", "llm", "events"):
+        setattr(settings, f"rate_limit_{tier}_per_min", 10**9)
+
+    apps = {stack: _build_app(stack) for stack in ("before", "after")}
+    endpoints = _endpoints(args.events_per_batch)
+
+    # Warm up routing, validation and pydantic caches
+    for app in apps.values():
+        for endpoint in endpoints.values():
+            await _drive(app, endpoint, 200, args.concurrency)
+
+    print(f"{args.requests:,} requests per endpoint, concurrency {args.concurrency}, "
+          f"best of {args.rounds}\n")
+    print(f"{'':<20}{'':<8}{'req/s':>10}{'p50 ms':>9}{'p99 ms':>9}")
+    for name, endpoint in endpoints.items():
+        results = {}
+        for stack, app in apps.items():
+            best = None
+            for _ in range(args.rounds):
+                elapsed, latencies = await _drive(app, endpoint, args.requests, args.concurrency)
+                if best is None or elapsed < best[0]:
+                    best = (elapsed, latencies)
+            elapsed, latencies = best
+            lat = sorted(latencies)
+            results[stack] = args.requests / elapsed
+            print(f"{name if stack == 'before' else '':<20}{stack:<8}"
+                  f"{results[stack]:>10,.0f}"
+                  f"{statistics.median(lat) * 1e3:>9.3f}"
+                  f"{lat[int(len(lat) * 0.99) - 1] * 1e3:>9.3f}")
+        print(f"{'':<20}{'':<8}{results['after'] / results['before']:>9.2f}x\n")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
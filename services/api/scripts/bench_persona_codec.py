@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Persona codec benchmark — binary blobs vs the per-field Redis hash layout.
+
+Builds N synthetic TripPersonaCache states and PersonaSnapshots and compares,
+per entry, the bytes Redis stores (field names + values) and the time to
+encode/decode them, for the legacy string hash and the binary codec (in its
+base64 wire form, as stored with decode_responses=True).
+
+Run:
+    cd services/api && python3 scripts/bench_persona_codec.py
+    cd services/api && python3 scripts/bench_persona_codec.py --n 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import time
+
+# ---------------------------------------------------------------------------
+# Ensure services.api is importable
+# ---------------------------------------------------------------------------
+_script_dir = os.path.dirname(os.path.abspath(__file__))
+_repo_root = os.path.dirname(os.path.dirname(os.path.dirname(_script_dir)))
+if _repo_root not in sys.path:
+    sys.path.insert(0, _repo_root)
+
+from services.api.persona.codec import (  # noqa: E402
+    SNAPSHOT_DIMENSIONS,
+    TRIP_DIMENSIONS,
+    decode_snapshot,
+    decode_trip_state,
+    encode_snapshot,
+    encode_trip_state,
+    from_wire,
+    to_wire,
+)
+from services.api.persona.effective import _decode_legacy_snapshot  # noqa: E402
+from services.api.persona.types import DimensionValue, PersonaSnapshot  # noqa: E402
+from services.api.realtime.trip_cache import _decode_hash  # noqa: E402
+
+_VALUES = ["low", "medium", "high", "driven", "balanced", "curious", "avoidant"]
+_SOURCES = ["onboarding", "behavioral_ema", "destination_prior", "cf_blend", "trip_cache"]
+_TAGS = ["party-central", "tourist-trap", "chain", "loud", "late-night", "crowded"]
+
+
+def _trip_states(n: int, rng: random.Random) -> list[dict]:
+    return [
+        {
+            "dims": {d: round(rng.uniform(0.05, 0.98), 6) for d in TRIP_DIMENSIONS},
+            "version": rng.randint(1, 500),
+            "count": rng.randint(0, 50),
+            "last_updated": "2026-03-01T10:00:00.123456+00:00",
+        }
+        for _ in range(n)
+    ]
+
+
+def _snapshots(n: int, rng: random.Random) -> list[PersonaSnapshot]:
+    out = []
+    for i in range(n):
+        dims = {
+            d: DimensionValue(
+                f"{d.split('_')[0]}_{rng.choice(_VALUES)}",
+                round(rng.uniform(0.1, 0.95), 4),
+                rng.choice(_SOURCES),
+            )
+            for d in SNAPSHOT_DIMENSIONS
+        }
+        out.append(PersonaSnapshot(
+            user_id=f"user-{i}",
+            trip_id=f"trip-{i}",
+            dimensions=dims,
+            negative_tag_affinities={
+                t: -round(rng.uniform(0.1, 1.0), 4) for t in rng.sample(_TAGS, rng.randint(0, 4))
+            },
+            source_breakdown={d: v.source for d, v in dims.items()},
+            confidence=round(rng.uniform(0.3, 0.9), 4),
+            cache_hit=False,
+            resolved_at="2026-03-01T10:00:00.123456+00:00",
+        ))
+    return out
+
+
+def _hash_bytes(mapping: dict[str, str]) -> int:
+    return sum(len(k) + len(v) for k, v in mapping.items())
+
+
+def _legacy_trip_hash(state: dict) -> dict[str, str]:
+    mapping = {k: str(v) for k, v in state["dims"].items()}
+    mapping["nightly_sync_version"] = str(state["version"])
+    mapping["signal_count_since_nightly"] = str(state["count"])
+    mapping["last_updated"] = state["last_updated"]
+    return mapping
+
+
+def _legacy_snapshot_hash(snapshot: PersonaSnapshot, version: int) -> dict[str, str]:
+    return {
+        "nightly_sync_version": str(version),
+        "dimensions": json.dumps({
+            k: {"value": v.value, "confidence": v.confidence, "source": v.source}
+            for k, v in snapshot.dimensions.items()
+        }),
+        "negative_tag_affinities": json.dumps(snapshot.negative_tag_affinities),
+        "source_breakdown": json.dumps(snapshot.source_breakdown),
+        "confidence": str(snapshot.confidence),
+        "resolved_at": snapshot.resolved_at,
+    }
+
+
+def _legacy_snapshot_decode(mapping: dict[str, str]) -> PersonaSnapshot:
+    int(mapping["nightly_sync_version"])
+    return _decode_legacy_snapshot(mapping, "user", "trip")
+
+
+def _timed(fn, items) -> tuple[list, float]:
+    gc.disable()
+    try:
+        t0 = time.perf_counter()
+        out = [fn(x) for x in items]
+        return out, time.perf_counter() - t0
+    finally:
+        gc.enable()
+
+
+def _report(label: str, n: int, legacy_bytes: int, binary_bytes: int,
+            legacy_enc: float, binary_enc: float,
+            legacy_dec: float, binary_dec: float) -> None:
+    print(f"\n{label} ({n:,} entries)")
+    print(f"  {'':18}{'legacy hash':>14}{'binary':>14}{'ratio':>9}")
+    print(f"  {'bytes / entry':18}{legacy_bytes / n:>14.1f}{binary_bytes / n:>14.1f}"
+          f"{binary_bytes / legacy_bytes:>9.2f}")
+    print(f"  {'encode µs / entry':18}{legacy_enc / n * 1e6:>14.2f}{binary_enc / n * 1e6:>14.2f}"
+          f"{binary_enc / legacy_enc:>9.2f}")
+    print(f"  {'decode µs / entry':18}{legacy_dec / n * 1e6:>14.2f}{binary_dec / n * 1e6:>14.2f}"
+          f"{binary_dec / legacy_dec:>9.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--n", type=int, default=1_000_000, help="synthetic entries per kind")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    states = _trip_states(args.n, rng)
+    legacy, legacy_enc = _timed(_legacy_trip_hash, states)
+    wire, binary_enc = _timed(
+        lambda s: {
+            "state": to_wire(encode_trip_state(
+                s["dims"], nightly_sync_version=s["version"], last_updated=s["last_updated"],
+            )),
+            "signal_count_since_nightly": str(s["count"]),
+        },
+        states,
+    )
+    _, legacy_dec = _timed(_decode_hash, legacy)
+    _, binary_dec = _timed(lambda m: decode_trip_state(from_wire(m["state"])), wire)
+    _report(
+        "TripPersonaCache state", args.n,
+        sum(map(_hash_bytes, legacy)), sum(map(_hash_bytes, wire)),
+        legacy_enc, binary_enc, legacy_dec, binary_dec,
+    )
+    del states, legacy, wire
+
+    snapshots = _snapshots(args.n, rng)
+    legacy, legacy_enc = _timed(lambda s: _legacy_snapshot_hash(s, 3), snapshots)
+    wire, binary_enc = _timed(
+        lambda s: {"snapshot": to_wire(encode_snapshot(s, 3))}, snapshots,
+    )
+    _, legacy_dec = _timed(_legacy_snapshot_decode, legacy)
+    _, binary_dec = _timed(
+        lambda m: decode_snapshot(from_wire(m["snapshot"]), "user", "trip"), wire,
+    )
+    _report(
+        "Effective PersonaSnapshot", args.n,
+        sum(map(_hash_bytes, legacy)), sum(map(_hash_bytes, wire)),
+        legacy_enc, binary_enc, legacy_dec, binary_dec,
+    )
+
+
+if __name__ == "__main__":
+    main()
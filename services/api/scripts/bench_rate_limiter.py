@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Rate limiter load test — sliding log vs window counter + local pre-limiter.
+
+Replays one synthetic request stream (mostly well-behaved clients plus a
+share of abusive ones at several times their limit) through RateLimiter
+configured three ways and reports, for each:
+
+  - Redis commands and round trips per request, and the Redis ops/sec that
+    implies per 1,000 requests/sec of traffic
+  - p50 / p99 latency the limiter adds per request
+  - Redis state left behind (sorted-set members vs counter keys)
+
+By default Redis is an in-process simulator that charges --rtt-ms per round
+trip; pass --redis-url to run against a real server (keys are written under
+a throwaway "bench:" prefix and deleted afterwards).
+
+Run:
+    cd services/api && python3 scripts/bench_rate_limiter.py
+    cd services/api && python3 scripts/bench_rate_limiter.py --redis-url redis://localhost:6379/0
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+
+# ---------------------------------------------------------------------------
+# Ensure services.api is importable
+# ---------------------------------------------------------------------------
+_script_dir = os.path.dirname(os.path.abspath(__file__))
+_repo_root = os.path.dirname(os.path.dirname(os.path.dirname(_script_dir)))
+if _repo_root not in sys.path:
+    sys.path.insert(0, _repo_root)
+
+from services.api.middleware.rate_limit import (  # noqa: E402
+    LocalPreLimiter,
+    RateLimiter,
+    SlidingLogBackend,
+)
+
+TIERS = {"anon": 10, "auth": 60, "llm": 5, "events": 60}
+
+
+# ---------------------------------------------------------------------------
+# Redis: simulator + counting wrapper
+# ---------------------------------------------------------------------------
+
+
+class SimulatedRedis:
+    """In-memory Redis subset with a fixed cost per round trip."""
+
+    def __init__(self, rtt_s: float) -> None:
+        self.rtt_s = rtt_s
+        self.strings: dict[str, int] = {}
+        self.zsets: dict[str, dict[str, float]] = {}
+
+    def pipeline(self, transaction: bool = True) -> "_SimPipeline":
+        return _SimPipeline(self)
+
+    def incr(self, key):
+        self.strings[key] = self.strings.get(key, 0) + 1
+        return self.strings[key]
+
+    def get(self, key):
+        return self.strings.get(key)
+
+    def pexpire(self, key, ms):
+        return True
+
+    def expire(self, key, seconds):
+        return True
+
+    def zremrangebyscore(self, key, lo, hi):
+        zset = self.zsets.get(key)
+        if zset:
+            for member in [m for m, s in zset.items() if s <= hi]:
+                del zset[member]
+
+    def zcard(self, key):
+        return len(self.zsets.get(key, ()))
+
+    def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+
+    def state_size(self) -> str:
+        """Live state at the end of the run (the simulator does not expire keys)."""
+        members = sum(len(z) for z in self.zsets.values())
+        if members:
+            return f"{len(self.zsets):,} zsets / {members:,} members"
+        if not self.strings:
+            return "-"
+        windows = [int(k.rsplit(":", 1)[1]) for k in self.strings]
+        latest = max(windows)
+        live = sum(1 for w in windows if w >= latest - 1)
+        return f"{live:,} counter keys"
+
+
+class _SimPipeline:
+    def __init__(self, redis: SimulatedRedis) -> None:
+        self._redis = redis
+        self._ops: list = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self._ops.append((name, args, kwargs))
+            return self
+        return queue
+
+    async def execute(self):
+        await asyncio.sleep(self._redis.rtt_s)
+        return [getattr(self._redis, n)(*a, **kw) for n, a, kw in self._ops]
+
+
+class CountingRedis:
+    """Wraps a client and counts commands / round trips sent through pipelines."""
+
+    def __init__(self, inner) -> None:
+        self.inner = inner
+        self.commands = 0
+        self.round_trips = 0
+
+    def pipeline(self, transaction: bool = True):
+        return _CountingPipeline(self, self.inner.pipeline(transaction=transaction))
+
+
+class _CountingPipeline:
+    def __init__(self, owner: CountingRedis, pipe) -> None:
+        self._owner = owner
+        self._pipe = pipe
+
+    def __getattr__(self, name):
+        method = getattr(self._pipe, name)
+
+        def call(*args, **kwargs):
+            self._owner.commands += 1
+            method(*args, **kwargs)
+            return self
+        return call
+
+    async def execute(self):
+        self._owner.round_trips += 1
+        return await self._pipe.execute()
+
+
+# ---------------------------------------------------------------------------
+# Workload
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class Request:
+    at: float
+    tier: str
+    client: str
+
+
+def _workload(n: int, clients: int, abusive_share: float, duration: float, seed: int) -> list[Request]:
+    rng = random.Random(seed)
+    n_abusive = max(1, int(clients * abusive_share))
+    tiers = list(TIERS)
+    # Abusers send ~20x the traffic of a normal client
+    weights = [20.0 if i < n_abusive else 1.0 for i in range(clients)]
+    picks = rng.choices(range(clients), weights=weights, k=n)
+    times = sorted(rng.uniform(0.0, duration) for _ in range(n))
+    return [
+        Request(at=t, tier=tiers[c % len(tiers)], client=f"ip:10.0.{c // 256}.{c % 256}")
+        for t, c in zip(times, picks)
+    ]
+
+
+@dataclass
+class Result:
+    label: str
+    requests: int
+    denied: int
+    local_denials: int
+    commands: int
+    round_trips: int
+    latencies: list[float]
+    state: str
+
+    def row(self) -> str:
+        lat = sorted(self.latencies)
+        p50 = statistics.median(lat) * 1e3
+        p99 = lat[int(len(lat) * 0.99) - 1] * 1e3
+        return (
+            f"{self.label:<34}{self.commands / self.requests:>8.2f}"
+            f"{self.round_trips / self.requests:>8.2f}"
+            f"{self.commands / self.requests * 1000:>12,.0f}"
+            f"{p50:>9.3f}{p99:>9.3f}"
+            f"{self.denied / self.requests:>9.1%}{self.local_denials:>9,}  {self.state}"
+        )
+
+
+async def _run(label: str, limiter: RateLimiter, redis, workload: list[Request],
+               concurrency: int, start: float) -> Result:
+    counting = CountingRedis(redis)
+    latencies: list[float] = []
+    denied = 0
+
+    async def one(req: Request) -> None:
+        nonlocal denied
+        t0 = time.perf_counter()
+        decision = await limiter.check(
+            counting, req.tier, f"bench:{req.client}", TIERS[req.tier], start + req.at
+        )
+        latencies.append(time.perf_counter() - t0)
+        if not decision.allowed:
+            denied += 1
+
+    for i in range(0, len(workload), concurrency):
+        await asyncio.gather(*(one(r) for r in workload[i:i + concurrency]))
+
+    local = limiter.pre_limiter.local_denials if limiter.pre_limiter else 0
+    state = redis.state_size() if isinstance(redis, SimulatedRedis) else "-"
+    return Result(label, len(workload), denied, local, counting.commands,
+                  counting.round_trips, latencies, state)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--requests", type=int, default=50_000)
+    parser.add_argument("--clients", type=int, default=2_000)
+    parser.add_argument("--abusive-share", type=float, default=0.05)
+    parser.add_argument("--duration", type=float, default=300.0, help="simulated seconds")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--rtt-ms", type=float, default=0.5, help="simulator round-trip cost")
+    parser.add_argument("--redis-url", default=None)
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    workload = _workload(args.requests, args.clients, args.abusive_share, args.duration, args.seed)
+    start = time.time()
+
+    configs = [
+        ("sliding log (current)", lambda: RateLimiter(
+            {t: SlidingLogBackend() for t in TIERS})),
+        ("window counter", lambda: RateLimiter()),
+        ("window counter + pre-limiter", lambda: RateLimiter(pre_limiter=LocalPreLimiter())),
+    ]
+
+    real = None
+    if args.redis_url:
+        import redis.asyncio as aioredis
+        real = aioredis.from_url(args.redis_url, decode_responses=True)
+
+    print(f"{len(workload):,} requests, {args.clients:,} clients "
+          f"({args.abusive_share:.0%} abusive), concurrency {args.concurrency}, "
+          f"{'redis ' + args.redis_url if real else f'simulated redis, rtt {args.rtt_ms} ms'}\n")
+    print(f"{'':<34}{'cmd/req':>8}{'rt/req':>8}{'ops/s@1k':>12}"
+          f"{'p50 ms':>9}{'p99 ms':>9}{'denied':>9}{'local':>9}  state")
+
+    try:
+        for label, build in configs:
+            redis = real if real is not None else SimulatedRedis(args.rtt_ms / 1000)
+            result = await _run(label, build(), redis, workload, args.concurrency, start)
+            print(result.row())
+            if real is not None:
+                async for key in real.scan_iter("ratelimit:*:bench:*"):
+                    await real.delete(key)
+    finally:
+        if real is not None:
+            await real.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
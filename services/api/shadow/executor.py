@@ -0,0 +1,333 @@
+"""
+Bounded shadow-mode execution.
+
+ShadowRunner.run_shadow_detached used to spawn one task and write one
+shadow_results row per request, so a traffic spike meant unbounded tasks
+and DB writes competing with production. ShadowExecutor bounds all of it:
+
+  sample   submit() keeps a request with probability sample_rate
+  queue    kept requests go to a bounded asyncio.Queue; when it is full the
+           request is dropped (counted), never awaited
+  workers  a fixed number of worker tasks run the model. With offload=True
+           the model's synchronous predict_sync(user_id, context_items) hook
+           runs in a worker thread, so CPU-bound NumPy models do not stall
+           the production loop. Only that hook is offloaded: async predict()
+           (and any I/O it does) always stays on the main loop, and a model
+           without predict_sync is run there even when offload is requested
+  writes   results are buffered and inserted with one multi-row INSERT per
+           flush (flush_rows results, or every flush_interval_s)
+
+stats exposes counters (submitted, sampled, dropped, completed, failed,
+written, write_errors) and a shadow latency histogram; stats.as_dict() is
+JSON-ready.
+
+Configuration defaults come from env vars, like SHADOW_MODE_ENABLED:
+SHADOW_SAMPLE_RATE, SHADOW_QUEUE_SIZE, SHADOW_WORKERS, SHADOW_OFFLOAD.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import random
+import uuid
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, NamedTuple
+
+from services.api.shadow.runner import ShadowModel, ShadowResult, compare_rankings, evaluate_shadow
+
+logger = logging.getLogger(__name__)
+
+SHADOW_SAMPLE_RATE = float(os.environ.get("SHADOW_SAMPLE_RATE", "0.1"))
+SHADOW_QUEUE_SIZE = int(os.environ.get("SHADOW_QUEUE_SIZE", "1000"))
+SHADOW_WORKERS = int(os.environ.get("SHADOW_WORKERS", "4"))
+SHADOW_OFFLOAD = os.environ.get("SHADOW_OFFLOAD", "false").lower() in ("true", "1", "yes")
+
+# Buffered result writes
+FLUSH_ROWS = 100
+FLUSH_INTERVAL_S = 1.0
+
+# Latency histogram bucket upper bounds (ms); the last bucket is open
+LATENCY_BUCKETS_MS: tuple[float, ...] = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+_INSERT_BATCH_SQL = """
+INSERT INTO shadow_results
+    ("id", "modelId", "modelVersion", "userId", "tripId",
+     "shadowRankings", "productionRankings", "overlapAt5", "ndcgAt10",
+     "latencyMs", "createdAt")
+SELECT id, model_id, model_version, user_id, trip_id,
+       shadow::jsonb, production::jsonb, overlap, ndcg, latency, created_at
+FROM unnest(
+    $1::text[], $2::text[], $3::text[], $4::text[], $5::text[],
+    $6::text[], $7::text[], $8::float8[], $9::float8[], $10::int[],
+    $11::timestamptz[]
+) AS t(id, model_id, model_version, user_id, trip_id,
+       shadow, production, overlap, ndcg, latency, created_at)
+"""
+
+
+class _Job(NamedTuple):
+    user_id: str
+    trip_id: str
+    candidates: list[str]
+    production_rankings: list[str]
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (ms)."""
+
+    def __init__(self, bounds_ms: tuple[float, ...] = LATENCY_BUCKETS_MS) -> None:
+        self.bounds_ms = bounds_ms
+        self.counts = [0] * (len(bounds_ms) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+
+    def observe(self, latency_ms: float) -> None:
+        self.counts[bisect_left(self.bounds_ms, latency_ms)] += 1
+        self.count += 1
+        self.sum_ms += latency_ms
+
+    def quantile(self, q: float) -> float | None:
+        """Upper bound of the bucket holding quantile ``q`` (inf if open)."""
+        if not self.count:
+            return None
+        target = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= target and n:
+                return self.bounds_ms[i] if i < len(self.bounds_ms) else float("inf")
+        return float("inf")
+
+    def as_dict(self) -> dict[str, Any]:
+        buckets = {f"le_{b:g}": n for b, n in zip(self.bounds_ms, self.counts)}
+        buckets["le_inf"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "sum_ms": self.sum_ms,
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "buckets": buckets,
+        }
+
+
+@dataclass
+class ShadowStats:
+    """Lifetime counters for one ShadowExecutor."""
+    submitted: int = 0
+    sampled: int = 0
+    dropped: int = 0
+    completed: int = 0
+    failed: int = 0
+    written: int = 0
+    write_errors: int = 0
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "submitted": self.submitted,
+            "sampled": self.sampled,
+            "dropped": self.dropped,
+            "completed": self.completed,
+            "failed": self.failed,
+            "written": self.written,
+            "write_errors": self.write_errors,
+            "latency": self.latency.as_dict(),
+        }
+
+
+class ShadowExecutor:
+    """
+    Sampled, bounded shadow runs with batched result persistence.
+
+    Usage:
+        executor = ShadowExecutor(db_pool, model, sample_rate=0.05)
+        executor.start()
+        runner = ShadowRunner(pool=db_pool, model=model, executor=executor)
+        runner.run_shadow_detached(user_id, trip_id, candidates, prod_rankings)
+        ...
+        await executor.stop()   # drains the queue and flushes results
+    """
+
+    def __init__(
+        self,
+        pool,
+        model: ShadowModel,
+        *,
+        sample_rate: float = SHADOW_SAMPLE_RATE,
+        queue_size: int = SHADOW_QUEUE_SIZE,
+        workers: int = SHADOW_WORKERS,
+        offload: bool = SHADOW_OFFLOAD,
+        flush_rows: int = FLUSH_ROWS,
+        flush_interval_s: float = FLUSH_INTERVAL_S,
+        rng: random.Random | None = None,
+    ) -> None:
+        self._pool = pool
+        self._model = model
+        self._sample_rate = sample_rate
+        self._queue: asyncio.Queue[_Job] = asyncio.Queue(maxsize=queue_size)
+        self._n_workers = workers
+        self._offload = offload and callable(getattr(model, "predict_sync", None))
+        if offload and not self._offload:
+            logger.warning(
+                "Shadow model %s has no predict_sync(); running predictions on the event loop",
+                getattr(model, "model_id", type(model).__name__),
+            )
+        self._flush_rows = flush_rows
+        self._flush_interval_s = flush_interval_s
+        self._rng = rng or random.Random()
+
+        self.stats = ShadowStats()
+        self._buffer: list[tuple[str, str, ShadowResult]] = []
+        self._flush_lock = asyncio.Lock()
+        self._workers: list[asyncio.Task] = []
+        self._flusher: asyncio.Task | None = None
+        self._threads: ThreadPoolExecutor | None = None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    def start(self) -> None:
+        if self.running:
+            return
+        if self._offload:
+            self._threads = ThreadPoolExecutor(self._n_workers, thread_name_prefix="shadow")
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"shadow-worker-{i}")
+            for i in range(self._n_workers)
+        ]
+        self._flusher = asyncio.create_task(self._flush_loop(), name="shadow-flusher")
+
+    async def stop(self, *, drain: bool = True) -> None:
+        """Stop workers (after finishing queued runs if ``drain``) and flush."""
+        if not self.running:
+            return
+        if drain:
+            await self._queue.join()
+        tasks = [*self._workers, self._flusher]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        self._flusher = None
+        if self._threads is not None:
+            # Let in-flight predictions finish without blocking the loop
+            await asyncio.to_thread(self._threads.shutdown, wait=True)
+            self._threads = None
+        await self.flush()
+
+    # ------------------------------------------------------------------
+    # Submission
+    # ------------------------------------------------------------------
+
+    def submit(
+        self,
+        user_id: str,
+        trip_id: str,
+        candidates: list[str],
+        production_rankings: list[str],
+    ) -> bool:
+        """
+        Offer a shadow run. Never blocks: returns False if the request was
+        not sampled, or was dropped because the queue is full.
+        """
+        self.stats.submitted += 1
+        if self._sample_rate < 1.0 and self._rng.random() >= self._sample_rate:
+            return False
+        self.stats.sampled += 1
+        try:
+            self._queue.put_nowait(_Job(user_id, trip_id, candidates, production_rankings))
+        except asyncio.QueueFull:
+            self.stats.dropped += 1
+            return False
+        return True
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                result = await self._run(job)
+                if result is None:
+                    self.stats.failed += 1
+                else:
+                    self.stats.completed += 1
+                    self.stats.latency.observe(result.latency_ms)
+                    self._buffer.append((job.user_id, job.trip_id, result))
+                    if len(self._buffer) >= self._flush_rows:
+                        await self.flush()
+            except Exception:
+                self.stats.failed += 1
+                logger.exception("Shadow run failed for user=%s trip=%s", job.user_id, job.trip_id)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: _Job) -> ShadowResult | None:
+        if self._threads is None:
+            return await evaluate_shadow(
+                self._model, job.user_id, job.trip_id, job.candidates, job.production_rankings
+            )
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        try:
+            shadow_rankings = await loop.run_in_executor(
+                self._threads, self._model.predict_sync, job.user_id, job.candidates
+            )
+        except Exception:
+            logger.exception(
+                "Shadow model prediction failed for user=%s trip=%s", job.user_id, job.trip_id
+            )
+            return None
+        latency_ms = int((loop.time() - start) * 1000)
+        return compare_rankings(self._model, shadow_rankings, job.production_rankings, latency_ms)
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._flush_interval_s)
+            await self.flush()
+
+    async def flush(self) -> int:
+        """Insert buffered results in one statement. Returns rows written."""
+        async with self._flush_lock:
+            if not self._buffer:
+                return 0
+            rows, self._buffer = self._buffer, []
+            try:
+                async with self._pool.acquire() as conn:
+                    await conn.execute(
+                        _INSERT_BATCH_SQL,
+                        [str(uuid.uuid4()) for _ in rows],
+                        [r.model_id for _, _, r in rows],
+                        [r.model_version for _, _, r in rows],
+                        [user_id for user_id, _, _ in rows],
+                        [trip_id for _, trip_id, _ in rows],
+                        [json.dumps(r.shadow_rankings) for _, _, r in rows],
+                        [json.dumps(r.production_rankings) for _, _, r in rows],
+                        [r.overlap_at_5 for _, _, r in rows],
+                        [r.ndcg_at_10 for _, _, r in rows],
+                        [r.latency_ms for _, _, r in rows],
+                        [r.created_at for _, _, r in rows],
+                    )
+            except Exception:
+                self.stats.write_errors += len(rows)
+                logger.exception("Failed to store %d shadow results", len(rows))
+                return 0
+            self.stats.written += len(rows)
+            return len(rows)
@@ -11,7 +11,10 @@ table for offline analysis.
 Feature-flagged via SHADOW_MODE_ENABLED env var (default: False).
 When disabled, run_shadow returns None with zero overhead.
 When enabled, shadow inference runs as a fire-and-forget asyncio task
-so it never blocks the production response path.
+so it never blocks the production response path. With a ShadowExecutor
+(shadow/executor.py), detached runs are sampled, queued with a bound and
+executed by a fixed worker pool instead, and results are inserted in
+batches.
 """
 
 import asyncio
@@ -131,6 +134,42 @@ def compute_ndcg_at_k(
     return dcg / idcg
 
 
+def compare_rankings(
+    model: ShadowModel,
+    shadow_rankings: list[str],
+    production_rankings: list[str],
+    latency_ms: int,
+) -> ShadowResult:
+    """Score shadow rankings against production into a ShadowResult."""
+    return ShadowResult(
+        model_id=model.model_id,
+        model_version=model.model_version,
+        shadow_rankings=shadow_rankings,
+        production_rankings=production_rankings,
+        overlap_at_5=compute_overlap_at_k(shadow_rankings, production_rankings, k=5),
+        ndcg_at_10=compute_ndcg_at_k(shadow_rankings, production_rankings, k=10),
+        latency_ms=latency_ms,
+    )
+
+
+async def evaluate_shadow(
+    model: ShadowModel,
+    user_id: str,
+    trip_id: str,
+    candidates: list[str],
+    production_rankings: list[str],
+) -> ShadowResult | None:
+    """Run the shadow model and compare; None (logged) if prediction fails."""
+    start = time.monotonic()
+    try:
+        shadow_rankings = await model.predict(user_id, candidates)
+    except Exception:
+        logger.exception("Shadow model prediction failed for user=%s trip=%s", user_id, trip_id)
+        return None
+    latency_ms = int((time.monotonic() - start) * 1000)
+    return compare_rankings(model, shadow_rankings, production_rankings, latency_ms)
+
+
 class ShadowRunner:
     """
     Runs a shadow ML model alongside the production ranker.
@@ -142,11 +181,15 @@ class ShadowRunner:
 
         # Or await result directly (for testing):
         result = await runner.run_shadow(user_id, trip_id, candidates, prod_rankings)
+
+    With an executor, run_shadow_detached submits to it (sampled, bounded,
+    batched writes) rather than spawning a task per request.
     """
 
-    def __init__(self, pool, model: ShadowModel | None = None):
+    def __init__(self, pool, model: ShadowModel | None = None, executor: Any = None):
         self._pool = pool
         self._model = model
+        self._executor = executor
 
     async def _get_shadow_model_info(self) -> dict | None:
         """Fetch the active shadow model from ModelRegistry."""
@@ -210,28 +253,10 @@ class ShadowRunner:
             )
             return None
 
-        start = time.monotonic()
-        try:
-            shadow_rankings = await model.predict(user_id, candidates)
-        except Exception:
-            logger.exception("Shadow model prediction failed for user=%s trip=%s", user_id, trip_id)
+        result = await evaluate_shadow(model, user_id, trip_id, candidates, production_rankings)
+        if result is None:
             return None
 
-        latency_ms = int((time.monotonic() - start) * 1000)
-
-        overlap = compute_overlap_at_k(shadow_rankings, production_rankings, k=5)
-        ndcg = compute_ndcg_at_k(shadow_rankings, production_rankings, k=10)
-
-        result = ShadowResult(
-            model_id=model.model_id,
-            model_version=model.model_version,
-            shadow_rankings=shadow_rankings,
-            production_rankings=production_rankings,
-            overlap_at_5=overlap,
-            ndcg_at_10=ndcg,
-            latency_ms=latency_ms,
-        )
-
         try:
             await self._store_result(user_id, trip_id, result)
         except Exception:
@@ -240,9 +265,9 @@ class ShadowRunner:
         logger.info(
             "Shadow run complete: model=%s overlap@5=%.3f ndcg@10=%.3f latency=%dms",
             model.model_id,
-            overlap,
-            ndcg,
-            latency_ms,
+            result.overlap_at_5,
+            result.ndcg_at_10,
+            result.latency_ms,
         )
 
         return result
@@ -256,13 +281,17 @@ class ShadowRunner:
     ) -> asyncio.Task | None:
         """
         Fire-and-forget shadow run. Returns the Task (for testing) or None
-        if shadow mode is disabled.
+        if shadow mode is disabled or the run went to the executor.
 
         MUST NOT block or delay the production response.
         """
         if not SHADOW_MODE_ENABLED and self._model is None:
             return None
 
+        if self._executor is not None:
+            self._executor.submit(user_id, trip_id, candidates, production_rankings)
+            return None
+
         task = asyncio.create_task(
             self.run_shadow(user_id, trip_id, candidates, production_rankings),
             name=f"shadow-{user_id}-{trip_id}",
@@ -0,0 +1,196 @@
+"""
+Building blocks for running the synthetic simulation concurrently.
+
+run_synthetic_simulation fans archetypes out over a bounded number of
+concurrent workers. Three pieces keep that safe:
+
+  SimulationBudget   the shared cost / request / token ceiling. Each trip
+                     reserves its worst-case cost (max_tokens output, a
+                     conservative input estimate) before its first LLM call,
+                     so concurrent workers cannot jointly overshoot the cap;
+                     actual usage is charged as calls return and the
+                     reservation is released when the trip ends.
+  SignalCopyWriter   buffers signal rows from every worker and writes them
+                     with COPY (copy_records_to_table) in batches. Each
+                     buffered entry also carries the producing worker's
+                     progress state; once the entry's batch is flushed that
+                     state becomes durable and on_flush is called.
+  load_checkpoint /  JSON progress file (same approach as the city seeder's
+  save_checkpoint    data/seed_progress): written after every flush, so an
+                     interrupted run resumes from its last durable state.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Rows per COPY batch
+COPY_BATCH_ROWS = 500
+
+# Flush (and so checkpoint) at least this often, in buffered entries (trips)
+CHECKPOINT_EVERY = 25
+
+
+@dataclass
+class SimulationBudget:
+    """
+    Shared spend ceiling for one simulation run.
+
+    cost_cap_usd always applies; max_requests and max_tokens are optional.
+    Single event loop only (no locking).
+    """
+    cost_cap_usd: float
+    max_requests: int | None = None
+    max_tokens: int | None = None
+    spent_usd: float = 0.0
+    requests: int = 0
+    tokens: int = 0
+    reserved_usd: float = 0.0
+    reserved_requests: int = 0
+    reserved_tokens: int = 0
+
+    @property
+    def exhausted(self) -> bool:
+        return (
+            self.spent_usd >= self.cost_cap_usd
+            or (self.max_requests is not None and self.requests >= self.max_requests)
+            or (self.max_tokens is not None and self.tokens >= self.max_tokens)
+        )
+
+    def reserve(self, cost_usd: float, tokens: int, requests: int) -> str | None:
+        """
+        Hold worst-case usage for one unit of work. Returns None when held,
+        otherwise the abort reason (always starting "budget_cap").
+        """
+        if (
+            self.max_requests is not None
+            and self.requests + self.reserved_requests + requests > self.max_requests
+        ):
+            return f"budget_cap_reached at {self.max_requests} requests"
+        if self.max_tokens is not None and self.tokens + self.reserved_tokens + tokens > self.max_tokens:
+            return f"budget_cap_reached at {self.max_tokens} tokens"
+        if self.exhausted or self.spent_usd + self.reserved_usd + cost_usd > self.cost_cap_usd:
+            return f"budget_cap_reached at ${self.cost_cap_usd:.2f}"
+        self.reserved_usd += cost_usd
+        self.reserved_tokens += tokens
+        self.reserved_requests += requests
+        return None
+
+    def release(self, cost_usd: float, tokens: int, requests: int) -> None:
+        self.reserved_usd = max(0.0, self.reserved_usd - cost_usd)
+        self.reserved_tokens = max(0, self.reserved_tokens - tokens)
+        self.reserved_requests = max(0, self.reserved_requests - requests)
+
+    def charge(self, cost_usd: float, tokens: int) -> None:
+        """Record one completed request."""
+        self.spent_usd += cost_usd
+        self.tokens += tokens
+        self.requests += 1
+
+
+class SignalCopyWriter:
+    """
+    Batched COPY writes shared by concurrent simulation workers.
+
+    add(key, rows, state) buffers ``rows`` for ``key`` (an archetype id)
+    with that worker's progress ``state``. A batch is flushed once it holds
+    ``batch_rows`` rows or ``checkpoint_every`` entries, and by close().
+    After each flush ``durable[key]`` is the latest flushed state and
+    ``written[key]`` the rows stored; a failed COPY is logged and counted
+    (the rows are lost, as a failed per-trip INSERT's were) but still
+    advances ``durable``.
+    """
+
+    def __init__(
+        self,
+        pool,
+        table: str,
+        columns: Sequence[str],
+        *,
+        batch_rows: int = COPY_BATCH_ROWS,
+        checkpoint_every: int = CHECKPOINT_EVERY,
+        on_flush: Callable[[], None] | None = None,
+    ) -> None:
+        self._pool = pool
+        self._table = table
+        self._columns = list(columns)
+        self._batch_rows = batch_rows
+        self._checkpoint_every = checkpoint_every
+        self._on_flush = on_flush
+        self._entries: list[tuple[str, list[tuple], Any]] = []
+        self._rows = 0
+        self._lock = asyncio.Lock()
+
+        self.durable: dict[str, Any] = {}
+        self.written: dict[str, int] = {}
+        self.flushes = 0
+        self.write_errors = 0
+
+    async def add(self, key: str, rows: list[tuple], state: Any) -> None:
+        self._entries.append((key, rows, state))
+        self._rows += len(rows)
+        if self._rows >= self._batch_rows or len(self._entries) >= self._checkpoint_every:
+            await self.flush()
+
+    async def flush(self) -> None:
+        async with self._lock:
+            if not self._entries:
+                return
+            entries, self._entries = self._entries, []
+            self._rows = 0
+            records = [row for _, rows, _ in entries for row in rows]
+            ok = True
+            if records:
+                try:
+                    async with self._pool.acquire() as conn:
+                        await conn.copy_records_to_table(
+                            self._table, records=records, columns=self._columns
+                        )
+                    self.flushes += 1
+                except Exception:
+                    ok = False
+                    self.write_errors += 1
+                    logger.exception(
+                        "synthetic_sim: COPY of %d rows into %s failed", len(records), self._table
+                    )
+            for key, rows, state in entries:
+                if ok:
+                    self.written[key] = self.written.get(key, 0) + len(rows)
+                self.durable[key] = state
+            if self._on_flush is not None:
+                self._on_flush()
+
+    async def close(self) -> None:
+        await self.flush()
+
+
+def load_checkpoint(path: str | Path) -> dict[str, Any] | None:
+    """Load a checkpoint written by save_checkpoint, or None if absent/corrupt."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (json.JSONDecodeError, OSError, ValueError):
+        logger.warning("synthetic_sim: corrupt checkpoint %s, starting fresh", path)
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def save_checkpoint(path: str | Path, data: dict[str, Any]) -> None:
+    """Atomically replace the checkpoint at ``path``."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
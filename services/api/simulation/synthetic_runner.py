@@ -20,19 +20,34 @@ Security / safety:
   - Strict output validation: Haiku must return valid enums + confidence 0-1
   - Hard-coded archetype data — no user data interpolated into prompts
 
-DB writes use raw asyncpg INSERT into behavioral_signals table.
+Scheduling (see simulation/scheduler.py):
+  - Archetypes run on a bounded number of concurrent workers; each trip
+    reserves its worst-case cost against the shared budget first
+  - Signals are streamed into batched COPY writes into behavioral_signals
+  - With checkpoint_path, progress is saved after every batch and an
+    interrupted run resumes from it
+
 All synthetic rows use signal_weight within [-1.0, 3.0] CHECK constraint.
 """
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import time
 import uuid
 from datetime import datetime, timezone
+from pathlib import Path
 from typing import Any
 
+from services.api.simulation.scheduler import (
+    SignalCopyWriter,
+    SimulationBudget,
+    load_checkpoint,
+    save_checkpoint,
+)
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -50,6 +65,10 @@ SYNTH_ID_PREFIX = "synth-"
 
 BUDGET_CAP_USD = 100.0          # per-run spend cap
 CIRCUIT_BREAKER_THRESHOLD = 5   # consecutive Haiku failures -> abort
+SIMULATION_CONCURRENCY = 4      # archetypes simulated at once
+
+SONNET_MAX_TOKENS = 400
+HAIKU_MAX_TOKENS = 512
 
 # Cost rates (per million tokens)
 SONNET_INPUT_COST_PER_M = 3.0
@@ -465,14 +484,14 @@ def _validate_haiku_output(raw: str) -> list[dict]:
 # Database write
 # ---------------------------------------------------------------------------
 
-_INSERT_BEHAVIORAL_SIGNAL_SQL = """
-INSERT INTO behavioral_signals
-  (id, "userId", "tripId", "slotId", "activityNodeId", "signalType",
-   "signalValue", "tripPhase", "rawAction", "modelVersion", "promptVersion",
-   "source", signal_weight, "createdAt")
-VALUES
-  ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14)
-"""
+_SIGNAL_TABLE = "behavioral_signals"
+
+# Column order of the rows built by _signal_rows (COPY quotes the names)
+_SIGNAL_COLUMNS: tuple[str, ...] = (
+    "id", "userId", "tripId", "slotId", "activityNodeId", "signalType",
+    "signalValue", "tripPhase", "rawAction", "modelVersion", "promptVersion",
+    "source", "signal_weight", "createdAt",
+)
 
 
 def _direction_to_signal_value(direction: str, confidence: float) -> float:
@@ -496,16 +515,8 @@ def _direction_to_signal_value(direction: str, confidence: float) -> float:
     return max(SIGNAL_WEIGHT_MIN, min(SIGNAL_WEIGHT_MAX, round(value, 4)))
 
 
-async def _write_signals(
-    db_pool,
-    user_id: str,
-    signals: list[dict],
-    city: str,
-) -> int:
-    """Write validated synthetic signals to behavioral_signals table."""
-    if not signals:
-        return 0
-
+def _signal_rows(user_id: str, signals: list[dict]) -> list[tuple]:
+    """behavioral_signals rows (in _SIGNAL_COLUMNS order) for validated signals."""
     now = datetime.now(timezone.utc)
     rows = []
     for sig in signals:
@@ -528,11 +539,33 @@ async def _write_signals(
             0.3,                        # signal_weight (synthetic = 0.3 per design doc)
             now,                        # createdAt
         ))
+    return rows
 
-    async with db_pool.acquire() as conn:
-        await conn.executemany(_INSERT_BEHAVIORAL_SIGNAL_SQL, rows)
 
-    return len(rows)
+# ---------------------------------------------------------------------------
+# Budget reservation
+# ---------------------------------------------------------------------------
+
+# Conservative chars-per-token for reserving input tokens before a call
+_CHARS_PER_TOKEN = 3
+
+
+def _trip_reservation(sonnet_prompt: str) -> tuple[float, int]:
+    """
+    Worst-case (cost_usd, tokens) of one trip: both calls at max_tokens,
+    with the Haiku input bounded by the Sonnet output.
+    """
+    sonnet_in = len(sonnet_prompt) // _CHARS_PER_TOKEN + 1
+    haiku_in = (
+        (len(_HAIKU_CLASSIFICATION_SYSTEM) + len(_build_haiku_prompt(""))) // _CHARS_PER_TOKEN
+        + SONNET_MAX_TOKENS
+        + 1
+    )
+    cost = (
+        _estimate_sonnet_cost(sonnet_in, SONNET_MAX_TOKENS)
+        + _estimate_haiku_cost(haiku_in, HAIKU_MAX_TOKENS)
+    )
+    return cost, sonnet_in + SONNET_MAX_TOKENS + haiku_in + HAIKU_MAX_TOKENS
 
 
 # ---------------------------------------------------------------------------
@@ -540,222 +573,208 @@ async def _write_signals(
 # ---------------------------------------------------------------------------
 
 
+def _new_archetype_state() -> dict[str, Any]:
+    """Checkpointable progress of one archetype (JSON-serializable)."""
+    return {
+        "next_trip": 1,
+        "cost": 0.0,
+        "requests": 0,
+        "tokens": 0,
+        "consecutive_failures": 0,
+        "aborted": False,
+        "abort_reason": None,
+        "done": False,
+    }
+
+
+def _archetype_result(
+    archetype_id: str,
+    state: dict[str, Any],
+    trips_per_archetype: int,
+    signals_generated: int,
+) -> dict:
+    return {
+        "archetype_id": archetype_id,
+        "trips_completed": state["next_trip"] - 1 if state["aborted"] else trips_per_archetype,
+        "signals_generated": signals_generated,
+        "cost_estimate_usd": state["cost"],
+        "aborted": state["aborted"],
+        "abort_reason": state["abort_reason"],
+    }
+
+
 async def _run_archetype(
     archetype: dict,
     trips_per_archetype: int,
-    db_pool,
     anthropic_client,
-    budget_tracker: dict,
-) -> dict:
+    budget: SimulationBudget,
+    writer: SignalCopyWriter,
+    state: dict[str, Any] | None = None,
+) -> dict[str, Any]:
     """
-    Run trips_per_archetype simulated trips for a single archetype.
+    Run the remaining simulated trips (from state["next_trip"]) for a single
+    archetype, in order, so the circuit breaker sees consecutive trips.
 
-    Returns:
-        {
-          "archetype_id": str,
-          "trips_completed": int,
-          "signals_generated": int,
-          "cost_estimate_usd": float,
-          "aborted": bool,
-          "abort_reason": str | None,
-        }
+    Validated signals go to ``writer`` together with the updated state after
+    every trip. Returns the final state (see _new_archetype_state);
+    _archetype_result turns it into the per-archetype result.
     """
     archetype_id = archetype["id"]
     cities = archetype["sample_cities"]
-    signals_generated = 0
-    cost_estimate = 0.0
-    consecutive_haiku_failures = 0
-
-    for trip_num in range(1, trips_per_archetype + 1):
-        # Check budget cap before each trip
-        if budget_tracker["total_cost"] >= BUDGET_CAP_USD:
-            logger.warning(
-                "synthetic_sim: budget cap $%.2f reached at archetype=%s trip=%d",
-                BUDGET_CAP_USD,
-                archetype_id,
-                trip_num,
-            )
-            return {
-                "archetype_id": archetype_id,
-                "trips_completed": trip_num - 1,
-                "signals_generated": signals_generated,
-                "cost_estimate_usd": cost_estimate,
-                "aborted": True,
-                "abort_reason": f"budget_cap_reached at ${BUDGET_CAP_USD:.2f}",
-            }
-
+    state = dict(state) if state is not None else _new_archetype_state()
+    state["aborted"] = False
+    state["abort_reason"] = None
+
+    def _charge(response, cost: float) -> None:
+        tokens = response.usage.input_tokens + response.usage.output_tokens
+        budget.charge(cost, tokens)
+        state["cost"] += cost
+        state["requests"] += 1
+        state["tokens"] += tokens
+
+    async def _abort(trip_num: int, reason: str, *, done: bool) -> dict[str, Any]:
+        state.update(next_trip=trip_num, aborted=True, abort_reason=reason, done=done)
+        await writer.add(archetype_id, [], dict(state))
+        return state
+
+    for trip_num in range(state["next_trip"], trips_per_archetype + 1):
         # Round-robin through sample cities
         city = cities[(trip_num - 1) % len(cities)]
 
         # Build synthetic user ID (synth- prefix, stable per archetype+trip)
         synth_user_id = f"{SYNTH_ID_PREFIX}{archetype_id}-{trip_num:04d}"
 
-        # --- Agent 1: Sonnet generates reaction ---
-        t0 = time.monotonic()
-        try:
-            sonnet_prompt = _build_sonnet_prompt(archetype, city, trip_num)
-            sonnet_response = await anthropic_client.messages.create(
-                model=SONNET_MODEL,
-                max_tokens=400,
-                messages=[{"role": "user", "content": sonnet_prompt}],
-            )
-            sonnet_latency_ms = round((time.monotonic() - t0) * 1000)
-            journal_text = sonnet_response.content[0].text.strip()
-
-            sonnet_cost = _estimate_sonnet_cost(
-                sonnet_response.usage.input_tokens,
-                sonnet_response.usage.output_tokens,
-            )
-            cost_estimate += sonnet_cost
-            budget_tracker["total_cost"] += sonnet_cost
-
-            logger.info(
-                "synthetic_sim sonnet model=%s prompt_version=%s archetype=%s "
-                "trip=%d latency_ms=%d input_tokens=%d output_tokens=%d cost_usd=%.6f",
-                SONNET_MODEL,
-                SONNET_PROMPT_VERSION,
-                archetype_id,
-                trip_num,
-                sonnet_latency_ms,
-                sonnet_response.usage.input_tokens,
-                sonnet_response.usage.output_tokens,
-                sonnet_cost,
-            )
-
-        except Exception as exc:
-            logger.error(
-                "synthetic_sim: sonnet failed archetype=%s trip=%d: %s",
+        # Hold the trip's worst-case spend before any call
+        sonnet_prompt = _build_sonnet_prompt(archetype, city, trip_num)
+        reserved_cost, reserved_tokens = _trip_reservation(sonnet_prompt)
+        refusal = budget.reserve(reserved_cost, reserved_tokens, 2)
+        if refusal is not None:
+            logger.warning(
+                "synthetic_sim: %s at archetype=%s trip=%d",
+                refusal,
                 archetype_id,
                 trip_num,
-                str(exc),
             )
-            # Sonnet failure is non-fatal per trip — skip this trip
-            continue
+            return await _abort(trip_num, refusal, done=False)
 
-        # --- Agent 2: Haiku classifies the reaction ---
-        t0 = time.monotonic()
         try:
-            haiku_prompt = _build_haiku_prompt(journal_text)
-            haiku_response = await anthropic_client.messages.create(
-                model=HAIKU_MODEL,
-                max_tokens=512,
-                system=_HAIKU_CLASSIFICATION_SYSTEM,
-                messages=[{"role": "user", "content": haiku_prompt}],
-            )
-            haiku_latency_ms = round((time.monotonic() - t0) * 1000)
-            raw_classification = haiku_response.content[0].text.strip()
-
-            haiku_cost = _estimate_haiku_cost(
-                haiku_response.usage.input_tokens,
-                haiku_response.usage.output_tokens,
-            )
-            cost_estimate += haiku_cost
-            budget_tracker["total_cost"] += haiku_cost
-
-            logger.info(
-                "synthetic_sim haiku model=%s prompt_version=%s archetype=%s "
-                "trip=%d latency_ms=%d input_tokens=%d output_tokens=%d cost_usd=%.6f",
-                HAIKU_MODEL,
-                HAIKU_PROMPT_VERSION,
-                archetype_id,
-                trip_num,
-                haiku_latency_ms,
-                haiku_response.usage.input_tokens,
-                haiku_response.usage.output_tokens,
-                haiku_cost,
-            )
-
-            # Validate Haiku output
-            validated_signals = _validate_haiku_output(raw_classification)
+            # --- Agent 1: Sonnet generates reaction ---
+            t0 = time.monotonic()
+            try:
+                sonnet_response = await anthropic_client.messages.create(
+                    model=SONNET_MODEL,
+                    max_tokens=SONNET_MAX_TOKENS,
+                    messages=[{"role": "user", "content": sonnet_prompt}],
+                )
+                sonnet_latency_ms = round((time.monotonic() - t0) * 1000)
+                journal_text = sonnet_response.content[0].text.strip()
 
-            # Reset circuit breaker on success
-            consecutive_haiku_failures = 0
+                sonnet_cost = _estimate_sonnet_cost(
+                    sonnet_response.usage.input_tokens,
+                    sonnet_response.usage.output_tokens,
+                )
+                _charge(sonnet_response, sonnet_cost)
 
-        except ValueError as exc:
-            # Validation failure
-            consecutive_haiku_failures += 1
-            logger.warning(
-                "synthetic_sim: haiku validation failed archetype=%s trip=%d "
-                "consecutive=%d: %s",
-                archetype_id,
-                trip_num,
-                consecutive_haiku_failures,
-                str(exc),
-            )
-            if consecutive_haiku_failures >= CIRCUIT_BREAKER_THRESHOLD:
-                logger.error(
-                    "synthetic_sim: circuit breaker tripped archetype=%s "
-                    "after %d consecutive haiku failures",
+                logger.info(
+                    "synthetic_sim sonnet model=%s prompt_version=%s archetype=%s "
+                    "trip=%d latency_ms=%d input_tokens=%d output_tokens=%d cost_usd=%.6f",
+                    SONNET_MODEL,
+                    SONNET_PROMPT_VERSION,
                     archetype_id,
-                    CIRCUIT_BREAKER_THRESHOLD,
+                    trip_num,
+                    sonnet_latency_ms,
+                    sonnet_response.usage.input_tokens,
+                    sonnet_response.usage.output_tokens,
+                    sonnet_cost,
                 )
-                return {
-                    "archetype_id": archetype_id,
-                    "trips_completed": trip_num - 1,
-                    "signals_generated": signals_generated,
-                    "cost_estimate_usd": cost_estimate,
-                    "aborted": True,
-                    "abort_reason": (
-                        f"circuit_breaker: {CIRCUIT_BREAKER_THRESHOLD} consecutive "
-                        f"haiku failures"
-                    ),
-                }
-            continue
-
-        except Exception as exc:
-            consecutive_haiku_failures += 1
-            logger.error(
-                "synthetic_sim: haiku call failed archetype=%s trip=%d "
-                "consecutive=%d: %s",
-                archetype_id,
-                trip_num,
-                consecutive_haiku_failures,
-                str(exc),
-            )
-            if consecutive_haiku_failures >= CIRCUIT_BREAKER_THRESHOLD:
+
+            except Exception as exc:
                 logger.error(
-                    "synthetic_sim: circuit breaker tripped archetype=%s "
-                    "after %d consecutive haiku failures",
+                    "synthetic_sim: sonnet failed archetype=%s trip=%d: %s",
                     archetype_id,
-                    CIRCUIT_BREAKER_THRESHOLD,
+                    trip_num,
+                    str(exc),
                 )
-                return {
-                    "archetype_id": archetype_id,
-                    "trips_completed": trip_num - 1,
-                    "signals_generated": signals_generated,
-                    "cost_estimate_usd": cost_estimate,
-                    "aborted": True,
-                    "abort_reason": (
-                        f"circuit_breaker: {CIRCUIT_BREAKER_THRESHOLD} consecutive "
-                        f"haiku failures"
-                    ),
-                }
-            continue
-
-        # --- Write signals to DB ---
-        if validated_signals:
+                # Sonnet failure is non-fatal per trip — skip this trip
+                state["next_trip"] = trip_num + 1
+                await writer.add(archetype_id, [], dict(state))
+                continue
+
+            # --- Agent 2: Haiku classifies the reaction ---
+            t0 = time.monotonic()
             try:
-                count = await _write_signals(
-                    db_pool, synth_user_id, validated_signals, city
+                haiku_prompt = _build_haiku_prompt(journal_text)
+                haiku_response = await anthropic_client.messages.create(
+                    model=HAIKU_MODEL,
+                    max_tokens=HAIKU_MAX_TOKENS,
+                    system=_HAIKU_CLASSIFICATION_SYSTEM,
+                    messages=[{"role": "user", "content": haiku_prompt}],
                 )
-                signals_generated += count
+                haiku_latency_ms = round((time.monotonic() - t0) * 1000)
+                raw_classification = haiku_response.content[0].text.strip()
+
+                haiku_cost = _estimate_haiku_cost(
+                    haiku_response.usage.input_tokens,
+                    haiku_response.usage.output_tokens,
+                )
+                _charge(haiku_response, haiku_cost)
+
+                logger.info(
+                    "synthetic_sim haiku model=%s prompt_version=%s archetype=%s "
+                    "trip=%d latency_ms=%d input_tokens=%d output_tokens=%d cost_usd=%.6f",
+                    HAIKU_MODEL,
+                    HAIKU_PROMPT_VERSION,
+                    archetype_id,
+                    trip_num,
+                    haiku_latency_ms,
+                    haiku_response.usage.input_tokens,
+                    haiku_response.usage.output_tokens,
+                    haiku_cost,
+                )
+
+                # Validate Haiku output
+                validated_signals = _validate_haiku_output(raw_classification)
+
+                # Reset circuit breaker on success
+                state["consecutive_failures"] = 0
+
             except Exception as exc:
-                logger.error(
-                    "synthetic_sim: db write failed archetype=%s trip=%d: %s",
+                # Validation failure (ValueError) or failed call
+                state["consecutive_failures"] += 1
+                log = logger.warning if isinstance(exc, ValueError) else logger.error
+                log(
+                    "synthetic_sim: haiku %s archetype=%s trip=%d consecutive=%d: %s",
+                    "validation failed" if isinstance(exc, ValueError) else "call failed",
                     archetype_id,
                     trip_num,
+                    state["consecutive_failures"],
                     str(exc),
                 )
-                # DB write failure is non-fatal per trip
-
-    return {
-        "archetype_id": archetype_id,
-        "trips_completed": trips_per_archetype,
-        "signals_generated": signals_generated,
-        "cost_estimate_usd": cost_estimate,
-        "aborted": False,
-        "abort_reason": None,
-    }
+                if state["consecutive_failures"] >= CIRCUIT_BREAKER_THRESHOLD:
+                    logger.error(
+                        "synthetic_sim: circuit breaker tripped archetype=%s "
+                        "after %d consecutive haiku failures",
+                        archetype_id,
+                        CIRCUIT_BREAKER_THRESHOLD,
+                    )
+                    return await _abort(
+                        trip_num,
+                        f"circuit_breaker: {CIRCUIT_BREAKER_THRESHOLD} consecutive haiku failures",
+                        done=True,
+                    )
+                state["next_trip"] = trip_num + 1
+                await writer.add(archetype_id, [], dict(state))
+                continue
+        finally:
+            budget.release(reserved_cost, reserved_tokens, 2)
+
+        # --- Stream signals to the batched COPY writer ---
+        state["next_trip"] = trip_num + 1
+        await writer.add(archetype_id, _signal_rows(synth_user_id, validated_signals), dict(state))
+
+    state["done"] = True
+    await writer.add(archetype_id, [], dict(state))
+    return state
 
 
 # ---------------------------------------------------------------------------
@@ -769,6 +788,11 @@ async def run_synthetic_simulation(
     is_admin: bool,
     archetype_filter: list[str] | None = None,
     trips_per_archetype: int = 50,
+    *,
+    concurrency: int = SIMULATION_CONCURRENCY,
+    max_requests: int | None = None,
+    max_tokens: int | None = None,
+    checkpoint_path: str | Path | None = None,
 ) -> dict:
     """
     Generate synthetic training data by simulating travel archetypes.
@@ -782,8 +806,13 @@ async def run_synthetic_simulation(
     All synthetic data tagged with source="synthetic_agent_v1".
     Synthetic user IDs use "synth-" prefix.
 
+    Archetypes run on ``concurrency`` workers (trips within an archetype stay
+    sequential). Signals from all workers are written with batched COPY.
+
     Safety controls:
-      - Budget cap: $100 per run (cumulative across all archetypes)
+      - Budget cap: $100 per run (cumulative across all archetypes), plus
+        optional request/token caps. Each trip reserves its worst-case cost
+        first, so concurrent archetypes stay under the cap
       - Circuit breaker: 5 consecutive Haiku failures per archetype -> abort that archetype
       - Strict output validation on all Haiku responses
 
@@ -794,6 +823,13 @@ async def run_synthetic_simulation(
         archetype_filter: If provided, run only archetypes with IDs in this list.
             If None, run all 12 archetypes.
         trips_per_archetype: Number of simulated trips per archetype. Default 50.
+        concurrency: Archetypes simulated at once. Default SIMULATION_CONCURRENCY.
+        max_requests: Optional cap on LLM requests for the run.
+        max_tokens: Optional cap on LLM tokens (input + output) for the run.
+        checkpoint_path: JSON progress file. Progress is saved after every
+            signal batch; re-running with the same path, archetypes and
+            trips_per_archetype resumes where the last run stopped, with its
+            spend counted against the budget.
 
     Returns:
         {
@@ -822,74 +858,139 @@ async def run_synthetic_simulation(
         archetypes_to_run = [_ARCHETYPE_BY_ID[a] for a in archetype_filter]
     else:
         archetypes_to_run = list(ARCHETYPES)
+    archetype_ids = [a["id"] for a in archetypes_to_run]
+
+    # Resume from a checkpoint of the same run shape
+    resumed: dict[str, dict[str, Any]] = {}
+    if checkpoint_path is not None:
+        checkpoint = load_checkpoint(checkpoint_path)
+        if checkpoint is not None:
+            if (
+                checkpoint.get("archetypes") == archetype_ids
+                and checkpoint.get("trips_per_archetype") == trips_per_archetype
+            ):
+                resumed = checkpoint.get("state", {})
+            else:
+                logger.warning(
+                    "synthetic_sim: checkpoint %s is for a different run, starting fresh",
+                    checkpoint_path,
+                )
+    resumed_signals = {k: s.pop("signals", 0) for k, s in resumed.items()}
 
-    # Shared budget tracker (mutable dict passed by reference to each archetype run)
-    budget_tracker = {"total_cost": 0.0}
+    budget = SimulationBudget(
+        cost_cap_usd=BUDGET_CAP_USD, max_requests=max_requests, max_tokens=max_tokens
+    )
+    for s in resumed.values():
+        budget.spent_usd += s["cost"]
+        budget.requests += s["requests"]
+        budget.tokens += s["tokens"]
+
+    def _signals(archetype_id: str) -> int:
+        return resumed_signals.get(archetype_id, 0) + writer.written.get(archetype_id, 0)
+
+    def _save() -> None:
+        save_checkpoint(checkpoint_path, {
+            "archetypes": archetype_ids,
+            "trips_per_archetype": trips_per_archetype,
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+            "state": {
+                k: {**s, "signals": _signals(k)}
+                for k, s in {**resumed, **writer.durable}.items()
+            },
+        })
+
+    writer = SignalCopyWriter(
+        db_pool,
+        _SIGNAL_TABLE,
+        _SIGNAL_COLUMNS,
+        on_flush=_save if checkpoint_path is not None else None,
+    )
 
-    total_signals = 0
-    archetypes_run = 0
-    archetype_results: list[dict] = []
+    final_states: dict[str, dict[str, Any]] = {}
     overall_aborted = False
     abort_reason: str | None = None
+    pending = iter(archetypes_to_run)
 
     logger.info(
-        "synthetic_sim: starting run archetypes=%d trips_per=%d",
+        "synthetic_sim: starting run archetypes=%d trips_per=%d concurrency=%d resumed=%d",
         len(archetypes_to_run),
         trips_per_archetype,
+        concurrency,
+        len(resumed),
     )
 
-    for archetype in archetypes_to_run:
-        # Budget check before each archetype
-        if budget_tracker["total_cost"] >= BUDGET_CAP_USD:
-            overall_aborted = True
-            abort_reason = f"budget_cap_reached at ${BUDGET_CAP_USD:.2f}"
-            logger.warning(
-                "synthetic_sim: aborting run at archetype=%s due to budget cap",
-                archetype["id"],
-            )
-            break
-
-        result = await _run_archetype(
-            archetype=archetype,
-            trips_per_archetype=trips_per_archetype,
-            db_pool=db_pool,
-            anthropic_client=anthropic_client,
-            budget_tracker=budget_tracker,
-        )
-
-        archetype_results.append(result)
-        archetypes_run += 1
-        total_signals += result["signals_generated"]
-
-        if result["aborted"]:
-            # Circuit breaker or budget cap during archetype run
-            if "budget_cap" in (result["abort_reason"] or ""):
-                overall_aborted = True
-                abort_reason = result["abort_reason"]
-                break
-            # Circuit breaker only aborts this archetype — continue with next
-            logger.warning(
-                "synthetic_sim: archetype=%s aborted (%s), continuing with next",
-                archetype["id"],
-                result["abort_reason"],
+    async def _worker() -> None:
+        nonlocal overall_aborted, abort_reason
+        for archetype in pending:
+            state = resumed.get(archetype["id"])
+            if state is not None and state["done"]:
+                final_states[archetype["id"]] = state
+                continue
+            # Budget check before each archetype
+            if overall_aborted or budget.exhausted:
+                if not overall_aborted:
+                    overall_aborted = True
+                    abort_reason = f"budget_cap_reached at ${BUDGET_CAP_USD:.2f}"
+                logger.warning(
+                    "synthetic_sim: aborting run at archetype=%s due to budget cap",
+                    archetype["id"],
+                )
+                return
+
+            state = await _run_archetype(
+                archetype=archetype,
+                trips_per_archetype=trips_per_archetype,
+                anthropic_client=anthropic_client,
+                budget=budget,
+                writer=writer,
+                state=state,
             )
+            final_states[archetype["id"]] = state
+
+            if state["aborted"]:
+                # Circuit breaker or budget cap during archetype run
+                if "budget_cap" in (state["abort_reason"] or ""):
+                    if not overall_aborted:
+                        overall_aborted = True
+                        abort_reason = state["abort_reason"]
+                    return
+                # Circuit breaker only aborts this archetype — continue with next
+                logger.warning(
+                    "synthetic_sim: archetype=%s aborted (%s), continuing with next",
+                    archetype["id"],
+                    state["abort_reason"],
+                )
 
+    try:
+        await asyncio.gather(*(_worker() for _ in range(max(1, concurrency))))
+    finally:
+        # Persist buffered signals (and the checkpoint) even when interrupted
+        await writer.close()
+
+    archetype_results = [
+        _archetype_result(a_id, final_states[a_id], trips_per_archetype, _signals(a_id))
+        for a_id in archetype_ids
+        if a_id in final_states
+    ]
+    total_signals = sum(r["signals_generated"] for r in archetype_results)
     final_status = "aborted" if overall_aborted else "completed"
 
     logger.info(
         "synthetic_sim: %s archetypes_run=%d signals_generated=%d "
-        "cost_estimate_usd=%.4f",
+        "cost_estimate_usd=%.4f requests=%d copy_batches=%d",
         final_status,
-        archetypes_run,
+        len(archetype_results),
         total_signals,
-        budget_tracker["total_cost"],
+        budget.spent_usd,
+        budget.requests,
+        writer.flushes,
     )
 
     return {
         "status": final_status,
-        "archetypes_run": archetypes_run,
+        "archetypes_run": len(archetype_results),
         "signals_generated": total_signals,
-        "cost_estimate_usd": round(budget_tracker["total_cost"], 4),
+        "cost_estimate_usd": round(budget.spent_usd, 4),
         "archetype_results": archetype_results,
         "abort_reason": abort_reason,
     }
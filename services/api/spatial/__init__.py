@@ -0,0 +1,31 @@
+"""
+In-memory spatial index package.
+
+Holds, per city, an array-backed grid index of canonical ActivityNode
+coordinates with vectorized radius, k-NN and corridor queries, so proximity
+questions (micro-stops, entity resolution) need no PostGIS round trip.
+"""
+
+from services.api.spatial.index import (
+    CityIndex,
+    haversine_m,
+    pairwise_haversine_m,
+)
+from services.api.spatial.store import (
+    CitySpatialIndexes,
+    clear_spatial_indexes,
+    discard_node,
+    invalidate_spatial_index,
+    spatial_index_bytes,
+)
+
+__all__ = [
+    "CityIndex",
+    "CitySpatialIndexes",
+    "clear_spatial_indexes",
+    "discard_node",
+    "haversine_m",
+    "invalidate_spatial_index",
+    "pairwise_haversine_m",
+    "spatial_index_bytes",
+]
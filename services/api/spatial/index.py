@@ -0,0 +1,294 @@
+"""
+CityIndex — array-backed spatial index over one city's ActivityNodes.
+
+Coordinates are projected onto a local equirectangular plane centred on the
+city (x east, y north, metres), which is accurate to well under 1% across a
+metro area. Points are bucketed into square grid cells of ``cell_m`` metres
+and stored sorted by cell key (cx * rows + cy), so every grid column of a
+query box is one contiguous slice found with np.searchsorted:
+
+  within()   radius query; exact haversine distance on the box candidates
+  nearest()  k-NN by growing the radius until k points are inside it
+  along()    corridor query: points within ``buffer_m`` of a line segment
+             (projected distance, as a buffered line would be)
+
+Per-node attributes (category code, convergenceScore, approved flag) are
+kept as parallel arrays so filters are boolean masks, not Python loops;
+names are optional, for callers that report what they found.
+discard() drops a node (e.g. merged away) without rebuilding.
+
+Memory is fixed per node: 8+8 (lat/lon) + 4+4 (x/y) + 8 (cell key) +
+4 (order) + 2 (category) + 4 (score) + 2 (flags) bytes, plus the id and
+name strings. nbytes reports the total.
+"""
+
+from __future__ import annotations
+
+import math
+import sys
+from typing import Iterable, Sequence
+
+import numpy as np
+
+EARTH_RADIUS_M = 6_371_008.8
+
+# Grid cell edge in metres: a 50 m radius query touches <= 4 cells, a 200 m
+# corridor a handful per column
+DEFAULT_CELL_M = 250.0
+
+# Box slack for the projection's east-west scale drift across a city
+_BOX_SLACK = 1.05
+
+
+def haversine_m(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Great-circle distance in metres; arguments broadcast like numpy arrays."""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=np.float64)) for v in (lat1, lon1, lat2, lon2))
+    a = (
+        np.sin((lat2 - lat1) / 2.0) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2.0) ** 2
+    )
+    return 2.0 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def pairwise_haversine_m(lats: Sequence[float], lons: Sequence[float]) -> np.ndarray:
+    """(n, n) matrix of great-circle distances in metres."""
+    lats = np.asarray(lats, dtype=np.float64)
+    lons = np.asarray(lons, dtype=np.float64)
+    return haversine_m(lats[:, None], lons[:, None], lats[None, :], lons[None, :])
+
+
+class CityIndex:
+    """
+    Grid-bucketed node coordinates for one city.
+
+    Positions returned by queries index into ``ids`` and the attribute
+    arrays. Queries skip discarded nodes and honour an optional boolean
+    ``mask`` over positions (see mask()).
+    """
+
+    def __init__(
+        self,
+        ids: Sequence[str],
+        lats: Sequence[float],
+        lons: Sequence[float],
+        *,
+        categories: Sequence[str | None] | None = None,
+        scores: Sequence[float | None] | None = None,
+        approved: Sequence[bool] | None = None,
+        names: Sequence[str] | None = None,
+        cell_m: float = DEFAULT_CELL_M,
+    ) -> None:
+        n = len(ids)
+        self.ids: list[str] = list(ids)
+        self.names: list[str] | None = list(names) if names is not None else None
+        self.size = n
+        self.cell_m = float(cell_m)
+        self.lat = np.asarray(lats, dtype=np.float64).reshape(n)
+        self.lon = np.asarray(lons, dtype=np.float64).reshape(n)
+        self._positions = {node_id: i for i, node_id in enumerate(self.ids)}
+
+        self.category_names: list[str] = sorted({c for c in categories or [] if c})
+        codes = {name: i for i, name in enumerate(self.category_names)}
+        self.category = np.array(
+            [codes.get(c, -1) if c else -1 for c in categories] if categories is not None else [-1] * n,
+            dtype=np.int16,
+        ).reshape(n)
+        self.score = np.array(
+            [np.nan if s is None else s for s in scores] if scores is not None else [np.nan] * n,
+            dtype=np.float32,
+        ).reshape(n)
+        self.approved = (
+            np.asarray(approved, dtype=bool).reshape(n) if approved is not None else np.ones(n, dtype=bool)
+        )
+        self.active = np.ones(n, dtype=bool)
+
+        # Local projection around the centroid
+        self._lat0 = float(self.lat.mean()) if n else 0.0
+        self._lon0 = float(self.lon.mean()) if n else 0.0
+        self._kx = EARTH_RADIUS_M * math.cos(math.radians(self._lat0)) * math.pi / 180.0
+        self._ky = EARTH_RADIUS_M * math.pi / 180.0
+        x, y = self.project(self.lat, self.lon)
+        self.x = x.astype(np.float32)
+        self.y = y.astype(np.float32)
+
+        if n:
+            self._x_min, self._y_min = float(x.min()), float(y.min())
+            self._cols = int((x.max() - self._x_min) // self.cell_m) + 1
+            self._rows = int((y.max() - self._y_min) // self.cell_m) + 1
+        else:
+            self._x_min = self._y_min = 0.0
+            self._cols = self._rows = 0
+        cx = ((x - self._x_min) // self.cell_m).astype(np.int64)
+        cy = ((y - self._y_min) // self.cell_m).astype(np.int64)
+        keys = cx * self._rows + cy
+        self._order = np.argsort(keys, kind="stable").astype(np.int32)
+        self._sorted_keys = keys[self._order]
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+
+    @property
+    def nbytes(self) -> int:
+        arrays = (
+            self.lat, self.lon, self.x, self.y, self.category, self.score,
+            self.approved, self.active, self._order, self._sorted_keys,
+        )
+        strings = self.ids + (self.names or [])
+        return sum(a.nbytes for a in arrays) + sum(sys.getsizeof(v) for v in strings)
+
+    def position(self, node_id: str) -> int | None:
+        return self._positions.get(node_id)
+
+    def discard(self, node_id: str) -> bool:
+        """Exclude a node from every later query. Returns False if unknown."""
+        i = self._positions.get(node_id)
+        if i is None:
+            return False
+        self.active[i] = False
+        return True
+
+    def project(self, lats, lons) -> tuple[np.ndarray, np.ndarray]:
+        """Local plane coordinates in metres."""
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        return (lons - self._lon0) * self._kx, (lats - self._lat0) * self._ky
+
+    def mask(
+        self,
+        *,
+        category: str | None = None,
+        approved_only: bool = False,
+        min_score: float | None = None,
+        exclude_ids: Iterable[str] | None = None,
+    ) -> np.ndarray:
+        """
+        Boolean filter over positions. ``min_score`` keeps nodes without a
+        score (NULL convergenceScore), like the SQL filters do.
+        """
+        keep = self.active.copy()
+        if category is not None:
+            try:
+                keep &= self.category == self.category_names.index(category)
+            except ValueError:
+                keep[:] = False
+        if approved_only:
+            keep &= self.approved
+        if min_score is not None:
+            keep &= np.isnan(self.score) | (self.score >= min_score)
+        for node_id in exclude_ids or ():
+            i = self._positions.get(node_id)
+            if i is not None:
+                keep[i] = False
+        return keep
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _box(self, x0: float, x1: float, y0: float, y1: float, mask: np.ndarray | None) -> np.ndarray:
+        """Positions in the grid cells overlapping [x0, x1] x [y0, y1]."""
+        if not self.size:
+            return np.empty(0, dtype=np.int64)
+        cx0 = max(int((x0 - self._x_min) // self.cell_m), 0)
+        cx1 = min(int((x1 - self._x_min) // self.cell_m), self._cols - 1)
+        cy0 = max(int((y0 - self._y_min) // self.cell_m), 0)
+        cy1 = min(int((y1 - self._y_min) // self.cell_m), self._rows - 1)
+        if cx0 > cx1 or cy0 > cy1:
+            return np.empty(0, dtype=np.int64)
+
+        columns = np.arange(cx0, cx1 + 1, dtype=np.int64) * self._rows
+        starts = np.searchsorted(self._sorted_keys, columns + cy0, side="left")
+        ends = np.searchsorted(self._sorted_keys, columns + cy1, side="right")
+        slices = [self._order[s:e] for s, e in zip(starts, ends) if e > s]
+        if not slices:
+            return np.empty(0, dtype=np.int64)
+        candidates = np.concatenate(slices).astype(np.int64)
+        keep = self.active[candidates] if mask is None else (self.active & mask)[candidates]
+        return candidates[keep]
+
+    def within(
+        self,
+        lat: float,
+        lon: float,
+        radius_m: float,
+        mask: np.ndarray | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """(positions, distances in metres) within ``radius_m``, nearest first."""
+        x, y = self.project(lat, lon)
+        half = radius_m * _BOX_SLACK + 1.0
+        candidates = self._box(float(x) - half, float(x) + half, float(y) - half, float(y) + half, mask)
+        dist = haversine_m(lat, lon, self.lat[candidates], self.lon[candidates])
+        inside = dist <= radius_m
+        candidates, dist = candidates[inside], dist[inside]
+        order = np.argsort(dist, kind="stable")
+        return candidates[order], dist[order]
+
+    def within_batch(
+        self,
+        lats: Sequence[float],
+        lons: Sequence[float],
+        radius_m: float,
+        mask: np.ndarray | None = None,
+    ) -> list[tuple[np.ndarray, np.ndarray]]:
+        """within() for many query points."""
+        return [self.within(lat, lon, radius_m, mask) for lat, lon in zip(lats, lons)]
+
+    def nearest(
+        self,
+        lat: float,
+        lon: float,
+        k: int,
+        mask: np.ndarray | None = None,
+        max_radius_m: float | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Up to ``k`` (positions, distances) nearest first, optionally capped in radius."""
+        if not self.size or k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        span = math.hypot(self._cols, self._rows) * self.cell_m
+        x, y = self.project(lat, lon)
+        # Radius that surely covers every node from this query point
+        limit = span + math.hypot(float(x) - self._x_min, float(y) - self._y_min) + self.cell_m
+        if max_radius_m is not None:
+            limit = min(limit, max_radius_m)
+
+        radius = min(self.cell_m, limit)
+        while True:
+            positions, dist = self.within(lat, lon, radius, mask)
+            if len(positions) >= k or radius >= limit:
+                return positions[:k], dist[:k]
+            radius = min(radius * 2.0, limit)
+
+    def along(
+        self,
+        origin_lat: float,
+        origin_lon: float,
+        destination_lat: float,
+        destination_lon: float,
+        buffer_m: float,
+        mask: np.ndarray | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        (positions, distances to the segment in metres) for nodes within
+        ``buffer_m`` of the straight line origin -> destination, in order of
+        distance from the line.
+        """
+        ax, ay = (float(v) for v in self.project(origin_lat, origin_lon))
+        bx, by = (float(v) for v in self.project(destination_lat, destination_lon))
+        half = buffer_m * _BOX_SLACK + 1.0
+        candidates = self._box(
+            min(ax, bx) - half, max(ax, bx) + half, min(ay, by) - half, max(ay, by) + half, mask
+        )
+        px = self.x[candidates].astype(np.float64)
+        py = self.y[candidates].astype(np.float64)
+        dx, dy = bx - ax, by - ay
+        length_sq = dx * dx + dy * dy
+        if length_sq > 0:
+            t = np.clip(((px - ax) * dx + (py - ay) * dy) / length_sq, 0.0, 1.0)
+        else:
+            t = np.zeros(len(candidates))
+        dist = np.hypot(px - (ax + t * dx), py - (ay + t * dy))
+        inside = dist <= buffer_m
+        candidates, dist = candidates[inside], dist[inside]
+        order = np.argsort(dist, kind="stable")
+        return candidates[order], dist[order]
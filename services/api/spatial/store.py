@@ -0,0 +1,191 @@
+"""
+Per-city CityIndex store — lazy load, refresh on re-sync, bounded memory.
+
+One process-wide LRU holds a CityIndex per city slug. CitySpatialIndexes
+wraps it with a database handle (and optionally Redis):
+
+  load      first get(city) runs one query for the city's canonical nodes
+            with coordinates; concurrent first calls share the load
+  refresh   an entry records the city's search generation (the Redis counter
+            bump_search_generation() increments after every Qdrant re-sync,
+            see generation/ranking_cache.py). The generation is re-read at
+            most every _GENERATION_CHECK_S; a newer one triggers a reload.
+            Without Redis, entries are rebuilt after _MAX_AGE_S.
+            invalidate_spatial_index(city) drops an entry in this process.
+  memory    entries are evicted least recently used once the summed
+            CityIndex.nbytes exceeds max_bytes
+
+Load failures are logged and get() returns None; callers fall back to
+PostGIS.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from services.api.generation.ranking_cache import city_key, search_generation_key
+from services.api.spatial.index import DEFAULT_CELL_M, CityIndex
+
+logger = logging.getLogger(__name__)
+
+# Default budget across all cities (~40 bytes + id and name strings per
+# node, roughly 150 bytes in all)
+SPATIAL_INDEX_MAX_BYTES = 256 * 1024 * 1024
+
+_GENERATION_CHECK_S = 30.0
+_MAX_AGE_S = 3600.0
+
+_LOAD_SQL = """
+SELECT id, name, latitude, longitude, category, "convergenceScore", status
+FROM activity_nodes
+WHERE city = $1
+  AND "isCanonical" = true
+  AND latitude IS NOT NULL
+  AND longitude IS NOT NULL
+"""
+
+
+@dataclass
+class _Entry:
+    index: CityIndex
+    generation: int
+    loaded_at: float
+    checked_at: float
+
+
+_indexes: OrderedDict[str, _Entry] = OrderedDict()
+_locks: dict[str, asyncio.Lock] = {}
+
+
+def clear_spatial_indexes() -> None:
+    """Drop every loaded city index in this process."""
+    _indexes.clear()
+    _locks.clear()
+
+
+def invalidate_spatial_index(city: str) -> None:
+    """Drop ``city``'s index so the next get() reloads it."""
+    _indexes.pop(city_key(city), None)
+
+
+def discard_node(node_id: str) -> None:
+    """Remove a node (e.g. merged away) from every loaded city index."""
+    for entry in _indexes.values():
+        entry.index.discard(node_id)
+
+
+def spatial_index_bytes() -> int:
+    """Memory held by loaded city indexes."""
+    return sum(entry.index.nbytes for entry in _indexes.values())
+
+
+class CitySpatialIndexes:
+    """
+    Lazy per-city CityIndex access.
+
+    Usage:
+        indexes = CitySpatialIndexes(db_pool, redis_client)
+        index = await indexes.get("Tokyo")
+        if index is not None:
+            positions, dist = index.within(35.68, 139.76, 50.0)
+    """
+
+    def __init__(
+        self,
+        db: Any,
+        redis_client: Any = None,
+        *,
+        max_bytes: int = SPATIAL_INDEX_MAX_BYTES,
+        cell_m: float = DEFAULT_CELL_M,
+    ) -> None:
+        self._db = db
+        self._redis = redis_client
+        self._max_bytes = max_bytes
+        self._cell_m = cell_m
+
+    async def get(self, city: str) -> CityIndex | None:
+        slug = city_key(city)
+        if not slug:
+            return None
+        entry = _indexes.get(slug)
+        if entry is not None and await self._is_current(slug, city, entry):
+            _indexes.move_to_end(slug)
+            return entry.index
+
+        lock = _locks.setdefault(slug, asyncio.Lock())
+        async with lock:
+            # Another caller may have reloaded while we waited
+            fresh = _indexes.get(slug)
+            if fresh is not None and fresh is not entry:
+                _indexes.move_to_end(slug)
+                return fresh.index
+            return await self._load(slug, city)
+
+    async def _is_current(self, slug: str, city: str, entry: _Entry) -> bool:
+        now = time.monotonic()
+        if self._redis is None:
+            return now - entry.loaded_at < _MAX_AGE_S
+        if now - entry.checked_at < _GENERATION_CHECK_S:
+            return True
+        generation = await self._generation(city)
+        if generation is None:
+            return True  # Redis unavailable: keep serving what we have
+        entry.checked_at = now
+        return generation == entry.generation
+
+    async def _generation(self, city: str) -> int | None:
+        if self._redis is None:
+            return 0
+        try:
+            return int(await self._redis.get(search_generation_key(city)) or 0)
+        except Exception:
+            logger.warning("spatial: generation read failed for city=%s", city, exc_info=True)
+            return None
+
+    async def _load(self, slug: str, city: str) -> CityIndex | None:
+        generation = await self._generation(city)
+        t0 = time.perf_counter()
+        try:
+            rows = await self._db.fetch(_LOAD_SQL, city)
+        except Exception:
+            logger.warning("spatial: node load failed for city=%s", city, exc_info=True)
+            return None
+
+        index = CityIndex(
+            [r["id"] for r in rows],
+            [r["latitude"] for r in rows],
+            [r["longitude"] for r in rows],
+            categories=[r["category"] for r in rows],
+            scores=[r["convergenceScore"] for r in rows],
+            approved=[r["status"] == "approved" for r in rows],
+            names=[r["name"] for r in rows],
+            cell_m=self._cell_m,
+        )
+        now = time.monotonic()
+        _indexes[slug] = _Entry(index=index, generation=generation or 0, loaded_at=now, checked_at=now)
+        _indexes.move_to_end(slug)
+        self._evict(keep=slug)
+
+        logger.info(
+            "spatial: loaded city=%s nodes=%d bytes=%d in %.1fms",
+            city,
+            index.size,
+            index.nbytes,
+            (time.perf_counter() - t0) * 1e3,
+        )
+        return index
+
+    def _evict(self, keep: str) -> None:
+        total = spatial_index_bytes()
+        while total > self._max_bytes and len(_indexes) > 1:
+            slug = next(iter(_indexes))
+            if slug == keep:
+                _indexes.move_to_end(slug)
+                continue
+            total -= _indexes.pop(slug).index.nbytes
+            logger.info("spatial: evicted city=%s (budget %d bytes)", slug, self._max_bytes)
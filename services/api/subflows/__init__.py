@@ -29,6 +29,7 @@ from services.api.subflows.slot_fitter import (
 from services.api.subflows.diversifier import (
     apply_mmr_diversification,
     generate_alternatives,
+    MMRIndex,
     DEFAULT_LAMBDA,
 )
 from services.api.subflows.split_detector import (
@@ -56,6 +57,7 @@ __all__ = [
     # diversifier
     "apply_mmr_diversification",
     "generate_alternatives",
+    "MMRIndex",
     "DEFAULT_LAMBDA",
     # split_detector
     "detect_group_split",
@@ -22,12 +22,16 @@ A combined score of:
 
 Design notes
 ------------
-- Pure functions — no I/O, no side effects.
+- No I/O, no side effects.
 - Lambda defaults to 0.6 (favours relevance slightly over diversity).
 - "relevance" is taken from the candidate's "score" or "convergenceScore"
   field. If neither is present, 0.5 is assumed.
 - Candidates must have an "id" field.
 - The functions operate on plain dicts — no ORM types.
+- Candidates are encoded once into an MMRIndex (relevance vector, boolean
+  vibe-tag matrix, pairwise similarity matrix); selection maintains a
+  running max-similarity vector with one vectorized update per pick.
+  Selection order is identical to the pairwise _similarity definition.
 """
 
 from __future__ import annotations
@@ -35,6 +39,8 @@ from __future__ import annotations
 import logging
 from typing import Any
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 # Default trade-off weight (higher = more relevance, lower = more diversity)
@@ -50,6 +56,116 @@ _VIBE_WEIGHT: float = 0.5
 # ---------------------------------------------------------------------------
 
 
+class MMRIndex:
+    """
+    Candidates encoded once for repeated MMR selection.
+
+    Holds the relevance vector, category codes and a boolean vibe-tag
+    matrix. select() keeps a running max-similarity vector and updates it
+    with one np.maximum per pick against the picked candidate's similarity
+    row (category equality + vibe Jaccard against every candidate), so a
+    selection is O(k * n) array work instead of O(k^2 * n) _similarity
+    calls. Rows are computed on first use and memoized on the index.
+
+    Build one per candidate pool and reuse it: generate_alternatives runs
+    every slot's selection against the same index, and accepts a prebuilt
+    index so repeated calls over one pool share its memoized rows.
+    """
+
+    def __init__(self, candidates: list[dict]) -> None:
+        self.candidates: list[dict] = list(candidates)
+        n = len(self.candidates)
+
+        self.relevance = np.fromiter(
+            (_get_relevance(c) for c in self.candidates), dtype=np.float64, count=n
+        )
+
+        category_codes: dict[str, int] = {}
+        tag_codes: dict[str, int] = {}
+        self._categories = np.full(n, -1, dtype=np.int64)
+        rows: list[int] = []
+        cols: list[int] = []
+        for i, candidate in enumerate(self.candidates):
+            category = _get_category(candidate)
+            if category:
+                self._categories[i] = category_codes.setdefault(category, len(category_codes))
+            for slug in _get_vibe_slugs(candidate):
+                rows.append(i)
+                cols.append(tag_codes.setdefault(slug, len(tag_codes)))
+
+        self._tags = np.zeros((n, len(tag_codes)), dtype=np.float64)
+        self._tags[rows, cols] = 1.0
+        self._tag_counts = self._tags.sum(axis=1)
+
+        self._ids = [c.get("id") for c in self.candidates]
+        self._rows: dict[int, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.candidates)
+
+    def similarity_row(self, i: int) -> np.ndarray:
+        """_similarity between candidate ``i`` and every candidate, as a vector."""
+        row = self._rows.get(i)
+        if row is None:
+            same_category = (self._categories == self._categories[i]) & (self._categories[i] >= 0)
+            intersection = self._tags @ self._tags[i]
+            union = self._tag_counts + self._tag_counts[i] - intersection
+            # union == 0 only for two tagless candidates, where intersection is 0 too
+            jaccard = intersection / np.maximum(union, 1.0)
+            row = _CATEGORY_WEIGHT * same_category + _VIBE_WEIGHT * jaccard
+            self._rows[i] = row
+        return row
+
+    def excluding_id(self, candidate_id: Any) -> np.ndarray:
+        """Boolean mask of the positions whose "id" equals ``candidate_id``."""
+        return np.fromiter(
+            (cid == candidate_id for cid in self._ids), dtype=bool, count=len(self._ids)
+        )
+
+    def select(
+        self,
+        num_select: int,
+        lambda_param: float = DEFAULT_LAMBDA,
+        exclude: np.ndarray | None = None,
+    ) -> list[int]:
+        """
+        Indices of up to ``num_select`` candidates in MMR-selected order.
+
+        ``exclude`` is an optional boolean mask of candidates to leave out of
+        the pool entirely. Ties resolve to the earliest candidate, as in a
+        left-to-right scan of the input list.
+        """
+        available = np.ones(len(self.candidates), dtype=bool)
+        if exclude is not None:
+            available &= ~exclude
+        num_select = min(num_select, int(available.sum()))
+        if num_select <= 0:
+            return []
+
+        # First selection: pure relevance
+        scores = np.where(available, self.relevance, -np.inf)
+        first = int(np.argmax(scores))
+        if scores[first] == -np.inf:
+            return []
+        selected = [first]
+        available[first] = False
+        max_sim = self.similarity_row(first).copy()
+
+        relevance_term = lambda_param * self.relevance
+        diversity_weight = 1 - lambda_param
+        while len(selected) < num_select:
+            scores = relevance_term - diversity_weight * max_sim
+            scores[~available] = -np.inf
+            best = int(np.argmax(scores))
+            if scores[best] == -np.inf:
+                break
+            selected.append(best)
+            available[best] = False
+            np.maximum(max_sim, self.similarity_row(best), out=max_sim)
+
+        return selected
+
+
 def apply_mmr_diversification(
     candidates: list[dict],
     num_select: int,
@@ -73,45 +189,11 @@ def apply_mmr_diversification(
         A new list of up to ``num_select`` candidates in MMR-selected order.
         The original list is not mutated.
     """
-    if not candidates:
-        return []
-
-    num_select = min(num_select, len(candidates))
-
-    if num_select <= 0:
+    if not candidates or num_select <= 0:
         return []
 
-    # Work with copies to avoid mutating the caller's list
-    pool: list[dict] = list(candidates)
-    selected: list[dict] = []
-
-    while len(selected) < num_select and pool:
-        best_idx: int | None = None
-        best_mmr: float = float("-inf")
-
-        for i, candidate in enumerate(pool):
-            relevance = _get_relevance(candidate)
-
-            if not selected:
-                # First selection: pure relevance
-                mmr_score = relevance
-            else:
-                max_sim = max(
-                    _similarity(candidate, s) for s in selected
-                )
-                mmr_score = (
-                    lambda_param * relevance - (1 - lambda_param) * max_sim
-                )
-
-            if mmr_score > best_mmr:
-                best_mmr = mmr_score
-                best_idx = i
-
-        if best_idx is None:
-            break
-
-        chosen = pool.pop(best_idx)
-        selected.append(chosen)
+    index = MMRIndex(candidates)
+    selected = [index.candidates[i] for i in index.select(num_select, lambda_param)]
 
     logger.debug(
         "MMR selected %d/%d candidates (lambda=%.2f)",
@@ -127,6 +209,7 @@ def generate_alternatives(
     selected: list[dict],
     remaining: list[dict],
     num_alternatives: int = 3,
+    index: MMRIndex | None = None,
 ) -> list[list[dict]]:
     """
     For each selected candidate, generate a list of diverse alternatives
@@ -137,11 +220,17 @@ def generate_alternatives(
     baseline — so the alternatives are diverse relative to each other
     rather than relative to the selected slot.
 
+    ``remaining`` is encoded into a single MMRIndex shared by every slot;
+    slots that exclude the same candidates reuse the same selection. Pass
+    ``index`` (built from this same ``remaining`` list) to skip the encode
+    when generating alternatives for the same pool more than once.
+
     Args:
         selected:         Candidates that have already been chosen for slots.
         remaining:        Pool of candidates not yet placed in any slot.
         num_alternatives: How many alternatives to generate per slot.
                           Default: 3.
+        index:            Optional prebuilt MMRIndex over ``remaining``.
 
     Returns:
         A list of length ``len(selected)``. Each element is a list of up to
@@ -151,23 +240,28 @@ def generate_alternatives(
     if not selected or not remaining:
         return [[] for _ in selected]
 
+    if index is None:
+        index = MMRIndex(remaining)
+    elif len(index) != len(remaining):
+        raise ValueError(
+            f"index covers {len(index)} candidates but remaining has {len(remaining)}"
+        )
+    by_exclusion: dict[bytes, list[dict]] = {}
     alternatives: list[list[dict]] = []
 
     for slot_candidate in selected:
-        # Build a mini-pool: exclude the slot_candidate itself from remaining
-        slot_id = slot_candidate.get("id")
-        mini_pool = [c for c in remaining if c.get("id") != slot_id]
-
-        # Score the mini-pool: maximize similarity to slot_candidate
-        # (we want alternatives that are similar in purpose but different
-        # enough from each other — MMR within the alternatives pool)
-        alts = apply_mmr_diversification(
-            candidates=mini_pool,
-            num_select=num_alternatives,
-            lambda_param=0.5,  # equal weight diversity vs relevance for alts
-        )
-
-        alternatives.append(alts)
+        # Exclude the slot_candidate itself from remaining, then MMR within
+        # the alternatives pool (equal weight diversity vs relevance for alts)
+        exclude = index.excluding_id(slot_candidate.get("id"))
+        key = np.packbits(exclude).tobytes()
+        alts = by_exclusion.get(key)
+        if alts is None:
+            alts = [
+                index.candidates[i]
+                for i in index.select(num_alternatives, lambda_param=0.5, exclude=exclude)
+            ]
+            by_exclusion[key] = alts
+        alternatives.append(list(alts))
 
     return alternatives
 
@@ -24,6 +24,7 @@ os.environ.setdefault("REDIS_URL", "redis://localhost:26379/0")
 os.environ.setdefault("QDRANT_URL", "http://localhost:26333")
 os.environ.setdefault("QDRANT_API_KEY", "")
 os.environ.setdefault("SENTRY_DSN", "")
+os.environ.setdefault("LLM_CACHE_DISABLED", "1")
 
 
 # ---------------------------------------------------------------------------
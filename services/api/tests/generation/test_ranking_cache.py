@@ -0,0 +1,194 @@
+"""
+Ranking cache tests.
+
+Validates:
+  - Persona signature / candidate fingerprint normalization
+  - Cache hits skip the Sonnet call; logMeta records tier and saved cost
+  - L2 (Redis) entries survive an L1 reset (another process)
+  - bump_search_generation invalidates a city's rankings
+  - Redis failures degrade to a miss
+"""
+
+from __future__ import annotations
+
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from services.api.generation.ranker import rank_candidates_with_llm
+from services.api.generation.ranking_cache import (
+    RankingCache,
+    bump_search_generation,
+    candidate_fingerprint,
+    clear_ranking_cache,
+    persona_signature,
+    search_generation_key,
+)
+
+PERSONA = {"vibes": ["hidden-gem", "street-food"], "pace": "moderate", "budget": "mid"}
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.store: dict[str, str] = {}
+        self.ttls: dict[str, int] = {}
+
+    def pipeline(self, transaction: bool = True) -> "FakePipeline":
+        return FakePipeline(self)
+
+    async def set(self, key, value, ex=None):
+        self.store[key] = value
+        self.ttls[key] = ex
+
+    async def incr(self, key):
+        self.store[key] = str(int(self.store.get(key, 0)) + 1)
+        return int(self.store[key])
+
+
+class FakePipeline:
+    def __init__(self, redis: FakeRedis) -> None:
+        self._redis = redis
+        self._keys: list[str] = []
+
+    def get(self, key):
+        self._keys.append(key)
+
+    async def execute(self):
+        return [self._redis.store.get(k) for k in self._keys]
+
+
+@pytest.fixture(autouse=True)
+def _clean_cache():
+    clear_ranking_cache()
+    yield
+    clear_ranking_cache()
+
+
+@pytest.fixture
+def candidates() -> list[dict]:
+    return [
+        {"id": f"node-{i}", "name": f"Venue {i}", "category": "culture", "convergenceScore": 0.5 + i / 10}
+        for i in range(4)
+    ]
+
+
+@pytest.fixture
+def client(candidates):
+    ranked = [
+        {"id": c["id"], "rank": i + 1, "slotType": "flex", "reasoning": "fits"}
+        for i, c in enumerate(candidates)
+    ]
+    response = MagicMock()
+    response.content = [MagicMock(text=json.dumps({"ranked": ranked}))]
+    response.usage = MagicMock(input_tokens=500, output_tokens=200)
+    client = MagicMock()
+    client.messages.create = AsyncMock(return_value=response)
+    return client
+
+
+async def _rank(client, candidates, cache, persona=PERSONA, city="Tokyo"):
+    return await rank_candidates_with_llm(
+        persona_seed=persona,
+        candidates=candidates,
+        anthropic_client=client,
+        cache=cache,
+        city=city,
+    )
+
+
+# ===========================================================================
+# Keys
+# ===========================================================================
+
+class TestKeys:
+    def test_persona_signature_is_normalized(self):
+        a = persona_signature({"vibes": ["Street-Food", "hidden-gem", "hidden-gem"]})
+        b = persona_signature({"vibes": ["hidden-gem", "street-food"], "pace": "moderate", "budget": "mid"})
+        assert a == b
+
+    def test_fingerprint_ignores_order_but_not_scores(self, candidates):
+        assert candidate_fingerprint(candidates) == candidate_fingerprint(candidates[::-1])
+        changed = [dict(c) for c in candidates]
+        changed[0]["convergenceScore"] = 0.99
+        assert candidate_fingerprint(changed) != candidate_fingerprint(candidates)
+
+    def test_generation_key_uses_city_slug(self):
+        assert search_generation_key("New York") == "search:generation:new-york"
+
+
+# ===========================================================================
+# Ranking through the cache
+# ===========================================================================
+
+class TestRankingCache:
+    @pytest.mark.asyncio
+    async def test_hit_skips_sonnet(self, client, candidates):
+        cache = RankingCache(FakeRedis())
+        first, first_meta = await _rank(client, candidates, cache)
+        second, second_meta = await _rank(client, candidates[::-1], cache)
+
+        assert client.messages.create.await_count == 1
+        assert first_meta["cache"] == "miss"
+        assert second_meta["cache"] == "memory"
+        assert second_meta["inputTokens"] == 0
+        assert second_meta["cacheSavedUsd"] == pytest.approx(500 * 3e-6 + 200 * 15e-6)
+        assert [m["id"] for m in second] == [m["id"] for m in first]
+
+    @pytest.mark.asyncio
+    async def test_same_archetype_different_user_hits(self, client, candidates):
+        cache = RankingCache(FakeRedis())
+        await _rank(client, candidates, cache)
+        reordered = {"budget": "MID", "vibes": ["street-food", "Hidden-Gem"]}
+        _, meta = await _rank(client, candidates, cache, persona=reordered)
+        assert meta["cache"] == "memory"
+
+    @pytest.mark.asyncio
+    async def test_redis_tier_serves_other_processes(self, client, candidates):
+        redis = FakeRedis()
+        await _rank(client, candidates, RankingCache(redis))
+        clear_ranking_cache()  # fresh process, shared Redis
+
+        _, meta = await _rank(client, candidates, RankingCache(redis))
+        assert meta["cache"] == "redis"
+        assert client.messages.create.await_count == 1
+        assert set(redis.ttls.values()) == {24 * 3600}
+
+    @pytest.mark.asyncio
+    async def test_generation_bump_invalidates_city(self, client, candidates):
+        redis = FakeRedis()
+        cache = RankingCache(redis)
+        await _rank(client, candidates, cache)
+        await _rank(client, candidates, cache, city="Kyoto")
+
+        assert await bump_search_generation(redis, "tokyo") == 1
+
+        _, tokyo = await _rank(client, candidates, cache)
+        _, kyoto = await _rank(client, candidates, cache, city="Kyoto")
+        assert tokyo["cache"] == "miss"
+        assert kyoto["cache"] == "memory"
+        assert client.messages.create.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_prompt_version_is_part_of_key(self, client, candidates, monkeypatch):
+        cache = RankingCache(FakeRedis())
+        await _rank(client, candidates, cache)
+        monkeypatch.setattr("services.api.generation.ranker.RANKER_PROMPT_VERSION", "ranker-v9")
+        _, meta = await _rank(client, candidates, cache)
+        assert meta["cache"] == "miss"
+
+    @pytest.mark.asyncio
+    async def test_redis_failure_is_a_miss(self, client, candidates):
+        redis = MagicMock()
+        redis.pipeline.side_effect = ConnectionError("down")
+        redis.set = AsyncMock(side_effect=ConnectionError("down"))
+        cache = RankingCache(redis)
+
+        _, meta = await _rank(client, candidates, cache)
+        assert meta["cache"] == "miss"
+        assert cache.stats.misses == 1
+
+    @pytest.mark.asyncio
+    async def test_no_cache_leaves_log_meta_unchanged(self, client, candidates):
+        _, meta = await _rank(client, candidates, None)
+        assert "cache" not in meta
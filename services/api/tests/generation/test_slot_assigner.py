@@ -0,0 +1,144 @@
+"""
+Slot assigner tests.
+
+Validates:
+  - _DayIntervals: bisect conflict lookup and sorted inserts
+  - Anchors from 10:00, meals in the lunch/dinner windows, flex in gaps
+  - Blocked flex probes move past the blocking interval
+  - assign_slots_batch matches per-trip assign_slots
+  - Random pools: no overlaps, meals at 12:00/19:00, chronological order
+"""
+
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from services.api.generation.slot_assigner import (
+    DAY_START_HOUR,
+    DINNER_START,
+    LUNCH_START,
+    TripSlotRequest,
+    _DayIntervals,
+    assign_slots,
+    assign_slots_batch,
+)
+
+START = datetime(2026, 5, 1, 15, 30, tzinfo=timezone.utc)
+
+
+def _pool(spec: list[tuple[str, str]]) -> tuple[list[dict], list[dict]]:
+    """spec: (category, slotType) per node, best first."""
+    nodes = [{"id": f"n{i}", "category": cat} for i, (cat, _) in enumerate(spec)]
+    meta = [
+        {"id": f"n{i}", "rank": i + 1, "slotType": slot_type}
+        for i, (_, slot_type) in enumerate(spec)
+    ]
+    return nodes, meta
+
+
+def _hm(dt: datetime) -> str:
+    return dt.strftime("%H:%M")
+
+
+class TestDayIntervals:
+    def test_conflict_and_reserve(self):
+        day = _DayIntervals()
+        day.reserve(600, 690)
+        day.reserve(720, 780)
+        day.reserve(540, 600)
+        assert day.starts == [540, 600, 720]
+        assert day.conflict(690, 720) is None
+        assert day.conflict(650, 700) == 690       # overlaps the interval before
+        assert day.conflict(700, 730) == 780       # overlaps the interval after
+        assert day.conflict(780, 840) is None      # touching end is free
+
+
+class TestAssignSlots:
+    def test_anchor_meal_flex_layout(self):
+        nodes, meta = _pool([
+            ("culture", "anchor"),
+            ("dining", "meal"),
+            ("outdoors", "flex"),
+            ("dining", "meal"),
+            ("shopping", "flex"),
+        ])
+        slots = assign_slots(nodes, meta, START, num_days=1)
+
+        layout = [(s.activity_node_id, s.slot_type, _hm(s.start_time), _hm(s.end_time)) for s in slots]
+        # Flex goes in rank order: n2 (2h) does not fit before the anchor,
+        # so it lands after lunch and n4 follows it.
+        assert layout == [
+            ("n0", "anchor", "10:00", "11:30"),
+            ("n1", "meal", "12:00", "13:00"),
+            ("n2", "flex", "13:00", "15:00"),
+            ("n4", "flex", "15:00", "16:00"),
+            ("n3", "meal", "19:00", "20:00"),
+        ]
+        assert [s.sort_order for s in slots] == [1, 2, 3, 4, 5]
+        assert all(s.start_time.date() == START.date() for s in slots)
+
+    def test_flex_skips_past_blocking_interval(self):
+        # The anchor holds 10:00-12:00, so a 2h flex cannot start at 09:00,
+        # 10:00 or 11:00; lunch holds 12:00-13:00. First fit is 13:00.
+        nodes, meta = _pool([("outdoors", "anchor"), ("dining", "meal"), ("outdoors", "flex")])
+        slots = assign_slots(nodes, meta, START, num_days=1)
+        flex = next(s for s in slots if s.slot_type == "flex")
+        assert _hm(flex.start_time) == "13:00"
+
+    def test_anchors_spread_across_days(self):
+        nodes, meta = _pool([("culture", "anchor")] * 4)
+        slots = assign_slots(nodes, meta, START, num_days=2)
+        assert [(s.activity_node_id, s.day_number) for s in slots] == [
+            ("n0", 1), ("n2", 1), ("n1", 2), ("n3", 2),
+        ]
+
+    def test_unknown_meta_ids_are_ignored(self):
+        nodes, meta = _pool([("culture", "anchor")])
+        meta.append({"id": "missing", "rank": 2, "slotType": "flex"})
+        assert [s.activity_node_id for s in assign_slots(nodes, meta, START, 1)] == ["n0"]
+
+
+class TestBatch:
+    def test_batch_matches_single_trip_calls(self):
+        trips = []
+        for days in (1, 3, 5):
+            nodes, meta = _pool([
+                ("culture", "anchor"), ("dining", "meal"), ("outdoors", "flex"),
+                ("wellness", "flex"), ("drinks", "meal"), ("experience", "anchor"),
+            ] * days)
+            trips.append(TripSlotRequest(nodes, meta, START, days))
+
+        batched = assign_slots_batch(trips)
+        for trip, result in zip(trips, batched):
+            single = assign_slots(trip.ranked_nodes, trip.ranked_meta, trip.trip_start_date, trip.num_days)
+            assert result == single
+
+
+class TestRandomPools:
+    @pytest.mark.parametrize("num_days", [1, 2, 7, 14])
+    def test_layout_invariants(self, num_days):
+        rng = random.Random(num_days)
+        categories = ["culture", "dining", "outdoors", "shopping", "wellness", "drinks", "experience"]
+        nodes, meta = _pool([
+            (rng.choice(categories), rng.choice(["anchor", "meal", "flex"]))
+            for _ in range(num_days * 8)
+        ])
+        slots = assign_slots(nodes, meta, START, num_days)
+
+        assert slots
+        assert len({s.activity_node_id for s in slots}) == len(slots)
+        meal_starts = {_hm(START.replace(hour=h, minute=m)) for h, m in (LUNCH_START, DINNER_START)}
+        for day in range(1, num_days + 1):
+            day_slots = [s for s in slots if s.day_number == day]
+            assert [s.sort_order for s in day_slots] == list(range(1, len(day_slots) + 1))
+            for prev, cur in zip(day_slots, day_slots[1:]):
+                assert prev.end_time <= cur.start_time
+            for s in day_slots:
+                assert s.start_time.date() == (START + timedelta(days=day - 1)).date()
+                assert s.start_time.hour >= DAY_START_HOUR
+                assert s.end_time - s.start_time == timedelta(minutes=s.duration_minutes)
+                if s.slot_type == "meal":
+                    assert _hm(s.start_time) in meal_starts
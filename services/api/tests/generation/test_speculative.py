@@ -0,0 +1,338 @@
+"""
+Speculative generation tests.
+
+Validates:
+  - run_speculative: LLM inside budget wins, slow LLM serves deterministic
+    with the task still pending, LLM errors fall back without a pending task
+  - The pending LLM task is cancelled if generation fails before handing it off
+  - GenerationEngine: deterministic slots written immediately, rewritten in
+    place when the LLM lands, left alone once the traveler touched a slot
+  - Both rankings logged as a ranking_shadow_compared RawEvent
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import anthropic
+import pytest
+
+from services.api.generation.engine import GenerationEngine
+from services.api.generation.fallbacks import run_speculative
+from services.api.tests.conftest import make_activity_node
+
+START = datetime(2026, 5, 1, tzinfo=timezone.utc)
+END = datetime(2026, 5, 2, tzinfo=timezone.utc)
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def candidates() -> list[dict]:
+    return [
+        make_activity_node(
+            id=f"node-{i:03d}",
+            category=cat,
+            convergenceScore=0.9 - i * 0.1,
+            authorityScore=0.5,
+        )
+        for i, cat in enumerate(["culture", "dining", "outdoors", "dining", "experience", "shopping"])
+    ]
+
+
+def _anthropic(candidates: list[dict], delay: float = 0.0, exc: Exception | None = None):
+    """Anthropic client whose ranking reverses the candidate order."""
+    ranked = [
+        {
+            "id": c["id"],
+            "rank": i + 1,
+            "slotType": "meal" if c["category"] == "dining" else "flex",
+            "reasoning": "llm",
+        }
+        for i, c in enumerate(reversed(candidates))
+    ]
+    response = MagicMock()
+    response.content = [MagicMock(text=json.dumps({"ranked": ranked}))]
+    response.usage = MagicMock(input_tokens=500, output_tokens=200)
+
+    async def create(**kwargs):
+        await asyncio.sleep(delay)
+        if exc is not None:
+            raise exc
+        return response
+
+    client = MagicMock()
+    client.messages.create = create
+    return client
+
+
+def _cancellable_anthropic(cancelled: asyncio.Event):
+    """Anthropic client whose call never returns and records its cancellation."""
+    async def create(**kwargs):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    client = MagicMock()
+    client.messages.create = create
+    return client
+
+
+def _search(candidates: list[dict]):
+    search = AsyncMock()
+    search.search = AsyncMock(return_value={"results": candidates, "count": len(candidates)})
+    return search
+
+
+@pytest.fixture
+def db():
+    db = AsyncMock()
+    db.transaction = MagicMock(return_value=AsyncMock(
+        __aenter__=AsyncMock(),
+        __aexit__=AsyncMock(),
+    ))
+    db.execute = AsyncMock(return_value=None)
+    db.executemany = AsyncMock(return_value=None)
+    db.fetch = AsyncMock(return_value=[])
+    db.fetchrow = AsyncMock(return_value=None)
+    db.acquire = MagicMock(side_effect=RuntimeError("no cantMiss lookups in these tests"))
+    return db
+
+
+def _raw_event_payloads(db, event_type: str) -> list[dict]:
+    return [
+        json.loads(call.args[-1])
+        for call in db.execute.call_args_list
+        if f"'{event_type}'" in call.args[0]
+    ]
+
+
+async def _generate(engine: GenerationEngine) -> dict:
+    return await engine.generate(
+        trip_id="trip-1",
+        user_id="user-1",
+        city="tokyo",
+        persona_seed={"vibes": [], "pace": "moderate", "budget": "mid"},
+        start_date=START,
+        end_date=END,
+    )
+
+
+# ===========================================================================
+# run_speculative
+# ===========================================================================
+
+class TestRunSpeculative:
+    @pytest.mark.asyncio
+    async def test_llm_within_budget_is_served(self, candidates):
+        result = await run_speculative(
+            candidates=candidates,
+            persona_seed={},
+            city="tokyo",
+            anthropic_client=_anthropic(candidates),
+            db=None,
+            budget_s=1.0,
+        )
+        assert result.generation_method == "llm"
+        assert result.pending_llm is None
+        assert result.ranked_meta[0]["id"] == "node-005"
+        assert result.deterministic_meta[0]["id"] == "node-000"
+
+    @pytest.mark.asyncio
+    async def test_slow_llm_serves_deterministic(self, candidates):
+        result = await run_speculative(
+            candidates=candidates,
+            persona_seed={},
+            city="tokyo",
+            anthropic_client=_anthropic(candidates, delay=0.2),
+            db=None,
+            budget_s=0.01,
+        )
+        assert result.generation_method == "deterministic_fallback"
+        assert result.ranked_meta == result.deterministic_meta
+        assert result.log_meta["llmPending"] is True
+        ranked, _ = await result.pending_llm
+        assert ranked[0]["id"] == "node-005"
+
+    @pytest.mark.asyncio
+    async def test_llm_error_inside_budget(self, candidates):
+        result = await run_speculative(
+            candidates=candidates,
+            persona_seed={},
+            city="tokyo",
+            anthropic_client=_anthropic(candidates, exc=ValueError("bad json")),
+            db=None,
+            budget_s=1.0,
+        )
+        assert result.generation_method == "deterministic_fallback"
+        assert result.pending_llm is None
+
+    @pytest.mark.asyncio
+    async def test_deterministic_failure_cancels_llm_task(self, candidates, monkeypatch):
+        from services.api.generation import fallbacks
+
+        llm_tasks: list[asyncio.Task] = []
+
+        def boom(*args, **kwargs):
+            llm_tasks.extend(
+                t for t in asyncio.all_tasks() if t.get_name() == "speculative-llm-rank-tokyo"
+            )
+            raise RuntimeError("bad persona")
+
+        monkeypatch.setattr(fallbacks, "_deterministic_rank", boom)
+        with pytest.raises(RuntimeError, match="bad persona"):
+            await run_speculative(
+                candidates=candidates,
+                persona_seed={},
+                city="tokyo",
+                anthropic_client=_cancellable_anthropic(asyncio.Event()),
+                db=None,
+                budget_s=1.0,
+            )
+        [llm_task] = llm_tasks
+        await asyncio.gather(llm_task, return_exceptions=True)
+        assert llm_task.cancelled()
+
+    @pytest.mark.asyncio
+    async def test_too_few_candidates_skips_llm(self, candidates):
+        client = _anthropic(candidates)
+        client.messages.create = AsyncMock()
+        result = await run_speculative(
+            candidates=candidates[:2],
+            persona_seed={},
+            city="tokyo",
+            anthropic_client=client,
+            db=None,
+        )
+        assert result.generation_method == "deterministic_fallback"
+        client.messages.create.assert_not_called()
+
+
+# ===========================================================================
+# GenerationEngine
+# ===========================================================================
+
+class TestSpeculativeEngine:
+    @pytest.mark.asyncio
+    async def test_upgrade_rewrites_slots_in_place(self, candidates, db):
+        engine = GenerationEngine(
+            _search(candidates), _anthropic(candidates, delay=0.05), db,
+            speculative_budget_s=0.01,
+        )
+        summary = await _generate(engine)
+        assert summary["generationMethod"] == "deterministic_fallback"
+        assert summary["upgradePending"] is True
+        slots_written = summary["slotsCreated"]
+        assert slots_written > 0
+
+        # Every written slot is still untouched when the LLM lands
+        written = [
+            call.args for call in db.execute.call_args_list
+            if "INSERT INTO itinerary_slots" in call.args[0]
+        ]
+        db.fetch.return_value = [
+            {"id": args[1], "dayNumber": args[4], "sortOrder": args[5],
+             "status": "proposed", "isLocked": False, "wasSwapped": False}
+            for args in written
+        ]
+        db.execute.reset_mock()
+
+        await _drain_upgrade()
+
+        update_calls = [
+            call for call in db.executemany.call_args_list
+            if "UPDATE itinerary_slots" in call.args[0]
+        ]
+        assert update_calls
+        updated_ids = {row[0] for call in update_calls for row in call.args[1]}
+        assert updated_ids <= {args[1] for args in written}
+
+        methods = [
+            call.args[1] for call in db.execute.call_args_list
+            if "generationMethod" in call.args[0]
+        ]
+        assert methods == ["llm"]
+
+        [comparison] = _raw_event_payloads(db, "ranking_shadow_compared")
+        assert comparison["upgraded"] is True
+        assert comparison["servedMethod"] == "deterministic_fallback"
+        assert comparison["llmRankedIds"][0] == "node-005"
+        assert comparison["deterministicRankedIds"][0] == "node-000"
+
+    @pytest.mark.asyncio
+    async def test_touched_slots_are_not_upgraded(self, candidates, db):
+        db.fetch.return_value = [
+            {"id": "slot-1", "dayNumber": 1, "sortOrder": 1,
+             "status": "confirmed", "isLocked": False, "wasSwapped": False},
+        ]
+        engine = GenerationEngine(
+            _search(candidates), _anthropic(candidates, delay=0.05), db,
+            speculative_budget_s=0.01,
+        )
+        await _generate(engine)
+        await _drain_upgrade()
+
+        db.executemany.assert_not_called()
+        [comparison] = _raw_event_payloads(db, "ranking_shadow_compared")
+        assert comparison["upgraded"] is False
+        assert comparison["llmRankedIds"][0] == "node-005"
+
+    @pytest.mark.asyncio
+    async def test_llm_within_budget_logs_shadow_deterministic(self, candidates, db):
+        engine = GenerationEngine(
+            _search(candidates), _anthropic(candidates), db, speculative_budget_s=1.0,
+        )
+        summary = await _generate(engine)
+        assert summary["generationMethod"] == "llm"
+        assert summary["upgradePending"] is False
+
+        [comparison] = _raw_event_payloads(db, "ranking_shadow_compared")
+        assert comparison["servedMethod"] == "llm"
+        assert comparison["deterministicRankedIds"][0] == "node-000"
+
+    @pytest.mark.asyncio
+    async def test_generate_failure_cancels_pending_llm(self, candidates, db):
+        cancelled = asyncio.Event()
+        engine = GenerationEngine(
+            _search(candidates),
+            _cancellable_anthropic(cancelled),
+            db,
+            speculative_budget_s=0.01,
+        )
+        db.transaction.side_effect = ConnectionError("db gone")
+
+        with pytest.raises(ConnectionError):
+            await _generate(engine)
+        await asyncio.wait_for(cancelled.wait(), timeout=1.0)
+        await _drain_upgrade()
+
+    @pytest.mark.asyncio
+    async def test_llm_failure_after_budget_keeps_deterministic(self, candidates, db):
+        engine = GenerationEngine(
+            _search(candidates),
+            _anthropic(candidates, delay=0.05, exc=anthropic.APIConnectionError(request=MagicMock())),
+            db,
+            speculative_budget_s=0.01,
+        )
+        await _generate(engine)
+        await _drain_upgrade()
+
+        db.executemany.assert_not_called()
+        [comparison] = _raw_event_payloads(db, "ranking_shadow_compared")
+        assert comparison["llmRankedIds"] is None
+        assert comparison["llmLogMeta"] == {"error": "APIConnectionError"}
+
+
+async def _drain_upgrade() -> None:
+    """Wait for the engine's background upgrade tasks to finish."""
+    from services.api.generation.engine import _background_upgrades
+
+    while _background_upgrades:
+        await asyncio.gather(*list(_background_upgrades))
@@ -21,6 +21,7 @@ import pytest
 from services.api.generation.preference_merger import (
     merge_preferences,
     score_candidate_per_member,
+    score_candidates_matrix,
     MergedPreference,
 )
 from services.api.group.fairness import FairnessState, MemberDebt
@@ -250,6 +251,30 @@ class TestCandidateScoring:
         )
         assert scores["user-alice"] > scores["user-bob"]
 
+    def test_matrix_matches_per_candidate_scores(self, three_member_ids):
+        """score_candidates_matrix agrees with score_candidate_per_member cell by cell."""
+        seeds = [
+            {"vibes": ["hidden-gem", "food"], "budget": "budget"},
+            {"vibes": [], "budget": "splurge"},
+            {"vibes": ["beach"]},
+        ]
+        pool = [
+            {"id": "a", "vibeTags": [{"slug": "food"}, {"slug": "night"}], "priceLevel": 3},
+            {"id": "b", "vibeTags": [], "priceLevel": None},
+            {"id": "c", "vibeTags": [{"slug": "night"}, "bad-tag"], "priceLevel": 1},
+            {"id": "d", "vibeTags": [{"slug": "hidden-gem"}, {"slug": "food"}, {"slug": "beach"}]},
+        ]
+
+        matrix = score_candidates_matrix(pool, seeds)
+
+        assert matrix.shape == (4, 3)
+        for i, candidate in enumerate(pool):
+            expected = score_candidate_per_member(candidate, seeds, three_member_ids)
+            assert matrix[i].tolist() == pytest.approx([expected[m] for m in three_member_ids])
+
+    def test_matrix_empty_pool(self, three_member_seeds):
+        assert score_candidates_matrix([], three_member_seeds).shape == (0, 3)
+
 
 # ===========================================================================
 # Group slot schema
@@ -0,0 +1,161 @@
+"""
+Opening-hours compiler tests.
+
+Validates:
+  - Single ranges, split shifts, past-midnight closes (incl. Sunday -> Monday)
+  - "closed" / "open 24 hours" / unparseable days (known vs unknown)
+  - HoursIndex batch lookups match per-node state_at
+  - Zone-aware times are checked against the local weekday and clock
+  - compiled_hours caches per node and recompiles when updatedAt changes
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pytest
+
+from services.api.hours import (
+    HoursIndex,
+    clear_hours_cache,
+    compile_hours,
+    compiled_hours,
+    is_open,
+    open_state,
+)
+
+# 2026-02-16 is a Monday
+MON, TUE, FRI, SAT, SUN = (datetime(2026, 2, d) for d in (16, 17, 20, 21, 22))
+
+
+def _at(day: datetime, hhmm: str) -> datetime:
+    h, m = map(int, hhmm.split(":"))
+    return day.replace(hour=h, minute=m)
+
+
+@pytest.fixture(autouse=True)
+def _clean_cache():
+    clear_hours_cache()
+    yield
+    clear_hours_cache()
+
+
+class TestCompile:
+    def test_single_range(self):
+        week = compile_hours({"friday": "09:00-17:00"})
+        assert week.state_at(4, 9 * 60) is True
+        assert week.state_at(4, 17 * 60) is False       # close is exclusive
+        assert week.state_at(0, 12 * 60) is None        # Monday unknown
+
+    def test_split_shift(self):
+        week = compile_hours({"monday": "11:30-14:00, 17:00-22:00"})
+        assert week.state_at(0, 12 * 60) is True
+        assert week.state_at(0, 15 * 60) is False
+        assert week.state_at(0, 18 * 60) is True
+
+    def test_list_value(self):
+        week = compile_hours({"monday": ["08:00-10:00", "16:00-18:00"]})
+        assert week.intervals.tolist() == [[480, 600], [960, 1080]]
+
+    def test_past_midnight_spills_into_next_day(self):
+        week = compile_hours({"friday": "18:00-02:00"})
+        assert week.state_at(5, 60) is True             # Saturday 01:00
+        assert week.state_at(5, 3 * 60) is None         # Saturday otherwise unknown
+
+    def test_sunday_wraps_to_monday(self):
+        week = compile_hours({"sunday": "20:00-03:00", "monday": "closed"})
+        assert week.state_at(0, 2 * 60) is True
+        assert week.state_at(0, 4 * 60) is False
+
+    def test_midnight_close(self):
+        week = compile_hours({"tuesday": "09:00-00:00"})
+        assert week.state_at(1, 23 * 60 + 59) is True
+
+    def test_closed_and_always_open(self):
+        week = compile_hours({"monday": "Closed", "tuesday": "Open 24 hours"})
+        assert week.state_at(0, 12 * 60) is False
+        assert week.state_at(1, 3 * 60) is True
+
+    def test_unparseable_day_is_unknown(self):
+        week = compile_hours({"friday": "always open", "saturday": "00:00-00:00"})
+        assert week.known_days == 0
+        assert week.state_at(4, 12 * 60) is None
+
+    def test_json_string_and_empty(self):
+        assert compile_hours(json.dumps({"monday": "09:00-10:00"})).state_at(0, 570) is True
+        assert compile_hours(None) is None
+        assert compile_hours({}) is None
+        assert compile_hours("not json") is None
+
+
+class TestVectorized:
+    def test_index_matches_state_at(self):
+        nodes = [
+            {"id": "a", "hours": {"monday": "09:00-17:00", "saturday": "10:00-02:00"}},
+            {"id": "b", "hours": None},
+            {"id": "c", "hours": {"sunday": "22:00-04:00", "monday": "11:00-14:00, 18:00-23:00"}},
+        ]
+        times = [_at(day, hhmm) for day in (MON, SAT, SUN) for hhmm in ("01:00", "03:00", "12:00", "16:00", "23:00")]
+        positions = np.repeat(np.arange(len(nodes)), len(times))
+        local_times = times * len(nodes)
+
+        inside, known = HoursIndex(nodes).open_state(positions, local_times)
+
+        for pos, t, o, k in zip(positions, local_times, inside, known):
+            week = compile_hours(nodes[pos]["hours"])
+            state = week.state_at(t.weekday(), t.hour * 60 + t.minute) if week else None
+            assert (bool(o), bool(k)) == (state is True, state is not None), (nodes[pos]["id"], t)
+
+    def test_zone_aware_times_use_local_clock(self):
+        nodes = [
+            {"id": "a", "hours": {"monday": "09:30-17:00"}},
+            {"id": "b", "hours": {"tuesday": "09:30-17:00"}},
+        ]
+        tokyo = ZoneInfo("Asia/Tokyo")
+        # Tokyo is UTC+9: Sunday 23:59 UTC is Monday 08:59 local
+        times_utc = [
+            datetime(2026, 2, 15, 23, 59, tzinfo=timezone.utc),
+            datetime(2026, 2, 16, 0, 30, tzinfo=timezone.utc),
+            datetime(2026, 2, 16, 7, 59, tzinfo=timezone.utc),
+            datetime(2026, 2, 16, 8, 0, tzinfo=timezone.utc),
+        ]
+        positions = np.repeat(np.arange(len(nodes)), len(times_utc))
+
+        inside, known = HoursIndex(nodes).open_state(
+            positions, [t.astimezone(tokyo) for t in times_utc] * len(nodes)
+        )
+
+        assert inside.tolist() == [False, True, True, False] + [False] * 4
+        assert known.tolist() == [True] * 4 + [False] * 4
+
+    def test_is_open_treats_unknown_as_open(self):
+        nodes = [
+            {"id": "open", "hours": {"friday": "09:00-17:00"}},
+            {"id": "closed", "hours": {"friday": "18:00-23:00"}},
+            {"id": "unknown", "hours": {"monday": "09:00-17:00"}},
+        ]
+        assert is_open(nodes, _at(FRI, "12:00")).tolist() == [True, False, True]
+        inside, known = open_state(nodes, _at(FRI, "12:00"))
+        assert known.tolist() == [True, True, False]
+
+    def test_per_node_times(self):
+        nodes = [{"id": "a", "hours": {"tuesday": "09:00-10:00"}}] * 2
+        assert is_open(nodes, [_at(TUE, "09:30"), _at(TUE, "10:30")]).tolist() == [True, False]
+
+    def test_length_mismatch_raises(self):
+        with pytest.raises(ValueError):
+            is_open([{"id": "a", "hours": None}], [MON, TUE])
+
+
+class TestCache:
+    def test_recompiles_when_updated_at_changes(self):
+        node = {"id": "n1", "hours": {"monday": "09:00-10:00"}, "updatedAt": datetime(2026, 1, 1)}
+        first = compiled_hours(node)
+        assert compiled_hours(dict(node)) is first
+
+        changed = dict(node, hours={"monday": "closed"}, updatedAt=datetime(2026, 1, 2))
+        assert compiled_hours(changed) is not first
+        assert compiled_hours(changed).state_at(0, 570) is False
@@ -139,6 +139,28 @@ class TestScrubPii:
         assert "[PHONE]" in result
         assert "alice@test.com" not in result
 
+    @pytest.mark.parametrize("text,expected", [
+        # Phone runs first; SSN only sees what phone left behind
+        ("883-372974 0555", "883-[PHONE]"),
+        ("715 674030-9483 5455", "715 [PHONE] 5455"),
+        ("001-499577.1080@5", "001-[PHONE]@5"),
+        ("123-45-6789 555-867-5309", "[SSN] [PHONE]"),
+        ("ID 123 45 6789 0123 4567", "ID [SSN] 0123 4567"),
+        ("Reach 5551234567@example.com today", "Reach [PHONE]@example.com today"),
+        ("4111-1111-1111-1111", "[CARD]"),
+    ])
+    def test_overlapping_shapes_scrub_sequentially(self, text, expected):
+        assert _scrub_pii(text) == expected
+
+    def test_matches_pattern_by_pattern_substitution(self):
+        from services.api.import_pipeline.chatgpt_import import _PII_PATTERNS
+
+        text = "883-372974 0555, 8-265-773241-7887. and 4-6@460-618570-3518"
+        reference = text
+        for pattern, replacement in _PII_PATTERNS:
+            reference = pattern.sub(replacement, reference)
+        assert _scrub_pii(text) == reference
+
 
 # ---------------------------------------------------------------------------
 # Unit: _validate_zip_entry
@@ -10,6 +10,7 @@ Covers:
 - Min-signals cold-start guard
 - Audit logging
 - Date window
+- Version bump + Redis version stamp
 """
 
 from __future__ import annotations
@@ -278,6 +279,29 @@ class TestIdempotency:
         assert result["status"] == "success"
 
 
+class TestVersionStamp:
+    @pytest.mark.asyncio
+    async def test_updated_users_get_version_bump_and_stamp(self):
+        signals = [
+            _signal_row("u1", "slot_confirm", "restaurant"),
+            _signal_row("u1", "slot_confirm", "restaurant"),
+        ]
+        conn = _make_conn(signal_rows=signals, persona_rows=[])
+        conn.fetchval = AsyncMock(return_value=8)
+        redis = MagicMock()
+        redis.pipeline.return_value.execute = AsyncMock(return_value=[])
+
+        await run_persona_update(
+            _make_pool(conn), target_date=date(2026, 2, 24), redis_client=redis,
+        )
+
+        bump_sql, uid = conn.fetchval.call_args[0]
+        assert "SET version" in bump_sql and uid == "u1"
+        redis.pipeline.return_value.set.assert_called_once_with(
+            "persona_version:u1", 8, ex=24 * 3600,
+        )
+
+
 # ===========================================================================
 # 5. Category-to-dimension mapping
 # ===========================================================================
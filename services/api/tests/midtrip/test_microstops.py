@@ -9,16 +9,23 @@ Covers:
 - Node status filter: only 'active' nodes surface as micro-stops
 - Micro-stop does not fire during locked slots
 - Micro-stop slot has correct field values
+- MicroStopService: a whole trip in a constant number of DB round trips
+- MicroStopService: a bad segment is skipped without blocking the others
 """
 
 from __future__ import annotations
 
 import math
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone, timedelta
 from typing import Optional
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
+from services.api.microstops.service import MicroStopService
+from services.api.microstops.spatial import TransitPath, find_nodes_along_paths
+from services.api.spatial import CityIndex
 from services.api.tests.conftest import make_itinerary_slot, make_activity_node
 
 
@@ -267,3 +274,195 @@ class TestMicrostopSlotCreation:
         should_surface = not is_active_locked
         # locked_slot.isLocked=True, status=confirmed → suppress
         assert should_surface is False
+
+
+# ---------------------------------------------------------------------------
+# MicroStopService — batched round trips
+# ---------------------------------------------------------------------------
+
+class _FakeDB:
+    """Routes asyncpg calls by SQL shape and records each round trip."""
+
+    def __init__(self, segments: list[dict], scheduled: list[dict], candidates: list[dict]) -> None:
+        self.segments = segments
+        self.scheduled = scheduled
+        self.candidates = candidates
+        self.calls: list[tuple[str, tuple]] = []
+        self.in_transaction = False
+        self.transactional_writes = 0
+
+    @asynccontextmanager
+    async def transaction(self):
+        self.in_transaction = True
+        try:
+            yield
+        finally:
+            self.in_transaction = False
+
+    async def fetch(self, sql: str, *args):
+        self.calls.append((sql, args))
+        if "WINDOW day_order" in sql:
+            return self.segments
+        if "CROSS JOIN LATERAL" in sql:
+            return self.candidates
+        return self.scheduled
+
+    async def execute(self, sql: str, *args):
+        self.calls.append((sql, args))
+        self.transactional_writes += self.in_transaction
+        return "OK"
+
+
+def _segment_row(slot_id: str, day: int, sort_order: int, followed_by_flex: bool = False) -> dict:
+    return {
+        "slot_id": slot_id,
+        "dayNumber": day,
+        "sortOrder": sort_order,
+        "startTime": None,
+        "endTime": datetime(2026, 3, 1, 10, 0, tzinfo=timezone.utc),
+        "durationMinutes": 20,
+        "origin_node_id": f"{slot_id}-from",
+        "dest_node_id": f"{slot_id}-to",
+        "followed_by_flex": followed_by_flex,
+        "city": "Tokyo",
+        "origin_lat": 35.68,
+        "origin_lon": 139.71,
+        "dest_lat": 35.69,
+        "dest_lon": 139.70,
+    }
+
+
+def _candidate_row(idx: int, node_id: str, score: float) -> dict:
+    return {
+        "idx": idx,
+        "id": node_id,
+        "name": node_id.title(),
+        "latitude": 35.685,
+        "longitude": 139.705,
+        "category": "culture",
+        "priceLevel": None,
+        "convergenceScore": score,
+        "descriptionShort": None,
+        "primaryImageUrl": None,
+        "neighborhood": None,
+    }
+
+
+class TestMicroStopServiceBatch:
+    @pytest.mark.asyncio
+    async def test_trip_uses_constant_round_trips(self):
+        db = _FakeDB(
+            segments=[
+                _segment_row("t1", 1, 2),
+                _segment_row("t2", 1, 4),
+                _segment_row("t3", 1, 6, followed_by_flex=True),
+                _segment_row("t4", 2, 2),
+            ],
+            scheduled=[{"dayNumber": 1, "activityNodeId": "booked"}],
+            candidates=[
+                _candidate_row(1, "shrine", 0.9),
+                _candidate_row(2, "shrine", 0.9),   # taken by t1 on the same day
+                _candidate_row(2, "garden", 0.7),
+                _candidate_row(3, "shrine", 0.9),   # t4 is on day 2: reusable
+            ],
+        )
+
+        results = await MicroStopService(db).suggest_for_trip(trip_id="trip-1", user_id="u")
+
+        assert len(db.calls) == 5
+        assert [r.day_number for r in results] == [1, 2]
+        assert [r.transit_segments_evaluated for r in results] == [3, 1]
+        day1, day2 = results
+        assert [(i.inserted_after_slot_id, i.activity_node_id, i.sort_order) for i in day1.insertions] == [
+            ("t1", "shrine", 3),
+            ("t2", "garden", 6),  # t2 moved from 4 to 5 after t1's micro-stop
+        ]
+        assert [(i.activity_node_id, i.sort_order) for i in day2.insertions] == [("shrine", 3)]
+        assert day1.insertions[0].end_time - day1.insertions[0].start_time == timedelta(minutes=25)
+
+        # The flex-followed segment is not searched; exclusions are per path
+        spatial_sql, spatial_args = db.calls[2]
+        assert len(spatial_args[0]) == 3
+        excluded = set(zip(spatial_args[5], spatial_args[6]))
+        assert {(1, "booked"), (1, "t1-from"), (1, "t1-to"), (3, "t4-to")} <= excluded
+        assert (3, "booked") not in excluded
+
+        _, shift_args = db.calls[3]
+        assert shift_args == ("trip-1", [1, 1, 2], [2, 4, 2])
+        _, insert_args = db.calls[4]
+        assert insert_args[4] == [1, 1, 2]
+        assert insert_args[5] == [3, 6, 3]
+
+    @pytest.mark.asyncio
+    async def test_bad_segment_is_skipped(self):
+        bad = _segment_row("t2", 1, 4)
+        bad["origin_lat"] = float("nan")
+        db = _FakeDB(
+            segments=[_segment_row("t1", 1, 2), bad, _segment_row("t3", 2, 2)],
+            scheduled=[],
+            candidates=[
+                _candidate_row(1, "shrine", 0.9),
+                _candidate_row(2, "garden", 0.7),
+            ],
+        )
+
+        day1, day2 = await MicroStopService(db).suggest_for_trip(trip_id="trip-1", user_id="u")
+
+        assert [i.inserted_after_slot_id for i in day1.insertions] == ["t1"]
+        assert [i.inserted_after_slot_id for i in day2.insertions] == ["t3"]
+        assert len(day1.warnings) == 1 and day1.warnings[0].startswith("Segment t2 failed:")
+        assert day2.warnings == []
+        assert len(db.calls) == 5
+
+        # Only the valid segments are searched and written, in one transaction
+        _, spatial_args = db.calls[2]
+        assert len(spatial_args[0]) == 2
+        _, shift_args = db.calls[3]
+        assert shift_args == ("trip-1", [1, 2], [2, 2])
+        _, insert_args = db.calls[4]
+        assert insert_args[5] == [3, 3]
+        assert db.transactional_writes == 2
+
+    @pytest.mark.asyncio
+    async def test_city_index_skips_spatial_query(self):
+        index = CityIndex(
+            ["booked", "shrine"],
+            [35.685, 35.685],
+            [139.705, 139.705],
+            categories=["culture", "culture"],
+            scores=[0.9, 0.8],
+            names=["Booked", "Shrine"],
+        )
+        indexes = MagicMock()
+        indexes.get = AsyncMock(return_value=index)
+        db = _FakeDB(
+            segments=[_segment_row("t1", 1, 2)],
+            scheduled=[{"dayNumber": 1, "activityNodeId": "booked"}],
+            candidates=[],
+        )
+
+        results = await MicroStopService(db, spatial_indexes=indexes).suggest_for_trip(
+            trip_id="trip-1", user_id="u"
+        )
+
+        indexes.get.assert_awaited_once_with("Tokyo")
+        assert not any("CROSS JOIN LATERAL" in sql for sql, _ in db.calls)
+        assert len(db.calls) == 4
+        assert [i.activity_node_id for i in results[0].insertions] == ["shrine"]
+
+    @pytest.mark.asyncio
+    async def test_day_without_segments_warns(self):
+        db = _FakeDB(segments=[], scheduled=[], candidates=[])
+        result = await MicroStopService(db).suggest_for_day(trip_id="trip-1", day_number=3, user_id="u")
+
+        assert result.day_number == 3
+        assert result.inserted_count == 0
+        assert result.warnings == ["No eligible transit segments found."]
+        assert len(db.calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_spatial_failure_yields_empty_lists(self):
+        db = MagicMock()
+        db.fetch = AsyncMock(side_effect=RuntimeError("postgis missing"))
+        path = TransitPath(35.68, 139.71, 35.69, 139.70)
+        assert await find_nodes_along_paths(db=db, paths=[path, path]) == [[], []]
@@ -11,10 +11,15 @@ Covers:
   - evaluate_trip: multi-slot evaluation with shared weather fetch
   - evaluate_slot: single-slot convenience method
   - Graceful degradation when search or DB fails
+  - Trip batch: node prefetch in one query, searches deduplicated and run
+    concurrently, one bulk PivotEvent insert
+  - Trip batch on a mixed trip: each trigger fires on its own slot, swapped
+    and completed slots stay quiet
 """
 
 from __future__ import annotations
 
+import asyncio
 import json
 from datetime import datetime, timezone, timedelta
 from typing import Any
@@ -23,7 +28,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 
 from services.api.pivot.detector import PivotDetector, _build_alternative_query, MAX_PIVOT_DEPTH
-from services.api.pivot.triggers import TriggerResult
+from services.api.pivot.triggers import TriggerResult, VenueClosureTrigger
 from services.api.tests.conftest import make_trip, make_itinerary_slot, make_activity_node
 
 
@@ -545,3 +550,212 @@ class TestEvaluateSlot:
         result = await detector.evaluate_slot(slot, trip, user_mood=False)
 
         assert result is None
+
+
+# ---------------------------------------------------------------------------
+# evaluate_trip: batch prefetch, concurrent search, bulk insert
+# ---------------------------------------------------------------------------
+
+def _rainy(svc) -> None:
+    svc.is_outdoor_slot = MagicMock(side_effect=lambda category: category == "outdoors")
+    svc.should_trigger_weather_pivot = MagicMock(return_value=True)
+    svc.get_weather = AsyncMock(return_value={"condition": "rain", "code": 501, "temp_c": 14.0})
+
+
+class TestEvaluateTripBatch:
+    @pytest.mark.asyncio
+    async def test_one_bulk_insert_for_all_events(self, mock_db, mock_search, mock_weather_service):
+        _rainy(mock_weather_service)
+        det = PivotDetector(db=mock_db, search_service=mock_search, weather_service=mock_weather_service)
+        slots = [_make_active_slot(category="outdoors", activityNodeId=f"node-{i}") for i in range(4)]
+
+        events = await det.evaluate_trip(_make_trip(), slots)
+
+        assert len(events) == 4
+        mock_db.execute.assert_called_once()
+        args = mock_db.execute.call_args.args
+        assert "unnest" in args[0]
+        assert args[1] == [e["id"] for e in events]
+        assert [json.loads(a) for a in args[7]] == [e["alternativeIds"] for e in events]
+
+    @pytest.mark.asyncio
+    async def test_identical_queries_share_one_search(self, mock_db, mock_search, mock_weather_service):
+        _rainy(mock_weather_service)
+        mock_search.search = AsyncMock(return_value=_make_search_result(["node-0", "node-alt-001"]))
+        det = PivotDetector(db=mock_db, search_service=mock_search, weather_service=mock_weather_service)
+        slots = [_make_active_slot(category="outdoors", activityNodeId=f"node-{i}") for i in range(3)]
+
+        events = await det.evaluate_trip(_make_trip(), slots)
+
+        mock_search.search.assert_awaited_once()
+        # Shared results, but each slot still drops its own node
+        assert events[0]["alternativeIds"] == ["node-alt-001"]
+        assert events[1]["alternativeIds"] == ["node-0", "node-alt-001"]
+
+    @pytest.mark.asyncio
+    async def test_distinct_searches_run_concurrently(self, mock_db, mock_weather_service):
+        _rainy(mock_weather_service)
+        in_flight = 0
+        peak = 0
+
+        async def search(query, city, filters=None, limit=10):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return _make_search_result(["node-alt-001"])
+
+        svc = MagicMock()
+        svc.search = search
+        det = PivotDetector(db=mock_db, search_service=svc, weather_service=mock_weather_service)
+        slots = []
+        for i in range(4):
+            node = make_activity_node()
+            node["vibeTags"] = [{"name": f"vibe-{i}"}]
+            slots.append(_make_active_slot(category="outdoors", activityNode=node))
+
+        events = await det.evaluate_trip(_make_trip(), slots)
+
+        assert len(events) == 4
+        assert peak == 4
+
+    @pytest.mark.asyncio
+    async def test_missing_nodes_prefetched_in_one_query(self, mock_db, mock_search, mock_weather_service):
+        # Sunday 2026-05-03 12:00 UTC; the venue only opens in the evening
+        mock_db.fetch = AsyncMock(return_value=[
+            {"id": "node-a", "name": "Night Market", "hours": json.dumps({"sunday": "18:00-23:00"}),
+             "googlePlaceId": "gp-a"},
+        ])
+        det = PivotDetector(db=mock_db, search_service=mock_search, weather_service=mock_weather_service)
+        start = datetime(2026, 5, 3, 12, 0, tzinfo=timezone.utc)
+        slots = [
+            _make_active_slot(activityNodeId="node-a", startTime=start, category="dining"),
+            _make_active_slot(activityNodeId="node-a", startTime=start, category="dining"),
+        ]
+
+        events = await det.evaluate_trip(_make_trip(), slots)
+
+        mock_db.fetch.assert_awaited_once()
+        assert mock_db.fetch.call_args.args[1] == ["node-a"]
+        assert [e["triggerType"] for e in events] == ["venue_closed", "venue_closed"]
+        assert events[0]["triggerPayload"]["venue_name"] == "Night Market"
+
+    @pytest.mark.asyncio
+    async def test_nested_nodes_skip_prefetch(self, mock_db, mock_search, mock_weather_service):
+        mock_db.fetch = AsyncMock(return_value=[])
+        det = PivotDetector(db=mock_db, search_service=mock_search, weather_service=mock_weather_service)
+        slot = _make_active_slot(activityNodeId="node-a", activityNode=make_activity_node(id="node-a"))
+
+        await det.evaluate_trip(_make_trip(), [slot])
+
+        mock_db.fetch.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_no_events_no_insert(self, mock_db, mock_search, mock_weather_service):
+        det = PivotDetector(db=mock_db, search_service=mock_search, weather_service=mock_weather_service)
+
+        assert await det.evaluate_trip(_make_trip(), [_make_active_slot()]) == []
+        mock_db.execute.assert_not_called()
+        mock_search.search.assert_not_called()
+
+
+class TestMixedTrip:
+    @pytest.mark.asyncio
+    async def test_each_trigger_fires_on_its_slot(self, mock_db, mock_weather_service):
+        _rainy(mock_weather_service)
+        search = MagicMock()
+        search.search = AsyncMock(return_value=_make_search_result(
+            ["node-overrun", "node-alt-001", "node-alt-002"]
+        ))
+        now = datetime.now(timezone.utc)
+        noon = datetime(2026, 5, 3, 12, 0, tzinfo=timezone.utc)
+
+        def slot(slot_id, category, evening_only=False, overrun=False, **overrides):
+            node = make_activity_node(id=f"node-{slot_id}")
+            node["hours"] = {
+                day: "18:00-23:00" if evening_only else "08:00-22:00"
+                for day in VenueClosureTrigger._DAY_NAMES
+            }
+            return _make_active_slot(
+                id=slot_id,
+                activityNodeId=node["id"],
+                activityNode=node,
+                category=category,
+                startTime=noon,
+                endTime=(now + timedelta(minutes=-45 if overrun else 90)).isoformat(),
+                **overrides,
+            )
+
+        slots = [
+            slot("rain", "outdoors"),
+            slot("closed", "dining", evening_only=True),
+            slot("overrun", "culture", overrun=True),
+            slot("fine", "culture"),
+            slot("swapped", "outdoors", wasSwapped=True),
+            slot("done", "outdoors", status="completed"),
+        ]
+        det = PivotDetector(db=mock_db, search_service=search, weather_service=mock_weather_service)
+
+        events = await det.evaluate_trip(_make_trip(), slots)
+
+        assert [(e["slotId"], e["triggerType"], e["alternativeIds"]) for e in events] == [
+            ("rain", "weather_change", ["node-overrun", "node-alt-001", "node-alt-002"]),
+            ("closed", "venue_closed", ["node-overrun", "node-alt-001", "node-alt-002"]),
+            ("overrun", "time_overrun", ["node-alt-001", "node-alt-002"]),
+        ]
+
+
+# ---------------------------------------------------------------------------
+# POST /pivot/evaluate
+# ---------------------------------------------------------------------------
+
+class TestEvaluateEndpoint:
+    @pytest.mark.asyncio
+    async def test_uses_app_weather_service(
+        self, app, client, mock_db, mock_weather_service, monkeypatch
+    ):
+        trip = _make_trip(city="Kyoto")
+        slot = _make_active_slot(category="outdoors", activityNode={"id": "node-original-001"})
+        mock_db.fetchrow = AsyncMock(
+            return_value={"id": trip["id"], "city": "Kyoto", "timezone": "UTC"}
+        )
+        mock_db.fetch = AsyncMock(return_value=[slot])
+        mock_weather_service.get_weather = AsyncMock(
+            return_value={"condition": "heavy rain", "code": 502, "temp_c": 14.0}
+        )
+        mock_weather_service.is_outdoor_slot = MagicMock(return_value=True)
+        mock_weather_service.should_trigger_weather_pivot = MagicMock(return_value=True)
+        monkeypatch.setattr(app.state, "weather_service", mock_weather_service, raising=False)
+
+        response = await client.post(
+            "/pivot/evaluate", json={"tripId": trip["id"]}, headers={"X-User-Id": "user-1"}
+        )
+
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert data["slotsEvaluated"] == 1
+        assert [e["triggerType"] for e in data["pivotEvents"]] == ["weather_change"]
+        mock_weather_service.get_weather.assert_awaited_once_with("Kyoto")
+
+    @pytest.mark.asyncio
+    async def test_503_without_weather_service(self, app, client, monkeypatch):
+        monkeypatch.setattr(app.state, "weather_service", None, raising=False)
+        response = await client.post(
+            "/pivot/evaluate",
+            json={"tripId": "00000000-0000-0000-0000-000000000001"},
+            headers={"X-User-Id": "user-1"},
+        )
+        assert response.status_code == 503
+
+    @pytest.mark.asyncio
+    async def test_unknown_trip_is_404(self, app, client, mock_db, mock_weather_service, monkeypatch):
+        mock_db.fetchrow = AsyncMock(return_value=None)
+        monkeypatch.setattr(app.state, "weather_service", mock_weather_service, raising=False)
+        response = await client.post(
+            "/pivot/evaluate",
+            json={"tripId": "00000000-0000-0000-0000-000000000001"},
+            headers={"X-User-Id": "user-1"},
+        )
+        assert response.status_code == 404
+        mock_weather_service.get_weather.assert_not_called()
@@ -308,6 +308,41 @@ class TestVenueClosureTrigger:
         assert result.payload["venue_name"] == "Senso-ji Temple"
         assert result.payload["hours"] == "09:00-17:00"
 
+    @pytest.mark.asyncio
+    async def test_fires_between_split_shifts(self):
+        trigger = VenueClosureTrigger()
+        trip = _trip("UTC")
+
+        test_now = datetime(2026, 2, 20, 15, 0, 0, tzinfo=timezone.utc)  # Friday
+        slot = self._make_slot_with_hours(
+            hours={"friday": "11:00-14:00, 17:00-22:00"},
+            start_time=test_now,
+        )
+
+        result = await trigger.evaluate(slot, trip, now_utc=test_now)
+        assert result.triggered is True
+
+        slot["startTime"] = test_now.replace(hour=18).isoformat()
+        result = await trigger.evaluate(slot, trip, now_utc=test_now)
+        assert result.triggered is False
+
+    @pytest.mark.asyncio
+    async def test_open_past_midnight_from_previous_day(self):
+        trigger = VenueClosureTrigger()
+        trip = _trip("UTC")
+
+        # Saturday 01:00, Friday's hours run to 02:00 and Saturday has none
+        test_now = datetime(2026, 2, 21, 1, 0, 0, tzinfo=timezone.utc)
+        slot = self._make_slot_with_hours(
+            hours={"friday": "18:00-02:00"},
+            start_time=test_now,
+        )
+
+        result = await trigger.evaluate(slot, trip, now_utc=test_now)
+
+        assert result.triggered is False
+        assert "open" in result.reason.lower()
+
 
 # ---------------------------------------------------------------------------
 # TimeOverrunTrigger tests
@@ -11,18 +11,28 @@ Coverage targets:
   - Outdoor category identification
   - BehavioralSignal.weatherContext string construction
   - should_trigger_weather_pivot logic
+  - Pooled client reuse, single-flight misses, last-known-good fallback
 """
 
 from __future__ import annotations
 
+import asyncio
 import json
+import time
 from datetime import datetime, timezone
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
 import pytest
 
-from services.api.weather.cache import WeatherCache, _slugify, _cache_key
+from services.api.weather.cache import (
+    WeatherCache,
+    _cache_key,
+    _slugify,
+    next_hour_bucket,
+    seconds_until_next_hour,
+)
 from services.api.weather.service import (
     WeatherService,
     _kelvin_to_celsius,
@@ -386,3 +396,165 @@ class TestWeatherServiceHelpers:
 
     def test_should_trigger_weather_pivot_none_weather(self, weather_service):
         assert weather_service.should_trigger_weather_pivot(None, "outdoors") is False
+
+
+# ---------------------------------------------------------------------------
+# Shared client, single-flight, last-known-good
+# ---------------------------------------------------------------------------
+
+def _api_client(payload: dict[str, Any] | None = None, delay_s: float = 0.0, error: Exception | None = None):
+    """Fake pooled httpx client whose get() optionally sleeps or raises."""
+    response = MagicMock()
+    response.json = MagicMock(return_value=payload or _make_owm_response())
+    response.raise_for_status = MagicMock()
+
+    async def _get(*args, **kwargs):
+        if delay_s:
+            await asyncio.sleep(delay_s)
+        if error is not None:
+            raise error
+        return response
+
+    client = MagicMock()
+    client.get = AsyncMock(side_effect=_get)
+    client.aclose = AsyncMock()
+    return client
+
+
+class TestWeatherServiceFetchPath:
+    @pytest.mark.asyncio
+    async def test_default_client_is_created_once_and_reused(self, weather_cache, mock_redis):
+        service = WeatherService(api_key="k", cache=weather_cache)
+        client = _api_client()
+        with patch("services.api.weather.service.httpx.AsyncClient", return_value=client) as cls:
+            await service.get_weather("Tokyo")
+            await service.get_weather("Kyoto")
+            await service.aclose()
+
+        cls.assert_called_once()
+        assert client.get.await_count == 2
+        client.aclose.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_injected_client_is_not_closed(self, weather_cache):
+        client = _api_client()
+        service = WeatherService(api_key="k", cache=weather_cache, http_client=client)
+        await service.get_weather("Tokyo")
+        await service.aclose()
+        client.aclose.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_call(self, weather_cache, mock_redis):
+        client = _api_client(_make_owm_response(501, "Rain"), delay_s=0.01)
+        service = WeatherService(api_key="k", cache=weather_cache, http_client=client)
+
+        results = await asyncio.gather(*(service.get_weather("Tokyo") for _ in range(20)))
+
+        assert client.get.await_count == 1
+        mock_redis.set.assert_called_once()
+        assert all(r["condition"] == "rain" for r in results)
+
+    @pytest.mark.asyncio
+    async def test_api_failure_falls_back_to_last_known_good(self, weather_cache, mock_redis):
+        service = WeatherService(
+            api_key="k", cache=weather_cache, http_client=_api_client(_make_owm_response(501, "Rain"))
+        )
+        fresh = await service.get_weather("Tokyo")
+        assert "stale" not in fresh
+
+        # Last-known-good is older than the stale-while-revalidate window,
+        # so the miss waits on the (failing) API and then falls back.
+        slug, (stored_at, raw) = next(iter(service._last_good.items()))
+        service._last_good[slug] = (stored_at - 3 * 3600, raw)
+        service._http = _api_client(error=httpx.ConnectError("down"))
+
+        result = await service.get_weather("Tokyo")
+        assert result["condition"] == "rain"
+        assert result["stale"] is True
+        service._http.get.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_recent_last_known_good_is_served_without_waiting(self, weather_cache, mock_redis):
+        service = WeatherService(
+            api_key="k", cache=weather_cache, http_client=_api_client(_make_owm_response(800, "Clear"))
+        )
+        await service.get_weather("Tokyo")
+
+        # Next hour: cache miss, slow API — the old summary comes back at once
+        slow = _api_client(_make_owm_response(501, "Rain"), delay_s=0.05)
+        service._http = slow
+        result = await asyncio.wait_for(service.get_weather("Tokyo"), timeout=0.02)
+        assert result["condition"] == "clear"
+        assert result["stale"] is True
+
+        await asyncio.gather(*service._inflight.values())
+        assert slow.get.await_count == 1
+        assert mock_redis.set.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_seeds_last_known_good(self, weather_cache, mock_redis):
+        service = WeatherService(api_key="", cache=weather_cache)
+        mock_redis.get = AsyncMock(return_value=json.dumps(_make_owm_response(501, "Rain")))
+        await service.get_weather("Tokyo")
+
+        mock_redis.get = AsyncMock(return_value=None)
+        result = await service.get_weather("Tokyo")
+        assert result["condition"] == "rain"
+        assert result["stale"] is True
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_keeps_original_fetch_time(self, weather_cache, mock_redis):
+        fetched_at = time.time() - 3 * 3600
+        payload = {**_make_owm_response(800, "Clear"), "_fetched_at": fetched_at}
+        mock_redis.get = AsyncMock(return_value=json.dumps(payload))
+        client = _api_client(_make_owm_response(501, "Rain"))
+        service = WeatherService(api_key="k", cache=weather_cache, http_client=client)
+
+        await service.get_weather("Tokyo")
+        await service.get_weather("Tokyo")
+        assert service._last_good["tokyo"][0] == fetched_at
+
+        # Too old to serve while revalidating: the miss waits on the API
+        mock_redis.get = AsyncMock(return_value=None)
+        result = await service.get_weather("Tokyo")
+        assert result["condition"] == "rain"
+        assert "stale" not in result
+
+    @pytest.mark.asyncio
+    async def test_fetch_stamps_cached_payload(self, weather_cache, mock_redis):
+        service = WeatherService(api_key="k", cache=weather_cache, http_client=_api_client())
+        before = time.time()
+        await service.get_weather("Tokyo")
+
+        _, stored = mock_redis.set.call_args[0]
+        assert json.loads(stored)["_fetched_at"] >= before
+
+    @pytest.mark.asyncio
+    async def test_refresh_writes_requested_bucket(self, weather_cache, mock_redis):
+        client = _api_client()
+        service = WeatherService(api_key="k", cache=weather_cache, http_client=client)
+        bucket = next_hour_bucket()
+
+        assert await service.refresh("Tokyo", bucket) is True
+
+        key, _ = mock_redis.set.call_args[0]
+        assert key == _cache_key("Tokyo", hour_bucket=bucket)
+        assert 3600 <= mock_redis.set.call_args[1]["ex"] <= 7200
+
+    @pytest.mark.asyncio
+    async def test_refresh_skips_api_when_already_cached(self, weather_cache, mock_redis):
+        client = _api_client()
+        service = WeatherService(api_key="k", cache=weather_cache, http_client=client)
+        mock_redis.get = AsyncMock(return_value=json.dumps(_make_owm_response()))
+
+        assert await service.refresh("Tokyo", next_hour_bucket()) is True
+        client.get.assert_not_awaited()
+        assert await service.refresh("Tokyo", force=True) is True
+        client.get.assert_awaited_once()
+
+
+class TestHourBuckets:
+    def test_next_bucket_and_seconds_until_top_of_hour(self):
+        at = datetime(2026, 2, 20, 23, 50, tzinfo=timezone.utc)
+        assert next_hour_bucket(at) == "20260221_00"
+        assert seconds_until_next_hour(at) == 600.0
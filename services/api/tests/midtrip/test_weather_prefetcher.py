@@ -0,0 +1,128 @@
+"""
+Tests for WeatherPrefetcher.
+
+Validates:
+  - Active cities are de-duplicated by slug and capped per cycle
+  - refresh_all refreshes every city into the requested bucket, jittered
+    and bounded in concurrency
+  - start() warms the current hour; stop() cancels the loop
+  - A failed cycle is logged, not raised
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from services.api.weather.prefetcher import WeatherPrefetcher
+
+_real_sleep = asyncio.sleep
+
+
+def _db(cities: list[str | None]) -> MagicMock:
+    db = MagicMock()
+    db.fetch = AsyncMock(return_value=[{"city": c} for c in cities])
+    return db
+
+
+def _weather(delay_s: float = 0.0) -> MagicMock:
+    weather = MagicMock()
+    state = {"active": 0, "peak": 0}
+
+    async def _refresh(city, hour_bucket=None, *, force=False):
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        await _real_sleep(delay_s)
+        state["active"] -= 1
+        return city != "Atlantis"
+
+    weather.refresh = AsyncMock(side_effect=_refresh)
+    weather.state = state
+    return weather
+
+
+class TestActiveCities:
+    @pytest.mark.asyncio
+    async def test_dedupes_by_slug_and_skips_blank(self):
+        prefetcher = WeatherPrefetcher(_weather(), _db(["Tokyo", "tokyo ", "New York", "", None]))
+        assert await prefetcher.active_cities() == ["Tokyo", "New York"]
+
+    @pytest.mark.asyncio
+    async def test_caps_cities_per_cycle(self):
+        weather = _weather()
+        prefetcher = WeatherPrefetcher(weather, _db(["Tokyo", "Kyoto", "Osaka"]), max_cities=2)
+
+        assert await prefetcher.active_cities() == ["Tokyo", "Kyoto"]
+        await prefetcher.refresh_all(jitter=False)
+        assert weather.refresh.await_count == 2
+
+    def test_default_cap_fits_daily_budget(self):
+        from services.api.weather.prefetcher import _CYCLES_PER_DAY, _MAX_CITIES, DAILY_CALL_BUDGET
+
+        assert _MAX_CITIES * _CYCLES_PER_DAY <= DAILY_CALL_BUDGET // 2
+
+
+class TestRefreshAll:
+    @pytest.mark.asyncio
+    async def test_refreshes_every_city_into_bucket(self):
+        weather = _weather()
+        prefetcher = WeatherPrefetcher(weather, _db(["Tokyo", "Kyoto", "Atlantis"]))
+
+        result = await prefetcher.refresh_all("20260220_15", jitter=False)
+
+        assert result == {"Tokyo": True, "Kyoto": True, "Atlantis": False}
+        weather.refresh.assert_any_await("Kyoto", "20260220_15")
+        assert weather.refresh.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_jittered_and_bounded(self):
+        weather = _weather(delay_s=0.005)
+        cities = [f"City {i}" for i in range(12)]
+        prefetcher = WeatherPrefetcher(
+            weather, _db(cities), lead_s=1.0, jitter_s=0.02, max_concurrent=3, rng=random.Random(7)
+        )
+        sleeps: list[float] = []
+
+        async def _sleep(delay):
+            sleeps.append(delay)
+            await _real_sleep(delay)
+
+        with patch("services.api.weather.prefetcher.asyncio.sleep", side_effect=_sleep):
+            result = await prefetcher.refresh_all("20260220_15")
+
+        assert all(result.values())
+        assert len(sleeps) == 12 and len(set(sleeps)) == 12
+        assert all(0.0 <= s < 0.02 for s in sleeps)
+        assert weather.state["peak"] <= 3
+
+
+class TestLifecycle:
+    @pytest.mark.asyncio
+    async def test_start_warms_current_hour_then_stop(self):
+        weather = _weather()
+        prefetcher = WeatherPrefetcher(weather, _db(["Tokyo", "Kyoto"]))
+
+        prefetcher.start()
+        prefetcher.start()  # idempotent
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert prefetcher.running
+
+        await prefetcher.stop()
+        assert not prefetcher.running
+        assert weather.refresh.await_count == 2
+        weather.refresh.assert_any_await("Tokyo", None)
+
+    @pytest.mark.asyncio
+    async def test_failed_cycle_is_logged(self, caplog):
+        db = MagicMock()
+        db.fetch = AsyncMock(side_effect=ConnectionError("db down"))
+        prefetcher = WeatherPrefetcher(_weather(), db)
+
+        with patch("services.api.weather.prefetcher._ERROR_BACKOFF_S", 0.0):
+            await prefetcher._cycle(None, jitter=False)
+
+        assert "cycle failed" in caplog.text
@@ -8,19 +8,26 @@ Covers:
 - Completion signal upgrade
 - Feature flag off returns nothing
 - Edge cases
+- Vectorized engine: clustering matches the per-ping rule, array input,
+  stay x slot match matrix, hand-built walking day
 """
 
 import os
 from datetime import datetime, timedelta, timezone
 from unittest.mock import patch
 
+import numpy as np
 import pytest
 
 from services.api.models.gps_features import (
+    PING_DTYPE,
     GPSConfig,
     GPSFeatureExtractor,
     StayPoint,
+    cluster_bounds,
     haversine_distance,
+    haversine_distances,
+    pings_to_array,
 )
 
 
@@ -312,3 +319,139 @@ class TestFeatureFlag:
         extractor = GPSFeatureExtractor()
         with patch.dict(os.environ, {"GPS_FEATURES_ENABLED": "false"}):
             assert extractor.is_active() is False
+
+
+# ===================================================================
+# Vectorized engine
+# ===================================================================
+
+
+def _reference_bounds(lat, lng, radius_m):
+    """Per-ping running-centroid clustering, as extract_stay_points defines it."""
+    starts = [0]
+    sum_lat, sum_lng, count = lat[0], lng[0], 1
+    for j in range(1, len(lat)):
+        if haversine_distance(sum_lat / count, sum_lng / count, lat[j], lng[j]) <= radius_m:
+            sum_lat, sum_lng, count = sum_lat + lat[j], sum_lng + lng[j], count + 1
+        else:
+            starts.append(j)
+            sum_lat, sum_lng, count = lat[j], lng[j], 1
+    return starts
+
+
+class TestVectorizedEngine:
+    def test_haversine_distances_matches_scalar(self):
+        d = haversine_distances([35.6812, 0.0], [139.7671, 179.0], [34.7025, 0.0], [135.4959, -179.0])
+        assert d[0] == pytest.approx(haversine_distance(35.6812, 139.7671, 34.7025, 135.4959))
+        assert d[1] == pytest.approx(haversine_distance(0.0, 179.0, 0.0, -179.0))
+
+    @pytest.mark.parametrize("seed", [0, 1, 2])
+    def test_cluster_bounds_match_per_ping_rule(self, seed):
+        rng = np.random.default_rng(seed)
+        # Jittered stays, walks and jumps of varying lengths
+        parts = []
+        here = np.array([35.68, 139.70])
+        for _ in range(12):
+            k = int(rng.integers(1, 400))
+            parts.append(here + rng.normal(0, 3e-4, (k, 2)))
+            there = here + rng.uniform(-0.01, 0.01, 2)
+            k = int(rng.integers(1, 300))
+            parts.append(here + np.linspace(0, 1, k)[:, None] * (there - here))
+            here = there
+        pts = np.vstack(parts)
+
+        starts = cluster_bounds(pts[:, 0], pts[:, 1], 100.0)
+        assert starts.tolist() == _reference_bounds(pts[:, 0], pts[:, 1], 100.0)
+
+    def test_array_input_matches_dicts(self):
+        extractor = GPSFeatureExtractor(GPSConfig(stay_radius_meters=100, stay_duration_minutes=15))
+        base_time = datetime(2026, 1, 15, 10, 0, tzinfo=timezone.utc)
+        pings = [
+            {"lat": 35.6762, "lng": 139.6503, "timestamp": base_time + timedelta(minutes=i)}
+            for i in range(21)
+        ] + [
+            {"lat": 34.7025, "lng": 135.4959, "timestamp": base_time + timedelta(minutes=30 + i)}
+            for i in range(21)
+        ]
+        arr = pings_to_array(pings)
+        assert arr.dtype == PING_DTYPE
+
+        from_dicts = extractor.extract_stay_points(pings)
+        from_array = extractor.extract_stay_points_array(arr)
+        assert from_array == from_dicts
+        assert from_array[1].arrival_time == base_time + timedelta(minutes=30)
+
+    def test_naive_timestamps_read_as_utc(self):
+        naive = datetime(2026, 1, 15, 10, 0)
+        arr = pings_to_array([{"lat": 0.0, "lng": 0.0, "timestamp": naive}])
+        assert arr["ts"][0] == datetime(2026, 1, 15, 10, 0, tzinfo=timezone.utc).timestamp()
+
+    def test_match_matrix(self):
+        extractor = GPSFeatureExtractor(GPSConfig(stay_radius_meters=100))
+        base_time = datetime(2026, 1, 15, 10, 0, tzinfo=timezone.utc)
+        stays = [
+            StayPoint(35.6762, 139.6503, base_time, base_time + timedelta(minutes=30), 30),
+            StayPoint(35.6762, 139.6503, base_time + timedelta(hours=2),
+                      base_time + timedelta(hours=3), 60),
+        ]
+        slot_starts = [base_time, base_time + timedelta(hours=2), base_time]
+        slot_ends = [base_time + timedelta(hours=1), base_time + timedelta(hours=4),
+                     base_time + timedelta(hours=1)]
+        lats = [35.6762, 35.6762, 35.7762]
+        lngs = [139.6503, 139.6503, 139.6503]
+
+        matrix = extractor.match_stays_to_slots(stays, lats, lngs, slot_starts, slot_ends)
+        expected = [
+            [extractor.match_stay_to_slot(sp, lat, lng, start, end)
+             for lat, lng, start, end in zip(lats, lngs, slot_starts, slot_ends)]
+            for sp in stays
+        ]
+        assert matrix.tolist() == expected == [[True, False, False], [False, True, False]]
+
+    def test_upgrade_uses_first_matching_stay(self):
+        extractor = GPSFeatureExtractor(GPSConfig(stay_radius_meters=100))
+        base_time = datetime(2026, 1, 15, 10, 0, tzinfo=timezone.utc)
+        stays = [
+            StayPoint(35.9, 139.9, base_time, base_time + timedelta(minutes=30), 30),
+            StayPoint(35.6762, 139.6503, base_time, base_time + timedelta(minutes=20), 20),
+            StayPoint(35.6762, 139.6503, base_time, base_time + timedelta(minutes=40), 40),
+        ]
+        slots = [
+            {"id": "s1", "lat": 35.6762, "lng": 139.6503, "start_time": base_time,
+             "end_time": base_time + timedelta(hours=1), "status": "likely_attended"},
+            {"id": "s2", "lat": 35.0, "lng": 139.0, "start_time": base_time,
+             "end_time": base_time + timedelta(hours=1), "status": "likely_attended"},
+        ]
+
+        with patch.dict(os.environ, {"GPS_FEATURES_ENABLED": "true"}):
+            result = extractor.upgrade_completion_signals(stays, slots)
+
+        assert [u["slot_id"] for u in result] == ["s1"]
+        assert result[0]["stay_point"]["duration_minutes"] == 20
+
+    def test_walking_day_fixture(self):
+        """Stay, walk, stay, short stop: two stays with known bounds and centroids."""
+        extractor = GPSFeatureExtractor(GPSConfig(stay_radius_meters=100, stay_duration_minutes=15))
+        base_time = datetime(2026, 3, 1, 9, 0, tzinfo=timezone.utc)
+        lat0, lng0 = 35.6762, 139.6503
+        # Minutes 0-30 jittered +-1e-4 around the first venue, 31-40 a walk in
+        # ~330 m steps, 41-70 at the second venue, 71-75 a short stop.
+        coords = [(lat0 + (1e-4 if i % 2 else -1e-4), lng0) for i in range(31)]
+        coords += [(lat0 + 0.003 * (k + 1), lng0) for k in range(10)]
+        coords += [(lat0 + 0.04, lng0)] * 30
+        coords += [(lat0 + 0.08, lng0)] * 5
+        pings = [
+            {"lat": lat, "lng": lng, "timestamp": base_time + timedelta(minutes=i)}
+            for i, (lat, lng) in enumerate(coords)
+        ]
+
+        stays = extractor.extract_stay_points_array(pings_to_array(pings))
+
+        assert [(s.arrival_time, s.departure_time, s.duration_minutes) for s in stays] == [
+            (base_time, base_time + timedelta(minutes=30), 30.0),
+            (base_time + timedelta(minutes=41), base_time + timedelta(minutes=70), 29.0),
+        ]
+        assert stays[0].lat == pytest.approx(lat0 - 1e-4 / 31, abs=1e-9)
+        assert stays[1].lat == pytest.approx(lat0 + 0.04, abs=1e-9)
+        assert all(s.lng == pytest.approx(lng0) for s in stays)
+        assert extractor.extract_stay_points(pings) == stays
@@ -10,8 +10,11 @@ Covers:
 - Tie-breaking via weighted aggregate
 - Empty histories
 - Edge cases (empty rankings, single candidate)
+- Vectorized path: objective matrix and skyline front match the scalar
+  definitions; tied objective vectors both stay on the front
 """
 
+import numpy as np
 import pytest
 
 from services.api.models.pareto_group_ranker import (
@@ -257,3 +260,74 @@ class TestWeightedAggregate:
         result = ranker.rank_group(rankings, histories)
         scores = [s for _, s in result]
         assert scores == sorted(scores, reverse=True)
+
+
+# ===================================================================
+# Vectorized objectives and skyline
+# ===================================================================
+
+
+def _brute_force_front(objectives: np.ndarray) -> list[int]:
+    return [
+        i for i, p in enumerate(objectives)
+        if not any(np.all(q >= p) and np.any(q > p) for q in objectives)
+    ]
+
+
+class TestVectorizedPath:
+    @pytest.mark.parametrize("seed", [0, 1, 2])
+    def test_pareto_mask_matches_brute_force(self, seed):
+        rng = np.random.default_rng(seed)
+        # Coarse values force ties and duplicate rows
+        objectives = rng.integers(0, 5, (400, 3)).astype(np.float64) / 4
+        mask = ParetoGroupRanker.pareto_mask(objectives, block=64)
+        assert np.flatnonzero(mask).tolist() == _brute_force_front(objectives)
+
+    def test_pareto_mask_empty(self):
+        assert ParetoGroupRanker.pareto_mask(np.empty((0, 3))).tolist() == []
+
+    def test_objective_matrix_matches_scalar(self):
+        ranker = ParetoGroupRanker()
+        rankings = {
+            "m1": [("c1", 0.9), ("c2", 0.3), ("c3", 0.0)],
+            "m2": [("c1", 0.8), ("c3", 0.0)],
+            "m3": [("c1", 0.2), ("c2", 0.7)],
+        }
+        histories = {"m1": {"c1"}, "m2": {"c1", "c2"}, "m3": set()}
+        candidates = ["c1", "c2", "c3", "c4"]
+
+        scores, present = ranker.member_score_matrix(candidates, list(rankings), rankings)
+        matrix = ranker.objective_matrix(candidates, scores, present, histories)
+
+        all_scores = ranker.compute_member_scores(rankings)
+        for i, cid in enumerate(candidates):
+            expected = ranker._compute_objective_vector(cid, all_scores.get(cid, {}), histories)
+            assert matrix[i] == pytest.approx(expected)
+
+    def test_rank_scores_from_matrix(self):
+        ranker = ParetoGroupRanker()
+        rankings = {
+            "m1": [("c1", 0.9), ("c2", 0.3), ("c3", 0.6)],
+            "m2": [("c1", 0.8), ("c2", 0.4), ("c3", 0.5)],
+        }
+        histories: dict[str, set[str]] = {"m1": set(), "m2": set()}
+        scores = np.array([[0.9, 0.8], [0.3, 0.4], [0.6, 0.5]])
+
+        result = ranker.rank_scores(["c1", "c2", "c3"], scores, histories)
+        assert result == pytest.approx(ranker.rank_group(rankings, histories))
+        assert result[0][0] == "c1"
+
+    def test_tied_vectors_both_kept(self):
+        ranker = ParetoGroupRanker()
+        rankings = {
+            "m1": [("a", 1.0), ("b", 1.0), ("c", 1.0), ("d", 0.2)],
+            "m2": [("a", 1.0), ("b", 1.0), ("c", 1.0), ("d", 0.2)],
+        }
+        # b loses novelty, d loses relevance; a and c tie on every objective
+        histories = {"m1": {"b"}, "m2": set()}
+
+        result = ranker.rank_group(rankings, histories)
+
+        assert sorted(cid for cid, _ in result) == ["a", "c"]
+        best = ranker._weighted_aggregate(np.array([1.0, 1.0, 1.0]))
+        assert [w for _, w in result] == pytest.approx([best, best])
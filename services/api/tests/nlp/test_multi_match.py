@@ -0,0 +1,138 @@
+"""
+Unit tests for the single-pass multi-pattern matchers in nlp/multi_match.py.
+
+Covers:
+- KeywordMatcher parity with per-pattern `\\b...\\b` IGNORECASE regexes
+- Overlapping hits and word-boundary handling
+- RegexFamily pattern IDs, capture groups, scoped flags and substitution
+- DIMENSION_MATCHER covers every spec in DIMENSION_PATTERNS
+"""
+
+from __future__ import annotations
+
+import re
+
+import pytest
+
+from services.api.nlp.multi_match import Hit, KeywordMatcher, RegexFamily
+from services.api.nlp.patterns import (
+    DIMENSION_MATCHER,
+    DIMENSION_PATTERN_INDEX,
+    DIMENSION_PATTERNS,
+)
+
+
+# ---------------------------------------------------------------------------
+# KeywordMatcher
+# ---------------------------------------------------------------------------
+
+class TestKeywordMatcher:
+
+    def test_reports_overlapping_hits(self):
+        matcher = KeywordMatcher([("a", "local"), ("b", "local food"), ("c", "food")])
+        ids = {h.pattern_id for h in matcher.scan("I love local food markets")}
+        assert ids == {"a", "b", "c"}
+
+    def test_case_insensitive_with_original_offsets(self):
+        matcher = KeywordMatcher([("lux", "luxury")])
+        hits = matcher.scan("Pure LUXURY here")
+        assert hits == [Hit("lux", 5, 11, "LUXURY")]
+
+    def test_word_boundary_rejects_substrings(self):
+        matcher = KeywordMatcher([("chill", "chill")])
+        assert matcher.scan("chilly evenings") == []
+        assert matcher.scan("so_chill") == []
+        assert len(matcher.scan("chill, vibes")) == 1
+
+    def test_word_boundary_disabled(self):
+        matcher = KeywordMatcher([("chill", "chill")], word_boundary=False)
+        assert len(matcher.scan("chilly evenings")) == 1
+
+    def test_first_hits_is_leftmost_per_pattern(self):
+        matcher = KeywordMatcher([("x", "gem")])
+        first = matcher.first_hits("a gem and another gem")
+        assert first["x"].start == 2
+
+    def test_expanding_lowercase_chars_keep_offsets(self):
+        matcher = KeywordMatcher([("city", "istanbul")])
+        hits = matcher.scan("İstanbul or istanbul")
+        assert [h.text for h in hits] == ["istanbul"]
+
+    def test_empty_literal_rejected(self):
+        with pytest.raises(ValueError):
+            KeywordMatcher([("x", "")])
+
+    @pytest.mark.parametrize("text", [
+        "I love exploring local food markets",
+        "Go with the flow, take it easy — no plans!",
+        "hidden gems and hidden gem, off the beaten path",
+        "I'm a foodie; must-eat street food, not picky",
+        "SOLO trip, by myself, with my friends later",
+        "",
+    ])
+    def test_parity_with_dimension_regexes(self, text):
+        expected = {
+            pattern_id: (m.start(), m.end())
+            for pattern_id, (_, spec) in DIMENSION_PATTERN_INDEX.items()
+            if (m := spec["pattern"].search(text))
+        }
+        got = {
+            pattern_id: (h.start, h.end)
+            for pattern_id, h in DIMENSION_MATCHER.first_hits(text).items()
+        }
+        assert got == expected
+
+
+class TestDimensionMatcher:
+
+    def test_every_spec_is_indexed(self):
+        total = sum(len(specs) for specs in DIMENSION_PATTERNS.values())
+        assert len(DIMENSION_MATCHER) == total
+        assert len(DIMENSION_PATTERN_INDEX) == total
+
+
+# ---------------------------------------------------------------------------
+# RegexFamily
+# ---------------------------------------------------------------------------
+
+class TestRegexFamily:
+
+    def test_hits_carry_pattern_ids_and_groups(self):
+        family = RegexFamily([
+            ("try", re.compile(r"try\s+([A-Z]\w+)", re.IGNORECASE)),
+            ("bold", re.compile(r"\*\*(\w+)\*\*")),
+        ])
+        hits = family.scan("Try Sparrow then **Thump**")
+        assert [(h.pattern_id, h.groups) for h in hits] == [
+            ("try", ("Sparrow",)),
+            ("bold", ("Thump",)),
+        ]
+
+    def test_member_flags_are_scoped(self):
+        family = RegexFamily([
+            ("ci", re.compile(r"abc", re.IGNORECASE)),
+            ("cs", re.compile(r"xyz")),
+        ])
+        assert [h.pattern_id for h in family.scan("ABC XYZ xyz")] == ["ci", "cs"]
+
+    def test_earlier_member_wins_at_same_position(self):
+        family = RegexFamily([
+            ("first", re.compile(r"\d{3}")),
+            ("second", re.compile(r"\d{3}-\d{4}")),
+        ])
+        assert family.search("555-1234").pattern_id == "first"
+
+    def test_search_returns_none_without_match(self):
+        family = RegexFamily([("x", re.compile(r"zzz"))])
+        assert family.search("nothing here") is None
+
+    def test_sub_replaces_per_pattern(self):
+        family = RegexFamily([
+            ("num", re.compile(r"\d+")),
+            ("at", re.compile(r"@\w+")),
+        ])
+        assert family.sub("call 42 or @bob", {"num": "[N]", "at": "[U]"}) == "call [N] or [U]"
+
+    def test_requires_patterns(self):
+        with pytest.raises(ValueError):
+            RegexFamily([])
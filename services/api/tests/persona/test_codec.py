@@ -0,0 +1,183 @@
+"""
+Tests for services/api/persona/codec.py
+
+Coverage:
+  1. Trip state round-trip: standard + extra dimensions, metadata
+  2. Snapshot round-trip: dimensions, extras, tag affinities, source breakdown
+  3. Fixed wire layout: mask + packed float32, string table dedup
+  4. Corrupt / foreign blobs raise CodecError
+  4b. Decoded float32 values equal round(value, 6), large extras included
+  5. Wire (base64) form and size vs the per-field hash layout
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import struct
+
+import pytest
+
+from services.api.persona.codec import (
+    TRIP_DIMENSIONS,
+    CodecError,
+    decode_snapshot,
+    decode_trip_state,
+    encode_snapshot,
+    encode_trip_state,
+    from_wire,
+    to_wire,
+)
+from services.api.persona.types import DimensionValue, PersonaSnapshot
+
+
+def _snapshot(**overrides) -> PersonaSnapshot:
+    fields = dict(
+        user_id="user-1",
+        trip_id="trip-1",
+        dimensions={
+            "energy_level": DimensionValue("high_energy", 0.82, "onboarding"),
+            "food_priority": DimensionValue("food_driven", 0.61, "behavioral_ema"),
+            "pace_preference": DimensionValue("slow_traveler", 0.3, "onboarding"),
+        },
+        negative_tag_affinities={"party-central": -0.8, "tourist-trap": -0.3333},
+        source_breakdown={
+            "energy_level": "onboarding",
+            "food_priority": "behavioral_ema",
+            "pace_preference": "onboarding",
+        },
+        confidence=0.5767,
+        cache_hit=False,
+        resolved_at="2026-02-25T03:00:00.123456+00:00",
+    )
+    fields.update(overrides)
+    return PersonaSnapshot(**fields)
+
+
+class TestTripState:
+    def test_round_trip(self):
+        dims = {name: 0.05 + i * 0.1 for i, name in enumerate(TRIP_DIMENSIONS)}
+        blob = encode_trip_state(
+            dims, nightly_sync_version=12, last_updated="2026-03-01T10:00:00+00:00"
+        )
+        state = decode_trip_state(blob)
+        for name, value in dims.items():
+            assert state[name] == pytest.approx(value, abs=1e-6)
+        assert state["nightly_sync_version"] == 12
+        assert state["last_updated"] == "2026-03-01T10:00:00+00:00"
+
+    def test_sparse_and_extra_dimensions(self):
+        blob = encode_trip_state(
+            {"pace_preference": 0.4, "coffee_focus": 0.9}, nightly_sync_version=1
+        )
+        state = decode_trip_state(blob)
+        assert state == {"pace_preference": 0.4, "coffee_focus": 0.9, "nightly_sync_version": 1}
+
+    def test_decoded_values_match_round(self):
+        rng = random.Random(3)
+        f32 = struct.Struct("<f")
+        for _ in range(2000):
+            dims = {name: round(rng.uniform(0.0, 1.0), 6) for name in TRIP_DIMENSIONS}
+            extra = rng.choice([rng.uniform(-5.0, 5.0), rng.uniform(-1e12, 1e12)])
+            state = decode_trip_state(encode_trip_state(
+                {**dims, "extra": extra}, nightly_sync_version=1
+            ))
+            for name, value in {**dims, "extra": extra}.items():
+                (as_f32,) = f32.unpack(f32.pack(value))
+                assert state[name] == round(as_f32, 6)
+
+    def test_fixed_layout_size(self):
+        dims = {name: 0.5 for name in TRIP_DIMENSIONS}
+        blob = encode_trip_state(dims, nightly_sync_version=1)
+        # header 2 + mask 2 + 9 * f32 + version 1 + last_updated 1 + extras 1
+        assert len(blob) == 2 + 2 + 36 + 3
+
+
+class TestSnapshot:
+    def test_round_trip(self):
+        original = _snapshot()
+        decoded, version = decode_snapshot(encode_snapshot(original, 7), "user-1", "trip-1")
+
+        assert version == 7
+        assert decoded.cache_hit is True
+        assert decoded.dimensions.keys() == original.dimensions.keys()
+        for name, dv in original.dimensions.items():
+            assert decoded.dimensions[name].value == dv.value
+            assert decoded.dimensions[name].source == dv.source
+            assert decoded.dimensions[name].confidence == pytest.approx(dv.confidence, abs=1e-6)
+        assert decoded.negative_tag_affinities == original.negative_tag_affinities
+        assert decoded.source_breakdown == original.source_breakdown
+        assert decoded.confidence == pytest.approx(original.confidence)
+        assert decoded.resolved_at == original.resolved_at
+
+    def test_explicit_source_breakdown_and_extra_dimension(self):
+        original = _snapshot(
+            dimensions={"coffee_focus": DimensionValue("espresso", 0.7, "cf_blend")},
+            source_breakdown={"coffee_focus": "destination_prior"},
+        )
+        decoded, _ = decode_snapshot(encode_snapshot(original, 1), "user-1", None)
+        assert decoded.dimensions["coffee_focus"].value == "espresso"
+        assert decoded.source_breakdown == {"coffee_focus": "destination_prior"}
+        assert decoded.trip_id is None
+
+    def test_strings_are_interned(self):
+        many_sources = _snapshot(
+            dimensions={
+                name: DimensionValue(f"value_{i}", 0.5, "onboarding")
+                for i, name in enumerate(["energy_level", "food_priority", "pace_preference"])
+            },
+            source_breakdown={},
+        )
+        blob = encode_snapshot(many_sources, 1)
+        assert blob.count(b"onboarding") == 1
+
+    def test_far_smaller_than_json_hash(self):
+        snapshot = _snapshot()
+        legacy = {
+            "dimensions": json.dumps({
+                k: {"value": v.value, "confidence": v.confidence, "source": v.source}
+                for k, v in snapshot.dimensions.items()
+            }),
+            "negative_tag_affinities": json.dumps(snapshot.negative_tag_affinities),
+            "source_breakdown": json.dumps(snapshot.source_breakdown),
+            "confidence": str(snapshot.confidence),
+            "resolved_at": snapshot.resolved_at,
+        }
+        legacy_bytes = sum(len(k) + len(v) for k, v in legacy.items())
+        assert len(to_wire(encode_snapshot(snapshot, 1))) < legacy_bytes / 2
+
+
+class TestErrors:
+    def test_wrong_kind(self):
+        blob = encode_trip_state({"pace_preference": 0.4}, nightly_sync_version=1)
+        with pytest.raises(CodecError):
+            decode_snapshot(blob, "u", "t")
+
+    def test_unknown_version(self):
+        blob = bytearray(encode_trip_state({}, nightly_sync_version=1))
+        blob[1] = 99
+        with pytest.raises(CodecError, match="version"):
+            decode_trip_state(bytes(blob))
+
+    def test_truncated(self):
+        blob = encode_snapshot(_snapshot(), 3)
+        with pytest.raises(CodecError):
+            decode_snapshot(blob[:-4], "u", "t")
+
+    @pytest.mark.parametrize("cut", [1, 3, 10, 41])
+    def test_truncated_trip_state(self, cut):
+        blob = encode_trip_state(
+            {name: 0.5 for name in TRIP_DIMENSIONS}, nightly_sync_version=300,
+            last_updated="2026-03-01T10:00:00+00:00",
+        )
+        with pytest.raises(CodecError):
+            decode_trip_state(blob[:cut])
+
+    def test_bad_base64(self):
+        with pytest.raises(CodecError):
+            from_wire("not base64!")
+
+    def test_wire_round_trip(self):
+        blob = encode_snapshot(_snapshot(), 3)
+        assert from_wire(to_wire(blob)) == blob
+        assert from_wire(to_wire(blob).encode()) == blob
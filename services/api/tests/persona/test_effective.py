@@ -16,6 +16,9 @@ Coverage:
  12. get_persona_for_ranking -> correct flat dict format
  13. get_persona_for_ranking pace/budget extraction
  14. get_persona_for_ranking vibes filtering by confidence threshold
+ 15. Version stamp in Redis -> no Postgres round-trip on cache validation
+ 16. L0 in-process cache -> warm reads skip Redis hash + DB entirely
+ 17. Binary snapshot field -> read, legacy JSON migrated, DB resolves written through
 """
 
 from __future__ import annotations
@@ -25,9 +28,13 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from services.api.persona.codec import decode_snapshot, encode_snapshot, from_wire, to_wire
 from services.api.persona.effective import (
+    _snapshot_cache,
+    clear_persona_cache,
     effective_persona,
     get_persona_for_ranking,
+    publish_persona_versions,
 )
 from services.api.persona.types import DimensionValue, PersonaSnapshot
 
@@ -115,12 +122,15 @@ def _make_pool(conn: AsyncMock) -> MagicMock:
 def _make_redis(
     cache_data: dict | None = None,
     raises: Exception | None = None,
+    version_stamp: int | None = None,
 ) -> AsyncMock:
     """
     Build a mock Redis client.
 
-    If raises is set, hgetall() raises that exception.
+    If raises is set, get() and hgetall() raise that exception.
     If cache_data is None, hgetall() returns empty dict (miss).
+    version_stamp is returned by get() for the persona_version key (None = miss).
+    pipeline().set(...) calls are recorded on redis.stamp_pipe.
     """
     redis = AsyncMock()
 
@@ -129,10 +139,26 @@ def _make_redis(
             raise raises
         return cache_data or {}
 
+    async def _get(key: str) -> str | None:
+        if raises is not None:
+            raise raises
+        return str(version_stamp) if version_stamp is not None else None
+
     redis.hgetall = AsyncMock(side_effect=_hgetall)
+    redis.get = AsyncMock(side_effect=_get)
+    redis.stamp_pipe = MagicMock()
+    redis.stamp_pipe.execute = AsyncMock(return_value=[])
+    redis.pipeline = MagicMock(return_value=redis.stamp_pipe)
     return redis
 
 
+@pytest.fixture(autouse=True)
+def _clear_l0_cache():
+    clear_persona_cache()
+    yield
+    clear_persona_cache()
+
+
 def _make_cached_snapshot(
     user_id: str,
     trip_id: str,
@@ -291,10 +317,9 @@ class TestCacheHit:
     async def test_cache_hit_returns_cached_snapshot(self):
         """Valid cache hit returns cached data and sets cache_hit=True."""
         cached = _make_cached_snapshot("user-123", "trip-456", version=5)
-        redis = _make_redis(cache_data=cached)
+        redis = _make_redis(cache_data=cached, version_stamp=5)
 
-        # DB returns the same version
-        conn = _make_conn(version_rows=[_make_version_row(5)])
+        conn = _make_conn()
         pool = _make_pool(conn)
 
         snapshot = await effective_persona(
@@ -310,9 +335,9 @@ class TestCacheHit:
 
     @pytest.mark.asyncio
     async def test_cache_hit_does_not_call_full_persona_fetch(self):
-        """On cache hit, we only do the version pre-fetch, not the full PersonaDimension query."""
+        """On cache hit with a version stamp, Postgres is not queried at all."""
         cached = _make_cached_snapshot("user-123", "trip-456", version=3)
-        redis = _make_redis(cache_data=cached)
+        redis = _make_redis(cache_data=cached, version_stamp=3)
 
         fetch_calls: list[str] = []
 
@@ -335,16 +360,8 @@ class TestCacheHit:
             "user-123", trip_id="trip-456", pool=pool, redis_client=redis
         )
 
-        # Only the version pre-fetch should have been called.
-        # The full PersonaDimension fetch is distinguished by selecting
-        # 'negativeTagAffinities' — the version pre-fetch only selects 'version'.
-        full_persona_calls = [
-            s for s in fetch_calls
-            if "negativeTagAffinities" in s
-        ]
-        assert len(full_persona_calls) == 0, (
-            f"Full PersonaDimension fetch was called on a cache hit: {full_persona_calls}"
-        )
+        assert fetch_calls == []
+        pool.acquire.assert_not_called()
 
 
 # ---------------------------------------------------------------------------
@@ -840,9 +857,9 @@ class TestGetPersonaForRanking:
     async def test_cache_hit_still_returns_correct_ranker_format(self):
         """Cache hit path also produces valid ranker dict."""
         cached = _make_cached_snapshot("user-123", "trip-456", version=1)
-        redis = _make_redis(cache_data=cached)
+        redis = _make_redis(cache_data=cached, version_stamp=1)
 
-        conn = _make_conn(version_rows=[_make_version_row(1)])
+        conn = _make_conn()
         pool = _make_pool(conn)
 
         result = await get_persona_for_ranking(
@@ -855,3 +872,261 @@ class TestGetPersonaForRanking:
         assert "dimensions" in result
         assert "negative_tags" in result
         assert result["negative_tags"] == {"party-central": -0.8}
+
+
+# ---------------------------------------------------------------------------
+# Test: Version stamp + L0 in-process cache
+# ---------------------------------------------------------------------------
+
+
+class TestVersionStamp:
+    @pytest.mark.asyncio
+    async def test_missing_stamp_reads_db_once_and_publishes(self):
+        """Cold stamp: one DB query serves both version and dimensions."""
+        redis = _make_redis(cache_data={}, version_stamp=None)
+        rows = [_make_row("food_priority", "food_driven", version=7)]
+        conn = _make_conn(persona_rows=rows)
+        pool = _make_pool(conn)
+
+        snapshot = await effective_persona(
+            "user-123", trip_id="trip-456", pool=pool, redis_client=redis
+        )
+
+        assert snapshot.dimensions["food_priority"].value == "food_driven"
+        assert conn.fetch.await_count == 1
+        redis.stamp_pipe.set.assert_called_once()
+        key, version = redis.stamp_pipe.set.call_args[0]
+        assert key == "persona_version:user-123"
+        assert version == 7
+
+    @pytest.mark.asyncio
+    async def test_stamp_behind_db_is_corrected(self):
+        redis = _make_redis(cache_data={}, version_stamp=3)
+        rows = [_make_row("food_priority", "food_driven", version=4)]
+        pool = _make_pool(_make_conn(persona_rows=rows))
+
+        await effective_persona("user-123", trip_id="trip-456", pool=pool, redis_client=redis)
+
+        assert redis.stamp_pipe.set.call_args[0][1] == 4
+        assert ("user-123", "trip-456", None, 4) in _snapshot_cache._entries
+
+    @pytest.mark.asyncio
+    async def test_publish_versions_is_one_pipeline(self):
+        redis = _make_redis()
+        await publish_persona_versions(redis, {"u1": 2, "u2": 5})
+        assert redis.stamp_pipe.set.call_count == 2
+        redis.stamp_pipe.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_publish_versions_swallows_errors(self):
+        redis = _make_redis()
+        redis.stamp_pipe.execute = AsyncMock(side_effect=ConnectionError("down"))
+        redis.delete = AsyncMock(side_effect=ConnectionError("down"))
+        await publish_persona_versions(redis, {"u1": 2})  # no raise
+
+    @pytest.mark.asyncio
+    async def test_failed_publish_drops_stamps(self, caplog):
+        redis = _make_redis()
+        redis.stamp_pipe.execute = AsyncMock(side_effect=ConnectionError("timeout"))
+        redis.delete = AsyncMock(return_value=2)
+        with caplog.at_level("WARNING", logger="services.api.persona.effective"):
+            await publish_persona_versions(redis, {"u1": 2, "u2": 5})
+        redis.delete.assert_awaited_once_with("persona_version:u1", "persona_version:u2")
+        assert "dropping their stamps" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_successful_publish_keeps_stamps(self):
+        redis = _make_redis()
+        redis.delete = AsyncMock()
+        await publish_persona_versions(redis, {"u1": 2})
+        redis.delete.assert_not_awaited()
+
+
+class TestL0Cache:
+    @pytest.mark.asyncio
+    async def test_warm_read_skips_hash_and_db(self):
+        rows = [_make_row("food_priority", "food_driven", version=2)]
+        conn = _make_conn(persona_rows=rows)
+        pool = _make_pool(conn)
+        redis = _make_redis(cache_data={}, version_stamp=2)
+
+        first = await effective_persona("user-123", trip_id="trip-456", pool=pool, redis_client=redis)
+        second = await effective_persona("user-123", trip_id="trip-456", pool=pool, redis_client=redis)
+
+        assert second is first
+        assert conn.fetch.await_count == 1
+        assert redis.hgetall.await_count == 1
+        assert redis.get.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_version_bump_invalidates(self):
+        rows = [_make_row("food_priority", "food_driven", version=2)]
+        conn = _make_conn(persona_rows=rows)
+        pool = _make_pool(conn)
+
+        await effective_persona(
+            "user-123", trip_id="trip-456", pool=pool,
+            redis_client=_make_redis(version_stamp=2),
+        )
+        rows[0] = _make_row("food_priority", "food_balanced", version=3)
+        snapshot = await effective_persona(
+            "user-123", trip_id="trip-456", pool=pool,
+            redis_client=_make_redis(version_stamp=3),
+        )
+
+        assert snapshot.dimensions["food_priority"].value == "food_balanced"
+        assert conn.fetch.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_city_slug_is_part_of_key(self):
+        rows = [_make_row("food_priority", "food_balanced", confidence=0.1, version=1)]
+        conn = _make_conn(persona_rows=rows)
+        pool = _make_pool(conn)
+        redis = _make_redis(version_stamp=1)
+
+        await effective_persona("user-123", pool=pool, redis_client=redis)
+        await effective_persona("user-123", pool=pool, redis_client=redis, city_slug="austin")
+
+        assert conn.fetch.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_no_redis_never_caches(self):
+        conn = _make_conn(persona_rows=[_make_row("food_priority", "food_driven")])
+        pool = _make_pool(conn)
+
+        await effective_persona("user-123", pool=pool)
+        await effective_persona("user-123", pool=pool)
+
+        assert conn.fetch.await_count == 2
+        assert len(_snapshot_cache) == 0
+
+
+class TestBinarySnapshotCache:
+    def _snapshot(self) -> PersonaSnapshot:
+        return PersonaSnapshot(
+            user_id="user-123",
+            trip_id="trip-456",
+            dimensions={
+                "food_priority": DimensionValue("food_driven", 0.9, "trip_cache"),
+            },
+            negative_tag_affinities={"party-central": -0.8},
+            source_breakdown={"food_priority": "trip_cache"},
+            confidence=0.9,
+            cache_hit=False,
+            resolved_at="2026-02-25T03:00:00+00:00",
+        )
+
+    @pytest.mark.asyncio
+    async def test_binary_snapshot_hit(self):
+        blob = to_wire(encode_snapshot(self._snapshot(), 4))
+        redis = _make_redis(cache_data={"snapshot": blob}, version_stamp=4)
+        pool = _make_pool(_make_conn())
+
+        snapshot = await effective_persona(
+            "user-123", trip_id="trip-456", pool=pool, redis_client=redis
+        )
+
+        assert snapshot.cache_hit is True
+        assert snapshot.dimensions["food_priority"].value == "food_driven"
+        assert snapshot.negative_tag_affinities == {"party-central": -0.8}
+        pool.acquire.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_binary_snapshot_version_guard(self):
+        blob = to_wire(encode_snapshot(self._snapshot(), 4))
+        redis = _make_redis(cache_data={"snapshot": blob}, version_stamp=5)
+        rows = [_make_row("food_priority", "food_balanced", version=5)]
+        pool = _make_pool(_make_conn(persona_rows=rows))
+
+        snapshot = await effective_persona(
+            "user-123", trip_id="trip-456", pool=pool, redis_client=redis
+        )
+
+        assert snapshot.cache_hit is False
+        assert snapshot.dimensions["food_priority"].value == "food_balanced"
+
+    @pytest.mark.asyncio
+    async def test_legacy_hash_is_migrated(self):
+        cached = _make_cached_snapshot("user-123", "trip-456", version=5)
+        redis = _make_redis(cache_data=cached, version_stamp=5)
+
+        await effective_persona(
+            "user-123", trip_id="trip-456", pool=_make_pool(_make_conn()), redis_client=redis
+        )
+
+        mapping = redis.stamp_pipe.hset.call_args.kwargs["mapping"]
+        migrated, version = decode_snapshot(from_wire(mapping["snapshot"]), "user-123", "trip-456")
+        assert version == 5
+        assert migrated.dimensions["pace_preference"].value == "slow_traveler"
+        assert "dimensions" in redis.stamp_pipe.hdel.call_args[0]
+
+    @pytest.mark.asyncio
+    async def test_snapshot_not_served_for_another_city(self):
+        blob = to_wire(encode_snapshot(self._snapshot(), 4))
+        redis = _make_redis(cache_data={"snapshot": blob}, version_stamp=4)
+        rows = [_make_row("food_priority", "food_balanced", version=4)]
+        pool = _make_pool(_make_conn(persona_rows=rows))
+
+        snapshot = await effective_persona(
+            "user-123", trip_id="trip-456", city_slug="bend", pool=pool, redis_client=redis
+        )
+
+        assert snapshot.cache_hit is False
+        assert snapshot.dimensions["food_priority"].value == "food_balanced"
+        mapping = redis.stamp_pipe.hset.call_args.kwargs["mapping"]
+        assert list(mapping) == ["snapshot@bend"]
+
+    @pytest.mark.asyncio
+    async def test_city_snapshot_hit(self):
+        blob = to_wire(encode_snapshot(self._snapshot(), 4))
+        redis = _make_redis(cache_data={"snapshot@bend": blob}, version_stamp=4)
+        pool = _make_pool(_make_conn())
+
+        snapshot = await effective_persona(
+            "user-123", trip_id="trip-456", city_slug="bend", pool=pool, redis_client=redis
+        )
+
+        assert snapshot.cache_hit is True
+        pool.acquire.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_legacy_hash_not_served_with_city(self):
+        cached = _make_cached_snapshot("user-123", "trip-456", version=5)
+        redis = _make_redis(cache_data=cached, version_stamp=5)
+        rows = [_make_row("food_priority", "food_balanced", version=5)]
+        pool = _make_pool(_make_conn(persona_rows=rows))
+
+        snapshot = await effective_persona(
+            "user-123", trip_id="trip-456", city_slug="bend", pool=pool, redis_client=redis
+        )
+
+        assert snapshot.cache_hit is False
+        redis.stamp_pipe.hdel.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_db_resolve_writes_through(self):
+        redis = _make_redis(cache_data={}, version_stamp=2)
+        redis.stamp_pipe.execute = AsyncMock(return_value=[1, 3600])
+        rows = [_make_row("food_priority", "food_driven", version=2)]
+
+        await effective_persona(
+            "user-123", trip_id="trip-456", pool=_make_pool(_make_conn(persona_rows=rows)),
+            redis_client=redis,
+        )
+
+        key = redis.stamp_pipe.hset.call_args[0][0]
+        assert key == "trip_persona_cache:user-123:trip-456"
+        redis.delete.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_write_through_without_trip_entry_is_removed(self):
+        redis = _make_redis(cache_data={}, version_stamp=2)
+        redis.stamp_pipe.execute = AsyncMock(return_value=[1, -1])
+        rows = [_make_row("food_priority", "food_driven", version=2)]
+
+        await effective_persona(
+            "user-123", trip_id="trip-456", pool=_make_pool(_make_conn(persona_rows=rows)),
+            redis_client=redis,
+        )
+
+        redis.delete.assert_awaited_once_with("trip_persona_cache:user-123:trip-456")
@@ -345,6 +345,21 @@ class FakeQdrantClient:
             col.points[p.id] = {"vector": p.vector, "payload": p.payload}
         col.points_count = len(col.points)
 
+    async def retrieve(self, collection_name, ids, with_payload=True, with_vectors=False):
+        col = self.collections.get(collection_name, FakeQdrantCollection())
+        return [
+            type("Record", (), {"id": pid, "payload": dict(col.points[pid]["payload"])})()
+            for pid in ids
+            if pid in col.points
+        ]
+
+    async def batch_update_points(self, collection_name, update_operations, wait=True):
+        col = self.collections.setdefault(collection_name, FakeQdrantCollection())
+        for op in update_operations:
+            for pid in op.set_payload.points:
+                if pid in col.points:
+                    col.points[pid]["payload"].update(op.set_payload.payload)
+
     async def delete(self, collection_name, points_selector):
         col = self.collections.get(collection_name)
         if col:
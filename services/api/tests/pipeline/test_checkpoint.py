@@ -5,12 +5,13 @@ Covers:
 - Simulate crash mid-pipeline -> restart -> verify resumes from correct step
 - Progress file persistence and loading
 - Step state transitions
+- Convergence watermark only advances on an error-free pass
 """
 
 import json
 from datetime import datetime, timezone
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 import pytest
 
@@ -27,7 +28,9 @@ from services.api.pipeline.city_seeder import (
     _mark_step_done,
     _mark_step_failed,
     _progress_path,
+    _step_convergence,
 )
+from services.api.pipeline.convergence import ConvergenceStats
 
 
 class TestCheckpointResume:
@@ -218,3 +221,46 @@ class TestStepTransitions:
             step = progress.steps[PipelineStep.SCRAPE.value]
             assert step.status == StepStatus.FAILED
             assert step.error == "timeout"
+
+
+class TestConvergenceWatermark:
+    """scored_through only moves forward when every batch scored."""
+
+    @staticmethod
+    def _progress(scored_through):
+        progress = SeedProgress(city="tokyo")
+        progress.steps[PipelineStep.CONVERGENCE.value] = StepProgress(
+            status=StepStatus.IN_PROGRESS,
+            metrics={"scored_through": scored_through} if scored_through else {},
+        )
+        return progress
+
+    @pytest.mark.asyncio
+    async def test_clean_pass_advances_watermark(self):
+        started = datetime(2026, 4, 2, tzinfo=timezone.utc)
+        scoring = AsyncMock(return_value=ConvergenceStats(mode="incremental", started_at=started))
+        with patch("services.api.pipeline.city_seeder.run_convergence_scoring", scoring):
+            metrics = await _step_convergence(None, "tokyo", self._progress("2026-04-01T00:00:00+00:00"))
+
+        assert scoring.await_args.kwargs["since"] == datetime(2026, 4, 1)
+        assert metrics["scored_through"] == started.isoformat()
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_keeps_previous_watermark(self):
+        previous = "2026-04-01T00:00:00+00:00"
+        stats = ConvergenceStats(
+            mode="incremental", errors=1, started_at=datetime(2026, 4, 2, tzinfo=timezone.utc),
+        )
+        with patch("services.api.pipeline.city_seeder.run_convergence_scoring", AsyncMock(return_value=stats)):
+            metrics = await _step_convergence(None, "tokyo", self._progress(previous))
+
+        assert metrics["scored_through"] == previous
+        assert metrics["errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_first_pass_leaves_no_watermark(self):
+        stats = ConvergenceStats(errors=2, started_at=datetime(2026, 4, 2, tzinfo=timezone.utc))
+        with patch("services.api.pipeline.city_seeder.run_convergence_scoring", AsyncMock(return_value=stats)):
+            metrics = await _step_convergence(None, "tokyo", self._progress(None))
+
+        assert metrics["scored_through"] is None
@@ -6,8 +6,13 @@ Covers:
 - Vibe agreement bonus
 - Authority score calculation
 - Source authority resolution
+- Batch scoring: one set-based UPDATE per batch, concurrent batches,
+  incremental node selection
 """
 
+import asyncio
+from datetime import datetime
+
 import pytest
 
 from services.api.pipeline.convergence import (
@@ -16,6 +21,8 @@ from services.api.pipeline.convergence import (
     compute_authority_score,
     compute_convergence_score,
     resolve_authority,
+    run_convergence_scoring,
+    score_nodes,
     _DEFAULT_AUTHORITY,
     _VIBE_AGREEMENT_BONUS,
     _CONVERGENCE_DENOMINATOR,
@@ -160,3 +167,167 @@ class TestConvergenceStats:
         stats.vibe_boosts_applied = 5
         assert stats.nodes_processed == 100
         assert stats.nodes_skipped == 10
+
+
+# ===================================================================
+# Batch scoring
+# ===================================================================
+
+
+def _signal(node_id, source, authority=0.5, signal_type="mention", meta=None):
+    return {
+        "activityNodeId": node_id,
+        "sourceName": source,
+        "sourceAuthority": authority,
+        "signalType": signal_type,
+        "extractionMetadata": meta,
+    }
+
+
+class _ScoringConn:
+    """Answers the convergence queries from in-memory signal rows."""
+
+    def __init__(self, db: "_ScoringPool") -> None:
+        self.db = db
+
+    async def fetch(self, query, *args):
+        if "FROM activity_nodes" in query:
+            self.db.select_queries.append((query, args))
+            return [{"id": nid} for nid in self.db.node_ids]
+        ids = set(args[0])
+        if "FROM quality_signals" in query:
+            self.db.in_flight += 1
+            self.db.peak_in_flight = max(self.db.peak_in_flight, self.db.in_flight)
+            await asyncio.sleep(0.01)
+            self.db.in_flight -= 1
+            return [r for r in self.db.signals if r["activityNodeId"] in ids]
+        return [{"activityNodeId": nid} for nid in self.db.vibe_agreement if nid in ids]
+
+    async def execute(self, query, *args):
+        self.db.updates.append((query, args))
+        return f"UPDATE {len(args[0])}"
+
+
+class _ScoringPool:
+    def __init__(self, node_ids, signals, vibe_agreement=()):
+        self.node_ids = node_ids
+        self.signals = signals
+        self.vibe_agreement = set(vibe_agreement)
+        self.select_queries: list = []
+        self.updates: list = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def acquire(self):
+        conn = _ScoringConn(self)
+
+        class _Acquire:
+            async def __aenter__(self):
+                return conn
+
+            async def __aexit__(self, *exc):
+                pass
+
+        return _Acquire()
+
+
+class TestScoreNodes:
+    def test_matches_scalar_formulas(self):
+        signals = [
+            _signal("a", "reddit", 0.6),
+            _signal("a", "reddit", 0.9),  # duplicate source: first authority wins
+            _signal("a", "blog", 0.4, signal_type="local_recommendation"),
+        ]
+        (score,) = score_nodes(["a"], signals, set())
+        assert score.source_count == 2
+        assert score.convergence == compute_convergence_score(2, False)
+        assert score.authority == pytest.approx((0.6 + 0.4 * 3) / 4, abs=1e-4)
+        assert score.tourist_score is None
+
+    def test_tourist_score_from_string_metadata(self):
+        signals = [
+            _signal("a", "s1", meta='{"overrated_flag": true}'),
+            _signal("a", "s2", meta={"overrated_flag": True}),
+            _signal("a", "s3", meta="not json"),
+        ]
+        (score,) = score_nodes(["a"], signals, set())
+        assert score.tourist_score == pytest.approx(0.7 + (2 / 3) * 0.3, abs=1e-4)
+
+    def test_nodes_without_signals_are_omitted(self):
+        scores = score_nodes(["a", "b"], [_signal("b", "s1")], {"b"})
+        assert [s.node_id for s in scores] == ["b"]
+        assert scores[0].vibe_boost is True
+
+
+class TestRunConvergenceScoring:
+    @pytest.mark.asyncio
+    async def test_one_bulk_update_per_batch(self):
+        node_ids = [f"n{i}" for i in range(10)]
+        signals = [_signal(nid, "reddit") for nid in node_ids[:8]]
+        pool = _ScoringPool(node_ids, signals)
+
+        stats = await run_convergence_scoring(pool, batch_size=4)
+
+        # Third batch (n8, n9) has no signals, so it issues no UPDATE
+        assert len(pool.updates) == 2
+        query, args = pool.updates[0]
+        assert "unnest($1::text[]" in query
+        assert "COALESCE(s.tourist_score, an.tourist_score)" in query
+        assert len(args) == 5 and all(len(a) == len(args[0]) for a in args)
+        assert stats.nodes_processed == 10
+        assert stats.nodes_updated == 8
+        assert stats.nodes_skipped == 2
+        assert stats.batches == 3
+        assert stats.mode == "full"
+
+    @pytest.mark.asyncio
+    async def test_batches_run_concurrently(self):
+        node_ids = [f"n{i}" for i in range(8)]
+        pool = _ScoringPool(node_ids, [_signal(nid, "reddit") for nid in node_ids])
+        await run_convergence_scoring(pool, batch_size=2, concurrency=3)
+        assert pool.peak_in_flight == 3
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_isolated(self):
+        node_ids = [f"n{i}" for i in range(4)]
+        pool = _ScoringPool(node_ids, [_signal(nid, "reddit") for nid in node_ids])
+        original = _ScoringConn.execute
+
+        async def flaky(self, query, *args):
+            if "n0" in args[0]:
+                raise RuntimeError("deadlock detected")
+            return await original(self, query, *args)
+
+        _ScoringConn.execute = flaky
+        try:
+            stats = await run_convergence_scoring(pool, batch_size=2)
+        finally:
+            _ScoringConn.execute = original
+
+        assert stats.errors == 1
+        assert stats.nodes_updated == 2
+
+    @pytest.mark.asyncio
+    async def test_incremental_filters_on_changed_signals_and_tags(self):
+        pool = _ScoringPool([], [])
+        since = datetime(2026, 3, 1)
+
+        stats = await run_convergence_scoring(pool, since=since)
+
+        query, args = pool.select_queries[0]
+        assert args == (since,)
+        assert 'qs."createdAt" > $1' in query
+        assert 'vt."createdAt" > $1' in query
+        assert 'merged."resolvedToId" = an.id AND merged."updatedAt" > $1' in query
+        assert stats.mode == "incremental"
+        assert pool.updates == []
+
+    @pytest.mark.asyncio
+    async def test_node_ids_and_since_combine(self):
+        pool = _ScoringPool([], [])
+        since = datetime(2026, 3, 1)
+        await run_convergence_scoring(pool, node_ids=["a"], since=since)
+        query, args = pool.select_queries[0]
+        assert args == (["a"], since)
+        assert "ANY($1::text[])" in query
+        assert 'qs."createdAt" > $2' in query
@@ -242,3 +242,51 @@ class TestResolutionStats:
         assert MatchTier.GEOCODE.value == "geocode_proximity"
         assert MatchTier.FUZZY_NAME.value == "fuzzy_name"
         assert MatchTier.CONTENT_HASH.value == "content_hash"
+
+
+# ===================================================================
+# Geocode tier from the in-memory city index
+# ===================================================================
+
+
+class _Indexes:
+    def __init__(self, index):
+        self.index = index
+
+    async def get(self, city):
+        return self.index
+
+
+class TestIndexedGeocodeMatch:
+    def _index(self):
+        from services.api.spatial import CityIndex
+
+        return CityIndex(
+            ["new", "near", "same-spot", "far", "other-cat"],
+            [35.6800, 35.6802, 35.6800, 35.6900, 35.6801],
+            [139.7000, 139.7001, 139.7000, 139.7000, 139.7000],
+            categories=["dining", "dining", "dining", "dining", "culture"],
+        )
+
+    def _node(self):
+        return {
+            "id": "new", "city": "Tokyo", "category": "dining",
+            "latitude": 35.6800, "longitude": 139.7000,
+        }
+
+    @pytest.mark.asyncio
+    async def test_same_category_within_radius(self):
+        resolver = EntityResolver(FakePool(), spatial_indexes=_Indexes(self._index()))
+        candidates = await resolver._match_geocode(None, self._node())
+
+        # Exact-coordinate matches (city-centre fallbacks) are skipped
+        assert [(c.winner_id, c.loser_id, c.tier) for c in candidates] == [
+            ("near", "new", MatchTier.GEOCODE)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_no_index_falls_back(self):
+        resolver = EntityResolver(FakePool(), spatial_indexes=_Indexes(None))
+        assert await resolver._match_geocode_indexed(self._node()) is None
+        resolver = EntityResolver(FakePool())
+        assert await resolver._match_geocode_indexed(self._node()) is None
@@ -0,0 +1,415 @@
+"""
+LLM response cache tests.
+
+Covers:
+- Content-addressed keys: normalization, sensitivity to model/version/payload
+- SQLite round-trip, persistence across instances, hit/miss counters
+- get_default_cache() honours LLM_CACHE_DISABLED
+- Scheduler map(lookup=...) bypasses dispatch for cached items
+- extract_vibe_tags_batch: a replay is served from cache and billed as savings
+- Only parsed/validated bodies are stored; unusable entries are evicted as misses
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import anthropic
+import pytest
+
+from services.api.pipeline import llm_cache
+from services.api.pipeline.llm_cache import LLMResponseCache, cache_key
+from services.api.pipeline.llm_scheduler import LLMWorkScheduler, SchedulerConfig
+from services.api.pipeline.vibe_extraction import (
+    INPUT_COST_PER_1M,
+    MODEL_NAME,
+    OUTPUT_COST_PER_1M,
+    PROMPT_VERSION,
+    ExtractionMetadata,
+    ExtractionResult,
+    NodeInput,
+    NonRetryableAPIError,
+    TagResult,
+    _build_payload,
+    _call_haiku,
+    extract_vibe_tags_batch,
+)
+from services.api.pipeline import backfill_llm, llm_fallback_seeder, research_llm
+
+from .conftest import FakePool, make_id
+
+
+def _payload(text: str = "Venue: Sparrow") -> dict:
+    return {
+        "model": "m",
+        "max_tokens": 768,
+        "system": "sys",
+        "messages": [{"role": "user", "content": text}],
+    }
+
+
+def _body(text: str = "{}", input_tokens: int = 1000, output_tokens: int = 200) -> dict:
+    return {
+        "content": [{"type": "text", "text": text}],
+        "usage": {"input_tokens": input_tokens, "output_tokens": output_tokens},
+    }
+
+
+# ===================================================================
+# Keys
+# ===================================================================
+
+class TestCacheKey:
+    def test_stable_across_dict_order_and_whitespace(self):
+        a = _payload("Venue: Sparrow\r\n")
+        b = dict(reversed(list(_payload("  Venue: Sparrow").items())))
+        assert cache_key("m", "v1", a) == cache_key("m", "v1", b)
+
+    def test_unicode_normalized(self):
+        composed = _payload("Café")
+        decomposed = _payload("Café")
+        assert cache_key("m", "v1", composed) == cache_key("m", "v1", decomposed)
+
+    @pytest.mark.parametrize("model,version,text", [
+        ("other-model", "v1", "Venue: Sparrow"),
+        ("m", "v2", "Venue: Sparrow"),
+        ("m", "v1", "Venue: Thump"),
+    ])
+    def test_any_input_change_changes_key(self, model, version, text):
+        assert cache_key("m", "v1", _payload()) != cache_key(model, version, _payload(text))
+
+
+# ===================================================================
+# Storage
+# ===================================================================
+
+class TestLLMResponseCache:
+    def test_miss_then_hit(self, tmp_path):
+        cache = LLMResponseCache(tmp_path / "c.sqlite3")
+        assert cache.get("m", "v1", _payload()) is None
+
+        cache.put("m", "v1", _payload(), _body('{"tags": []}'))
+        entry = cache.get("m", "v1", _payload())
+
+        assert entry.body["content"][0]["text"] == '{"tags": []}'
+        assert (entry.input_tokens, entry.output_tokens) == (1000, 200)
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+        assert cache.stats.hit_rate == 0.5
+
+    def test_persists_across_instances(self, tmp_path):
+        path = tmp_path / "c.sqlite3"
+        LLMResponseCache(path).put("m", "v1", _payload(), _body())
+        assert LLMResponseCache(path).get("m", "v1", _payload()) is not None
+
+    def test_cost_usd(self):
+        entry = llm_cache.CachedResponse(body={}, input_tokens=1_000_000, output_tokens=500_000)
+        assert entry.cost_usd(0.80, 4.00) == pytest.approx(2.80)
+
+    def test_clear_by_prompt_version(self, tmp_path):
+        cache = LLMResponseCache(tmp_path / "c.sqlite3")
+        cache.put("m", "v1", _payload(), _body())
+        cache.put("m", "v2", _payload(), _body())
+        assert cache.clear("v1") == 1
+        assert len(cache) == 1
+
+    def test_evict_turns_hit_into_miss(self, tmp_path):
+        cache = LLMResponseCache(tmp_path / "c.sqlite3")
+        cache.put("m", "v1", _payload(), _body())
+        entry = cache.get("m", "v1", _payload())
+        cache.evict("m", "v1", _payload(), entry)
+        assert len(cache) == 0
+        assert (cache.stats.hits, cache.stats.misses, cache.stats.evictions) == (0, 1, 1)
+        assert cache.stats.saved_input_tokens == 0
+
+    def test_corrupt_row_is_a_miss(self, tmp_path):
+        cache = LLMResponseCache(tmp_path / "c.sqlite3")
+        cache.put("m", "v1", _payload(), _body())
+        cache._conn.execute("UPDATE llm_responses SET body = 'not json'")
+        assert cache.get("m", "v1", _payload()) is None
+        assert len(cache) == 0
+
+    def test_unserializable_body_is_skipped(self, tmp_path):
+        cache = LLMResponseCache(tmp_path / "c.sqlite3")
+        cache.put("m", "v1", _payload(), {"usage": {}, "x": object()})
+        assert len(cache) == 0
+        assert cache.stats.errors
+
+    def test_expired_entry_is_a_miss_and_deleted(self, tmp_path):
+        cache = LLMResponseCache(tmp_path / "c.sqlite3", ttl_s=3600)
+        cache.put("m", "v1", _payload(), _body())
+        cache._conn.execute(
+            "UPDATE llm_responses SET created_at = '2000-01-01T00:00:00.000000+00:00'"
+        )
+        assert cache.get("m", "v1", _payload()) is None
+        assert len(cache) == 0
+        assert (cache.stats.misses, cache.stats.expired) == (1, 1)
+
+    def test_no_ttl_keeps_old_entries(self, tmp_path):
+        cache = LLMResponseCache(tmp_path / "c.sqlite3", ttl_s=None)
+        cache.put("m", "v1", _payload(), _body())
+        cache._conn.execute(
+            "UPDATE llm_responses SET created_at = '2000-01-01T00:00:00.000000+00:00'"
+        )
+        assert cache.get("m", "v1", _payload()) is not None
+
+    def test_prune_trims_to_max_rows_keeping_hit_and_recent(self, tmp_path):
+        cache = LLMResponseCache(tmp_path / "c.sqlite3", max_rows=2)
+        for i in range(4):
+            cache.put("m", "v1", {"i": i}, _body())
+        cache.get("m", "v1", {"i": 0})
+
+        assert cache.prune() == 2
+        assert len(cache) == 2
+        assert cache.get("m", "v1", {"i": 0}) is not None
+        assert cache.get("m", "v1", {"i": 3}) is not None
+        assert cache.stats.pruned == 2
+
+    def test_put_prunes_periodically(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(llm_cache, "PRUNE_EVERY", 3)
+        cache = LLMResponseCache(tmp_path / "c.sqlite3", max_rows=2)
+        for i in range(3):
+            cache.put("m", "v1", {"i": i}, _body())
+        assert len(cache) == 2
+
+    def test_open_prunes_expired_rows(self, tmp_path):
+        path = tmp_path / "c.sqlite3"
+        first = LLMResponseCache(path)
+        first.put("m", "v1", _payload(), _body())
+        first._conn.execute(
+            "UPDATE llm_responses SET created_at = '2000-01-01T00:00:00.000000+00:00'"
+        )
+        first._conn.commit()
+        assert len(LLMResponseCache(path)) == 0
+
+
+class TestDefaultCache:
+    def test_disabled_by_env(self, monkeypatch):
+        monkeypatch.setenv("LLM_CACHE_DISABLED", "1")
+        assert llm_cache.get_default_cache() is None
+
+    def test_enabled_uses_env_path(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("LLM_CACHE_DISABLED", "")
+        monkeypatch.setenv("LLM_CACHE_PATH", str(tmp_path / "default.sqlite3"))
+        monkeypatch.setattr(llm_cache, "_default_cache", None)
+        cache = llm_cache.get_default_cache()
+        assert cache is llm_cache.get_default_cache()
+        assert cache.path == tmp_path / "default.sqlite3"
+
+    def test_eviction_bounds_from_env(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("LLM_CACHE_DISABLED", "")
+        monkeypatch.setenv("LLM_CACHE_PATH", str(tmp_path / "default.sqlite3"))
+        monkeypatch.setenv("LLM_CACHE_TTL_DAYS", "0")
+        monkeypatch.setenv("LLM_CACHE_MAX_ROWS", "10")
+        monkeypatch.setattr(llm_cache, "_default_cache", None)
+        cache = llm_cache.get_default_cache()
+        assert (cache.ttl_s, cache.max_rows) == (None, 10)
+
+    def test_default_path_is_not_cwd_relative(self):
+        assert llm_cache.DEFAULT_CACHE_PATH.is_absolute()
+        assert llm_cache.DEFAULT_CACHE_PATH.parent.parent.parent == (
+            llm_cache.Path(llm_cache.__file__).resolve().parent.parent
+        )
+
+
+# ===================================================================
+# Scheduler fast path
+# ===================================================================
+
+class TestSchedulerLookup:
+    @pytest.mark.asyncio
+    async def test_lookup_hits_skip_dispatch(self):
+        scheduler = LLMWorkScheduler(SchedulerConfig(
+            requests_per_minute=60_000, tokens_per_minute=10_000_000,
+        ))
+        work = AsyncMock(side_effect=lambda n: n * 10)
+
+        outcomes = await scheduler.map(
+            work, [1, 2, 3, 4], lookup=lambda n: -n if n % 2 else None,
+        )
+
+        assert [o.value for o in outcomes] == [-1, 20, -3, 40]
+        assert work.await_count == 2
+        assert scheduler.stats.bypassed == 2
+        assert scheduler.stats.submitted == 2
+
+
+# ===================================================================
+# Vibe extraction replay
+# ===================================================================
+
+class TestVibeExtractionReplay:
+    @pytest.mark.asyncio
+    async def test_replay_is_served_from_cache(self, tmp_path):
+        nodes = [
+            NodeInput(id=make_id(), name=f"Venue {i}", city="bend", category="dining")
+            for i in range(3)
+        ]
+        cache = LLMResponseCache(tmp_path / "c.sqlite3")
+        body = _body('{"tags": [{"tag": "hidden-gem", "score": 0.9}], "metadata": {}}')
+        for node in nodes[:2]:
+            cache.put(MODEL_NAME, PROMPT_VERSION, _build_payload(node), body)
+
+        async def fake_call(client, api_key, node, cache=None):
+            return ExtractionResult(
+                node_id=node.id, node_name=node.name, city=node.city,
+                tags=[TagResult(tag_slug="hidden-gem", score=0.9)],
+                metadata=ExtractionMetadata(), flagged_contradictions=[],
+                input_tokens=1000, output_tokens=200,
+            )
+
+        with patch("services.api.pipeline.vibe_extraction._call_haiku", side_effect=fake_call) as call, \
+             patch("services.api.pipeline.vibe_extraction._write_vibe_tags", AsyncMock(return_value=1)), \
+             patch("services.api.pipeline.vibe_extraction._resolve_vibe_tag_ids",
+                   AsyncMock(return_value={"hidden-gem": "tag-1"})), \
+             patch("services.api.pipeline.vibe_extraction.EXTRACTION_LOG_DIR", tmp_path):
+            results, stats = await extract_vibe_tags_batch(
+                FakePool(), "key", nodes,
+                scheduler=LLMWorkScheduler(abort_on=(NonRetryableAPIError,)),
+                cache=cache,
+            )
+
+        assert call.call_count == 1
+        assert call.call_args[0][2] is nodes[2]
+        assert [r.node_id for r in results] == [n.id for n in nodes]
+        assert [r.cached for r in results] == [True, True, False]
+        assert stats.cache_hits == 2
+        assert stats.cache_misses == 1
+        assert stats.total_input_tokens == 1000
+        assert stats.cache_saved_usd == pytest.approx(
+            2 * (1000 * INPUT_COST_PER_1M + 200 * OUTPUT_COST_PER_1M) / 1_000_000
+        )
+
+
+# ===================================================================
+# Malformed responses are never cached or replayed
+# ===================================================================
+
+def _http_client(body: dict) -> MagicMock:
+    response = MagicMock()
+    response.json.return_value = body
+    response.raise_for_status = MagicMock()
+    client = MagicMock()
+    client.post = AsyncMock(return_value=response)
+    return client
+
+
+class TestMalformedResponses:
+    @pytest.mark.asyncio
+    async def test_garbage_vibe_body_is_not_cached(self, tmp_path):
+        cache = LLMResponseCache(tmp_path / "c.sqlite3")
+        node = NodeInput(id=make_id(), name="Sparrow", city="bend", category="dining")
+
+        result = await _call_haiku(_http_client(_body("Sorry, I can't help")), "key", node, cache)
+        assert result.tags == []
+        assert len(cache) == 0
+
+        with pytest.raises(ValueError):
+            await _call_haiku(
+                _http_client(_body('{"tags": [{"tag": "hidden-gem", "score": "junk"}]}')),
+                "key", node, cache,
+            )
+        assert len(cache) == 0
+
+        await _call_haiku(
+            _http_client(_body('{"tags": [{"tag": "hidden-gem", "score": 0.9}]}')), "key", node, cache,
+        )
+        assert len(cache) == 1
+
+    @pytest.mark.asyncio
+    async def test_poisoned_vibe_entry_is_evicted_and_refetched(self, tmp_path):
+        nodes = [
+            NodeInput(id=make_id(), name=f"Venue {i}", city="bend", category="dining")
+            for i in range(2)
+        ]
+        cache = LLMResponseCache(tmp_path / "c.sqlite3")
+        cache.put(MODEL_NAME, PROMPT_VERSION, _build_payload(nodes[0]),
+                  _body('{"tags": [{"tag": "hidden-gem", "score": "junk"}]}'))
+
+        async def fake_call(client, api_key, node, cache=None):
+            return ExtractionResult(
+                node_id=node.id, node_name=node.name, city=node.city,
+                tags=[TagResult(tag_slug="hidden-gem", score=0.9)],
+                metadata=ExtractionMetadata(), flagged_contradictions=[],
+                input_tokens=1000, output_tokens=200,
+            )
+
+        with patch("services.api.pipeline.vibe_extraction._call_haiku", side_effect=fake_call) as call, \
+             patch("services.api.pipeline.vibe_extraction._write_vibe_tags", AsyncMock(return_value=1)), \
+             patch("services.api.pipeline.vibe_extraction._resolve_vibe_tag_ids",
+                   AsyncMock(return_value={"hidden-gem": "tag-1"})), \
+             patch("services.api.pipeline.vibe_extraction.EXTRACTION_LOG_DIR", tmp_path):
+            results, stats = await extract_vibe_tags_batch(
+                FakePool(), "key", nodes,
+                scheduler=LLMWorkScheduler(abort_on=(NonRetryableAPIError,)),
+                cache=cache,
+            )
+
+        assert call.call_count == 2
+        assert [r.node_id for r in results] == [n.id for n in nodes]
+        assert stats.cache_hits == 0
+        assert len(cache) == 0
+        assert cache.stats.evictions == 1
+
+    def test_poisoned_fallback_batch_is_evicted(self, tmp_path):
+        cache = LLMResponseCache(tmp_path / "c.sqlite3")
+        signals = [{"id": "s1", "source_name": "blog", "raw_excerpt": "Try Sparrow Bakery"}]
+        payload = llm_fallback_seeder._build_payload(
+            "Bend", llm_fallback_seeder._batch_excerpts(signals),
+        )
+        cache.put(llm_fallback_seeder.MODEL_NAME, llm_fallback_seeder.PROMPT_VERSION,
+                  payload, _body('{"venues": [{"name": 42}]}'))
+        stats = llm_fallback_seeder.FallbackStats()
+
+        result = llm_fallback_seeder._lookup_cached_batch(cache, "Bend", signals, set(), "bend", stats)
+
+        assert result is None
+        assert stats.cache_hits == 0
+        assert stats.cache_misses == 1
+        assert len(cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_research_pass_a_caches_only_after_parse(self, tmp_path):
+        cache = LLMResponseCache(tmp_path / "c.sqlite3")
+        bundle = MagicMock()
+        with patch.object(research_llm, "build_pass_a_prompt", return_value="prompt"), \
+             patch.object(research_llm, "_call_llm", AsyncMock(return_value=_body("not json"))):
+            with pytest.raises(ValueError):
+                await research_llm.run_pass_a(bundle, api_key="key", client=MagicMock(), cache=cache)
+        assert len(cache) == 0
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("reply, cached_entries", [("maybe", 0), ("tier_3", 1)])
+    async def test_backfill_classify_caches_only_after_parse(self, tmp_path, reply, cached_entries):
+        cache = LLMResponseCache(tmp_path / "c.sqlite3")
+        message = anthropic.types.Message.model_validate({
+            "id": "msg_1", "type": "message", "role": "assistant",
+            "model": backfill_llm.HAIKU_MODEL, "stop_reason": "end_turn",
+            "content": [{"type": "text", "text": reply}],
+            "usage": {"input_tokens": 10, "output_tokens": 1},
+        })
+        client = MagicMock()
+        client.messages.create = AsyncMock(return_value=message)
+
+        with patch.object(backfill_llm, "get_default_cache", return_value=cache):
+            await backfill_llm.classify_submission(client, "diary")
+            await backfill_llm.classify_submission(client, "diary")
+
+        assert len(cache) == cached_entries
+        assert client.messages.create.call_count == 2 - cached_entries
+
+    @pytest.mark.asyncio
+    async def test_backfill_tool_reply_without_list_is_not_cached(self, tmp_path):
+        cache = LLMResponseCache(tmp_path / "c.sqlite3")
+        message = anthropic.types.Message.model_validate({
+            "id": "msg_1", "type": "message", "role": "assistant",
+            "model": backfill_llm.SONNET_MODEL, "stop_reason": "tool_use",
+            "content": [{"type": "tool_use", "id": "tu_1", "name": "extract_venues",
+                         "input": {"venues": "none"}}],
+            "usage": {"input_tokens": 10, "output_tokens": 5},
+        })
+        client = MagicMock()
+        client.messages.create = AsyncMock(return_value=message)
+
+        with patch.object(backfill_llm, "get_default_cache", return_value=cache):
+            assert await backfill_llm.extract_venues(client, "diary", None) == []
+
+        assert len(cache) == 0
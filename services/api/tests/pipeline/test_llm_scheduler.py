@@ -0,0 +1,392 @@
+"""
+LLM work scheduler tests.
+
+Covers:
+- Bounded concurrency and ordered outcomes from map()
+- Ordered batch flushing via on_batch
+- lookup() fast path, including a lookup that raises
+- stop_on_error: no dispatch after the first item error
+- Global abort on a declared fatal error (NonRetryableAPIError)
+- 429 handling: concurrency halves, shared pause, additive recovery
+- Token bucket pacing and estimate reconciliation
+- extract_vibe_tags_batch: concurrent extraction + DLQ on abort
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from services.api.pipeline.llm_scheduler import (
+    LLMWorkScheduler,
+    SchedulerAborted,
+    SchedulerConfig,
+    TokenBucket,
+)
+from services.api.pipeline.vibe_extraction import (
+    ExtractionMetadata,
+    ExtractionResult,
+    NodeInput,
+    NonRetryableAPIError,
+    TagResult,
+    extract_vibe_tags_batch,
+)
+
+from .conftest import FakePool, make_id
+
+
+def _fast_config(**overrides) -> SchedulerConfig:
+    """Limits high enough that buckets never block in unit tests."""
+    cfg = dict(
+        max_concurrency=4,
+        requests_per_minute=60_000,
+        tokens_per_minute=10_000_000,
+        backoff_base_s=0.01,
+    )
+    cfg.update(overrides)
+    return SchedulerConfig(**cfg)
+
+
+# ===================================================================
+# map(): concurrency + ordering
+# ===================================================================
+
+class TestMap:
+    @pytest.mark.asyncio
+    async def test_outcomes_in_input_order(self):
+        scheduler = LLMWorkScheduler(_fast_config())
+
+        async def work(n: int) -> int:
+            await asyncio.sleep(0.001 * (10 - n))  # later items finish first
+            return n * 2
+
+        outcomes = await scheduler.map(work, list(range(10)))
+        assert [o.value for o in outcomes] == [n * 2 for n in range(10)]
+        assert all(o.started and o.error is None for o in outcomes)
+        assert scheduler.stats.completed == 10
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self):
+        scheduler = LLMWorkScheduler(_fast_config(max_concurrency=3))
+        in_flight = 0
+        peak = 0
+
+        async def work(_: int) -> None:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.005)
+            in_flight -= 1
+
+        await scheduler.map(work, list(range(12)))
+        assert peak == 3
+        assert scheduler.stats.peak_in_flight == 3
+
+    @pytest.mark.asyncio
+    async def test_runs_concurrently(self):
+        scheduler = LLMWorkScheduler(_fast_config(max_concurrency=8))
+
+        async def work(_: int) -> None:
+            await asyncio.sleep(0.05)
+
+        t0 = time.monotonic()
+        await scheduler.map(work, list(range(8)))
+        # 8 x 50ms serially would be 400ms
+        assert time.monotonic() - t0 < 0.2
+
+    @pytest.mark.asyncio
+    async def test_errors_captured_per_item(self):
+        scheduler = LLMWorkScheduler(_fast_config())
+
+        async def work(n: int) -> int:
+            if n == 2:
+                raise ValueError("boom")
+            return n
+
+        outcomes = await scheduler.map(work, list(range(4)))
+        assert isinstance(outcomes[2].error, ValueError)
+        assert [o.value for o in outcomes if o.error is None] == [0, 1, 3]
+        assert scheduler.stats.failed == 1
+
+    @pytest.mark.asyncio
+    async def test_on_batch_flushes_in_order(self):
+        scheduler = LLMWorkScheduler(_fast_config())
+        flushed: list[list[int]] = []
+
+        async def work(n: int) -> int:
+            await asyncio.sleep(0.001 * ((n * 7) % 5))
+            return n
+
+        async def on_batch(batch):
+            flushed.append([o.value for o in batch])
+
+        await scheduler.map(work, list(range(7)), on_batch=on_batch, batch_size=3)
+        assert flushed == [[0, 1, 2], [3, 4, 5], [6]]
+
+    @pytest.mark.asyncio
+    async def test_on_batch_failure_cancels_sibling_workers(self):
+        scheduler = LLMWorkScheduler(_fast_config(max_concurrency=4))
+        started: list[int] = []
+        finished: list[int] = []
+        failed = False
+
+        async def work(n: int) -> int:
+            started.append(n)
+            # Item 0 finishes first; the others are still in flight when it flushes
+            await asyncio.sleep(0 if n == 0 else 0.05)
+            finished.append(n)
+            return n
+
+        async def on_batch(batch):
+            nonlocal failed
+            failed = True
+            raise RuntimeError("write failed")
+
+        with pytest.raises(RuntimeError, match="write failed"):
+            await scheduler.map(work, list(range(20)), on_batch=on_batch, batch_size=1)
+
+        assert failed
+        calls_at_failure = len(started)
+        await asyncio.sleep(0.1)
+        # No call started after the failure and the in-flight ones never completed
+        assert len(started) == calls_at_failure == 4
+        assert finished == [0]
+
+    @pytest.mark.asyncio
+    async def test_lookup_error_falls_back_to_live_call(self):
+        scheduler = LLMWorkScheduler(_fast_config())
+
+        def lookup(n: int):
+            if n == 1:
+                raise RuntimeError("cache unreadable")
+            return -n if n == 2 else None
+
+        async def work(n: int) -> int:
+            return n
+
+        outcomes = await scheduler.map(work, list(range(4)), lookup=lookup)
+        assert [o.value for o in outcomes] == [0, 1, -2, 3]
+        assert all(o.error is None for o in outcomes)
+        assert scheduler.stats.bypassed == 1
+        assert scheduler.stats.submitted == 3
+
+    @pytest.mark.asyncio
+    async def test_stop_on_error_stops_dispatch(self):
+        scheduler = LLMWorkScheduler(_fast_config(max_concurrency=1))
+        calls: list[int] = []
+
+        async def work(n: int) -> int:
+            calls.append(n)
+            if n == 1:
+                raise ValueError("bad batch")
+            return n
+
+        outcomes = await scheduler.map(work, list(range(5)), stop_on_error=True)
+        assert calls == [0, 1]
+        assert isinstance(outcomes[1].error, ValueError)
+        assert [o.started for o in outcomes] == [True, True, False, False, False]
+        assert scheduler.aborted is None
+
+        # Scoped to that call: the scheduler keeps accepting work
+        assert [o.value for o in await scheduler.map(work, [2, 3])] == [2, 3]
+
+    @pytest.mark.asyncio
+    async def test_empty_items(self):
+        scheduler = LLMWorkScheduler(_fast_config())
+        on_batch = AsyncMock()
+        assert await scheduler.map(AsyncMock(), [], on_batch=on_batch) == []
+        on_batch.assert_not_called()
+
+
+# ===================================================================
+# Abort
+# ===================================================================
+
+class TestAbort:
+    @pytest.mark.asyncio
+    async def test_fatal_error_stops_dispatch(self):
+        scheduler = LLMWorkScheduler(
+            _fast_config(max_concurrency=1), abort_on=(NonRetryableAPIError,),
+        )
+        calls: list[int] = []
+
+        async def work(n: int) -> int:
+            calls.append(n)
+            if n == 1:
+                raise NonRetryableAPIError("credit balance is too low")
+            return n
+
+        outcomes = await scheduler.map(work, list(range(5)))
+        assert calls == [0, 1]
+        assert isinstance(scheduler.aborted, NonRetryableAPIError)
+        assert [o.started for o in outcomes] == [True, True, False, False, False]
+        assert scheduler.stats.aborted == 3
+
+    @pytest.mark.asyncio
+    async def test_submit_after_abort_raises(self):
+        scheduler = LLMWorkScheduler(_fast_config(), abort_on=(NonRetryableAPIError,))
+
+        async def fatal():
+            raise NonRetryableAPIError("invalid x-api-key")
+
+        with pytest.raises(NonRetryableAPIError):
+            await scheduler.submit(fatal)
+        with pytest.raises(SchedulerAborted):
+            await scheduler.submit(AsyncMock(return_value=1))
+
+
+# ===================================================================
+# Rate limiting + backoff
+# ===================================================================
+
+class TestBackoff:
+    @pytest.mark.asyncio
+    async def test_throttle_halves_concurrency(self):
+        scheduler = LLMWorkScheduler(_fast_config(max_concurrency=8))
+        await scheduler.throttle(0.0)
+        assert scheduler.concurrency_limit == 4
+        await scheduler.throttle(0.0)
+        assert scheduler.concurrency_limit == 2
+        assert scheduler.stats.rate_limited == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrency_never_below_min(self):
+        scheduler = LLMWorkScheduler(_fast_config(max_concurrency=2, min_concurrency=1))
+        for _ in range(4):
+            await scheduler.throttle(0.0)
+        assert scheduler.concurrency_limit == 1
+
+    @pytest.mark.asyncio
+    async def test_recovers_after_successes(self):
+        scheduler = LLMWorkScheduler(_fast_config(max_concurrency=4))
+        await scheduler.throttle(0.0)
+        assert scheduler.concurrency_limit == 2
+        for _ in range(2):
+            await scheduler.submit(AsyncMock(return_value=None))
+        assert scheduler.concurrency_limit == 3
+
+    @pytest.mark.asyncio
+    async def test_throttle_pauses_other_submissions(self):
+        scheduler = LLMWorkScheduler(_fast_config())
+        t0 = time.monotonic()
+        scheduler._note_rate_limited(0.05)  # as if another job hit a 429
+        await scheduler.submit(AsyncMock(return_value=None))
+        assert time.monotonic() - t0 >= 0.04
+
+    @pytest.mark.asyncio
+    async def test_http_429_from_job_is_recorded(self):
+        scheduler = LLMWorkScheduler(_fast_config(max_concurrency=4))
+        response = httpx.Response(429, request=httpx.Request("POST", "https://x"))
+
+        async def limited():
+            raise httpx.HTTPStatusError("429", request=response.request, response=response)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await scheduler.submit(limited)
+        assert scheduler.stats.rate_limited == 1
+        assert scheduler.concurrency_limit == 2
+
+
+class TestTokenBucket:
+    @pytest.mark.asyncio
+    async def test_acquire_waits_for_refill(self):
+        bucket = TokenBucket(per_minute=600, burst=1)  # 10/s
+        await bucket.acquire(1)
+        t0 = time.monotonic()
+        await bucket.acquire(1)
+        assert time.monotonic() - t0 >= 0.08
+
+    @pytest.mark.asyncio
+    async def test_oversized_request_is_clamped(self):
+        bucket = TokenBucket(per_minute=60_000, burst=5)
+        await asyncio.wait_for(bucket.acquire(100), timeout=1.0)
+
+    def test_debit_reconciles_estimate(self):
+        bucket = TokenBucket(per_minute=60, burst=10)
+        bucket.debit(15)
+        assert bucket.available < 0
+
+    def test_rejects_non_positive_rate(self):
+        with pytest.raises(ValueError):
+            TokenBucket(per_minute=0)
+
+
+# ===================================================================
+# Vibe extraction integration
+# ===================================================================
+
+def _node(i: int) -> NodeInput:
+    return NodeInput(id=make_id(), name=f"Venue {i}", city="bend", category="dining")
+
+
+def _result(node: NodeInput) -> ExtractionResult:
+    return ExtractionResult(
+        node_id=node.id, node_name=node.name, city=node.city,
+        tags=[TagResult(tag_slug="hidden-gem", score=0.9)],
+        metadata=ExtractionMetadata(), flagged_contradictions=[],
+        input_tokens=100, output_tokens=20,
+    )
+
+
+class TestExtractVibeTagsBatch:
+    @pytest.mark.asyncio
+    async def test_results_written_in_order(self, tmp_path):
+        nodes = [_node(i) for i in range(12)]
+
+        async def fake_call(client, api_key, node, cache=None):
+            await asyncio.sleep(0.001 * (len(node.name) % 3))
+            return _result(node)
+
+        written: list[list[str]] = []
+
+        async def fake_write(pool, results, tag_id_map):
+            written.append([r.node_id for r in results])
+            return len(results)
+
+        with patch("services.api.pipeline.vibe_extraction._call_haiku", side_effect=fake_call), \
+             patch("services.api.pipeline.vibe_extraction._write_vibe_tags", side_effect=fake_write), \
+             patch("services.api.pipeline.vibe_extraction._resolve_vibe_tag_ids",
+                   AsyncMock(return_value={"hidden-gem": "tag-1"})), \
+             patch("services.api.pipeline.vibe_extraction.EXTRACTION_LOG_DIR", tmp_path):
+            results, stats = await extract_vibe_tags_batch(
+                FakePool(), "key", nodes,
+                scheduler=LLMWorkScheduler(_fast_config(), abort_on=(NonRetryableAPIError,)),
+            )
+
+        assert [r.node_id for r in results] == [n.id for n in nodes]
+        assert [len(b) for b in written] == [10, 2]
+        assert stats.nodes_processed == 12
+        assert stats.tags_written == 12
+        assert stats.total_input_tokens == 1200
+
+    @pytest.mark.asyncio
+    async def test_non_retryable_writes_unfinished_nodes_to_dlq(self, tmp_path):
+        nodes = [_node(i) for i in range(5)]
+        response = httpx.Response(
+            400, text="Your credit balance is too low",
+            request=httpx.Request("POST", "https://api.anthropic.com/v1/messages"),
+        )
+
+        async def fake_call(client, api_key, node, cache=None):
+            if node is nodes[1]:
+                raise httpx.HTTPStatusError("400", request=response.request, response=response)
+            return _result(node)
+
+        with patch("services.api.pipeline.vibe_extraction._call_haiku", side_effect=fake_call), \
+             patch("services.api.pipeline.vibe_extraction._write_dead_letter") as mock_dlq, \
+             patch("services.api.pipeline.vibe_extraction._write_vibe_tags", AsyncMock(return_value=1)), \
+             patch("services.api.pipeline.vibe_extraction._resolve_vibe_tag_ids", AsyncMock(return_value={})), \
+             patch("services.api.pipeline.vibe_extraction.EXTRACTION_LOG_DIR", tmp_path):
+            results, stats = await extract_vibe_tags_batch(
+                FakePool(), "key", nodes,
+                scheduler=LLMWorkScheduler(
+                    _fast_config(max_concurrency=1), abort_on=(NonRetryableAPIError,),
+                ),
+            )
+
+        assert [r.node_id for r in results] == [nodes[0].id]
+        dlq_nodes = mock_dlq.call_args[0][1]
+        assert [n.id for n in dlq_nodes] == [n.id for n in nodes[1:]]
+        assert any("Non-retryable" in e for e in stats.errors)
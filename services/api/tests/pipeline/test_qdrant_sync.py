@@ -0,0 +1,288 @@
+"""
+Qdrant sync pipeline tests.
+
+Covers:
+- Keyset page query: parameter numbering with/without since + cursor
+- _iter_node_pages walks the table page by page without OFFSET
+- run_full_sync streams every node through embed → upsert (wait=False)
+  and finishes with a wait=True barrier
+- Embedding failures are isolated to their batch
+- Stage stats: throughput and queue peaks
+- A DB error propagates unwrapped
+- Text fingerprints: unchanged text gets a payload-only update, no re-embed
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from services.api.pipeline import qdrant_sync
+from services.api.pipeline.qdrant_sync import (
+    COLLECTION_NAME,
+    SyncStats,
+    _fetch_node_page,
+    _iter_node_pages,
+    run_full_sync,
+    run_incremental_sync,
+    text_fingerprint,
+)
+
+from .conftest import FakeEmbeddingService, FakeQdrantClient, make_activity_node
+
+
+def _nodes(n: int) -> list:
+    base = datetime(2026, 1, 1)
+    nodes = []
+    for i in range(n):
+        node = make_activity_node(name=f"Venue {i}", updated_at=base + timedelta(minutes=i))
+        node["vibe_tag_slugs"] = ["hidden-gem"]
+        nodes.append(node)
+    return nodes
+
+
+class _Table:
+    """Stand-in for _fetch_node_page over an in-memory, updatedAt-ordered table."""
+
+    def __init__(self, nodes: list) -> None:
+        self.nodes = sorted(nodes, key=lambda r: (r["updatedAt"], r["id"]))
+        self.calls: list[dict] = []
+
+    async def __call__(self, pool, *, since=None, after=None, limit=100):
+        self.calls.append({"since": since, "after": after, "limit": limit})
+        rows = [r for r in self.nodes if since is None or r["updatedAt"] > since]
+        if after is not None:
+            rows = [r for r in rows if (r["updatedAt"], r["id"]) > after]
+        return rows[:limit]
+
+
+class _RecordingQdrant(FakeQdrantClient):
+    def __init__(self) -> None:
+        super().__init__()
+        self.waits: list[bool] = []
+
+    async def upsert(self, collection_name, points, wait=True):
+        self.waits.append(wait)
+        await super().upsert(collection_name, points, wait=wait)
+
+
+class _CapturingConn:
+    def __init__(self) -> None:
+        self.query = ""
+        self.args: tuple = ()
+
+    async def fetch(self, query, *args):
+        self.query, self.args = query, args
+        return []
+
+
+class _CapturingPool:
+    def __init__(self) -> None:
+        self.conn = _CapturingConn()
+
+    def acquire(self):
+        conn = self.conn
+
+        class _Acquire:
+            async def __aenter__(self):
+                return conn
+
+            async def __aexit__(self, *exc):
+                pass
+
+        return _Acquire()
+
+
+# ===================================================================
+# Keyset reader
+# ===================================================================
+
+class TestKeysetReader:
+    @pytest.mark.asyncio
+    async def test_first_page_params(self):
+        pool = _CapturingPool()
+        await _fetch_node_page(pool, limit=50)
+        assert pool.conn.args == (50,)
+        assert "LIMIT $1" in pool.conn.query
+        assert "OFFSET" not in pool.conn.query
+
+    @pytest.mark.asyncio
+    async def test_cursor_and_since_params(self):
+        pool = _CapturingPool()
+        since = datetime(2026, 1, 1)
+        after = (datetime(2026, 1, 2), "node-9")
+        await _fetch_node_page(pool, since=since, after=after, limit=10)
+        assert pool.conn.args == (since, after[0], "node-9", 10)
+        assert '"updatedAt" > $1' in pool.conn.query
+        assert '("updatedAt", id) > ($2, $3)' in pool.conn.query
+        assert "LIMIT $4" in pool.conn.query
+
+    @pytest.mark.asyncio
+    async def test_iterates_pages_with_cursor(self):
+        table = _Table(_nodes(25))
+        stats = SyncStats()
+        with patch.object(qdrant_sync, "_fetch_node_page", table):
+            pages = [p async for p in _iter_node_pages(None, stats, page_size=10)]
+
+        assert [len(p) for p in pages] == [10, 10, 5]
+        assert table.calls[0]["after"] is None
+        assert table.calls[1]["after"] == (pages[0][-1]["updatedAt"], pages[0][-1]["id"])
+        assert stats.pages_read == 3
+        assert stats.nodes_fetched == 25
+
+
+# ===================================================================
+# Streaming pipeline
+# ===================================================================
+
+async def _run_full(nodes, qdrant, embedder, *, queue_depth: int = 4, **kwargs):
+    with patch.object(qdrant_sync, "_fetch_node_page", _Table(nodes)), \
+         patch.object(qdrant_sync, "AsyncQdrantClient", return_value=qdrant), \
+         patch.object(qdrant_sync, "_get_canonical_count", AsyncMock(return_value=len(nodes))), \
+         patch.object(qdrant_sync, "BATCH_SIZE", 10), \
+         patch.object(qdrant_sync, "QUEUE_DEPTH", queue_depth):
+        return await run_full_sync(None, embedder, qdrant_url="http://qdrant", **kwargs)
+
+
+class TestPipelinedSync:
+    @pytest.mark.asyncio
+    async def test_full_sync_upserts_every_node(self):
+        nodes = _nodes(35)
+        qdrant = _RecordingQdrant()
+        embedder = FakeEmbeddingService()
+
+        stats = await _run_full(nodes, qdrant, embedder)
+
+        points = qdrant.collections[COLLECTION_NAME].points
+        assert set(points) == {n["id"] for n in nodes}
+        assert stats.nodes_fetched == 35
+        assert stats.nodes_embedded == 35
+        assert stats.nodes_upserted == 35
+        assert stats.errors == 0
+        assert not stats.error_details  # parity OK
+
+    @pytest.mark.asyncio
+    async def test_upserts_are_async_with_final_barrier(self):
+        qdrant = _RecordingQdrant()
+        await _run_full(_nodes(30), qdrant, FakeEmbeddingService())
+        assert qdrant.waits[:-1] == [False, False, False]
+        assert qdrant.waits[-1] is True
+
+    @pytest.mark.asyncio
+    async def test_payload_shape(self):
+        nodes = _nodes(1)
+        qdrant = _RecordingQdrant()
+        await _run_full(nodes, qdrant, FakeEmbeddingService())
+        payload = qdrant.collections[COLLECTION_NAME].points[nodes[0]["id"]]["payload"]
+        assert payload["vibe_tag_slugs"] == ["hidden-gem"]
+        assert payload["is_canonical"] is True
+        assert payload["city"] == "tokyo"
+
+    @pytest.mark.asyncio
+    async def test_embedding_failure_is_isolated(self):
+        class FlakyEmbedder(FakeEmbeddingService):
+            def embed_batch(self, texts, batch_size=32, is_query=False):
+                if "Venue 12" in " ".join(texts):
+                    raise RuntimeError("OOM")
+                return super().embed_batch(texts, batch_size, is_query)
+
+        qdrant = _RecordingQdrant()
+        stats = await _run_full(_nodes(30), qdrant, FlakyEmbedder())
+
+        assert stats.nodes_upserted == 20
+        assert stats.errors == 10
+        assert any("Embedding batch failed" in e for e in stats.error_details)
+
+    @pytest.mark.asyncio
+    async def test_stage_stats(self):
+        stats = await _run_full(
+            _nodes(60), _RecordingQdrant(), FakeEmbeddingService(), queue_depth=1,
+        )
+        assert stats.pages_read == 6
+        assert 0 < stats.embed_queue_peak <= 1
+        assert stats.upsert_queue_peak <= 1
+        throughput = stats.stage_throughput()
+        assert set(throughput) == {"read", "embed", "upsert"}
+        assert throughput["embed"] > 0
+
+    @pytest.mark.asyncio
+    async def test_incremental_with_no_changes(self):
+        qdrant = _RecordingQdrant()
+        with patch.object(qdrant_sync, "_fetch_node_page", _Table(_nodes(5))), \
+             patch.object(qdrant_sync, "AsyncQdrantClient", return_value=qdrant):
+            stats = await run_incremental_sync(
+                None, FakeEmbeddingService(), since=datetime(2030, 1, 1),
+            )
+        assert stats.nodes_fetched == 0
+        assert qdrant.waits == []
+
+    @pytest.mark.asyncio
+    async def test_db_error_propagates_unwrapped(self):
+        async def broken(pool, **kwargs):
+            raise ConnectionError("db down")
+
+        with patch.object(qdrant_sync, "_fetch_node_page", broken), \
+             patch.object(qdrant_sync, "AsyncQdrantClient", return_value=_RecordingQdrant()):
+            with pytest.raises(ConnectionError, match="db down"):
+                await run_full_sync(None, FakeEmbeddingService())
+
+
+# ===================================================================
+# Fingerprint skip
+# ===================================================================
+
+class TestFingerprintSkip:
+    def test_fingerprint_tracks_text_and_model(self):
+        base = text_fingerprint("Sparrow. Category: dining", "nomic")
+        assert base == text_fingerprint("Sparrow. Category: dining", "nomic")
+        assert base != text_fingerprint("Sparrow. Category: bar", "nomic")
+        assert base != text_fingerprint("Sparrow. Category: dining", "other-model")
+
+    @pytest.mark.asyncio
+    async def test_score_only_change_skips_embedding(self):
+        nodes = _nodes(25)
+        qdrant = _RecordingQdrant()
+        await _run_full(nodes, qdrant, FakeEmbeddingService())
+
+        for node in nodes:
+            node["convergenceScore"] = 0.9
+        embedder = FakeEmbeddingService()
+        stats = await _run_full(nodes, qdrant, embedder)
+
+        assert embedder.calls == []
+        assert stats.nodes_embedded == 0
+        assert stats.nodes_payload_only == 25
+        assert stats.nodes_upserted == 0
+        points = qdrant.collections[COLLECTION_NAME].points
+        assert all(p["payload"]["convergence_score"] == 0.9 for p in points.values())
+
+    @pytest.mark.asyncio
+    async def test_text_change_is_reembedded(self):
+        nodes = _nodes(10)
+        qdrant = _RecordingQdrant()
+        await _run_full(nodes, qdrant, FakeEmbeddingService())
+
+        nodes[3]["descriptionShort"] = "Now with a rooftop bar"
+        embedder = FakeEmbeddingService()
+        stats = await _run_full(nodes, qdrant, embedder)
+
+        assert stats.nodes_embedded == 1
+        assert stats.nodes_payload_only == 9
+        assert "rooftop" in embedder.calls[0][0][0]
+
+    @pytest.mark.asyncio
+    async def test_reembed_forces_full_upsert(self):
+        nodes = _nodes(10)
+        qdrant = _RecordingQdrant()
+        await _run_full(nodes, qdrant, FakeEmbeddingService())
+        stats = await _run_full(nodes, qdrant, FakeEmbeddingService(), reembed=True)
+        assert stats.nodes_embedded == 10
+        assert stats.nodes_payload_only == 0
+
+    @pytest.mark.asyncio
+    async def test_lookup_failure_falls_back_to_embedding(self):
+        qdrant = _RecordingQdrant()
+        qdrant.retrieve = AsyncMock(side_effect=RuntimeError("timeout"))
+        stats = await _run_full(_nodes(10), qdrant, FakeEmbeddingService())
+        assert stats.nodes_embedded == 10
+        assert stats.errors == 0
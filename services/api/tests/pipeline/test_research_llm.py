@@ -7,6 +7,7 @@ from services.api.pipeline.research_llm import (
     build_pass_b_prompt, run_pass_b, parse_pass_b_response,
     filter_injection_patterns, MODEL_NAME, PROMPT_VERSION_A, PROMPT_VERSION_B,
 )
+from services.api.pipeline.llm_scheduler import LLMWorkScheduler, SchedulerConfig
 from services.api.pipeline.source_bundle import SourceBundle
 
 
@@ -226,6 +227,33 @@ class TestRunPassB:
             api_key="test-key", client=mock_client)
         assert call_count == 3  # 120/50 = 3 batches
 
+    @pytest.mark.asyncio
+    async def test_failed_batch_stops_later_batches(self):
+        call_count = 0
+        async def mock_post(*args, **kwargs):
+            nonlocal call_count
+            call_count += 1
+            resp = MagicMock()
+            resp.raise_for_status = MagicMock()
+            resp.status_code = 200
+            resp.text = "not json"
+            resp.json.return_value = {
+                "content": [{"type": "text", "text": "not json"}],
+                "usage": {"input_tokens": 100, "output_tokens": 50}}
+            return resp
+
+        mock_client = AsyncMock()
+        mock_client.post = mock_post
+        scheduler = LLMWorkScheduler(SchedulerConfig(
+            max_concurrency=1, requests_per_minute=60_000, tokens_per_minute=10_000_000))
+
+        with pytest.raises(ValueError, match="not valid JSON"):
+            await run_pass_b(
+                _make_bundle(), {}, [f"V{i}" for i in range(200)], ["hidden-gem"],
+                api_key="test-key", client=mock_client, scheduler=scheduler)
+        assert call_count == 1
+        assert scheduler.stats.aborted == 3
+
     @pytest.mark.asyncio
     async def test_concatenates_results(self):
         resp_data = json.dumps({"venues": [
@@ -28,6 +28,8 @@ from services.api.scrapers.atlas_obscura import (
     _map_category,
 )
 from services.api.scrapers.arctic_shift import (
+    VENUE_HINT_PATTERNS,
+    VENUE_STOPWORDS,
     ArcticShiftScraper,
     compute_authority_score,
     compute_sentiment,
@@ -166,6 +168,25 @@ class TestAtlasObscuraScraper:
 # ===================================================================
 
 
+def _reference_venue_names(text):
+    """Pattern-by-pattern extraction: every pattern scans the full text."""
+    candidates = []
+    for pattern in VENUE_HINT_PATTERNS:
+        for match in pattern.finditer(text):
+            name = match.group(1).strip().rstrip(".")
+            if name.lower() in VENUE_STOPWORDS or len(name) < 3:
+                continue
+            if name == name.lower() and not any("\u3000" <= c <= "\u9fff" for c in name):
+                continue
+            candidates.append(name)
+    seen, unique = set(), []
+    for c in candidates:
+        if c.lower().strip() not in seen:
+            seen.add(c.lower().strip())
+            unique.append(c)
+    return unique
+
+
 class TestArcticShiftScraper:
     def test_detect_city_austin(self):
         assert detect_city("I walked down South Congress and grabbed tacos on East Austin") == "austin"
@@ -191,6 +212,21 @@ class TestArcticShiftScraper:
         names = extract_venue_names(text)
         assert not any(n.lower() == "japan" for n in names)
 
+    @pytest.mark.parametrize("text", [
+        "We visited Senso-ji is amazing",
+        "Definitely try Senso-ji Temple was great",
+        "I ate at Ichiran Ramen was incredible",
+        'Check out **Golden Gai** and "Omoide Yokocho" is worth it',
+        "We went to Nishiki Market, then visited **Nishiki Market** again",
+    ])
+    def test_extract_venue_names_keeps_overlapping_hints(self, text):
+        assert extract_venue_names(text) == _reference_venue_names(text)
+
+    def test_extract_venue_names_overlap_found_by_each_pattern(self):
+        names = extract_venue_names("Definitely try Senso-ji Temple was great")
+        assert "Senso-ji Temple was great" in names
+        assert "Definitely try Senso-ji Temple" in names
+
     def test_compute_sentiment_positive(self):
         assert compute_sentiment("This place was amazing and fantastic") == "positive"
 
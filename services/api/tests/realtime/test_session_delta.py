@@ -10,7 +10,11 @@ from __future__ import annotations
 import pytest
 from unittest.mock import AsyncMock, MagicMock
 
-from services.api.realtime.session_delta import SessionPersonaDelta, _redis_key
+from services.api.realtime.session_delta import (
+    SessionPersonaDelta,
+    SessionSignal,
+    _redis_key,
+)
 
 
 # ---------------------------------------------------------------------------
@@ -21,12 +25,25 @@ class FakeRedis:
     """
     Minimal dict-backed Redis fake implementing the operations used by
     SessionPersonaDelta:
-      hget, hset, hincrby, hgetall, expire, delete
+      hget, hset, hincrby, hincrbyfloat, hgetall, expire, delete, pipeline
     """
 
     def __init__(self) -> None:
         self._store: dict[str, dict[str, str]] = {}
         self._ttls: dict[str, int] = {}
+        self.pipelines: list["FakePipeline"] = []
+
+    def pipeline(self, transaction: bool = True) -> "FakePipeline":
+        pipe = FakePipeline(self, transaction)
+        self.pipelines.append(pipe)
+        return pipe
+
+    async def hincrbyfloat(self, key: str, field: str, amount: float) -> float:
+        if key not in self._store:
+            self._store[key] = {}
+        new_val = float(self._store[key].get(field, "0")) + amount
+        self._store[key][field] = repr(new_val)
+        return new_val
 
     async def hget(self, key: str, field: str) -> str | None:
         return self._store.get(key, {}).get(field)
@@ -62,6 +79,29 @@ class FakeRedis:
         return self._ttls.get(key)
 
 
+class FakePipeline:
+    """Queues commands and runs them against FakeRedis on execute()."""
+
+    def __init__(self, redis: FakeRedis, transaction: bool) -> None:
+        self._redis = redis
+        self.transaction = transaction
+        self.commands: list[tuple[str, tuple, dict]] = []
+        self.executed = 0
+
+    def __getattr__(self, name: str):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+        return queue
+
+    async def execute(self) -> list:
+        self.executed += 1
+        return [
+            await getattr(self._redis, name)(*args, **kwargs)
+            for name, args, kwargs in self.commands
+        ]
+
+
 # ---------------------------------------------------------------------------
 # Fixtures
 # ---------------------------------------------------------------------------
@@ -364,15 +404,17 @@ class TestErrorHandling:
     @pytest.mark.asyncio
     async def test_apply_signal_survives_redis_error(self):
         """apply_signal should not propagate Redis exceptions."""
-        bad_redis = AsyncMock()
-        bad_redis.hget.side_effect = ConnectionError("Redis down")
-        bad_redis.hset.side_effect = ConnectionError("Redis down")
-        bad_redis.hincrby.side_effect = ConnectionError("Redis down")
-        bad_redis.expire.side_effect = ConnectionError("Redis down")
+        bad_redis = MagicMock()
+        bad_redis.pipeline.return_value.execute = AsyncMock(
+            side_effect=ConnectionError("Redis down")
+        )
 
         delta = SessionPersonaDelta(bad_redis)
         # Should not raise
         await delta.apply_signal(USER_ID, SESSION_ID, "slot_confirm", "restaurant", "active")
+        assert await delta.apply_signals(
+            [SessionSignal(USER_ID, SESSION_ID, "slot_confirm", "museum", "active")]
+        ) == 0
 
     @pytest.mark.asyncio
     async def test_get_delta_returns_empty_on_redis_error(self):
@@ -382,3 +424,60 @@ class TestErrorHandling:
         delta = SessionPersonaDelta(bad_redis)
         result = await delta.get_delta(USER_ID, SESSION_ID)
         assert result == {}
+
+
+# ---------------------------------------------------------------------------
+# Pipelined writes + batch entry point
+# ---------------------------------------------------------------------------
+
+class TestPipelinedWrites:
+    @pytest.mark.asyncio
+    async def test_single_signal_is_one_transaction(self, delta, fake_redis):
+        await delta.apply_signal(USER_ID, SESSION_ID, "slot_confirm", "hike", "active")
+
+        assert len(fake_redis.pipelines) == 1
+        pipe = fake_redis.pipelines[0]
+        assert pipe.transaction is True
+        assert pipe.executed == 1
+        names = [name for name, _, _ in pipe.commands]
+        assert names == ["hincrbyfloat", "hincrbyfloat", "hincrby", "hset", "expire"]
+        assert "hget" not in names
+
+    @pytest.mark.asyncio
+    async def test_batch_is_one_round_trip(self, delta, fake_redis):
+        applied = await delta.apply_signals([
+            SessionSignal(USER_ID, SESSION_ID, "slot_confirm", "restaurant", "active"),
+            SessionSignal(USER_ID, SESSION_ID, "slot_confirm", "restaurant", "active"),
+            SessionSignal(USER_ID, SESSION_ID, "card_viewed", "museum", "active"),
+            SessionSignal(USER_ID, "sess-bbb", "slot_skip", "bar", "active"),
+        ])
+
+        assert applied == 4
+        assert len(fake_redis.pipelines) == 1
+        result = await delta.get_delta(USER_ID, SESSION_ID)
+        assert abs(result["food_priority_adj"] - 0.2) < 1e-6
+        assert result["signal_count"] == 3
+        other = await delta.get_delta(USER_ID, "sess-bbb")
+        assert abs(other["nightlife_interest_adj"] - (-0.08)) < 1e-6
+        assert fake_redis.get_ttl(_redis_key(USER_ID, "sess-bbb")) == 30 * 60
+
+    @pytest.mark.asyncio
+    async def test_same_field_folded_into_one_increment(self, delta, fake_redis):
+        await delta.apply_signals(
+            [SessionSignal(USER_ID, SESSION_ID, "slot_confirm", "museum", "active")] * 5
+        )
+        commands = fake_redis.pipelines[0].commands
+        incrs = [args for name, args, _ in commands if name == "hincrbyfloat"]
+        assert incrs == [(_redis_key(USER_ID, SESSION_ID), "culture_engagement_adj", 0.5)]
+        assert ("hincrby", (_redis_key(USER_ID, SESSION_ID), "signal_count", 5), {}) in commands
+
+    @pytest.mark.asyncio
+    async def test_accepts_plain_tuples(self, delta):
+        await delta.apply_signals([(USER_ID, SESSION_ID, "slot_confirm", "park", "active")])
+        result = await delta.get_delta(USER_ID, SESSION_ID)
+        assert abs(result["nature_preference_adj"] - 0.08) < 1e-6
+
+    @pytest.mark.asyncio
+    async def test_empty_batch_skips_redis(self, delta, fake_redis):
+        assert await delta.apply_signals([]) == 0
+        assert fake_redis.pipelines == []
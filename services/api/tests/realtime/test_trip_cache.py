@@ -11,12 +11,15 @@ import time
 from datetime import datetime, timedelta, timezone
 
 import pytest
-from unittest.mock import AsyncMock
+from redis.exceptions import WatchError
+from unittest.mock import AsyncMock, MagicMock
 
+from services.api.persona.codec import decode_trip_state, from_wire
 from services.api.realtime.trip_cache import (
     TripPersonaCache,
     _expiry_timestamp,
     _redis_key,
+    _MERGE_ATTEMPTS,
     _PERSONA_MIN,
     _PERSONA_MAX,
 )
@@ -30,12 +33,20 @@ class FakeRedis:
     """
     Minimal dict-backed Redis fake implementing the operations used by
     TripPersonaCache:
-      hget, hset, hincrby, hgetall, expireat, delete
+      hget, hset, hdel, hincrby, hgetall, expireat, delete, pipeline
+    Every write bumps a per-key version so pipelines can emulate WATCH.
     """
 
     def __init__(self) -> None:
         self._store: dict[str, dict[str, str]] = {}
         self._expiry_timestamps: dict[str, int] = {}
+        self._versions: dict[str, int] = {}
+
+    def _touch(self, key: str) -> None:
+        self._versions[key] = self._versions.get(key, 0) + 1
+
+    def version(self, key: str) -> int:
+        return self._versions.get(key, 0)
 
     async def hget(self, key: str, field: str) -> str | None:
         return self._store.get(key, {}).get(field)
@@ -45,6 +56,12 @@ class FakeRedis:
             self._store[key] = {}
         for k, v in mapping.items():
             self._store[key][k] = str(v)
+        self._touch(key)
+
+    async def hdel(self, key: str, *fields: str) -> int:
+        bucket = self._store.get(key, {})
+        self._touch(key)
+        return sum(bucket.pop(f, None) is not None for f in fields)
 
     async def hincrby(self, key: str, field: str, amount: int) -> int:
         if key not in self._store:
@@ -52,6 +69,7 @@ class FakeRedis:
         current = int(self._store[key].get(field, "0"))
         new_val = current + amount
         self._store[key][field] = str(new_val)
+        self._touch(key)
         return new_val
 
     async def hgetall(self, key: str) -> dict[str, str]:
@@ -59,10 +77,15 @@ class FakeRedis:
 
     async def expireat(self, key: str, timestamp: int) -> None:
         self._expiry_timestamps[key] = timestamp
+        self._touch(key)
 
     async def delete(self, key: str) -> None:
         self._store.pop(key, None)
         self._expiry_timestamps.pop(key, None)
+        self._touch(key)
+
+    def pipeline(self, transaction: bool = True) -> "FakePipeline":
+        return FakePipeline(self)
 
     def key_exists(self, key: str) -> bool:
         return key in self._store
@@ -71,6 +94,56 @@ class FakeRedis:
         return self._expiry_timestamps.get(key)
 
 
+class FakePipeline:
+    """
+    Queues FakeRedis calls and runs them in order on execute().
+
+    After watch(), commands run immediately until multi(); execute() then
+    raises WatchError if a watched key was written in between.
+    """
+
+    def __init__(self, redis: FakeRedis) -> None:
+        self._redis = redis
+        self._ops: list = []
+        self._watched: dict[str, int] = {}
+        self._immediate = False
+
+    async def __aenter__(self) -> "FakePipeline":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self._ops = []
+        self._watched = {}
+        self._immediate = False
+
+    async def watch(self, *keys: str) -> None:
+        self._watched = {k: self._redis.version(k) for k in keys}
+        self._immediate = True
+
+    def multi(self) -> None:
+        self._immediate = False
+
+    def __getattr__(self, name: str):
+        if self._immediate:
+            return getattr(self._redis, name)
+
+        def queue(*args, **kwargs):
+            self._ops.append((name, args, kwargs))
+            return self
+        return queue
+
+    async def execute(self) -> list:
+        if any(self._redis.version(k) != v for k, v in self._watched.items()):
+            self.reset()
+            raise WatchError("Watched variable changed.")
+        results = [await getattr(self._redis, n)(*a, **kw) for n, a, kw in self._ops]
+        self.reset()
+        return results
+
+
 # ---------------------------------------------------------------------------
 # Fixtures
 # ---------------------------------------------------------------------------
@@ -350,6 +423,56 @@ class TestMergeSessionDelta:
         result = await cache.get_cached_persona(USER_ID, TRIP_ID)
         assert result["signal_count_since_nightly"] == 0
 
+    @pytest.mark.asyncio
+    async def test_concurrent_merge_is_not_lost(self, cache, fake_redis):
+        await _seed_cache(cache)
+        hgetall = fake_redis.hgetall
+        raced = False
+
+        async def racing_hgetall(key):
+            nonlocal raced
+            raw = await hgetall(key)
+            if not raced:
+                # Another session flushes between this read and the write
+                raced = True
+                await cache.merge_session_delta(
+                    USER_ID, TRIP_ID, {"food_priority_adj": 0.1, "signal_count": 2}
+                )
+            return raw
+
+        fake_redis.hgetall = racing_hgetall
+        await cache.merge_session_delta(
+            USER_ID, TRIP_ID, {"food_priority_adj": 0.1, "signal_count": 3}
+        )
+        fake_redis.hgetall = hgetall
+
+        result = await cache.get_cached_persona(USER_ID, TRIP_ID)
+        assert result["food_priority"] == pytest.approx(0.8)
+        assert result["signal_count_since_nightly"] == 5
+
+    @pytest.mark.asyncio
+    async def test_merge_gives_up_after_repeated_conflicts(self, cache, fake_redis):
+        await _seed_cache(cache)
+        key = _redis_key(USER_ID, TRIP_ID)
+        hgetall = fake_redis.hgetall
+        reads = 0
+
+        async def always_racing_hgetall(k):
+            nonlocal reads
+            reads += 1
+            raw = await hgetall(k)
+            await fake_redis.expireat(k, 0)  # any write invalidates the WATCH
+            return raw
+
+        fake_redis.hgetall = always_racing_hgetall
+        await cache.merge_session_delta(USER_ID, TRIP_ID, {"food_priority_adj": 0.1})
+        fake_redis.hgetall = hgetall
+
+        assert reads == _MERGE_ATTEMPTS
+        result = await cache.get_cached_persona(USER_ID, TRIP_ID)
+        assert result["food_priority"] == pytest.approx(0.6)
+        assert key in fake_redis._store
+
     @pytest.mark.asyncio
     async def test_last_updated_refreshed_on_merge(self, cache):
         await _seed_cache(cache)
@@ -435,8 +558,10 @@ class TestErrorHandling:
 
     @pytest.mark.asyncio
     async def test_set_survives_redis_error(self):
-        bad_redis = AsyncMock()
-        bad_redis.hset.side_effect = ConnectionError("Redis down")
+        bad_redis = MagicMock()
+        bad_redis.pipeline.return_value.execute = AsyncMock(
+            side_effect=ConnectionError("Redis down")
+        )
         cache = TripPersonaCache(bad_redis)
         # Should not raise
         await cache.set_cached_persona(USER_ID, TRIP_ID, _BASE_PERSONA, 1, _FUTURE_END)
@@ -444,7 +569,7 @@ class TestErrorHandling:
     @pytest.mark.asyncio
     async def test_merge_survives_redis_error(self):
         bad_redis = AsyncMock()
-        bad_redis.hgetall.side_effect = ConnectionError("Redis down")
+        bad_redis.pipeline = MagicMock(side_effect=ConnectionError("Redis down"))
         cache = TripPersonaCache(bad_redis)
         # Should not raise
         await cache.merge_session_delta(USER_ID, TRIP_ID, {"food_priority_adj": 0.1})
@@ -466,6 +591,89 @@ class TestErrorHandling:
         await cache.invalidate(USER_ID, TRIP_ID)
 
 
+# ---------------------------------------------------------------------------
+# Binary storage + legacy migration
+# ---------------------------------------------------------------------------
+
+def _legacy_hash() -> dict[str, str]:
+    """A pre-codec entry: one string field per dimension."""
+    return {
+        **{dim: str(v) for dim, v in _BASE_PERSONA.items()},
+        "nightly_sync_version": "3",
+        "signal_count_since_nightly": "4",
+        "last_updated": "2026-03-01T10:00:00+00:00",
+    }
+
+
+class TestBinaryStorage:
+    @pytest.mark.asyncio
+    async def test_hash_holds_state_blob_and_count_only(self, cache, fake_redis):
+        await _seed_cache(cache, version=9)
+        stored = fake_redis._store[_redis_key(USER_ID, TRIP_ID)]
+        assert set(stored) == {"state", "signal_count_since_nightly"}
+        state = decode_trip_state(from_wire(stored["state"]))
+        assert state["nightly_sync_version"] == 9
+        assert state["food_priority"] == pytest.approx(0.6)
+
+    @pytest.mark.asyncio
+    async def test_corrupt_blob_is_a_miss(self, cache, fake_redis):
+        await _seed_cache(cache)
+        fake_redis._store[_redis_key(USER_ID, TRIP_ID)]["state"] = "bm90IGEgYmxvYg=="
+        assert await cache.get_cached_persona(USER_ID, TRIP_ID) is None
+
+    @pytest.mark.asyncio
+    async def test_seed_keeps_effective_persona_fields(self, cache, fake_redis):
+        key = _redis_key(USER_ID, TRIP_ID)
+        fake_redis._store[key] = {"snapshot": "abc"}
+        await _seed_cache(cache)
+        assert fake_redis._store[key]["snapshot"] == "abc"
+
+    @pytest.mark.asyncio
+    async def test_effective_fields_alone_are_a_miss(self, cache, fake_redis):
+        fake_redis._store[_redis_key(USER_ID, TRIP_ID)] = {"snapshot": "abc"}
+        assert await cache.get_cached_persona(USER_ID, TRIP_ID) is None
+
+
+class TestLegacyMigration:
+    @pytest.mark.asyncio
+    async def test_legacy_hash_is_read_transparently(self, cache, fake_redis):
+        fake_redis._store[_redis_key(USER_ID, TRIP_ID)] = _legacy_hash()
+        result = await cache.get_cached_persona(USER_ID, TRIP_ID)
+        assert result["food_priority"] == pytest.approx(0.6)
+        assert result["nightly_sync_version"] == 3
+        assert result["signal_count_since_nightly"] == 4
+        assert result["last_updated"] == "2026-03-01T10:00:00+00:00"
+
+    @pytest.mark.asyncio
+    async def test_legacy_hash_rewritten_in_place(self, cache, fake_redis):
+        key = _redis_key(USER_ID, TRIP_ID)
+        fake_redis._store[key] = _legacy_hash()
+        fake_redis._expiry_timestamps[key] = 1_900_000_000
+
+        first = await cache.get_cached_persona(USER_ID, TRIP_ID)
+
+        assert set(fake_redis._store[key]) == {"state", "signal_count_since_nightly"}
+        assert fake_redis.get_expiry_ts(key) == 1_900_000_000
+        assert await cache.get_cached_persona(USER_ID, TRIP_ID) == first
+
+    @pytest.mark.asyncio
+    async def test_merge_onto_legacy_hash(self, cache, fake_redis):
+        fake_redis._store[_redis_key(USER_ID, TRIP_ID)] = _legacy_hash()
+        await cache.merge_session_delta(
+            USER_ID, TRIP_ID, {"food_priority_adj": 0.1, "signal_count": 2}
+        )
+        result = await cache.get_cached_persona(USER_ID, TRIP_ID)
+        assert result["food_priority"] == pytest.approx(0.7)
+        assert result["signal_count_since_nightly"] == 6
+        assert result["nightly_sync_version"] == 3
+
+    @pytest.mark.asyncio
+    async def test_check_version_on_legacy_hash(self, cache, fake_redis):
+        fake_redis._store[_redis_key(USER_ID, TRIP_ID)] = _legacy_hash()
+        assert await cache.check_version(USER_ID, TRIP_ID, 3) is True
+        assert await cache.check_version(USER_ID, TRIP_ID, 4) is False
+
+
 # ---------------------------------------------------------------------------
 # expiry_timestamp helper
 # ---------------------------------------------------------------------------
@@ -11,13 +11,18 @@ Covers:
 - Gate details structure
 - DB storage of eval results
 - Edge cases (single query, all hits, all misses)
+- Batched engine: rank-matrix metrics, predict_batch and bounded fallback,
+  several models in one pass, bootstrap CI gate; hand-computed aggregates
+  on both the batched and per-query paths
 """
 
+import asyncio
 import math
 import os
 from dataclasses import dataclass
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import numpy as np
 import pyarrow as pa
 import pyarrow.parquet as pq
 import pytest
@@ -31,7 +36,10 @@ from services.api.evaluation.offline_eval import (
     _compute_ndcg_at_k,
     _compute_reciprocal_rank,
     _load_test_data,
+    bootstrap_ci,
+    metrics_from_ranks,
     run_offline_eval,
+    run_offline_eval_many,
 )
 
 
@@ -419,3 +427,149 @@ class TestEvalResultDataclass:
         assert result.model_id == "m1"
         assert result.total_queries == 100
         assert result.passed_gates is True
+
+
+# ===========================================================================
+# Batched engine
+# ===========================================================================
+
+@dataclass
+class BatchModel:
+    """Model with predict_batch; ranks the ground truth at a fixed position."""
+    model_id: str
+    rank: int
+    model_version: str = "1.0.0"
+    batch_calls: int = 0
+
+    async def predict_batch(self, user_ids, context_items):
+        self.batch_calls += 1
+        return [self._ranking(u) for u in user_ids]
+
+    async def predict(self, user_id, context_items):
+        raise AssertionError("predict_batch should be used")
+
+    def _ranking(self, user_id):
+        truth = f"t-{user_id}"
+        if self.rank == 0:
+            return ["x"]
+        return [f"x{i}" for i in range(self.rank - 1)] + [truth]
+
+
+def _queries(n):
+    return [
+        {"user_id": f"u{i}", "ground_truth_item_id": f"t-u{i}", "context_items": []}
+        for i in range(n)
+    ]
+
+
+class TestBatchedEngine:
+
+    def test_metrics_from_ranks_match_per_query(self):
+        ranks = np.array([[1, 2, 5, 6, 10, 11, 0]])
+        hr, rr, ndcg = metrics_from_ranks(ranks, k=10)
+        for j, rank in enumerate(ranks[0]):
+            ranking = ["target"] if rank == 1 else [f"x{i}" for i in range(rank - 1)] + ["target"]
+            if rank == 0:
+                ranking = ["x"]
+            assert hr[0, j] == _compute_hr_at_k(ranking, "target", k=5)
+            assert rr[0, j] == pytest.approx(_compute_reciprocal_rank(ranking, "target"))
+            assert ndcg[0, j] == pytest.approx(_compute_ndcg_at_k(ranking, "target", k=10))
+
+    def test_bootstrap_ci_is_paired_and_ordered(self):
+        rng = np.random.default_rng(1)
+        base = rng.random(500)
+        ci = bootstrap_ci(np.stack([base, base + 0.1]), n_resamples=200, seed=3)
+        assert ci.shape == (2, 2)
+        assert np.all(ci[:, 0] <= ci[:, 1])
+        # Same resamples for both rows: the shift carries through exactly
+        assert ci[1] == pytest.approx(ci[0] + 0.1)
+        assert ci[0, 0] <= base.mean() <= ci[0, 1]
+
+    async def test_predict_batch_used_per_batch(self, tmp_path):
+        fp = str(tmp_path / "test.parquet")
+        _write_test_data(fp, _queries(10))
+        model = BatchModel("batch-v1", rank=1)
+        pool, conn = _make_pool()
+
+        result = await run_offline_eval(pool, model, fp, batch_size=4)
+
+        assert model.batch_calls == 3
+        assert result.total_queries == 10
+        assert result.hr_at_5 == 1.0
+
+    async def test_predict_fallback_is_bounded(self, tmp_path):
+        fp = str(tmp_path / "test.parquet")
+        _write_test_data(fp, _queries(20))
+        active = 0
+        peak = 0
+
+        class SlowModel(MockEvalModel):
+            async def predict(self, user_id, context_items):
+                nonlocal active, peak
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.001)
+                active -= 1
+                return [f"t-{user_id}"]
+
+        pool, conn = _make_pool()
+        result = await run_offline_eval(pool, SlowModel(), fp, concurrency=3)
+
+        assert result.mrr == 1.0
+        assert 1 < peak <= 3
+
+    async def test_several_models_one_pass_with_bootstrap_gate(self, tmp_path):
+        fp = str(tmp_path / "test.parquet")
+        _write_test_data(fp, _queries(200))
+        better = BatchModel("better", rank=1)
+        worse = BatchModel("worse", rank=8)
+        production = BatchModel("production", rank=3)
+        pool, conn = _make_pool(production_ndcg=0.0)
+
+        results = await run_offline_eval_many(
+            pool, [better, worse], fp, production_model=production, n_resamples=100
+        )
+
+        assert [r.model_id for r in results] == ["better", "worse"]
+        assert better.batch_calls == worse.batch_calls == production.batch_calls == 1
+        good, bad = results
+        assert good.passed_gates is True
+        assert good.gate_details["ndcg_at_10"]["method"] == "bootstrap_ci_non_overlap"
+        assert good.gate_details["ndcg_at_10"]["production_baseline"] == pytest.approx(0.5)
+        assert good.ndcg_at_10_ci == pytest.approx((1.0, 1.0))
+        assert bad.gate_details["ndcg_at_10"]["passed"] is False
+        # Production metrics are not stored; the stored baseline is not read
+        stored = [c.args[2] for c in conn.execute.call_args_list]
+        assert stored == ["better", "worse"]
+        conn.fetchrow.assert_not_called()
+
+    @pytest.mark.parametrize("batched", [False, True])
+    async def test_aggregates_hand_computed(self, tmp_path, batched):
+        fp = str(tmp_path / "test.parquet")
+        _write_test_data(fp, _queries(4))
+        ranks = {"u0": 1, "u1": 3, "u2": 12, "u3": 0}
+
+        class RankModel(MockEvalModel):
+            def _ranking(self, user_id):
+                rank = ranks[user_id]
+                return [f"x{i}" for i in range(rank - 1)] + [f"t-{user_id}"] if rank else ["x"]
+
+            async def predict(self, user_id, context_items):
+                if ranks[user_id] == 0:
+                    raise RuntimeError("model error")
+                return self._ranking(user_id)
+
+            async def predict_batch(self, user_ids, context_items):
+                return [self._ranking(u) for u in user_ids]
+
+        model = RankModel()
+        if not batched:
+            model.predict_batch = None
+        pool, conn = _make_pool()
+
+        result = await run_offline_eval(pool, model, fp)
+
+        # HR@5 hits ranks 1 and 3; NDCG@10 adds 1 + 1/log2(4); rank 12 only counts for MRR
+        assert result.hr_at_5 == pytest.approx(2 / 4)
+        assert result.mrr == pytest.approx((1 + 1 / 3 + 1 / 12) / 4)
+        assert result.ndcg_at_10 == pytest.approx((1 + 0.5) / 4)
@@ -0,0 +1,252 @@
+"""
+Tests for ShadowExecutor: sampled, bounded shadow runs.
+
+Covers:
+- Sampling rate (0, 1, seeded fractional)
+- Drop-on-full queue policy
+- Fixed worker pool concurrency bound
+- Batched multi-row result inserts (size and interval triggers, stop flush)
+- Counters, latency histogram and write-error accounting
+- Off-loop (thread) prediction via predict_sync; async predict stays on the loop
+- ShadowRunner routing detached runs to the executor
+"""
+
+import asyncio
+import json
+import random
+import threading
+from unittest.mock import AsyncMock, MagicMock
+
+from services.api.shadow.executor import LatencyHistogram, ShadowExecutor
+from services.api.shadow.runner import ShadowRunner
+from services.api.tests.shadow_training.test_shadow_runner import MockShadowModel, _make_pool
+
+
+class _GatedModel:
+    """Model whose predictions wait on an event; tracks peak concurrency."""
+
+    model_id = "gated-v1"
+    model_version = "1.0.0"
+
+    def __init__(self) -> None:
+        self.gate = asyncio.Event()
+        self.active = 0
+        self.peak = 0
+
+    async def predict(self, user_id: str, context_items: list[str]) -> list[str]:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await self.gate.wait()
+        finally:
+            self.active -= 1
+        return list(context_items)
+
+
+class _ThreadRecordingModel:
+    model_id = "thread-v1"
+    model_version = "1.0.0"
+
+    def __init__(self) -> None:
+        self.threads: set[str] = set()
+        self.async_calls = 0
+
+    async def predict(self, user_id: str, context_items: list[str]) -> list[str]:
+        self.async_calls += 1
+        return list(reversed(context_items))
+
+    def predict_sync(self, user_id: str, context_items: list[str]) -> list[str]:
+        self.threads.add(threading.current_thread().name)
+        return list(reversed(context_items))
+
+
+# ===========================================================================
+# Sampling and admission
+# ===========================================================================
+
+class TestAdmission:
+    def test_sample_rate_zero_keeps_nothing(self):
+        pool, _ = _make_pool()
+        executor = ShadowExecutor(pool, MockShadowModel(), sample_rate=0.0)
+        assert not any(executor.submit("u", "t", ["a"], ["a"]) for _ in range(50))
+        assert executor.stats.submitted == 50
+        assert executor.stats.sampled == 0
+
+    def test_sampling_is_roughly_the_configured_rate(self):
+        pool, _ = _make_pool()
+        executor = ShadowExecutor(
+            pool, MockShadowModel(), sample_rate=0.25, queue_size=10_000, rng=random.Random(7)
+        )
+        for _ in range(4000):
+            executor.submit("u", "t", ["a"], ["a"])
+        assert 850 <= executor.stats.sampled <= 1150
+
+    def test_full_queue_drops_without_blocking(self):
+        pool, _ = _make_pool()
+        executor = ShadowExecutor(pool, MockShadowModel(), sample_rate=1.0, queue_size=3)
+        accepted = [executor.submit("u", "t", ["a"], ["a"]) for _ in range(5)]
+        assert accepted == [True, True, True, False, False]
+        assert executor.stats.sampled == 5
+        assert executor.stats.dropped == 2
+
+
+# ===========================================================================
+# Workers and persistence
+# ===========================================================================
+
+class TestExecution:
+    async def test_worker_pool_bounds_concurrency(self):
+        pool, _ = _make_pool()
+        model = _GatedModel()
+        executor = ShadowExecutor(pool, model, sample_rate=1.0, queue_size=100, workers=3)
+        executor.start()
+        for i in range(20):
+            executor.submit(f"u{i}", "t", ["a", "b"], ["a", "b"])
+        await asyncio.sleep(0.01)
+        assert model.peak == 3
+
+        model.gate.set()
+        await executor.stop()
+        assert model.peak == 3
+        assert executor.stats.completed == 20
+
+    async def test_results_inserted_in_batches(self):
+        pool, conn = _make_pool()
+        executor = ShadowExecutor(
+            pool, MockShadowModel(), sample_rate=1.0, workers=2, flush_rows=4, flush_interval_s=60
+        )
+        executor.start()
+        for i in range(10):
+            executor.submit(f"u{i}", f"t{i}", ["a", "b", "c"], ["a", "b", "c"])
+        await executor.stop()
+
+        # Two full batches of 4, then the remaining 2 on stop
+        batch_sizes = [len(call.args[1]) for call in conn.execute.call_args_list]
+        assert batch_sizes == [4, 4, 2]
+        assert executor.stats.written == 10
+
+        sql, ids, model_ids, _, user_ids, trip_ids, shadow, *_ = conn.execute.call_args_list[0].args
+        assert "unnest" in sql
+        assert len(set(ids)) == 4
+        assert set(model_ids) == {"test-bpr-v1"}
+        assert [u[1:] for u in user_ids] == [t[1:] for t in trip_ids]
+        assert json.loads(shadow[0]) == ["c", "b", "a"]
+
+    async def test_interval_flush(self):
+        pool, conn = _make_pool()
+        executor = ShadowExecutor(
+            pool, MockShadowModel(), sample_rate=1.0, flush_rows=100, flush_interval_s=0.01
+        )
+        executor.start()
+        executor.submit("u", "t", ["a"], ["a"])
+        await asyncio.sleep(0.05)
+        assert conn.execute.await_count == 1
+        await executor.stop()
+        assert executor.stats.written == 1
+
+    async def test_counters_and_latency_histogram(self):
+        pool, _ = _make_pool()
+        executor = ShadowExecutor(pool, MockShadowModel(_should_fail=True), sample_rate=1.0)
+        executor.start()
+        executor.submit("u", "t", ["a"], ["a"])
+        await executor.stop()
+        assert executor.stats.failed == 1
+        assert executor.stats.completed == 0
+
+        executor = ShadowExecutor(pool, MockShadowModel(), sample_rate=1.0)
+        executor.start()
+        for _ in range(3):
+            executor.submit("u", "t", ["a"], ["a"])
+        await executor.stop()
+        stats = executor.stats.as_dict()
+        assert stats["completed"] == 3
+        assert stats["latency"]["count"] == 3
+        assert stats["latency"]["buckets"]["le_1"] == 3
+
+    async def test_write_failure_is_counted_not_raised(self):
+        pool, conn = _make_pool()
+        conn.execute = AsyncMock(side_effect=RuntimeError("db down"))
+        executor = ShadowExecutor(pool, MockShadowModel(), sample_rate=1.0)
+        executor.start()
+        executor.submit("u", "t", ["a"], ["a"])
+        await executor.stop()
+        assert executor.stats.completed == 1
+        assert executor.stats.write_errors == 1
+        assert executor.stats.written == 0
+
+    async def test_offload_runs_prediction_off_loop(self):
+        pool, _ = _make_pool()
+        model = _ThreadRecordingModel()
+        executor = ShadowExecutor(pool, model, sample_rate=1.0, workers=2, offload=True)
+        executor.start()
+        executor.submit("u", "t", ["a", "b"], ["b", "a"])
+        await executor.stop()
+        assert executor.stats.completed == 1
+        assert model.threads and all(name.startswith("shadow") for name in model.threads)
+        assert model.async_calls == 0
+
+    async def test_offload_without_sync_hook_stays_on_loop(self):
+        pool, _ = _make_pool()
+        model = MockShadowModel()
+        executor = ShadowExecutor(pool, model, sample_rate=1.0, workers=2, offload=True)
+        executor.start()
+        assert executor._threads is None
+        executor.submit("u", "t", ["a", "b"], ["b", "a"])
+        await executor.stop()
+        assert executor.stats.completed == 1
+
+    async def test_stop_waits_for_in_flight_thread_predictions(self):
+        pool, _ = _make_pool()
+        release = threading.Event()
+        finished: list[str] = []
+
+        class _SlowModel(_ThreadRecordingModel):
+            def predict_sync(self, user_id, context_items):
+                release.wait(5)
+                finished.append(user_id)
+                return list(context_items)
+
+        executor = ShadowExecutor(pool, _SlowModel(), sample_rate=1.0, workers=1, offload=True)
+        executor.start()
+        executor.submit("u", "t", ["a"], ["a"])
+        await asyncio.sleep(0.01)
+        stopping = asyncio.create_task(executor.stop(drain=False))
+        await asyncio.sleep(0.01)
+        assert not stopping.done()
+        release.set()
+        await stopping
+        assert finished == ["u"]
+
+
+# ===========================================================================
+# Histogram and runner integration
+# ===========================================================================
+
+class TestLatencyHistogram:
+    def test_buckets_and_quantiles(self):
+        hist = LatencyHistogram((10, 100))
+        for ms in (1, 5, 50, 500):
+            hist.observe(ms)
+        assert hist.counts == [2, 1, 1]
+        assert hist.quantile(0.5) == 10
+        assert hist.quantile(0.75) == 100
+        assert hist.quantile(1.0) == float("inf")
+        assert LatencyHistogram().quantile(0.5) is None
+
+
+class TestRunnerRouting:
+    async def test_detached_runs_go_to_executor(self):
+        pool, _ = _make_pool()
+        executor = MagicMock()
+        runner = ShadowRunner(pool=pool, model=MockShadowModel(), executor=executor)
+
+        assert runner.run_shadow_detached("u1", "t1", ["a"], ["a"]) is None
+        executor.submit.assert_called_once_with("u1", "t1", ["a"], ["a"])
+
+    async def test_disabled_runner_skips_executor(self):
+        pool, _ = _make_pool()
+        executor = MagicMock()
+        runner = ShadowRunner(pool=pool, model=None, executor=executor)
+
+        assert runner.run_shadow_detached("u1", "t1", ["a"], ["a"]) is None
+        executor.submit.assert_not_called()
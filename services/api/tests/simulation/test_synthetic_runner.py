@@ -19,13 +19,16 @@ Coverage:
   - All synthetic DB writes use "category_preference" signal_type
   - signal_value stays within [-1.0, 3.0] for all direction/confidence combos
   - LLM calls are logged with model version, prompt version, latency, cost
-  - DB write uses correct SQL table (behavioral_signals)
+  - DB write uses correct SQL table (behavioral_signals), via batched COPY
   - Run with zero archetypes returns completed with 0 signals
   - Sonnet failure per trip is non-fatal (skips trip, continues)
+  - Scheduling: bounded archetype concurrency, shared budget reservations,
+    request cap, checkpoint/resume
 """
 
 from __future__ import annotations
 
+import asyncio
 import json
 from unittest.mock import AsyncMock, MagicMock, patch, call
 
@@ -46,6 +49,7 @@ from services.api.simulation.synthetic_runner import (
     SONNET_PROMPT_VERSION,
     HAIKU_PROMPT_VERSION,
 )
+from services.api.simulation.scheduler import SimulationBudget, load_checkpoint
 
 pytestmark = pytest.mark.asyncio
 
@@ -482,14 +486,14 @@ class TestSyntheticUserIDs:
         )
 
         conn = db_pool.acquire.return_value.__aenter__.return_value
-        if conn.executemany.called:
-            for call_args in conn.executemany.call_args_list:
-                rows = call_args[0][1]
-                for row in rows:
-                    user_id = row[1]  # index 1 is user_id
-                    assert user_id.startswith(SYNTH_ID_PREFIX), (
-                        f"Synthetic user ID {user_id!r} missing 'synth-' prefix"
-                    )
+        assert conn.copy_records_to_table.called
+        for call_args in conn.copy_records_to_table.call_args_list:
+            rows = call_args.kwargs["records"]
+            for row in rows:
+                user_id = row[1]  # index 1 is user_id
+                assert user_id.startswith(SYNTH_ID_PREFIX), (
+                    f"Synthetic user ID {user_id!r} missing 'synth-' prefix"
+                )
 
     def test_synth_prefix_constant(self):
         assert SYNTH_ID_PREFIX == "synth-"
@@ -620,12 +624,12 @@ class TestDBInteraction:
         )
 
         conn = db_pool.acquire.return_value.__aenter__.return_value
-        if conn.executemany.called:
-            for call_args in conn.executemany.call_args_list:
-                rows = call_args[0][1]
-                for row in rows:
-                    signal_type = row[5]  # index 5 is signal_type
-                    assert signal_type == "category_preference"
+        assert conn.copy_records_to_table.called
+        for call_args in conn.copy_records_to_table.call_args_list:
+            rows = call_args.kwargs["records"]
+            for row in rows:
+                signal_type = row[5]  # index 5 is signal_type
+                assert signal_type == "category_preference"
 
     async def test_signals_written_to_behavioral_signal_table(self):
         """INSERT SQL must target BehavioralSignal table."""
@@ -641,6 +645,192 @@ class TestDBInteraction:
         )
 
         conn = db_pool.acquire.return_value.__aenter__.return_value
-        if conn.executemany.called:
-            sql_arg = conn.executemany.call_args_list[0][0][0]
-            assert 'behavioral_signals' in sql_arg
+        assert conn.copy_records_to_table.called
+        table_arg = conn.copy_records_to_table.call_args_list[0][0][0]
+        assert table_arg == 'behavioral_signals'
+
+
+# ---------------------------------------------------------------------------
+# Scheduling: concurrency, shared budget, COPY batching, checkpoints
+# ---------------------------------------------------------------------------
+
+def _make_tracking_client(delay_s: float = 0.0) -> tuple[AsyncMock, dict]:
+    """Anthropic mock that records peak concurrent Sonnet calls."""
+    inner = _make_anthropic_client()
+    stats = {"active": 0, "peak": 0, "calls": 0}
+
+    async def _create(**kwargs):
+        stats["calls"] += 1
+        if kwargs.get("model") == SONNET_MODEL:
+            stats["active"] += 1
+            stats["peak"] = max(stats["peak"], stats["active"])
+            await asyncio.sleep(delay_s)
+            stats["active"] -= 1
+        return await inner.messages.create(**kwargs)
+
+    client = AsyncMock()
+    client.messages.create = AsyncMock(side_effect=_create)
+    return client, stats
+
+
+class TestScheduling:
+    async def test_archetypes_run_concurrently_up_to_limit(self):
+        client, stats = _make_tracking_client(delay_s=0.01)
+        result = await run_synthetic_simulation(
+            db_pool=_make_db_pool(),
+            anthropic_client=client,
+            is_admin=True,
+            trips_per_archetype=2,
+            concurrency=3,
+        )
+        assert stats["peak"] == 3
+        assert result["status"] == "completed"
+        assert [r["archetype_id"] for r in result["archetype_results"]] == [
+            a["id"] for a in ARCHETYPES
+        ]
+
+    async def test_signals_batched_into_few_copies(self):
+        db_pool = _make_db_pool()
+        result = await run_synthetic_simulation(
+            db_pool=db_pool,
+            anthropic_client=_make_anthropic_client(),
+            is_admin=True,
+            archetype_filter=["budget_backpacker", "luxury_foodie"],
+            trips_per_archetype=10,
+        )
+        conn = db_pool.acquire.return_value.__aenter__.return_value
+        copied = sum(len(c.kwargs["records"]) for c in conn.copy_records_to_table.call_args_list)
+        # 2 archetypes x 10 trips x 2 signals, in far fewer than 20 writes
+        assert copied == result["signals_generated"] == 40
+        assert conn.copy_records_to_table.await_count < 5
+        assert not conn.executemany.called
+
+    async def test_parallel_run_matches_sequential(self):
+        """Concurrent archetypes write the same signals at the same cost as one at a time."""
+        outputs = []
+        for concurrency in (1, 4):
+            db_pool = _make_db_pool()
+            result = await run_synthetic_simulation(
+                db_pool=db_pool,
+                anthropic_client=_make_anthropic_client(),
+                is_admin=True,
+                trips_per_archetype=3,
+                concurrency=concurrency,
+            )
+            conn = db_pool.acquire.return_value.__aenter__.return_value
+            rows = sorted(
+                row[1:13]  # without the random id and createdAt
+                for c in conn.copy_records_to_table.call_args_list
+                for row in c.kwargs["records"]
+            )
+            outputs.append((result["signals_generated"], result["cost_estimate_usd"], rows))
+
+        (seq_signals, seq_cost, seq_rows), (par_signals, par_cost, par_rows) = outputs
+        assert seq_signals == par_signals == len(seq_rows) > 0
+        assert par_cost == pytest.approx(seq_cost)
+        assert par_rows == seq_rows
+
+    async def test_failed_copy_not_counted(self):
+        db_pool = _make_db_pool()
+        conn = db_pool.acquire.return_value.__aenter__.return_value
+        conn.copy_records_to_table = AsyncMock(side_effect=RuntimeError("db down"))
+        result = await run_synthetic_simulation(
+            db_pool=db_pool,
+            anthropic_client=_make_anthropic_client(),
+            is_admin=True,
+            archetype_filter=["budget_backpacker"],
+            trips_per_archetype=2,
+        )
+        assert result["status"] == "completed"
+        assert result["signals_generated"] == 0
+
+    async def test_request_cap_stops_all_workers(self):
+        client, stats = _make_tracking_client()
+        result = await run_synthetic_simulation(
+            db_pool=_make_db_pool(),
+            anthropic_client=client,
+            is_admin=True,
+            trips_per_archetype=50,
+            concurrency=4,
+            max_requests=20,
+        )
+        assert result["status"] == "aborted"
+        assert "budget_cap" in result["abort_reason"]
+        assert stats["calls"] <= 20
+
+    async def test_budget_reservation_keeps_concurrent_spend_under_cap(self):
+        budget = SimulationBudget(cost_cap_usd=1.0)
+        assert budget.reserve(0.4, 10, 2) is None
+        assert budget.reserve(0.4, 10, 2) is None
+        # A third concurrent trip would overshoot, even before anything is spent
+        assert "budget_cap" in budget.reserve(0.4, 10, 2)
+        budget.charge(0.1, 10)
+        budget.release(0.4, 10, 2)
+        assert budget.reserve(0.4, 10, 2) is None
+        assert not budget.exhausted
+
+    async def test_checkpoint_resumes_interrupted_run(self, tmp_path):
+        checkpoint = tmp_path / "sim.json"
+        calls = {"n": 0}
+        inner = _make_anthropic_client()
+
+        async def _create(**kwargs):
+            calls["n"] += 1
+            if calls["n"] > 12:
+                raise asyncio.CancelledError()
+            return await inner.messages.create(**kwargs)
+
+        client = AsyncMock()
+        client.messages.create = AsyncMock(side_effect=_create)
+        db_pool = _make_db_pool()
+        with pytest.raises(asyncio.CancelledError):
+            await run_synthetic_simulation(
+                db_pool=db_pool,
+                anthropic_client=client,
+                is_admin=True,
+                archetype_filter=["budget_backpacker"],
+                trips_per_archetype=10,
+                checkpoint_path=checkpoint,
+            )
+        saved = load_checkpoint(checkpoint)
+        state = saved["state"]["budget_backpacker"]
+        assert state["next_trip"] == 7  # 6 trips (12 calls) finished
+        assert state["signals"] == 12
+
+        resumed_client = _make_anthropic_client()
+        result = await run_synthetic_simulation(
+            db_pool=db_pool,
+            anthropic_client=resumed_client,
+            is_admin=True,
+            archetype_filter=["budget_backpacker"],
+            trips_per_archetype=10,
+            checkpoint_path=checkpoint,
+        )
+        # Only the remaining 4 trips are simulated
+        assert resumed_client.messages.create.await_count == 8
+        assert result["status"] == "completed"
+        assert result["signals_generated"] == 20
+        assert result["archetype_results"][0]["trips_completed"] == 10
+        assert load_checkpoint(checkpoint)["state"]["budget_backpacker"]["done"] is True
+
+    async def test_checkpoint_for_other_run_is_ignored(self, tmp_path):
+        checkpoint = tmp_path / "sim.json"
+        await run_synthetic_simulation(
+            db_pool=_make_db_pool(),
+            anthropic_client=_make_anthropic_client(),
+            is_admin=True,
+            archetype_filter=["budget_backpacker"],
+            trips_per_archetype=2,
+            checkpoint_path=checkpoint,
+        )
+        client = _make_anthropic_client()
+        result = await run_synthetic_simulation(
+            db_pool=_make_db_pool(),
+            anthropic_client=client,
+            is_admin=True,
+            archetype_filter=["budget_backpacker"],
+            trips_per_archetype=3,
+            checkpoint_path=checkpoint,
+        )
+        assert client.messages.create.await_count == 6
+        assert result["signals_generated"] == 6
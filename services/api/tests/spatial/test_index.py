@@ -0,0 +1,290 @@
+"""
+Tests for the in-memory spatial index.
+
+Validates:
+  - within / nearest / along agree with brute-force haversine scans
+  - mask filters (category, approved, min score, exclusions) and discard()
+  - CitySpatialIndexes loads once, reloads on a new search generation,
+    keeps memory under its byte budget and returns None on load failure
+  - find_nodes_in_index mirrors the SQL corridor filters and ranking
+"""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+
+from services.api.generation.ranking_cache import search_generation_key
+from services.api.microstops.spatial import (
+    MAX_CANDIDATES,
+    TRANSIT_BUFFER_METERS,
+    TransitPath,
+    find_nodes_in_index,
+)
+from services.api.spatial import (
+    CityIndex,
+    CitySpatialIndexes,
+    clear_spatial_indexes,
+    discard_node,
+    haversine_m,
+    invalidate_spatial_index,
+    pairwise_haversine_m,
+    spatial_index_bytes,
+)
+
+_LAT0, _LON0 = 35.68, 139.70
+
+
+def _random_index(n: int = 3000, seed: int = 7, **kwargs) -> CityIndex:
+    rng = np.random.default_rng(seed)
+    lats = _LAT0 + rng.uniform(-0.05, 0.05, n)
+    lons = _LON0 + rng.uniform(-0.06, 0.06, n)
+    return CityIndex([f"n{i}" for i in range(n)], lats, lons, **kwargs)
+
+
+def _segment_distance_m(index: CityIndex, olat, olon, dlat, dlon) -> np.ndarray:
+    ax, ay = index.project(olat, olon)
+    bx, by = index.project(dlat, dlon)
+    px, py = index.x.astype(np.float64), index.y.astype(np.float64)
+    dx, dy = bx - ax, by - ay
+    t = np.clip(((px - ax) * dx + (py - ay) * dy) / (dx * dx + dy * dy), 0.0, 1.0)
+    return np.hypot(px - (ax + t * dx), py - (ay + t * dy))
+
+
+@pytest.fixture(autouse=True)
+def _clear():
+    clear_spatial_indexes()
+    yield
+    clear_spatial_indexes()
+
+
+# ===================================================================
+# Distance helpers
+# ===================================================================
+
+
+class TestHaversine:
+    def test_one_degree_of_latitude(self):
+        assert haversine_m(0.0, 0.0, 1.0, 0.0) == pytest.approx(111_195, rel=1e-3)
+
+    def test_pairwise_is_symmetric_with_zero_diagonal(self):
+        d = pairwise_haversine_m([35.0, 35.1, 35.2], [139.0, 139.1, 139.2])
+        assert d.shape == (3, 3)
+        assert np.allclose(d, d.T)
+        assert np.all(np.diag(d) == 0.0)
+
+
+# ===================================================================
+# CityIndex queries
+# ===================================================================
+
+
+class TestCityIndexQueries:
+    @pytest.mark.parametrize("radius", [10.0, 50.0, 400.0, 2500.0])
+    def test_within_matches_brute_force(self, radius):
+        index = _random_index()
+        for qlat, qlon in [(_LAT0, _LON0), (35.71, 139.74), (35.60, 139.70)]:
+            positions, dist = index.within(qlat, qlon, radius)
+            brute = haversine_m(qlat, qlon, index.lat, index.lon)
+            assert set(positions.tolist()) == set(np.flatnonzero(brute <= radius).tolist())
+            assert np.all(np.diff(dist) >= 0)
+
+    def test_nearest_matches_brute_force(self):
+        index = _random_index()
+        positions, dist = index.nearest(35.69, 139.71, 15)
+        brute = haversine_m(35.69, 139.71, index.lat, index.lon)
+        assert positions.tolist() == np.argsort(brute, kind="stable")[:15].tolist()
+        assert dist == pytest.approx(np.sort(brute)[:15])
+
+    def test_nearest_respects_max_radius(self):
+        index = _random_index()
+        positions, dist = index.nearest(_LAT0, _LON0, 100, max_radius_m=300.0)
+        assert len(positions) < 100
+        assert np.all(dist <= 300.0)
+
+    def test_along_matches_brute_force(self):
+        index = _random_index()
+        segment = (35.66, 139.68, 35.70, 139.73)
+        positions, dist = index.along(*segment, 200.0)
+        brute = _segment_distance_m(index, *segment)
+        assert set(positions.tolist()) == set(np.flatnonzero(brute <= 200.0).tolist())
+        assert np.all(dist <= 200.0)
+
+    def test_empty_index(self):
+        index = CityIndex([], [], [])
+        assert len(index.within(_LAT0, _LON0, 100.0)[0]) == 0
+        assert len(index.nearest(_LAT0, _LON0, 3)[0]) == 0
+        assert len(index.along(_LAT0, _LON0, 35.69, 139.71, 200.0)[0]) == 0
+
+
+class TestCityIndexFilters:
+    def _index(self) -> CityIndex:
+        return CityIndex(
+            ["a", "b", "c", "d"],
+            [_LAT0] * 4,
+            [_LON0, _LON0 + 0.0001, _LON0 + 0.0002, _LON0 + 0.0003],
+            categories=["dining", "culture", "dining", None],
+            scores=[0.9, None, 0.1, 0.5],
+            approved=[True, True, False, True],
+        )
+
+    def _ids(self, index, mask) -> list[str]:
+        positions, _ = index.within(_LAT0, _LON0, 100.0, mask)
+        return sorted(index.ids[p] for p in positions)
+
+    def test_mask_filters(self):
+        index = self._index()
+        assert self._ids(index, index.mask(category="dining")) == ["a", "c"]
+        assert self._ids(index, index.mask(category="unknown")) == []
+        assert self._ids(index, index.mask(approved_only=True)) == ["a", "b", "d"]
+        # NULL scores pass a minimum, like the SQL filters
+        assert self._ids(index, index.mask(min_score=0.3)) == ["a", "b", "d"]
+        assert self._ids(index, index.mask(exclude_ids=["a", "missing"])) == ["b", "c", "d"]
+
+    def test_discard(self):
+        index = self._index()
+        assert index.discard("b") is True
+        assert index.discard("missing") is False
+        assert self._ids(index, None) == ["a", "c", "d"]
+        assert self._ids(index, index.mask(category="culture")) == []
+
+    def test_nbytes_scales_with_size(self):
+        small, large = _random_index(100), _random_index(10_000)
+        assert 0 < small.nbytes < large.nbytes
+        assert large.nbytes < 10_000 * 200
+
+
+# ===================================================================
+# CitySpatialIndexes store
+# ===================================================================
+
+
+def _rows(n: int, prefix: str = "n") -> list[dict]:
+    return [
+        {
+            "id": f"{prefix}{i}", "name": f"Node {i}", "latitude": _LAT0 + i * 1e-4,
+            "longitude": _LON0, "category": "dining", "convergenceScore": 0.5,
+            "status": "approved",
+        }
+        for i in range(n)
+    ]
+
+
+def _db(rows: list[dict]) -> MagicMock:
+    db = MagicMock()
+    db.fetch = AsyncMock(return_value=rows)
+    return db
+
+
+class _Redis:
+    def __init__(self) -> None:
+        self.store: dict[str, str] = {}
+
+    async def get(self, key: str) -> str | None:
+        return self.store.get(key)
+
+
+class TestCitySpatialIndexes:
+    @pytest.mark.asyncio
+    async def test_loads_once_for_concurrent_callers(self):
+        db = _db(_rows(5))
+        store = CitySpatialIndexes(db)
+        indexes = await asyncio.gather(*(store.get("Tokyo") for _ in range(5)))
+
+        assert db.fetch.await_count == 1
+        assert all(index is indexes[0] for index in indexes)
+        assert indexes[0].size == 5
+        assert await store.get("tokyo") is indexes[0]
+
+    @pytest.mark.asyncio
+    async def test_reloads_on_new_search_generation(self, monkeypatch):
+        monkeypatch.setattr("services.api.spatial.store._GENERATION_CHECK_S", 0.0)
+        redis = _Redis()
+        db = _db(_rows(3))
+        store = CitySpatialIndexes(db, redis)
+
+        first = await store.get("Tokyo")
+        assert await store.get("Tokyo") is first
+
+        redis.store[search_generation_key("Tokyo")] = "1"
+        second = await store.get("Tokyo")
+        assert second is not first
+        assert db.fetch.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidate_and_discard(self):
+        db = _db(_rows(3))
+        store = CitySpatialIndexes(db)
+        index = await store.get("Tokyo")
+
+        discard_node("n1")
+        assert not index.active[index.position("n1")]
+
+        invalidate_spatial_index("Tokyo")
+        assert await store.get("Tokyo") is not index
+
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_used_over_budget(self):
+        db = _db(_rows(200))
+        probe = CitySpatialIndexes(db)
+        one_city = (await probe.get("Probe")).nbytes
+        clear_spatial_indexes()
+
+        store = CitySpatialIndexes(db, max_bytes=int(one_city * 2.5))
+        for city in ("Tokyo", "Kyoto", "Osaka"):
+            await store.get(city)
+
+        assert spatial_index_bytes() <= one_city * 2.5
+        db.fetch.reset_mock()
+        await store.get("Osaka")
+        assert db.fetch.await_count == 0
+        await store.get("Tokyo")
+        assert db.fetch.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_load_failure_returns_none(self):
+        db = MagicMock()
+        db.fetch = AsyncMock(side_effect=RuntimeError("db down"))
+        assert await CitySpatialIndexes(db).get("Tokyo") is None
+        assert await CitySpatialIndexes(db).get("") is None
+
+
+# ===================================================================
+# Micro-stop corridor from the index
+# ===================================================================
+
+
+class TestFindNodesInIndex:
+    def test_mirrors_sql_filters_and_ranking(self):
+        n = 12
+        index = CityIndex(
+            [f"n{i}" for i in range(n)],
+            [35.6850] * n,
+            [139.7000 + i * 1e-4 for i in range(n)],
+            categories=["culture"] * n,
+            scores=[None, 0.2, 0.9, 0.5, 0.6, 0.7, 0.8, 0.4, 0.45, 0.55, 0.65, 0.75],
+            approved=[True] * 11 + [False],
+            names=[f"Node {i}" for i in range(n)],
+        )
+        path = TransitPath(35.6850, 139.6990, 35.6850, 139.7020, exclude_node_ids=("n2",))
+
+        found = find_nodes_in_index(index, path)
+
+        assert len(found) == MAX_CANDIDATES
+        ids = [c.activity_node_id for c in found]
+        assert "n1" not in ids   # below MIN_CONVERGENCE_SCORE
+        assert "n2" not in ids   # excluded
+        assert "n11" not in ids  # not approved
+        scores = [c.convergence_score for c in found]
+        assert scores == sorted(scores, reverse=True)
+        assert found[0].name == "Node 6"
+        assert found[0].category == "culture"
+
+    def test_corridor_width(self):
+        index = CityIndex(["on", "off"], [35.6850, 35.6900], [139.7005, 139.7005])
+        found = find_nodes_in_index(index, TransitPath(35.6850, 139.7000, 35.6850, 139.7010))
+        assert [c.activity_node_id for c in found] == ["on"]
+        assert TRANSIT_BUFFER_METERS < haversine_m(35.6850, 139.7005, 35.6900, 139.7005)
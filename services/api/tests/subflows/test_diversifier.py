@@ -13,13 +13,19 @@ Covers:
   - num_select > len(candidates) is handled gracefully
   - Candidates without score fields use 0.5 fallback relevance
   - Determinism: same inputs produce same outputs
+  - MMRIndex: similarity rows match _similarity; selection order matches
+    the pairwise reference loop
 """
 
 from __future__ import annotations
 
+import random
+
 import pytest
 
+from services.api.subflows import diversifier
 from services.api.subflows.diversifier import (
+    MMRIndex,
     apply_mmr_diversification,
     generate_alternatives,
     DEFAULT_LAMBDA,
@@ -302,3 +308,107 @@ class TestLambdaSensitivity:
         candidates = [make_candidate("a"), make_candidate("b")]
         apply_mmr_diversification(candidates, num_select=1, lambda_param=0.0)
         apply_mmr_diversification(candidates, num_select=1, lambda_param=1.0)
+
+
+# ---------------------------------------------------------------------------
+# MMRIndex
+# ---------------------------------------------------------------------------
+
+def _reference_mmr(candidates: list[dict], num_select: int, lambda_param: float) -> list[str]:
+    """The pairwise O(k^2 * n) loop the index replaces."""
+    pool = list(candidates)
+    selected: list[dict] = []
+    while len(selected) < num_select and pool:
+        best_idx, best_mmr = None, float("-inf")
+        for i, candidate in enumerate(pool):
+            relevance = _get_relevance(candidate)
+            if not selected:
+                mmr_score = relevance
+            else:
+                max_sim = max(_similarity(candidate, s) for s in selected)
+                mmr_score = lambda_param * relevance - (1 - lambda_param) * max_sim
+            if mmr_score > best_mmr:
+                best_mmr, best_idx = mmr_score, i
+        selected.append(pool.pop(best_idx))
+    return [c["id"] for c in selected]
+
+
+def _random_pool(seed: int, n: int) -> list[dict]:
+    rng = random.Random(seed)
+    categories = ["dining", "museum", "outdoor", "nightlife", "", "shopping"]
+    vibes = ["ramen", "art", "scenic", "hidden-gem", "late-night", "cafe", "market", "jazz"]
+    return [
+        make_candidate(
+            f"c{i}",
+            score=round(rng.random(), 2),  # coarse scores force ties
+            category=rng.choice(categories),
+            vibes=rng.sample(vibes, rng.randint(0, 4)),
+        )
+        for i in range(n)
+    ]
+
+
+class TestMMRIndex:
+    def test_similarity_rows_match_pairwise(self):
+        pool = _random_pool(seed=7, n=30)
+        index = MMRIndex(pool)
+        for i, a in enumerate(pool):
+            row = index.similarity_row(i)
+            assert row.tolist() == [_similarity(a, b) for b in pool]
+
+    @pytest.mark.parametrize("lambda_param", [0.0, 0.3, 0.5, DEFAULT_LAMBDA, 1.0])
+    def test_selection_matches_reference_loop(self, lambda_param):
+        for seed in range(5):
+            pool = _random_pool(seed=seed, n=60)
+            result = apply_mmr_diversification(pool, num_select=12, lambda_param=lambda_param)
+            assert [c["id"] for c in result] == _reference_mmr(pool, 12, lambda_param)
+
+    def test_exclude_mask_removes_candidates(self):
+        pool = [make_candidate("a", score=0.9), make_candidate("b", score=0.5), make_candidate("a", score=0.1)]
+        index = MMRIndex(pool)
+        exclude = index.excluding_id("a")
+        assert exclude.tolist() == [True, False, True]
+        assert index.select(3, exclude=exclude) == [1]
+
+    def test_alternatives_match_reference_loop(self):
+        pool = _random_pool(seed=11, n=60)
+        selected, remaining = pool[:12], pool[12:]
+        alts = generate_alternatives(selected, remaining, num_alternatives=3)
+        expected = [
+            _reference_mmr([c for c in remaining if c.get("id") != s.get("id")], 3, 0.5)
+            for s in selected
+        ]
+        assert [[c["id"] for c in a] for a in alts] == expected
+
+    def test_alternatives_share_selection_for_same_exclusion(self):
+        selected = [make_candidate("s1"), make_candidate("s2")]
+        remaining = [make_candidate(f"r{i}", score=i / 10) for i in range(5)]
+        alts = generate_alternatives(selected, remaining, num_alternatives=3)
+        assert [c["id"] for c in alts[0]] == [c["id"] for c in alts[1]]
+        assert alts[0] is not alts[1]
+
+    def test_prebuilt_index_is_reused(self, monkeypatch):
+        pool = _random_pool(seed=5, n=40)
+        remaining = pool[8:]
+        index = MMRIndex(remaining)
+        first = generate_alternatives(pool[:4], remaining, num_alternatives=3, index=index)
+        rows_after_first = len(index._rows)
+
+        def _no_rebuild(*args, **kwargs):
+            raise AssertionError("generate_alternatives rebuilt the index")
+
+        monkeypatch.setattr(diversifier, "MMRIndex", _no_rebuild)
+        second = generate_alternatives(pool[4:8], remaining, num_alternatives=3, index=index)
+
+        assert rows_after_first > 0
+        assert [[c["id"] for c in a] for a in first + second] == [
+            _reference_mmr([c for c in remaining if c.get("id") != s.get("id")], 3, 0.5)
+            for s in pool[:8]
+        ]
+
+    def test_prebuilt_index_must_match_pool(self):
+        remaining = [make_candidate(f"r{i}") for i in range(4)]
+        with pytest.raises(ValueError):
+            generate_alternatives(
+                [make_candidate("s1")], remaining, index=MMRIndex(remaining[:2])
+            )
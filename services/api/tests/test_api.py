@@ -184,3 +184,34 @@ class TestRateLimiting:
         app.state.redis = None
         response = await client.get("/health")
         assert response.status_code == 200
+
+
+# ---------------------------------------------------------------------------
+# Lifespan
+# ---------------------------------------------------------------------------
+
+class TestLifespan:
+    """Process-wide services built at startup and released at shutdown."""
+
+    @pytest.mark.asyncio
+    async def test_weather_service_always_shared_and_closed(self, monkeypatch):
+        from fastapi import FastAPI
+
+        from services.api import main
+
+        monkeypatch.setattr(main.settings, "redis_url", "")
+        monkeypatch.setattr(main.settings, "database_url", "")
+        monkeypatch.setattr(main.settings, "weather_prefetch_enabled", False)
+        monkeypatch.setattr(main, "setup_sentry", MagicMock())
+        monkeypatch.setattr(main, "QdrantSearchClient", MagicMock(return_value=AsyncMock()))
+        weather = MagicMock()
+        weather.aclose = AsyncMock()
+        monkeypatch.setattr(main, "WeatherService", MagicMock(return_value=weather))
+
+        app = FastAPI()
+        async with main.lifespan(app):
+            # Built even with the prefetcher off: pivot evaluation reads it
+            assert app.state.weather_service is weather
+            weather.aclose.assert_not_awaited()
+
+        weather.aclose.assert_awaited_once()
@@ -0,0 +1,244 @@
+"""
+Rate limiter tests.
+
+Covers:
+- WindowCounterBackend: counting, previous-window decay, Retry-After
+- SlidingLogBackend: exact log semantics kept for tiers that opt in
+- LocalPreLimiter: GCRA over-limit rejection, denial cache, LRU bound
+- RateLimitMiddleware: local rejections skip Redis, per-tier backends,
+  streamed responses pass through with headers added
+"""
+
+from __future__ import annotations
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from httpx import ASGITransport, AsyncClient
+
+from services.api.middleware.rate_limit import (
+    LocalPreLimiter,
+    RateDecision,
+    RateLimitMiddleware,
+    SlidingLogBackend,
+    WindowCounterBackend,
+)
+
+
+class FakeRedis:
+    """Dict-backed Redis covering the commands both backends use."""
+
+    def __init__(self) -> None:
+        self.strings: dict[str, int] = {}
+        self.zsets: dict[str, dict[str, float]] = {}
+        self.commands = 0
+        self.round_trips = 0
+
+    def pipeline(self, transaction: bool = True) -> "FakePipeline":
+        return FakePipeline(self)
+
+    def incr(self, key):
+        self.strings[key] = self.strings.get(key, 0) + 1
+        return self.strings[key]
+
+    def pexpire(self, key, ms):
+        return True
+
+    def expire(self, key, seconds):
+        return True
+
+    def get(self, key):
+        value = self.strings.get(key)
+        return None if value is None else str(value)
+
+    def zremrangebyscore(self, key, lo, hi):
+        zset = self.zsets.setdefault(key, {})
+        for member in [m for m, s in zset.items() if lo <= s <= hi]:
+            del zset[member]
+
+    def zcard(self, key):
+        return len(self.zsets.get(key, {}))
+
+    def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+
+
+class FakePipeline:
+    def __init__(self, redis: FakeRedis) -> None:
+        self._redis = redis
+        self._ops: list = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self._ops.append((name, args, kwargs))
+            return self
+        return queue
+
+    async def execute(self):
+        self._redis.round_trips += 1
+        self._redis.commands += len(self._ops)
+        return [getattr(self._redis, n)(*a, **kw) for n, a, kw in self._ops]
+
+
+# ===================================================================
+# Backends
+# ===================================================================
+
+class TestWindowCounter:
+    @pytest.mark.asyncio
+    async def test_allows_up_to_limit_then_denies(self):
+        redis, backend = FakeRedis(), WindowCounterBackend()
+        decisions = [await backend.hit(redis, "k", 5, 60.0, 120.0) for _ in range(6)]
+        assert [d.allowed for d in decisions] == [True] * 5 + [False]
+        assert decisions[0].remaining == 4
+        assert decisions[-1].retry_after == pytest.approx(60.0)
+
+    @pytest.mark.asyncio
+    async def test_one_round_trip_of_three_commands(self):
+        redis = FakeRedis()
+        await WindowCounterBackend().hit(redis, "k", 5, 60.0, 120.0)
+        assert (redis.round_trips, redis.commands) == (1, 3)
+
+    @pytest.mark.asyncio
+    async def test_previous_window_decays(self):
+        redis, backend = FakeRedis(), WindowCounterBackend()
+        redis.strings["k:1"] = 12  # busy previous window (60-120s)
+
+        early = await backend.hit(redis, "k", 10, 60.0, 126.0)  # 12 * 0.9 + 1 > 10
+        assert early.allowed is False
+        # 12 * (1 - e/60) + 1 <= 10 once e >= 15s into the window
+        assert early.retry_after == pytest.approx(9.0)
+
+        late = await backend.hit(redis, "k", 10, 60.0, 170.0)  # ~17% overlap
+        assert late.allowed is True
+
+    @pytest.mark.asyncio
+    async def test_denied_requests_count(self):
+        redis, backend = FakeRedis(), WindowCounterBackend()
+        for _ in range(8):
+            await backend.hit(redis, "k", 3, 60.0, 60.0)
+        assert redis.strings["k:1"] == 8
+
+
+class TestSlidingLog:
+    @pytest.mark.asyncio
+    async def test_exact_window(self):
+        redis, backend = FakeRedis(), SlidingLogBackend()
+        for t in range(3):
+            assert (await backend.hit(redis, "k", 3, 60.0, 100.0 + t)).allowed
+        assert not (await backend.hit(redis, "k", 3, 60.0, 130.0)).allowed
+        # first entries have left the window
+        assert (await backend.hit(redis, "k", 3, 60.0, 161.5)).allowed
+
+
+# ===================================================================
+# Pre-limiter
+# ===================================================================
+
+class TestLocalPreLimiter:
+    def test_passes_within_budget(self):
+        local = LocalPreLimiter()
+        assert all(local.check("k", 5, 60.0, 0.0) is None for _ in range(5))
+
+    def test_rejects_when_local_budget_spent(self):
+        local = LocalPreLimiter()
+        for _ in range(5):
+            local.check("k", 5, 60.0, 0.0)
+        decision = local.check("k", 5, 60.0, 0.0)
+        assert decision is not None and not decision.allowed
+        assert decision.retry_after == pytest.approx(12.0)
+        # GCRA refills one slot per interval
+        assert local.check("k", 5, 60.0, 12.0) is None
+
+    def test_denial_cache(self):
+        local = LocalPreLimiter()
+        denial = RateDecision(allowed=False, limit=5, remaining=0, reset_at=60.0, retry_after=30.0)
+        local.record_denial("k", denial, 0.0)
+        assert local.check("k", 5, 60.0, 29.0) is not None
+        assert local.check("k", 5, 60.0, 31.0) is None
+        assert local.local_denials == 1
+
+    def test_bounded(self):
+        local = LocalPreLimiter(max_entries=3)
+        for i in range(10):
+            local.check(f"k{i}", 5, 60.0, 0.0)
+        assert len(local) == 3
+
+
+# ===================================================================
+# Middleware
+# ===================================================================
+
+def _app(redis, **kwargs) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/things")
+    async def things():
+        return {"ok": True}
+
+    @app.post("/generate/itinerary")
+    async def generate():
+        return {"ok": True}
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                yield f"line {i}\n"
+        return StreamingResponse(chunks(), media_type="text/calendar")
+
+    app.add_middleware(RateLimitMiddleware, redis_client=redis, **kwargs)
+    return app
+
+
+async def _get(app, path="/things", method="get"):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        return await getattr(client, method)(path)
+
+
+class TestMiddleware:
+    @pytest.mark.asyncio
+    async def test_headers_and_429(self):
+        redis = FakeRedis()
+        app = _app(redis)
+        responses = [await _get(app) for _ in range(11)]  # anon tier: 10/min
+        assert responses[0].headers["X-RateLimit-Limit"] == "10"
+        assert responses[0].headers["X-RateLimit-Remaining"] == "9"
+        assert responses[-1].status_code == 429
+        assert responses[-1].json()["error"]["code"] == "RATE_LIMITED"
+        assert int(responses[-1].headers["Retry-After"]) >= 1
+
+    @pytest.mark.asyncio
+    async def test_repeat_offender_is_rejected_locally(self):
+        redis = FakeRedis()
+        app = _app(redis)
+        for _ in range(11):
+            await _get(app)
+        trips = redis.round_trips
+        responses = [await _get(app) for _ in range(20)]
+        assert all(r.status_code == 429 for r in responses)
+        assert redis.round_trips == trips
+
+    @pytest.mark.asyncio
+    async def test_backend_per_tier(self):
+        redis = FakeRedis()
+        app = _app(redis, backends={"llm": SlidingLogBackend()})
+        await _get(app, "/generate/itinerary", method="post")
+        await _get(app)
+        assert list(redis.zsets) == ["ratelimit:llm:ip:127.0.0.1"]
+        assert any(k.startswith("ratelimit:anon:ip:127.0.0.1:") for k in redis.strings)
+
+    @pytest.mark.asyncio
+    async def test_streaming_response_keeps_headers(self):
+        redis = FakeRedis()
+        response = await _get(_app(redis), "/stream")
+        assert response.status_code == 200
+        assert response.text == "line 0\nline 1\nline 2\n"
+        assert response.headers["content-type"].startswith("text/calendar")
+        assert response.headers["X-RateLimit-Limit"] == "10"
+
+    @pytest.mark.asyncio
+    async def test_no_redis_bypasses(self):
+        response = await _get(_app(None))
+        assert response.status_code == 200
+        assert "X-RateLimit-Limit" not in response.headers
@@ -3,9 +3,11 @@ Weather service package.
 
 Provides OpenWeatherMap integration with per-city per-hour Redis caching.
 Multiple trips share weather data — city + hour is the cache key.
+WeatherPrefetcher refreshes active-trip cities ahead of the hourly rollover.
 """
 
 from services.api.weather.service import WeatherService
 from services.api.weather.cache import WeatherCache
+from services.api.weather.prefetcher import WeatherPrefetcher
 
-__all__ = ["WeatherService", "WeatherCache"]
+__all__ = ["WeatherService", "WeatherCache", "WeatherPrefetcher"]
@@ -13,6 +13,10 @@ City slug normalisation:
 
 The raw OpenWeatherMap /weather JSON is cached verbatim so WeatherService
 can parse whatever fields it needs without extra round-trips.
+
+Writes may target the *next* hour's bucket (WeatherPrefetcher does this a
+few minutes before the top of the hour). Such entries live until the end of
+the bucket they belong to, so the hourly rollover finds them already cached.
 """
 
 from __future__ import annotations
@@ -21,7 +25,7 @@ import json
 import logging
 import re
 import unicodedata
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Any
 
 logger = logging.getLogger(__name__)
@@ -45,10 +49,33 @@ def _slugify(city: str) -> str:
     return slug or "unknown"
 
 
-def _hour_bucket() -> str:
-    """Return the current UTC hour as a string: YYYYMMDD_HH."""
-    now = datetime.now(timezone.utc)
-    return now.strftime("%Y%m%d_%H")
+_BUCKET_FORMAT = "%Y%m%d_%H"
+
+
+def _hour_bucket(at: datetime | None = None) -> str:
+    """Return the UTC hour (default: now) as a string: YYYYMMDD_HH."""
+    now = at or datetime.now(timezone.utc)
+    return now.astimezone(timezone.utc).strftime(_BUCKET_FORMAT)
+
+
+def next_hour_bucket(at: datetime | None = None) -> str:
+    """Bucket of the UTC hour after ``at`` (default: now)."""
+    now = at or datetime.now(timezone.utc)
+    return _hour_bucket(now + timedelta(hours=1))
+
+
+def seconds_until_next_hour(at: datetime | None = None) -> float:
+    """Seconds from ``at`` (default: now) to the next UTC top of the hour."""
+    now = (at or datetime.now(timezone.utc)).astimezone(timezone.utc)
+    top = now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+    return (top - now).total_seconds()
+
+
+def _bucket_ttl(hour_bucket: str) -> int:
+    """Seconds until the end of ``hour_bucket``, capped at two hours."""
+    start = datetime.strptime(hour_bucket, _BUCKET_FORMAT).replace(tzinfo=timezone.utc)
+    remaining = (start + timedelta(hours=1) - datetime.now(timezone.utc)).total_seconds()
+    return max(1, min(int(remaining), 2 * _TTL_SECONDS))
 
 
 def _cache_key(city: str, hour_bucket: str | None = None) -> str:
@@ -77,12 +104,12 @@ class WeatherCache:
         """
         self._redis = redis
 
-    async def get(self, city: str) -> dict[str, Any] | None:
+    async def get(self, city: str, hour_bucket: str | None = None) -> dict[str, Any] | None:
         """Return cached weather payload for city, or None on miss / unavailable."""
         if self._redis is None:
             return None
 
-        key = _cache_key(city)
+        key = _cache_key(city, hour_bucket)
         try:
             raw = await self._redis.get(key)
             if raw is None:
@@ -94,15 +121,26 @@ class WeatherCache:
             logger.warning("Weather cache GET failed for key=%s", key, exc_info=True)
             return None
 
-    async def set(self, city: str, payload: dict[str, Any]) -> None:
-        """Write weather payload to Redis with a 1-hour TTL."""
+    async def set(
+        self,
+        city: str,
+        payload: dict[str, Any],
+        hour_bucket: str | None = None,
+    ) -> None:
+        """
+        Write weather payload to Redis.
+
+        The current hour gets a 1-hour TTL; an explicit ``hour_bucket`` lives
+        until the end of that hour.
+        """
         if self._redis is None:
             return
 
-        key = _cache_key(city)
+        key = _cache_key(city, hour_bucket)
+        ttl = _TTL_SECONDS if hour_bucket is None else _bucket_ttl(hour_bucket)
         try:
-            await self._redis.set(key, json.dumps(payload), ex=_TTL_SECONDS)
-            logger.debug("Weather cached: key=%s ttl=%ds", key, _TTL_SECONDS)
+            await self._redis.set(key, json.dumps(payload), ex=ttl)
+            logger.debug("Weather cached: key=%s ttl=%ds", key, ttl)
         except Exception:
             logger.warning("Weather cache SET failed for key=%s", key, exc_info=True)
 
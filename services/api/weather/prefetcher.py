@@ -0,0 +1,207 @@
+"""
+WeatherPrefetcher — keep active-trip cities cached across the hourly rollover.
+
+WeatherCache keys are per UTC hour, so every city's entry misses at the top
+of the hour and pivot detection would otherwise fetch inline. The prefetcher
+runs one background loop per process:
+
+  1. On start, warm the current hour for every city with an active trip
+     (cities already in Redis cost a GET, not an API call).
+  2. Each hour, starting lead_s before the top of the hour, refresh every
+     active city into the *next* hour's bucket. Each city gets a uniform
+     random delay in [0, jitter_s) so calls spread out instead of bursting,
+     with at most max_concurrent requests in flight.
+
+Active cities are the legs of trips with status 'active' whose dates cover
+today (one query per cycle), busiest first. Each cycle refreshes at most
+max_cities of them: OpenWeatherMap's free tier is 1,000 calls/day and up to
+25 cycles run per day, so the default cap spends at most half the budget
+and leaves the rest for inline fetches. Failures are logged; the loop keeps
+going and WeatherService falls back to its last-known-good summary.
+
+Off by default (WEATHER_PREFETCH_ENABLED).
+
+Usage (see main.py lifespan):
+    prefetcher = WeatherPrefetcher(weather_service, db_pool)
+    prefetcher.start()
+    ...
+    await prefetcher.stop()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from typing import Any
+
+from services.api.weather.cache import _slugify, next_hour_bucket, seconds_until_next_hour
+from services.api.weather.service import WeatherService
+
+logger = logging.getLogger(__name__)
+
+# Start refreshing this long before the top of the hour ...
+_LEAD_S = 600.0
+# ... spreading cities over this window (leaves lead - jitter of slack)
+_JITTER_S = 480.0
+# Bound on concurrent OpenWeatherMap calls from one prefetch cycle
+_MAX_CONCURRENT = 4
+# Retry delay after a failed cycle (e.g. database unavailable)
+_ERROR_BACKOFF_S = 60.0
+
+# OpenWeatherMap free tier, and the share of it prefetching may spend
+DAILY_CALL_BUDGET = 1000
+_PREFETCH_BUDGET_SHARE = 0.5
+# Hourly cycles plus the startup warm-up
+_CYCLES_PER_DAY = 25
+# Cities refreshed per cycle (20 -> at most 500 calls/day)
+_MAX_CITIES = int(DAILY_CALL_BUDGET * _PREFETCH_BUDGET_SHARE) // _CYCLES_PER_DAY
+
+_ACTIVE_CITIES_SQL = """
+SELECT tl.city, COUNT(DISTINCT t.id) AS trips
+FROM trips t
+JOIN trip_legs tl ON tl."tripId" = t.id
+WHERE t.status = 'active'
+  AND tl."startDate" <= now() + interval '1 day'
+  AND tl."endDate" >= now() - interval '1 day'
+GROUP BY tl.city
+ORDER BY trips DESC, tl.city
+"""
+
+
+class WeatherPrefetcher:
+    """Background refresh of weather for every city with an active trip."""
+
+    def __init__(
+        self,
+        weather_service: WeatherService,
+        db: Any,
+        *,
+        lead_s: float = _LEAD_S,
+        jitter_s: float = _JITTER_S,
+        max_concurrent: int = _MAX_CONCURRENT,
+        max_cities: int = _MAX_CITIES,
+        rng: random.Random | None = None,
+    ) -> None:
+        """
+        Args:
+            weather_service: Shared WeatherService (pooled client, last-known-good).
+            db:              asyncpg pool.
+            lead_s:          Seconds before the top of the hour to start refreshing.
+            jitter_s:        Window over which per-city refreshes are spread.
+            max_concurrent:  Max in-flight API calls per cycle.
+            max_cities:      Max cities refreshed per cycle (API budget cap).
+            rng:             Random source for jitter (tests pass a seeded one).
+        """
+        self._weather = weather_service
+        self._db = db
+        self._lead_s = lead_s
+        self._jitter_s = min(jitter_s, lead_s)
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._max_cities = max(0, max_cities)
+        self._rng = rng or random.Random()
+        self._task: asyncio.Task | None = None
+
+    async def active_cities(self) -> list[str]:
+        """
+        Distinct cities of active trips in progress, one per slug, busiest
+        first and capped at max_cities.
+        """
+        rows = await self._db.fetch(_ACTIVE_CITIES_SQL)
+        cities: dict[str, str] = {}
+        for row in rows:
+            city = (row["city"] or "").strip()
+            if city:
+                cities.setdefault(_slugify(city), city)
+        if len(cities) > self._max_cities:
+            logger.warning(
+                "WeatherPrefetcher: %d active cities, refreshing the busiest %d "
+                "(max_cities, %d calls/day budget)",
+                len(cities),
+                self._max_cities,
+                DAILY_CALL_BUDGET,
+            )
+        return list(cities.values())[: self._max_cities]
+
+    async def refresh_all(
+        self,
+        hour_bucket: str | None = None,
+        *,
+        jitter: bool = True,
+    ) -> dict[str, bool]:
+        """
+        Refresh every active city into ``hour_bucket`` (default: this hour).
+
+        Returns city -> refreshed. With ``jitter`` each city waits a random
+        delay in [0, jitter_s) before its call.
+        """
+        cities = await self.active_cities()
+        delays = [self._rng.uniform(0.0, self._jitter_s) if jitter else 0.0 for _ in cities]
+        results = await asyncio.gather(
+            *(self._refresh_city(city, hour_bucket, delay) for city, delay in zip(cities, delays))
+        )
+        refreshed = dict(zip(cities, results))
+        failed = [city for city, ok in refreshed.items() if not ok]
+        logger.info(
+            "WeatherPrefetcher: refreshed %d/%d cities for bucket=%s%s",
+            len(cities) - len(failed),
+            len(cities),
+            hour_bucket or "current",
+            f" (failed: {', '.join(failed)})" if failed else "",
+        )
+        return refreshed
+
+    async def _refresh_city(self, city: str, hour_bucket: str | None, delay_s: float) -> bool:
+        if delay_s > 0:
+            await asyncio.sleep(delay_s)
+        async with self._semaphore:
+            return await self._weather.refresh(city, hour_bucket)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the background loop (no-op if already running)."""
+        if self.running:
+            return
+        self._task = asyncio.create_task(self._run(), name="weather-prefetcher")
+
+        def _on_done(t: asyncio.Task) -> None:
+            if not t.cancelled() and t.exception() is not None:
+                logger.error("WeatherPrefetcher stopped unexpectedly", exc_info=t.exception())
+
+        self._task.add_done_callback(_on_done)
+
+    async def stop(self) -> None:
+        """Cancel the background loop and wait for it to exit."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        await self._cycle(None, jitter=False)
+        while True:
+            wait_s = seconds_until_next_hour() - self._lead_s
+            if wait_s > 0:
+                await asyncio.sleep(wait_s)
+            bucket = next_hour_bucket()
+            await self._cycle(bucket, jitter=True)
+            # Past this hour's refresh window before scheduling the next one
+            await asyncio.sleep(max(0.0, seconds_until_next_hour()) + 1.0)
+
+    async def _cycle(self, hour_bucket: str | None, *, jitter: bool) -> None:
+        try:
+            await self.refresh_all(hour_bucket, jitter=jitter)
+        except Exception:
+            logger.warning("WeatherPrefetcher: cycle failed", exc_info=True)
+            await asyncio.sleep(_ERROR_BACKOFF_S)
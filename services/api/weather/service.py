@@ -5,6 +5,21 @@ Budget: 1,000 free API calls/day (~41/hour).
 Cache strategy: per-city per-hour (WeatherCache), so all trips in the same
 city share one API call per hour regardless of trip count.
 
+Fetch path (one WeatherService per process):
+  - One pooled httpx.AsyncClient, created on first use and reused for every
+    call until aclose().
+  - Single-flight: concurrent misses for the same city + hour share one
+    in-flight request instead of each calling the API.
+  - Last-known-good: every payload read from the cache or the API is kept
+    in-process per city, aged by when it was originally fetched (stamped
+    into the cached payload as "_fetched_at"), not when this process last
+    read it. On a miss with a recent last-known-good summary,
+    get_weather() returns it (marked "stale") immediately and refreshes in
+    the background; when the API is down it falls back to it. Only a city
+    this process has never seen waits on the API.
+  - refresh() fetches for an explicit hour bucket; WeatherPrefetcher uses it
+    to fill the next hour's key before the top of the hour.
+
 Outdoor category detection:
   ActivityCategory.outdoors and ActivityCategory.active are flagged as outdoor.
   Rain condition codes 500-531 and storm codes 200-232 trigger weather alerts.
@@ -23,13 +38,21 @@ OpenWeatherMap /weather endpoint returns:
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+import time
 from typing import Any
 
 import httpx
 
-from services.api.weather.cache import WeatherCache
+from services.api.weather.cache import (
+    _TTL_SECONDS,
+    WeatherCache,
+    _cache_key,
+    _hour_bucket,
+    _slugify,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -49,6 +72,21 @@ _WEATHER_ENDPOINT = f"{_OWM_BASE}/weather"
 # HTTP timeout for OpenWeatherMap calls
 _API_TIMEOUT_S = 8.0
 
+# Pooled client bounds (shared by every city and trip in the process)
+_MAX_CONNECTIONS = 20
+_MAX_KEEPALIVE_CONNECTIONS = 10
+
+# Serve a last-known-good summary on a cache miss (refreshing in the
+# background) while it is at most this old; beyond that the miss waits on
+# the API and last-known-good is only the API-failure fallback.
+_STALE_WHILE_REVALIDATE_S = 2 * 3600
+
+# Never fall back to a summary older than this
+_LAST_GOOD_MAX_AGE_S = 24 * 3600
+
+# Payload key holding the fetch time (unix seconds) of a cached response
+_FETCHED_AT_KEY = "_fetched_at"
+
 
 def _kelvin_to_celsius(k: float) -> float:
     return round(k - 273.15, 1)
@@ -103,51 +141,152 @@ class WeatherService:
         service = WeatherService(api_key="...", cache=WeatherCache(redis))
         summary = await service.get_weather("Tokyo")
         context = service.build_weather_context(summary, slot_category="outdoors")
+        ...
+        await service.aclose()
     """
 
-    def __init__(self, api_key: str, cache: WeatherCache) -> None:
+    def __init__(
+        self,
+        api_key: str,
+        cache: WeatherCache,
+        *,
+        http_client: httpx.AsyncClient | None = None,
+        timeout_s: float = _API_TIMEOUT_S,
+    ) -> None:
         """
         Args:
-            api_key: OpenWeatherMap API key (OPENWEATHERMAP_API_KEY env var).
-            cache:   WeatherCache instance backed by Redis.
+            api_key:     OpenWeatherMap API key (OPENWEATHERMAP_API_KEY env var).
+            cache:       WeatherCache instance backed by Redis.
+            http_client: Optional shared client; by default one pooled client
+                         is created on first use and closed by aclose().
+            timeout_s:   Per-request timeout for the default client.
         """
         self._api_key = api_key
         self._cache = cache
+        self._http = http_client
+        self._owns_http = http_client is None
+        self._timeout_s = timeout_s
+        # cache key -> in-flight fetch (single-flight)
+        self._inflight: dict[str, asyncio.Task] = {}
+        # city slug -> (unix time originally fetched, raw OWM payload)
+        self._last_good: dict[str, tuple[float, dict[str, Any]]] = {}
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client if this service created it."""
+        if self._http is not None and self._owns_http:
+            await self._http.aclose()
+            self._http = None
+
+    def _client(self) -> httpx.AsyncClient:
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                timeout=self._timeout_s,
+                limits=httpx.Limits(
+                    max_connections=_MAX_CONNECTIONS,
+                    max_keepalive_connections=_MAX_KEEPALIVE_CONNECTIONS,
+                ),
+            )
+        return self._http
 
     async def get_weather(self, city: str) -> dict[str, Any] | None:
         """
         Fetch current weather for a city, using the Redis cache.
 
-        Returns a parsed weather summary dict or None if the API is unreachable.
+        Returns a parsed weather summary dict or None if the API is unreachable
+        and there is no last-known-good summary.
 
         Cache strategy:
           - Check Redis first (key: weather:{city_slug}:{hour})
           - On hit: deserialise and return
-          - On miss: call OpenWeatherMap, cache the raw response, return parsed summary
+          - On miss with a recent last-known-good: return it with
+            "stale": True and refresh in the background
+          - Otherwise: call OpenWeatherMap (single-flight), cache the raw
+            response, return parsed summary; on failure fall back to
+            last-known-good
 
         Errors are logged and return None — callers must handle None gracefully.
         """
         # Check cache first
         cached = await self._cache.get(city)
         if cached is not None:
+            self._remember(city, cached)
             return _parse_condition(cached)
 
         # Cache miss — call OpenWeatherMap
         if not self._api_key:
             logger.warning("OPENWEATHERMAP_API_KEY not set; skipping weather fetch for %r", city)
-            return None
+            return self._stale_summary(city)
+
+        if self._last_good_payload(city, _STALE_WHILE_REVALIDATE_S) is not None:
+            self._start_fetch(city, _hour_bucket())
+            return self._stale_summary(city)
+
+        raw = await asyncio.shield(self._start_fetch(city, _hour_bucket()))
+        if raw is None:
+            return self._stale_summary(city)
+        return _parse_condition(raw)
+
+    async def refresh(
+        self,
+        city: str,
+        hour_bucket: str | None = None,
+        *,
+        force: bool = False,
+    ) -> bool:
+        """
+        Make sure ``city`` is cached for ``hour_bucket`` (default: this hour).
 
+        An entry already in Redis (e.g. written by another worker) counts as
+        refreshed unless ``force``. Returns False if the API call failed.
+        """
+        bucket = hour_bucket or _hour_bucket()
+        if not force:
+            cached = await self._cache.get(city, bucket)
+            if cached is not None:
+                self._remember(city, cached)
+                return True
+        if not self._api_key:
+            return False
+        return await asyncio.shield(self._start_fetch(city, bucket)) is not None
+
+    def _start_fetch(self, city: str, hour_bucket: str) -> asyncio.Task:
+        """Join the in-flight fetch for (city, hour_bucket) or start one."""
+        key = _cache_key(city, hour_bucket)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch_and_store(city, hour_bucket))
+            self._inflight[key] = task
+
+            def _on_done(t: asyncio.Task) -> None:
+                if self._inflight.get(key) is t:
+                    del self._inflight[key]
+
+            task.add_done_callback(_on_done)
+        return task
+
+    async def _fetch_and_store(self, city: str, hour_bucket: str) -> dict[str, Any] | None:
+        raw = await self._fetch(city)
+        if raw is None:
+            return None
+        raw[_FETCHED_AT_KEY] = time.time()
+        self._remember(city, raw)
+        await self._cache.set(
+            city, raw, hour_bucket=None if hour_bucket == _hour_bucket() else hour_bucket
+        )
+        return raw
+
+    async def _fetch(self, city: str) -> dict[str, Any] | None:
+        """One OpenWeatherMap call. Errors are logged and return None."""
         try:
-            async with httpx.AsyncClient(timeout=_API_TIMEOUT_S) as client:
-                resp = await client.get(
-                    _WEATHER_ENDPOINT,
-                    params={
-                        "q": city,
-                        "appid": self._api_key,
-                    },
-                )
-                resp.raise_for_status()
-                raw = resp.json()
+            resp = await self._client().get(
+                _WEATHER_ENDPOINT,
+                params={
+                    "q": city,
+                    "appid": self._api_key,
+                },
+            )
+            resp.raise_for_status()
+            return resp.json()
         except httpx.HTTPStatusError as exc:
             logger.warning(
                 "OpenWeatherMap returned %d for city=%r: %s",
@@ -160,10 +299,34 @@ class WeatherService:
             logger.exception("OpenWeatherMap fetch failed for city=%r", city)
             return None
 
-        # Store raw payload in cache (TTL 1 hour)
-        await self._cache.set(city, raw)
+    def _remember(self, city: str, raw: dict[str, Any]) -> None:
+        """
+        Keep ``raw`` as last-known-good, stamped with its original fetch time.
 
-        return _parse_condition(raw)
+        Payloads cached before fetch stamps existed fall back to the OWM
+        observation time, else to the oldest a live cache entry can be.
+        """
+        fetched_at = raw.get(_FETCHED_AT_KEY) or raw.get("dt")
+        if not isinstance(fetched_at, (int, float)):
+            fetched_at = time.time() - _TTL_SECONDS
+        slug = _slugify(city)
+        current = self._last_good.get(slug)
+        if current is None or fetched_at >= current[0]:
+            self._last_good[slug] = (float(fetched_at), raw)
+
+    def _last_good_payload(self, city: str, max_age_s: float) -> dict[str, Any] | None:
+        entry = self._last_good.get(_slugify(city))
+        if entry is None or time.time() - entry[0] > max_age_s:
+            return None
+        return entry[1]
+
+    def _stale_summary(self, city: str) -> dict[str, Any] | None:
+        raw = self._last_good_payload(city, _LAST_GOOD_MAX_AGE_S)
+        if raw is None:
+            return None
+        summary = _parse_condition(raw)
+        summary["stale"] = True
+        return summary
 
     def is_outdoor_slot(self, category: str) -> bool:
         """Return True if the activity category is weather-sensitive."""